@@ -1,16 +1,48 @@
+import time
+STARTUP_START = time.perf_counter()  # Taken before the heavy imports so the startup budget covers them
 import numpy as np
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import filedialog, messagebox, simpledialog, ttk
 from PIL import Image, ImageTk
 import os
-import shutil
-from datetime import datetime
 import logging
 from colorlog import ColoredFormatter
-import webcolors
-import zipfile
-import tempfile
 import sys
+import threading
+import shlex
+
+from tutankham import roms
+from tutankham.roms import (ROM_CONFIG, ROM_SETS, rom_cache, state_callbacks, register_callback,
+                            trigger_callback, load_all_roms, load_roms_from_folder,
+                            load_roms_from_zip, save_all_roms, update_copyright_checksum)
+from tutankham.graphics import (PALETTE_FILE_OFFSETS, tile_size, UI_GRAPHICS_CONFIG,
+                                TREASURE_GRAPHICS_CONFIG, PALETTE_NAMES, encode_palette_byte,
+                                get_font_name, extract_pixels, apply_palette_to_tile, get_tile_name,
+                                get_asset_store, write_bank, changed_region, render_tile_map)
+from tutankham.maps import (num_maps, map_width, map_height, empty_path_tile, NUM_DIFFICULTIES,
+                            NUM_TELEPORTS, NUM_SPAWNS, NUM_RESPAWNS, PATH_TILES, WALL_TILES,
+                            SPAWNER_TILES, TELEPORTER_TILES, DOOR_POSITIONS_BY_WIDTH, DOOR_TILES,
+                            ITEM_TILES, FILLED_TO_EMPTY, PLAYER_START_MARKER_TILE,
+                            RESPAWN_MARKER_TILE, ENEMY_SPAWN_MARKER_TILE, TELEPORTER_MARKER_TILE,
+                            load_visual_map_from_cache, write_visual_tile_to_cache,
+                            generate_logical_maps_from_visual, load_map_config, save_map_config,
+                            load_object_data, save_object_data, ITEM_GROUPS, get_object_index,
+                            TELEPORTER_STATUS, get_teleporter_table, get_validation_engine,
+                            analyze_reachability, find_doors, find_door, find_teleporters,
+                            visual_map_size, get_tile_usage)
+from tutankham.export import export_sprite_sheets, import_sprite_sheet, quantize_image, export_maps
+from tutankham.levels import import_level_file
+from tutankham.patches import write_patches, apply_patch_files
+from tutankham.romdiff import read_rom_set, diff_rom_sets, describe_regions
+from tutankham.memorymap import get_memory_map
+from tutankham.digests import get_rom_digests
+from tutankham.animations import (ANIMATION_GAME_FPS, animation_tables, decode_animation, animation_header,
+                                  animation_duration_ms)
+from tutankham.watcher import get_rom_watcher, notify_rom_change, WATCH_RELOADED, WATCH_CONFLICT, WATCH_MISSING
+from tutankham.playtest import playtest, playtest_command, playtest_driver, get_playtest_rompath
+from tutankham.journal import JOURNAL_PATH, recoverable_edits, replay_journal, start_autosave, stop_autosave
+from tutankham.highscores import (NUM_HIGH_SCORES, load_high_scores, save_high_scores, bcd_to_int,
+                                  int_to_bcd, sync_high_score, sort_high_scores)
 
 #########################################
 # Logging Setup
@@ -46,504 +78,36 @@ open_windows   = {			    # Window Tracking - ensure only one instance of each ed
     'ui_graphics':     None,
     'treasure_editor': None,
     'high_score':      None,
-    'palette':         None}
-state_callbacks = {             # Callback registry for cross-window updates
-    'palette_changed': [],
-    'tile_changed':    [],
-    'font_changed':    []
-}
-
-#########################################
-# Tutankham Data Setup
-#########################################
-
-# Palette ROM configuration
-PALETTE_ROM_PATH = "./m1.1h"
-PALETTE_FILE_OFFSETS = [0x2D1, 0x2E1, 0x2F1, 0x301, 0x311, 0x321, 0x331]
-# ROM file structure - centralized definition
-ROM_CONFIG = {
-    'tile_roms': ['c1.1i', 'c2.2i', 'c3.3i', 'c4.4i', 'c5.5i'],
-    'visual_map_rom': 'c8.8i',
-    'logical_map_roms': ['c6.6i', 'c7.7i'],
-    'object_roms': ['m1.1h', 'm2.2h'],
-    'high_score_rom': 'm1.1h',
-    'palette_rom': 'm1.1h',}
-# All ROM files with paths
-
-CURRENT_ROM_SET = 'Konami'      # Default Set (Konami, Stern, Bootleg)
+    'palette':         None,
+    'rom_diff':        None,
+    'hex_viewer':      None,
+    'animation_viewer': None}
 GLOBAL_MODIFIED = False         # Track if ANY changes have been made
-ROM_SETS = {
-    'Konami': {
-        'name': 'Konami (Original)',
-        'notes': [
-            'Original Japanese release',
-            'Copyright: © 1982 KONAMI',
-        ],
-        'files': {
-            'c1.1i': './c1.1i',
-            'c2.2i': './c2.2i',
-            'c3.3i': './c3.3i',
-            'c4.4i': './c4.4i',
-            'c5.5i': './c5.5i',
-            'c6.6i': './c6.6i',
-            'c7.7i': './c7.7i',
-            'c8.8i': './c8.8i',
-            'c9.9i': './c9.9i',
-            'm1.1h': './m1.1h',
-            'm2.2h': './m2.2h',
-            'm4.4h': './m4.4h',
-            'm5.5h': './m5.5h',
-            '3j.3h': './3j.3h',
-            'j6.6h': './j6.6h',
-        }
-    },
-    'Stern': {
-        'name': 'Stern Electronics (US)',
-        'notes': [
-            'Licensed US release by Stern Electronics',
-            'Copyright: © 1982 KONAMI / STERN ELECTRONICS',
-            'Differences in copyright graphic and checksum'
-        ],    
-        'files': {
-            'c1.1i': './c1.1i',
-            'c2.2i': './c2.2i',
-            'c3.3i': './c3.3i',
-            'c4.4i': './c4.4i',
-            'c5.5i': './c5.5i',
-            'c6.6i': './c6.6i',
-            'c7.7i': './c7.7i',
-            'c8.8i': './c8.8i',
-            'c9.9i': './c9.9i',
-            'm1.1h': './m1.1h',
-            'm2.2h': './m2.2h',
-            'm4.4h': './m4.4h',
-            'm5.5h': './m5.5h',
-            '3j.3h': './3a.3h',
-            'j6.6h': './a6.6h',
-        }
-    },
-    'Bootleg': {
-        'name': 'Bootleg (Unofficial)',
-        'notes': [
-            'Copyright changed from "© 1982 KONAMI" to "1982"',
-            'Title graphic zeroed out (no "TUTANKHAM" logo)',
-            'Copy protection bypassed (checksum branch NOPed at 0xCE27)',
-            'High score name changed from HTA to SYY',
-            'Otherwise identical to Konami version, including the ignored checksum'
-        ],        
-        'files': {
-            'c1.1i': './t7.1i',
-            'c2.2i': './t8.2i',
-            'c3.3i': './t9.3i',
-            'c4.4i': './t10.4i',
-            'c5.5i': './t11.5i',
-            'c6.6i': './t12.6i',
-            'c7.7i': './t13.7i',
-            'c8.8i': './t14.8i',
-            'c9.9i': './t15.9i',
-            'm1.1h': './t1.1h',
-            'm2.2h': './t2.2h',
-            'm4.4h': './t4.4h',
-            'm5.5h': './t5.5h',
-            '3j.3h': './t3.3h',
-            'j6.6h': './t6.6h',
-        }
-    }
-}
-
-# Global ROM cache - loaded once at startup
-rom_cache          = {}
-# Constants
-tile_size          = 16 * 16 // 2 # Tile Size
-num_maps           = 4       # Number Of Maps in Game
-map_width          = 64      # Map Width  by Tile Count
-map_height         = 12      # Map Height by Tile Count
-visual_map_size    = 0x300   # Visual  Map Byte Size In ROM
-logical_map_size   = 0x700   # Logical Map Byte Size In ROM
-empty_path_tile    = 0x26    # Blank Path - Where Player/Monsters Can Move Freely
-# Level Data Constants
-CONFIG_BASE_OFFSET = 0x061E  # Config data for each map/difficulty block
-CONFIG_BLOCK_SIZE  = 11      # 11 bytes of config data per block
-MAP_CONFIG_OFFSETS = {
-    'logical_map_ptr': 0,
-    'visual_map_ptr':  2,
-    'spawn_rate':      4,
-    'time_limit':      5,
-    'unknown_bytes': (6, 11)}# 5 bytes from offset 6-10
-OBJECT_BASE_OFFSET = CONFIG_BASE_OFFSET + CONFIG_BLOCK_SIZE  # Object data follows config
-OBJECT_BLOCK_SIZE  = 0x0148  # Block Size 
-NUM_DIFFICULTIES   = 4       # Four Difficulties
-NUM_ITEMS          = 14      # Max Items - Keys, Treasure Boxes, Rings, Keyholes
-NUM_TELEPORTS      = 6       # Max Number Of Teleporter Pairs
-NUM_SPAWNS         = 7       # Max Number Of Enemy Spawn Points
-NUM_RESPAWNS       = 3       # Max Number Of Player Respawn Points
-# High Score data constants
-HIGH_SCORE_OFFSET  = 0x04A0  # Offset for high score data in m1.1h
-HIGH_STAGE_OFFSET  = HIGH_SCORE_OFFSET + 0x2D
-NUM_HIGH_SCORES    = 7       # 7 high score entries
-# Tile Palette Categories
-PATH_TILES = [0x26]          # Empty Path Tile
-WALL_TILES = [0x00, 0x01,    # Wall Tiles
-              0x02, 0x03, 
-              0x04, 0x05, 
-              0x06, 0x07, 
-              0x08, 0x09, 
-              0x0A, 0x0B, 
-              0x0C, 0x0D, 
-              0x0E, 0x11, 
-              0x13, 0x1F, 
-              0x20, 0x27, 
-              0x28]
-SPAWNER_TILES = [0x0F,      # All spawner decoration pieces
-              0x10, 0x12, 
-              0x14, 0x15, 
-              0x18, 0x1B, 
-              0x1D]
-TELEPORTER_TILES = [
-              0x64, 0x65]   # Left and Right Pillars
-TREASURE_TILES = [
-              0x4A, 0x62,   # Crown box (empty, filled)
-              0x21, 0x6F,   # Ring box (empty, filled)
-              0x22, 0x70,   # Key box (empty, filled)
-              0x72]         # Keyhole
-SPAWN_MARKER_TILES = [0x29, # Player start (drag-only, not in palette)
-              0x17]         # Respawn flame
-# Composite block definitions
-DOOR_POSITIONS_BY_WIDTH = {
-    0: (8, 11),            # Width 0: 16 tiles
-    1: (8, 27),            # Width 1: 32 tiles
-    2: (8, 43),            # Width 2: 48 tiles
-    3: (8, 59),            # Width 3: 64 tiles
-}
-DOOR_TILES = np.array([
-   [115, 116, 117],          # Door Top Tiles
-   [118, 119, 120],          # Door Middle Tiles
-   [121, 122, 123]])         # Door Bottom Tiles
-DOOR_LOGICAL = np.array([
-  [[0x00,0x00],              # Door Top Left Logical Bytes
-   [0x00,0x06],              # Door Top Middle Logical Bytes
-   [0x00,0x00]],             # Door Top Right Logical Bytes
-  [[0x55,0x06],              # Door Center Left Logical Bytes
-   [0xF6,0x6E],              # Door Center Middle Logical Bytes
-   [0xF6,0x06]],             # Door Center Right Logical Bytes
-  [[0x00,0x00],              # Door Bottom Left Logical Bytes
-   [0xF0,0x66],              # Door Bottom Middle Logical Bytes
-   [0xF0,0x00]]])            # Door Bottom Right Logical Bytes
-# Item tile constraints
-ITEM_TILES = {
-    0x62: 0x4A,  # Crown -> bottom-accessible box
-    0x6F: 0x21,  # Ring -> top-accessible box
-    0x70: 0x22,  # Key -> side-accessible box
-    0x72: 0x26   # Keyhole -> opens to blank space
-}
-# Empty to filled box mapping
-EMPTY_TO_FILLED = {
-    0x4A: 0x62,  # Crown box
-    0x21: 0x6F,  # Ring box
-    0x22: 0x70,  # Key box
-}
-FILLED_TO_EMPTY = {v: k for k, v in EMPTY_TO_FILLED.items()}
-
-# Overlay Tile Selections
-PLAYER_START_MARKER_TILE = 0x29    # Forward-facing player sprite
-RESPAWN_MARKER_TILE      = 0x6E    # Flame sprite
-ENEMY_SPAWN_MARKER_TILE  = 0x17    # Poof cloud sprite (or whatever you prefer)
-TELEPORTER_MARKER_TILE   = 0x63    # Pillar sprite (or whatever you prefer)
-# Tile names for display (0x00 - 0x9F, 160 tiles total)
-TILE_NAMES = {
-    # Empty Path
-    0x26: "Empty Path",
-    # Adventurer
-    0x23: "Man Down 1",      0x24: "Man Down 2",        0x25: "Man Down 3",
-    0x29: "Man Down 4",      0x2A: "Man Up 1",          0x2B: "Man Up 2",
-    0x2C: "Man Up 3",        0x2D: "Man Up 4",          0x2E: "Man Left 1",
-    0x2F: "Man Left 2",      0x30: "Man Left 3",        0x31: "Man Left 4",
-    0x3A: "Man Right 1",     0x3B: "Man Right 2",       0x3C: "Man Right 3", 
-    0x3D: "Man Right 4",
-    # Adventurer Carrying Key
-    0x4E: "Man+Key Down 1",   0x4F: "Man+Key Down 2",     0x50: "Man+Key Down 3",
-    0x51: "Man+Key Down 4",   0x52: "Man+Key Up 1",       0x53: "Man+Key Up 2",
-    0x54: "Man+Key Up 3",     0x55: "Man+Key Up 4",       0x5A: "Man+Key Left 1", 
-    0x5B: "Man+Key Left 2",   0x5C: "Man+Key Left 3",     0x5D: "Man+Key Left 4", 
-    0x5E: "Man+Key Right 1",  0x5F: "Man+Key Right 2",    0x60: "Man+Key Right 3", 
-    0x61: "Man+Key Right 4",
-    # Walls 
-    0x00: "Wall 01",          0x01: "Wall 02",            0x02: "Wall 03", 
-    0x03: "Wall 04",          0x04: "Wall 05",            0x05: "Wall 06", 
-    0x06: "Wall 07",          0x07: "Wall 08",            0x08: "Wall 09", 
-    0x09: "Wall 10",          0x0A: "Wall 11",            0x0B: "Wall 12",
-    0x0C: "Wall 13",          0x0D: "Wall 14",            0x0E: "Wall 15", 
-    0x11: "Wall 16",          0x13: "Wall 17",            0x1F: "Wall 18", 
-    0x20: "Wall 19",          0x27: "Wall 20",            0x28: "Wall 21",
-    # Monster Spawn Cloud
-    0x56: "Spawn Cloud 1",    0x57: "Spawn Cloud 2",      0x58: "Spawn Cloud 3", 
-    0x59: "Spawn Cloud 4",    0x63: "Spawn Cloud 5", 
-    # Adventurer Death (Skull)
-    0x67: "Man Death 1",      0x68: "Man Death 2",        0x69: "Man Death 3", 
-    0x6A: "Man Death 4",
-    # Monster Death (Particles)
-    0x6B: "Monster Death 1",  0x6C: "Monster Death 2",    0x6D: "Monster Death 3",
-    0x6E: "Monster Death 4", 
-    # Object Boxes 
-    0x4A: "Empty Crown Box",  0x21: "Empty Ring Box",     0x22: "Empty Key Box",
-    0x62: "Full Crown Box",   0x6F: "Full Ring Box",      0x70: "Full Key Box",
-    # Score Boxes
-    0x80: "Score Box - 500",  0x81: "Score Box - 1000",   0x82: "Score Box - 1500",
-    0x83: "Score Box - 2000", 0x84: "Score Box - 3000",   0x85: "Score Box - 4000",
-    # Teleport Pillars
-    0x64: "Teleport Left",    0x65: "Teleport Right",
-    # Monster Spawner Walls
-    0x1D: "Spawn Top Left",   0x0F: "Spawn Top Center",   0x10: "Spawn Top Right", 
-    0x1B: "Spawn Middle Left",                            0x12: "Spawn Middle Right", 
-    0x18: "Spawn Bottom Left",0x15: "Spawn Bottom Center",0x14: "Spawn Bottom Right",
-    # Keyhole
-    0x72: "Keyhole 1",        0x16: "Keyhole 2",          0x1E: "Keyhole 3",
-    0x4D: "Keyhole 4",        0x66: "Keyhole 5",          0x71: "Keyhole 6",
-    # Big Door
-    0x73: "Door Top Left",    0x74: "Door Top Center",    0x75: "Door Top Right", 
-    0x76: "Door Middle Left", 0x77: "Door Middle Center", 0x78: "Door Middle Right", 
-    0x79: "Door Bottom Left", 0x7A: "Door Bottom Center", 0x7B: "Door Bottom Right",
-    # Tut Mask
-    0x86: "Tut Mask Left",    0x87: "Tut Mask Right",     0x88: "Tut Mask Center",
-    # Cobra
-    0x36: "Cobra Left 1",     0x37: "Cobra Left 2",       0x38: "Cobra Left 3", 
-    0x39: "Cobra Left 4",     0x46: "Cobra Right 1",      0x47: "Cobra Right 2", 
-    0x48: "Cobra Right 3",    0x49: "Cobra Right 4", 
-    # Vulture
-    0x3E: "Vulture Left 1",   0x3F: "Vulture Left 2",     0x40: "Vulture Left 3",
-    0x41: "Vulture Left 4",   0x42: "Vulture Right 1",    0x43: "Vulture Right 2",
-    0x44: "Vulture Right 3",  0x45: "Vulture Right 4", 
-    # Bat
-    0x32: "Bat 1",            0x33: "Bat 2",              0x34: "Bat 3", 
-    0x35: "Bat 4",            0x7C: "Bat 5",              0x7D: "Bat 6", 
-    0x7E: "Bat 7", 
-    # Dragon
-    0x89: "Dragon Left 1",    0x8A: "Dragon Left 2",      0x8B: "Dragon Left 3",
-    0x8C: "Dragon Left ",     0x8D: "Dragon Right 1",     0x8E: "Dragon Right 2",
-    0x8F: "Dragon Right 3",   0x90: "Dragon Right 4",
-    # Gryphon
-    0x91: "Gryphon Left 1",   0x92: "Gryphon Left 2",     0x93: "Gryphon Left 3",
-    0x94: "Gryphon Left 4",   0x95: "Gryphon Right 1",    0x96: "Gryphon Right 2",
-    0x97: "Gryphon Right 3",  0x98: "Gryphon Right 4",
-    # Glaive
-    0x99: "Glaive 1",         0x9A: "Glaive 2",           0x9B: "Glaive 3",
-    0x9C: "Glaive 4",         0x9D: "Glaive 5",           0x9E: "Glaive 6",
-    0x9F: "Glaive 7",
-   # Unknown/Unused
-    0x17: "Flame 1 (Unused)",
-    0x19: "Flame 2 (Unused)", 
-    0x1A: "Flame 3 (Unused)",
-    0x1C: "Flame 4 (Unused)", 
-    0x4B: "Score Box - 2000 (Unused)", 
-    0x4C: "Score Box - 3000 (Unused)",
-    0x7F: "Rock? (Unused)"
-}
-
-# UI Graphics configuration
-UI_GRAPHICS_CONFIG = {
-    "Copyright Notice": {
-        'rom': 'j6.6h',
-        'offset': 0x05C0,
-        'width': 16,
-        'height': 102,
-        'mode': 'sprite',
-        'bytes_per_row': 16,
-        'rotate': True,
-        'zoom': 5,
-        'description': 'Copyright symbol displayed on title screen'
-    },
-    "Timer Banner": {
-        'rom': 'j6.6h',
-        'offset': 0x08F0,
-        'width': 32,
-        'height': 39,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 6,
-        'description': 'Timer display banner at top of screen'
-    },
-    "Player Counter": {
-        'rom': 'j6.6h',
-        'offset': 0x05A0,
-        'width': 8,
-        'height': 8,
-        'mode': 'sprite',
-        'bytes_per_row': 8,
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Player life counter icon'
-    },
-    "Smart Bomb Counter": {
-        'rom': 'j6.6h',
-        'offset': 0x0B70,
-        'width': 16,
-        'height': 14,
-        'mode': 'sprite',
-        'bytes_per_row': 16,
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Genie lamp/smart bomb counter icon'
-    },
-    "Stage Banner": {
-        'rom': 'j6.6h',
-        'offset': 0x0C60,
-        'width': 30,
-        'height': 32,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Stage number banner display'
-    },
-    "Title Letter - T": {
-        'rom': 'c8.8i',
-        'offset': 0x0C00,
-        'width': 30,
-        'height': 25,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Game Title - Upper Case T'
-    },
-    "Title Letter - u": {
-        'rom': 'c8.8i',
-        'offset': 0x0D77,
-        'width': 20,
-        'height': 20,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Game Title - Lower Case u'
-    },
-    "Title Letter - t": {
-        'rom': 'c8.8i',
-        'offset': 0x0E3F,
-        'width': 26,
-        'height': 14,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Game Title - Lower Case t'
-    },
-    "Title Letter - a": {
-        'rom': 'c6.6i',
-        'offset': 0x0E00,
-        'width': 20,
-        'height': 20,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Game Title - Lower Case a'
-    },
-    "Title Letter - n": {
-        'rom': 'c7.7i',
-        'offset': 0x0E00,
-        'width': 20,
-        'height': 20,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Game Title - Lower Case n'
-    },
-    "Title Letter - k": {
-        'rom': 'c6.6i',
-        'offset': 0x0EC8,
-        'width': 30,
-        'height': 20,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Game Title - Lower Case k'
-    },
-    "Title Letter - h": {
-        'rom': 'c7.7i',
-        'offset': 0x0EC8,
-        'width': 30,
-        'height': 20,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Game Title - Lower Case h'
-    },
-    "Title Letter - m": {
-        'rom': 'c8.8i',
-        'offset': 0x0EF5,
-        'width': 20,
-        'height': 26,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'Game Title - Lower Case m'
-    }
-}
-
-# Treasure graphics configuration (separate from UI graphics)
-TREASURE_GRAPHICS_CONFIG = {
-    "Treasure 1 (Map)": {
-        'rom': 'c9.9i',
-        'offset': 0x0000,
-        'width': 44,
-        'height': 44,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'End of level treasure - World Map'
-    },
-    "Treasure 2 (Genie Lamp)": {
-        'rom': 'c9.9i',
-        'offset': 0x03DE,
-        'width': 44,
-        'height': 44,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'End of level treasure - Genie Lamp'
-    },
-    "Treasure 3 (Treasure Chest)": {
-        'rom': 'c9.9i',
-        'offset': 0x07BC,
-        'width': 44,
-        'height': 44,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'End of level treasure - Treasure Chest'
-    },
-    "Treasure 4 (Tut Mask)": {
-        'rom': 'c9.9i',
-        'offset': 0x0B9A,
-        'width': 44,
-        'height': 44,
-        'mode': 'tile',
-        'rotate': True,
-        'zoom': 10,
-        'description': 'End of level treasure - Tutankhamun Mask'
-    }
-}
-
-FONT_NAMES = {
-    # Digits (0x0000-0x013F, 10 chars × 32 bytes)
-    0: "0",   1: "1",  2: "2",  3: "3",  4: "4",
-    5: "5",   6: "6",  7: "7",  8: "8",  9: "9",
-    # Special characters (0x0140-0x021F, 7 chars × 32 bytes)
-    10: "©", 11: "□", 12: ".", 13: "!", 14: "?",
-    15: "♪", 16: " ",
-    # Alphabet (0x0220-0x055F, 26 chars × 32 bytes)
-    17: "A", 18: "B", 19: "C", 20: "D", 21: "E", 
-    22: "F", 23: "G", 24: "H", 25: "I", 26: "J", 
-    27: "K", 28: "L", 29: "M", 30: "N", 31: "O", 
-    32: "P", 33: "Q", 34: "R", 35: "S", 36: "T", 
-    37: "U", 38: "V", 39: "W", 40: "X", 41: "Y", 
-    42: "Z"
-}
-PALETTE_NAMES = [
-    "Map 1",
-    "Map 2", 
-    "Map 3",
-    "Map 4",
-    "High Score",
-    "Title Screen",
-    "Player Start"
-]
+STARTUP_BUDGET_MS = {           # Time from launch, checked by --startup-benchmark
+    'window': 1000,             # Main window drawn and responsive
+    'roms':   2500}             # Zip extracted and ROM cache filled in the background
+STARTUP_POLL_MS = 20            # How often the Tk loop checks on the background ROM load
+DIFF_REFRESH_MS = 500           # Live refresh interval of the ROM diff window
+DIFF_CURRENT    = "Current ROMs (with edits)"
+DIFF_LOADED     = "Loaded ROMs (before edits)"
+HEX_BYTES_PER_ROW = 16          # Hex viewer layout
+HEX_ROW_HEIGHT  = 18
+HEX_CHAR_WIDTH  = 8             # Courier 10 advance
+HEX_REFRESH_MS  = 250           # How often the hex viewer checks its visible rows for outside writes
+HEX_REGION_COLORS = ['#E4ECFF', '#FFF1D6']  # Alternating known regions
+HEX_UNKNOWN_COLOR = '#FFE0E0'   # "Unknown ..." regions
+HEX_CURSOR_COLOR  = '#4080FF'
+WATCH_POLL_MS   = 1000          # How often the files the ROMs came from are checked for outside changes
+ANIM_TICK_MS    = round(1000 / ANIMATION_GAME_FPS)  # Animation viewer timer, one game frame
+ANIM_SCALE      = 6             # Animation viewer: playing frame
+ANIM_STRIP_SCALE = 3            # Animation viewer: strip of all frames
+DIGEST_REFRESH_MS = 1000        # How often the main window re-checks the ROMs against the known dumps
+startup_times   = {}            # Startup phase -> ms since launch
+ROM_MENU_ITEMS = ["Reload Original ROMs From Zip", "Open ROMs From Current Directory",
+                  "Open ROMs From Folder", "Open ROMs From Folder (Edit In Place)", "Save ROMs", "Save ROMs To Folder",
+                  "Save Patches (IPS)", "Save Patches (BPS)", "Apply Patches",
+                  "Export Sprite Sheets (PNG)", "Import Sprite Sheet (PNG)",
+                  "Export Maps (PNG + Level Files)", "Import Level File"]
 
 #########################################
 # Code Starts Here
@@ -618,9 +182,8 @@ class PixelEditor:
         logging.info(f"Loaded {self.name}: {self.pixels.shape}")
     
     def load_palette(self):
-        """Load palette from ROM cache"""
-        palettes = load_palettes_from_rom()
-        self.palette = palettes[self.palette_idx]
+        """Load palette from the shared asset store"""
+        self.palette = get_asset_store().get('palette', self.palette_idx)
     
     def show(self):
         """Create and show the editor window"""
@@ -685,6 +248,7 @@ class PixelEditor:
         button_frame.pack(fill=tk.X, pady=5)
         
         ttk.Button(button_frame, text="Close", command=self.window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Import PNG", command=self.import_png).pack(side=tk.LEFT, padx=5)
         
         # Initial render
         self.render_canvas()
@@ -790,6 +354,8 @@ class PixelEditor:
         min_distance = None
         closest_name = None
 
+        import webcolors  # Only the palette editor needs it, keep it off the startup path
+
         # webcolors supports this in all versions:
         for name in webcolors.names():
             try:
@@ -805,6 +371,29 @@ class PixelEditor:
 
         return closest_name
 
+    def import_png(self):
+        """Replace the whole graphic with a PNG, quantized to the current palette"""
+        path = filedialog.askopenfilename(parent=self.window, title=f"Import PNG for {self.name}",
+                                          filetypes=[("PNG images", "*.png"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            pixels, inexact = quantize_image(Image.open(path), self.palette, self.pixels.shape)
+        except Exception as e:
+            messagebox.showerror("Import Failed", f"Couldn't import {os.path.basename(path)}:\n{e}",
+                                 parent=self.window)
+            return
+        
+        self.pixels = pixels
+        self.write_pixels_to_rom()
+        self.render_canvas()
+        
+        if inexact.any():
+            messagebox.showwarning("Import PNG", f"{int(inexact.sum())} pixels had no exact match in "
+                                   f"{PALETTE_NAMES[self.palette_idx]} and were mapped to the nearest color",
+                                   parent=self.window)
+        logging.info(f"Imported {path} into {self.name}")
+    
     def change_palette(self):
         """Change the palette and re-render"""
         # Get the selected index from the combobox
@@ -887,7 +476,7 @@ class PixelEditor:
                 logging.info(f"Set pixel ({px}, {py}) to color {self.selected_color}")
             
             # Save and Render
-            self.write_pixels_to_rom()
+            self.write_pixels_to_rom([(py, px)])
             self.render_canvas()
 
     def on_pixel_right_click(self, event):
@@ -904,15 +493,20 @@ class PixelEditor:
             logging.info(f"Erased pixel ({px}, {py}) to background")
             
             # Save and Render
-            self.write_pixels_to_rom()
+            self.write_pixels_to_rom([(py, px)])
             self.render_canvas()
 
     def on_pixel_drag(self, event):
         """Handle pixel drag - same as click"""
         self.on_pixel_click(event)
 
-    def write_pixels_to_rom(self):
-        """Write current pixel data back to ROM cache"""
+    def write_pixels_to_rom(self, changed=None):
+        """Write current pixel data back to ROM cache
+        
+        Args:
+            changed: Optional list of edited (y, x) pixels - only the ROM bytes
+                     holding them are rewritten. None rewrites the whole graphic.
+        """
         
         # Make a copy for writing
         pixels_to_write = self.pixels.copy()
@@ -925,35 +519,17 @@ class PixelEditor:
         if self.rotate:
             pixels_to_write = np.rot90(pixels_to_write, k=-1)  # Rotate back (counter-clockwise)
         
-        # Get ROM data reference
-        rom_data = rom_cache[self.rom_name]
+        region = None
+        if changed:
+            region = changed_region(changed, self.pixels.shape, self.rotate)
         
-        # Convert pixels back to ROM format based on mode
-        if self.mode == 'tile':
-            # Tile mode: row-major, 4bpp interleaved nibbles
-            bytes_per_row = self.width // 2
-            
-            for y in range(self.height):
-                for x in range(0, self.width, 2):
-                    # Pack two pixels into one byte (low nibble, high nibble)
-                    byte_val = (pixels_to_write[y, x] & 0x0F) | ((pixels_to_write[y, x + 1] & 0x0F) << 4)
-                    byte_offset = self.offset + (y * bytes_per_row) + (x // 2)
-                    rom_data[byte_offset] = byte_val
-        
-        elif self.mode == 'sprite':
-            # Sprite mode: interleaved scanlines
-            bytes_per_row = self.bytes_per_row if self.bytes_per_row else (self.width // 2)
-            
-            for y in range(self.height):
-                pair_idx = y // 2
-                base = self.offset + (pair_idx * bytes_per_row)
-                half = 0 if (y % 2 == 0) else (bytes_per_row // 2)
-                
-                for x in range(0, self.width, 2):
-                    # Pack two pixels into one byte (low nibble, high nibble)
-                    byte_val = (pixels_to_write[y, x] & 0x0F) | ((pixels_to_write[y, x + 1] & 0x0F) << 4)
-                    byte_offset = base + half + (x // 2)
-                    rom_data[byte_offset] = byte_val
+        # Pack the pixels back into the ROM nibble layout with one slice assignment
+        start, end = write_bank(rom_cache[self.rom_name], [self.offset], pixels_to_write[None],
+                                self.height, self.width, self.mode, self.bytes_per_row, rotate=False,
+                                region=region)
+        
+        # Only the assets decoded from these bytes need decoding again
+        get_asset_store().invalidate_rom_range(self.rom_name, start, end)
         
         # Trigger callback for other windows to refresh
         if self.graphic_type == 'tile':
@@ -1060,65 +636,132 @@ def create_window_icon(root, tiles=None, palettes=None):
     
     Args:
         root: Tkinter window
-        tiles: Optional tile array (if None, loads from ROM)
-        palettes: Optional palette array (if None, loads from ROM)
+        tiles: Optional tile array (if None, uses the shared asset store)
+        palettes: Optional palette array (if None, uses the shared asset store)
     """
     try:
         from PIL import Image, ImageTk
         
-        # Load data if not provided
+        # Use middle Tut mask tile (0x87)
+        tile_idx = 0x87
+
+        # Load data if not provided - only the icon tile is decoded, not the whole bank
         if tiles is None:
-            tiles = load_tiles()
+            tiles = get_asset_store().view('tile')
         if palettes is None:
-            palettes = load_palettes_from_rom()
+            palettes = get_asset_store().view('palette')
 
-        # Use middle Tut mask tile (0x87)
-        tile_idx = 0x87
+        if tile_idx >= len(tiles):
+            return
+        tile = tiles[tile_idx]
 
-        if tile_idx < len(tiles):
-            tile = tiles[tile_idx]
-            palette = palettes[0]  # Use Map 1 palette
-            color_tile = apply_palette_to_tile(tile, palette)
+        palette = palettes[0]  # Use Map 1 palette
+        color_tile = apply_palette_to_tile(tile, palette)
 
-            # Convert to PIL Image
-            icon_rgb = color_tile[:, :, :3]
-            icon_pil = Image.fromarray(icon_rgb.astype('uint8')).convert('RGB')
+        # Convert to PIL Image
+        icon_rgb = color_tile[:, :, :3]
+        icon_pil = Image.fromarray(icon_rgb.astype('uint8')).convert('RGB')
 
-            # Resize to standard icon size (32x32)
-            icon_pil = icon_pil.resize((32, 32), Image.NEAREST)
+        # Resize to standard icon size (32x32)
+        icon_pil = icon_pil.resize((32, 32), Image.NEAREST)
 
-            # Convert to PhotoImage and set as icon
-            icon_photo = ImageTk.PhotoImage(icon_pil)
-            root.iconphoto(True, icon_photo)
+        # Convert to PhotoImage and set as icon
+        icon_photo = ImageTk.PhotoImage(icon_pil)
+        root.iconphoto(True, icon_photo)
 
-            # Keep reference to prevent garbage collection
-            root._icon_ref = icon_photo
+        # Keep reference to prevent garbage collection
+        root._icon_ref = icon_photo
     except Exception:
         logging.warning("Couldn't set window icon", exc_info=True)
 
-def register_callback(event_type, callback):
-    """Register a callback for a state change event"""
-    if event_type in state_callbacks:
-        state_callbacks[event_type].append(callback)
+def mark_startup(phase):
+    """Record how long after launch a startup phase finished"""
+    startup_times[phase] = (time.perf_counter() - STARTUP_START) * 1000
+    logging.info(f"Startup: {phase} ready after {startup_times[phase]:.0f} ms "
+                 f"(budget {STARTUP_BUDGET_MS[phase]} ms)")
+
+def finish_startup(error, benchmark=False):
+    """Called on the Tk thread once the background ROM load is done"""
+    if error:
+        logging.error(f"Error loading ROMs: {error}")
+        if not benchmark:
+            messagebox.showerror("Error", f"Failed to load ROMs:\n{error}")
+        status_label.config(text="ROMs failed to load - use the File menu to open them")
+    else:
+        logging.info("ROMs loaded into cache")
+        create_window_icon(root)                            # Needs the tile ROMs
+        status_label.config(text="Ready - Select an editor from the menu")
+        refresh_digest_status()
+        if not benchmark:
+            offer_journal_recovery()
+            start_autosave()
+            poll_rom_files()
+    set_rom_menus_state("normal")
+    mark_startup('roms')
+
+    if benchmark:
+        root._startup_error = error
+        root.destroy()
 
-def trigger_callback(event_type, *args, **kwargs):
-    """Trigger all callbacks for an event type"""
-    if event_type in state_callbacks:
-        # Make a copy to avoid modification during iteration
-        callbacks = state_callbacks[event_type].copy()
-        
-        for callback in callbacks:
-            try:
-                callback(*args, **kwargs)
-            except tk.TclError as e:
-                # Window was destroyed, remove this callback
-                if "bad window path name" in str(e):
-                    logging.debug(f"Removing stale callback for {event_type}")
-                    state_callbacks[event_type].remove(callback)
-                else:
-                    logging.error(f"Callback error for {event_type}: {e}")
-            except Exception as e:
-                logging.error(f"Callback error for {event_type}: {e}")
+def offer_journal_recovery():
+    """Offer to replay the autosave journal a crashed session left behind"""
+    global GLOBAL_MODIFIED
+    pending = recoverable_edits()
+    if pending is None:
+        return
+    runs, last_time = pending
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(last_time))
+    if messagebox.askyesno("Recover Unsaved Edits",
+                           f"The last session ended without saving.\n\n"
+                           f"Replay its {runs} autosaved edits (last one at {when}) onto the loaded ROMs?",
+                           icon='warning'):
+        try:
+            replay_journal()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to replay {JOURNAL_PATH}:\n{e}")
+            return
+        GLOBAL_MODIFIED = True
+        status_label.config(text=f"Recovered {runs} edits - save to keep them")
+
+def poll_rom_files():
+    """Pick up ROM files changed by other tools, asking before overwriting unsaved edits"""
+    watcher = get_rom_watcher() if rom_cache else None
+    for rom_name, status, detail in watcher.poll() if watcher else []:
+        if status == WATCH_RELOADED:
+            status_label.config(text=f"Reloaded {rom_name} from disk ({detail} changed runs)")
+        elif status == WATCH_CONFLICT:
+            take_disk = messagebox.askyesno(
+                "ROM Changed On Disk",
+                f"{rom_name} was changed by another program:\n{detail}\n\n"
+                f"It also has unsaved edits here. Reload it from disk, discarding those edits?\n\n"
+                f"(No keeps the edits - saving will overwrite the file)",
+                icon='warning', default='no')
+            watcher.resolve(rom_name, take_disk)
+            status_label.config(text=f"{'Reloaded' if take_disk else 'Kept edits to'} {rom_name}")
+        elif status == WATCH_MISSING:
+            status_label.config(text=f"{rom_name} is gone from {os.path.dirname(detail)}")
+        else:
+            status_label.config(text=f"{rom_name} changed size on disk ({detail} bytes) - not reloaded")
+    root.after(WATCH_POLL_MS, poll_rom_files)
+
+def quit_editor():
+    """Close the editor for good - a clean exit needs no journal"""
+    stop_autosave(discard=True)
+    root.destroy()
+
+def report_startup_benchmark(error):
+    """Print startup phase times against the budget, return the exit code"""
+    failed = error is not None
+    for phase, budget in STARTUP_BUDGET_MS.items():
+        elapsed = startup_times.get(phase)
+        if elapsed is None or elapsed > budget:
+            failed = True
+        shown = "not reached" if elapsed is None else f"{elapsed:.0f} ms"
+        print(f"{phase:<8} {shown:>12}  (budget {budget} ms)")
+    if error is not None:
+        print(f"ROM load failed: {error}")
+    print("FAIL - startup over budget" if failed else "OK - startup within budget")
+    return 1 if failed else 0
 
 def on_quit():
     """Handle application quit with unsaved changes check"""
@@ -1136,14 +779,9 @@ def on_quit():
         if result is None:  # Cancel
             return
         elif result:  # Yes - save first
-            # Try to save
-            try:
-                save_roms(None)
-                # If save succeeded, quit
-                root.destroy()
-            except:
-                # Save failed, don't quit
-                return
+            # Quit only once the save went through - a cancelled or failed save keeps the journal
+            if save_roms(None):
+                quit_editor()
         else:  # No - quit without saving
             confirm = messagebox.askyesno(
                 "Confirm Quit",
@@ -1152,10 +790,10 @@ def on_quit():
                 default='no'
             )
             if confirm:
-                root.destroy()
+                quit_editor()
     else:
         # No changes, safe to quit
-        root.destroy()
+        quit_editor()
 
 
 #########################################
@@ -1166,13 +804,14 @@ def load_all(location=None):
     try:
         if location == "Zip":
             load_roms_from_zip()
-        elif location == "Folder":
+        elif location in ("Folder", "In-Place Folder"):
             folder = filedialog.askdirectory(
                 title="Select Folder That Contains Your Extracted Tutankham ROMs",
                 initialdir=os.path.abspath("."))
             if not folder:
                 return
-            load_roms_from_folder(folder)
+            # In place: Save ROMs writes only the changed blocks back into this folder
+            load_roms_from_folder(folder, in_place=location == "In-Place Folder")
         else:
             load_all_roms()
         
@@ -1181,124 +820,60 @@ def load_all(location=None):
         logging.error(f"Error loading ROMs: {e}")
         messagebox.showerror("Error", f"Failed to load ROMs:\n{e}")
 
-def load_all_roms():
-    """Load all ROM files into memory at startup"""
-    global rom_cache
-    rom_files = ROM_SETS[CURRENT_ROM_SET]['files']
-    
-    # Clear cache first
-    rom_cache.clear()
-    logging.info(f"Loading ROM set: {ROM_SETS[CURRENT_ROM_SET]['name']}")
+def set_rom_menus_state(state):
+    """Enable/disable the menus that need the ROM cache ("normal" or "disabled")"""
+    root._menubar.entryconfig("Editors", state=state)
+    for label in ROM_MENU_ITEMS:
+        root._filemenu.entryconfig(label, state=state)
+    root._rom_set_dropdown.config(state="readonly" if state == "normal" else "disabled")
+
+def load_roms_in_background(on_loaded):
+    """Load the ROM zip on a worker thread while the main window is already up
     
-    for rom_name, rom_path in rom_files.items():
+    The worker only fills rom_cache; on_loaded(error) is called from the Tk loop
+    once it finishes, so every widget update stays on the main thread.
+    """
+    result = {}
+
+    def worker():
         try:
-            with open(rom_path, 'rb') as f:
-                rom_cache[rom_name] = bytearray(f.read())
-            # Log both logical name and physical filename
-            physical_filename = os.path.basename(rom_path)
-            logging.info("Loaded %s from %s: %d bytes", rom_name, physical_filename, len(rom_cache[rom_name]))
+            load_roms_from_zip()
+            get_memory_map()    # Region index for the diff view, off the Tk thread too
+            get_rom_digests()   # First full hash, later refreshes only re-hash edited ROMs
         except Exception as e:
-            physical_filename = os.path.basename(rom_path)
-            logging.critical("Error loading %s from %s: %s", rom_name, physical_filename, e)
-    
-    logging.info(f"ROM cache now contains {len(rom_cache)} files")
+            result['error'] = e
 
-def load_roms_from_folder(folder_path: str):
-    """Temporarily repoint ROM files and call load_all_roms()."""
-    global ROM_SETS, CURRENT_ROM_SET
-    
-    original = ROM_SETS[CURRENT_ROM_SET]['files'].copy()
-    try:
-        # Look for files by their PHYSICAL names in the folder
-        updated_paths = {}
-        rom_files = ROM_SETS[CURRENT_ROM_SET]['files']
-        
-        for logical_name, physical_path in rom_files.items():
-            # Extract just the filename
-            physical_filename = os.path.basename(physical_path)
-            full_path = os.path.join(folder_path, physical_filename)
-            
-            if not os.path.isfile(full_path):
-                raise FileNotFoundError(f"Missing {physical_filename} (needed for {logical_name}) in {folder_path}")
-            
-            updated_paths[logical_name] = full_path
-            logging.info(f"Found {logical_name} -> {physical_filename}")
-        
-        # Update paths temporarily
-        ROM_SETS[CURRENT_ROM_SET]['files'].update(updated_paths)
-        
-        load_all_roms()
-        logging.info("ROMs loaded from folder: %s", folder_path)
-    finally:
-        ROM_SETS[CURRENT_ROM_SET]['files'].clear()
-        ROM_SETS[CURRENT_ROM_SET]['files'].update(original)
-
-def load_roms_from_zip():
-    """Load ROMs from a known zip file in the application directory."""
-    global ROM_SETS, CURRENT_ROM_SET
-    
-    try:
-        app_dir = os.path.dirname(os.path.abspath(__file__))
-        zip_path = os.path.join(app_dir, "tutankhm.zip")
+    thread = threading.Thread(target=worker, name="rom-loader", daemon=True)
+    thread.start()
 
-        if not os.path.exists(zip_path):
-            messagebox.showerror("Error", f"Zip file not found:\n{zip_path}")
-            sys.exit(1)
+    def poll():
+        if thread.is_alive():
+            root.after(STARTUP_POLL_MS, poll)
+        else:
+            on_loaded(result.get('error'))
 
-        with tempfile.TemporaryDirectory() as extract_dir:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-            logging.info(f"Extracted ROMs from: {zip_path}")
-            
-            # Log what files were extracted
-            extracted_files = os.listdir(extract_dir)
-            logging.info(f"Extracted files: {', '.join(extracted_files)}")
-
-            # Point ROM_SETS to extracted versions
-            # Look for files by their PHYSICAL names (not logical names)
-            updated_paths = {}
-            rom_files = ROM_SETS[CURRENT_ROM_SET]['files']
-            
-            for logical_name, physical_path in rom_files.items():
-                # Extract just the filename from the path (e.g., './a6.6h' -> 'a6.6h')
-                physical_filename = os.path.basename(physical_path)
-                extracted_path = os.path.join(extract_dir, physical_filename)
-                
-                if os.path.exists(extracted_path):
-                    updated_paths[logical_name] = extracted_path
-                    logging.info(f"Mapped {logical_name} -> {physical_filename}")
-                else:
-                    logging.error(f"MISSING: {logical_name} needs physical file '{physical_filename}' but not found in zip!")
-                    messagebox.showerror(
-                        "Missing ROM File",
-                        f"ROM set '{ROM_SETS[CURRENT_ROM_SET]['name']}' requires file:\n"
-                        f"  {physical_filename}\n\n"
-                        f"But it was not found in {zip_path}\n\n"
-                        f"Available files: {', '.join(extracted_files)}"
-                    )
-                    return
-
-            # Only temporarily override ROM_SETS
-            original_paths = rom_files.copy()
-            ROM_SETS[CURRENT_ROM_SET]['files'].update(updated_paths)
-
-            # Load the ROMs
-            load_all_roms()
-            logging.info("ROMs loaded successfully from zip file.")
+    root.after(STARTUP_POLL_MS, poll)
 
-            # Restore ROM_SETS to original paths
-            ROM_SETS[CURRENT_ROM_SET]['files'].clear()
-            ROM_SETS[CURRENT_ROM_SET]['files'].update(original_paths)
+def refresh_digest_status():
+    """Show whether the ROMs still match a known dump, re-checked every DIGEST_REFRESH_MS"""
+    if rom_cache:
+        digests = get_rom_digests()
+        digest_label.config(text=digests.summary(),
+                            foreground='dark green' if not digests.modified() else 'dark orange')
+    root.after(DIGEST_REFRESH_MS, refresh_digest_status)
 
-            # Temporary directory auto-deletes here
-    except Exception as e:
-        logging.error(f"Error loading from zip: {e}")
-        messagebox.showerror("Error", f"Failed to load ROMs from zip:\n{e}")
+def show_rom_digests():
+    """List each ROM's CRC32/SHA1 and dump status"""
+    if not rom_cache:
+        return
+    digests = get_rom_digests()
+    lines = [f"{rom_name}: {digests.crc32[rom_name]:08X}  {digests.dump_status(rom_name)}"
+             for rom_name in sorted(digests.crc32)]
+    lines.append(f"\nCopyright checksum 0x{digests.checksum:04X} (stored 0x{digests.checksum_stored():04X})")
+    messagebox.showinfo("ROM Checksums", "\n".join(lines))
 
 def switch_rom_set(new_set):
     """Switch to a different ROM set and reload cache"""
-    global CURRENT_ROM_SET
-    
     if new_set not in ROM_SETS:
         messagebox.showerror("Error", f"Unknown ROM set: {new_set}")
         return
@@ -1306,7 +881,7 @@ def switch_rom_set(new_set):
     # Check if there are unsaved changes
     # (We could add a global flag to track this in the future)
     
-    CURRENT_ROM_SET = new_set
+    roms.CURRENT_ROM_SET = new_set
     logging.info(f"Switched to ROM set: {ROM_SETS[new_set]['name']}")
     
     # Reload ROMs
@@ -1328,38 +903,19 @@ def switch_rom_set(new_set):
         logging.error(f"Error switching ROM set: {e}")
         messagebox.showerror("Error", f"Failed to switch ROM set:\n{e}")
 
-def save_all_roms(target_directory=None):
-    """Write all modified ROMs back to disk
-    
-    Args:
-        target_directory: Optional directory path. If None, saves to original ROM_FILES paths.
-                         If specified, saves all ROMs to that directory with original names.
-    """
-    rom_files = ROM_SETS[CURRENT_ROM_SET]['files']
-    
-    for rom_name, rom_data in rom_cache.items():
-        try:
-            if target_directory:
-                rom_path = os.path.join(target_directory, rom_name)
-            else:
-                rom_path = rom_files[rom_name]
-            
-            with open(rom_path, 'wb') as f:
-                f.write(rom_data)
-            logging.info("Saved %s to %s", rom_name, rom_path)
-        except Exception as e:
-            logging.critical("Error saving %s: %s", rom_name, e)
-
 def save_roms(target_directory):
-    """Save all ROMs"""
+    """Save all ROMs, returns True only if every ROM was written"""
     global GLOBAL_MODIFIED
 
     try:
         # Confirm before overwriting
         if target_directory:
             msg = f"Overwrite ROM files in:\n{target_directory}\n\nThis cannot be undone!"
+        elif roms.in_place_roms:
+            directory = os.path.dirname(next(iter(roms.in_place_roms.values()))[0])
+            msg = f"Write changes back to the ROM files in:\n{directory}\n\nThis cannot be undone!"
         else:
-            rom_files = ROM_SETS[CURRENT_ROM_SET]['files']
+            rom_files = ROM_SETS[roms.CURRENT_ROM_SET]['files']
             sample_path = list(rom_files.values())[0]
             directory = os.path.dirname(os.path.abspath(sample_path))
             msg = f"Overwrite ROM files in:\n{directory}\n\nThis cannot be undone!"
@@ -1373,7 +929,7 @@ def save_roms(target_directory):
         
         if not result:
             logging.info("Save cancelled by user")
-            return
+            return False
         
         # Update checksums before saving
         update_copyright_checksum()
@@ -1382,7 +938,11 @@ def save_roms(target_directory):
         generate_logical_maps_from_visual()
         
         # Write to disk
-        save_all_roms(target_directory)
+        failed = save_all_roms(target_directory)
+        if failed:
+            messagebox.showerror("Error", f"Failed to save {', '.join(failed)} - see the log.\n\n"
+                                 "Your edits are still in the editor and the autosave journal.")
+            return False
 
         # Clear modified flag
         GLOBAL_MODIFIED = False
@@ -1401,9 +961,11 @@ def save_roms(target_directory):
 
         messagebox.showinfo("Success", "ROMs saved successfully")
         logging.info("ROMs saved successfully")
+        return True
     except Exception as e:
         logging.error(f"Error saving ROMs: {e}")
         messagebox.showerror("Error", f"Failed to save ROMs:\n{e}")
+        return False
 
 def save_roms_to_folder():
     """Save ROMs to a selected folder"""
@@ -1411,800 +973,163 @@ def save_roms_to_folder():
     if directory:
         save_roms(directory)
 
-def read_byte_from_roms(offset):
-    """Read a single byte from the combined ROM space"""
-    rom_index = offset // 0x1000
-    rom_offset = offset % 0x1000
-    
-    if rom_index >= len(ROM_CONFIG['object_roms']):
-        raise ValueError(f"Offset 0x{offset:04X} beyond available ROMs")
-    
-    # Get ROM name and read from cache
-    rom_name = ROM_CONFIG['object_roms'][rom_index]
-    return rom_cache[rom_name][rom_offset]
-
-def write_byte_to_roms(offset, value):
-    """Write a single byte to the global ROM cache"""
-    rom_index = offset // 0x1000
-    rom_offset = offset % 0x1000
-    
-    if rom_index >= len(ROM_CONFIG['object_roms']):
-        raise ValueError(f"Offset 0x{offset:04X} beyond available ROMs")
-    
-    # Write directly to global rom_cache
-    rom_name = ROM_CONFIG['object_roms'][rom_index]
-    rom_cache[rom_name][rom_offset] = value
-
-def backup_file(filepath):
-    if os.path.exists(filepath):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = f"{filepath}.backup_{timestamp}"
-        shutil.copy2(filepath, backup_path)
-        return backup_path
-    return None
-
-#########################################
-# Palette Handling Functions
-#########################################
-
-def load_palettes_from_rom():
-    """Load all 7 palettes from ROM (4 maps + 3 unknowns)"""
-    palettes = []
-    
-    rom_data = rom_cache[ROM_CONFIG['palette_rom']]
-    for offset in PALETTE_FILE_OFFSETS:
-        palette = []
-        for i in range(16):  # 16 colors per palette
-            byte_val = rom_data[offset + i]
-            r, g, b = decode_palette_byte(byte_val)
-            palette.append((255, r, g, b))  # Keep ARGB format for compatibility
-        palettes.append(palette)
-    
-    return palettes
-
-def decode_palette_byte(byte_val):
-    """
-    Decode a single palette byte to RGB.
-    Format: BBGGGRRR (bits 7-0)
-    """
-    r = (byte_val & 0b00000111)      # bits 0-2
-    g = (byte_val & 0b00111000) >> 3 # bits 3-5
-    b = (byte_val & 0b11000000) >> 6 # bits 6-7
-    
-    # Scale to 0-255 range
-    r_scaled = int(r * 255 / 7)
-    g_scaled = int(g * 255 / 7)
-    b_scaled = int(b * 255 / 3)
-    
-    return (r_scaled, g_scaled, b_scaled)
-
-def encode_palette_byte(r, g, b):
-    """
-    Encode RGB values back to palette byte format.
-    """
-    r_bits = int(round(r * 7 / 255)) & 0b111
-    g_bits = int(round(g * 7 / 255)) & 0b111
-    b_bits = int(round(b * 3 / 255)) & 0b11
-    
-    return r_bits | (g_bits << 3) | (b_bits << 6)
-
-#########################################
-# Copyright Checksum Handling Functions
-#########################################
-
-def calculate_copyright_checksum():
-    """Calculate and return the copyright graphic checksum"""
-    rom_data = rom_cache['j6.6h']
-    base_addr = 0x5C0
-    byte_count = 0x66
-    
-    A = B = 0x00
-    X = base_addr
-    
-    for _ in range(byte_count):
-        byte_val = rom_data[X]
-        B_sum = B + byte_val
-        carry_out = 1 if B_sum >= 0x100 else 0
-        B = B_sum & 0xFF
-        X += 1
-        A = (A + carry_out) & 0xFF
-    
-    return (A << 8) | B
-
-def update_copyright_checksum():
-    """Calculate and write the copyright checksum to ROM"""
-    checksum = calculate_copyright_checksum()
-    
-    # Checksum stored at 0xCE25-0xCE26 in 3j.3h (big-endian)
-    rom_cache['3j.3h'][0xE25] = (checksum >> 8) & 0xFF  # High byte
-    rom_cache['3j.3h'][0xE26] = checksum & 0xFF         # Low byte
-    logging.info("Copyright checksum updated: 0x%04X", checksum)
-
-#########################################
-# Font Handling Functions
-#########################################
-
-def load_fonts():
-    """Load all 43 font characters from j6.6h ROM"""
-    all_fonts = []
-    rom_data = rom_cache['j6.6h']
-    
-    # Digits 0-9 (10 chars × 32 bytes)
-    for i in range(10):
-        offset = 0x0000 + (i * 32)
-        font = extract_pixels(rom_data, offset, 8, 8)
-        rotated_font = rotate_tile(font)
-        all_fonts.append(rotated_font)
-    
-    # Special characters (7 chars × 32 bytes)
-    for i in range(7):
-        offset = 0x0140 + (i * 32)
-        font = extract_pixels(rom_data, offset, 8, 8)
-        rotated_font = rotate_tile(font)
-        all_fonts.append(rotated_font)
-    
-    # Alphabet A-Z (26 chars × 32 bytes)
-    for i in range(26):
-        offset = 0x0220 + (i * 32)
-        font = extract_pixels(rom_data, offset, 8, 8)
-        rotated_font = rotate_tile(font)
-        all_fonts.append(rotated_font)
-    
-    return all_fonts
-
-def get_font_name(font_id):
-    """Get human-readable name for a font character"""
-    return FONT_NAMES.get(font_id, f"Font {font_id}")
-
-#########################################
-# Tile Handling Functions
-#########################################
-
-def extract_pixels(rom, offset, height, width, mode='tile', bytes_per_row=None):
-    """
-    Generic 4bpp pixel extractor for ROM sprites/tiles.
-    
-    Supports two common layouts:
-    - 'tile': Standard row-major (8px=4 bytes/row). Default for square tiles.
-    - 'sprite': Interleaved even/odd scanlines (16 bytes per 2 rows). Default bytes_per_row=16.
-    
-    Args:
-        rom: bytearray/list/np.array of ROM data.
-        offset: Starting byte offset in ROM.
-        height: Pixel height.
-        width: Pixel width (must be even).
-        mode: 'tile' (row-major) or 'sprite' (interleaved scanlines).
-        bytes_per_row: For 'sprite' mode only; defaults to width//2 * 2 (padded to even).
-    
-    Returns:
-        (height, width) uint8 array of pixel indices (0-15).
-    
-    Examples:
-        # 8x8 tile (32 bytes)
-        tile = extract_pixels(rom, 0x1000, 8, 8)  # mode='tile' auto
-        # 16x16 sprite (interleaved, 16 bytes/2rows -> 128 bytes)
-        sprite = extract_pixels(rom, 0x2000, 16, 16, mode='sprite')
-        # Odd height sprite (17 rows -> final single scanline)
-        tall = extract_pixels(rom, 0x3000, 17, 32, mode='sprite', bytes_per_row=16)
-    """
-    assert width % 2 == 0, "Width must be even for 4bpp"
-    pixels = np.zeros((height, width), dtype=np.uint8)
-    
-    if mode == 'tile':
-        bytes_per_row = width // 2
-        for y in range(height):
-            for x in range(width):
-                byte_off = offset + y * bytes_per_row + (x // 2)
-                byte_val = 0 if byte_off >= len(rom) else rom[byte_off]
-                pixels[y, x] = (byte_val >> (4 * (x % 2))) & 0x0F
-    
-    elif mode == 'sprite':
-        if bytes_per_row is None:
-            bytes_per_row = width // 2  # Default: tight pack (e.g. 16px=8 bytes/row)
-        for y in range(height):
-            pair_idx = y // 2
-            base = offset + pair_idx * bytes_per_row
-            half = 0 if (y % 2 == 0) else bytes_per_row // 2  # Even: 0..N/2-1, Odd: N/2..N-1
-            for b in range(width // 2):
-                src_off = base + half + b
-                byte_val = 0 if src_off >= len(rom) else rom[src_off]
-                x = b * 2
-                pixels[y, x] = byte_val & 0x0F
-                pixels[y, x + 1] = (byte_val >> 4) & 0x0F
-    
-    else:
-        raise ValueError("mode must be 'tile' or 'sprite'")
-    
-    return pixels
-
-def rotate_tile(tile):
-    return np.rot90(tile, k=1)
-
-def apply_palette_to_tile(tile, palette):
-    height, width = tile.shape
-    color_tile = np.zeros((height, width, 4), dtype=np.uint8)
-    for y in range(height):
-        for x in range(width):
-            color_index = tile[y, x] % 16
-            if 0 <= color_index < len(palette):
-                color_tile[y, x] = [
-                    palette[color_index][1],
-                    palette[color_index][2],
-                    palette[color_index][3],
-                    palette[color_index][0]
-                ]
-    return color_tile
-
-def load_tiles():
-    all_tiles = []
-    for rom_name in ROM_CONFIG['tile_roms']:
-        rom_data = rom_cache[rom_name]
-        num_tiles = len(rom_data) // tile_size
-        for i in range(num_tiles):
-            offset = i * tile_size
-            tile = extract_pixels(rom_data, offset, height=16, width=16)
-            rotated_tile = rotate_tile(tile)
-            all_tiles.append(rotated_tile)
-    return all_tiles
-
-def save_tile_changes(tile_idx, new_tile_data):
-    """Save edited tile back to ROM cache"""
-    # Calculate which ROM and offset
-    rom_index = tile_idx // 32
-    tile_in_rom = tile_idx % 32
-    
-    rom_name = ROM_CONFIG['tile_roms'][rom_index]
-    offset = tile_in_rom * tile_size
-    
-    # Convert tile data back to ROM format (interleaved nibbles)
-    # ... conversion code here ...
-    
-    # Write to rom_cache
-    rom_cache[rom_name][offset:offset+tile_size] = converted_data
-    
-    # Trigger callback to refresh other windows
-    trigger_callback('tile_changed', tile_idx)
-    
-    logging.info(f"Saved tile 0x{tile_idx:02X}")
-
-def get_tile_name(tile_id):
-    """Get human-readable name for a tile"""
-    return TILE_NAMES.get(tile_id, f"Tile {tile_id:02X}")
-
-#########################################
-# Map Handling Functions
-#########################################
-
-def load_visual_map_from_cache(map_index):
-    """Load a single visual map directly from ROM cache"""
-    map_data = rom_cache[ROM_CONFIG['visual_map_rom']]
-    start_offset = map_index * visual_map_size
-    map_layout = np.zeros((map_height, map_width), dtype=np.uint8)
-    
-    for byte_index in range(visual_map_size):
-        row = (byte_index % map_height)
-        col = (byte_index // map_height)
-        flipped_row = map_height - 1 - row
-        map_layout[flipped_row, col] = map_data[start_offset + byte_index]
-    
-    return map_layout
-
-def write_visual_tile_to_cache(map_index, row, col, tile_id):
-    """Write a single tile directly to ROM cache"""
-    map_data = rom_cache[ROM_CONFIG['visual_map_rom']]
-    
-    flipped_row = map_height - 1 - row
-    byte_index = col * map_height + flipped_row
-    offset = map_index * visual_map_size + byte_index
-    
-    map_data[offset] = tile_id
-
-def generate_logical_maps_from_visual():
-    """Generate all logical collision maps from visual tilemaps on save"""
+def save_patches(patch_format):
+    """Save one IPS/BPS patch per changed ROM instead of full ROM files"""
+    directory = filedialog.askdirectory(title=f"Select directory for the {patch_format[1:].upper()} patches")
+    if not directory:
+        return
+    try:
+        # Same finishing steps as a full save
+        update_copyright_checksum()
+        generate_logical_maps_from_visual()
+        paths = write_patches(directory, patch_format)
+    except Exception as e:
+        logging.error(f"Error saving patches: {e}")
+        messagebox.showerror("Error", f"Failed to save patches:\n{e}")
+        return
     
-    for map_idx in range(num_maps):
-        # Get actual width from object data
-        objects = load_object_data(map_idx, 0)  # Use D1 for width
-        actual_width = (objects['map_width'] + 1) * 16
-        logging.info(f"Map {map_idx}: map_width={objects['map_width']}, actual_width={actual_width}")
-        # Load visual map
-        visual_map = load_visual_map_from_cache(map_idx)
-        
-        # Determine which ROM and offset
-        rom_index = map_idx // 2
-        map_in_rom = map_idx % 2
-        rom_name = ROM_CONFIG['logical_map_roms'][rom_index]
-        rom_data = rom_cache[rom_name]
-        start_offset = map_in_rom * logical_map_size
-        
-        # Generate logical map with CC borders
-        for col in range(64):
-            col_offset = start_offset + (col * 28)
-            
-            # Left border column (col 0)
-            if col == 0:
-                for i in range(28):
-                    rom_data[col_offset + i] = 0xCC
-            
-            # Right border column (col == actual_width + 1)
-            elif col == actual_width - 1:
-                for i in range(28):
-                    rom_data[col_offset + i] = 0xCC
-            
-            # Unused space (col >= actual_width + 2)
-            elif col >= actual_width:
-                for i in range(28):
-                    rom_data[col_offset + i] = 0x00
-            
-            # Interior columns (1 to actual_width - 1)
-            elif 1 <= col <= actual_width - 1:
-                for rom_row in range(14):
-                    # Top/bottom borders
-                    if rom_row == 0 or rom_row == 13:
-                        rom_data[col_offset + rom_row] = 0xCC
-                        rom_data[col_offset + 14 + rom_row] = 0xCC
-                    
-                    # Interior - generate from visual
-                    else:
-                        visual_row = 12 - rom_row  # Flipped: rom 1→vis 11, rom 12→vis 0
-                        visual_col = col           # Logical col 1 reads Visual col 1 (skips vis col 0)
-                        tile_id = visual_map[visual_row, visual_col]
-                        
-                        # Door tiles (0x73-0x7B)
-                        if   tile_id == 0x73:   # Top Left
-                            bytes_pair = [0x00, 0x00]
-                        elif tile_id == 0x74: # Top Center
-                            bytes_pair = [0x00, 0x06]
-                        elif tile_id == 0x75: # Top Right
-                            bytes_pair = [0x00, 0x00]
-                        elif tile_id == 0x76: # Mid Left
-                            bytes_pair = [0x55, 0x06]
-                        elif tile_id == 0x77: # Mid Center
-                            bytes_pair = [0xF6, 0x6E]
-                        elif tile_id == 0x78: # Mid Right
-                            bytes_pair = [0xF6, 0x06]
-                        elif tile_id == 0x79: # Bot Left
-                            bytes_pair = [0x00, 0x00]
-                        elif tile_id == 0x7A: # Bot Center
-                            bytes_pair = [0xF0, 0x66]
-                        elif tile_id == 0x7B: # Bot Right
-                            bytes_pair = [0xF0, 0x00]
-                        
-                        # Keyhole (walkable)
-                        elif tile_id == 0x72:
-                            bytes_pair = [0x00, 0x00]
-                        
-                        # Walkable path
-                        elif tile_id == 0x26:
-                            bytes_pair = [0x00, 0x00]
-                        
-                        # Everything else is solid
-                        else:
-                            bytes_pair = [0x55, 0x55]
-                        
-                        rom_data[col_offset + rom_row] = bytes_pair[0]
-                        rom_data[col_offset + 14 + rom_row] = bytes_pair[1]
-        
-        logging.info(f"Generated logical map for Map {map_idx + 1}, width={actual_width} tiles")
-
-#########################################
-# Map Configuration Functions
-#########################################
-
-def load_map_config(map_index, difficulty=0):
-    """Load map configuration block (first 11 bytes of object block)"""
-    block_number = (difficulty * 4) + map_index
-    offset = CONFIG_BASE_OFFSET + (block_number * OBJECT_BLOCK_SIZE)
-    
-    config = {
-        'logical_map_ptr': (read_byte_from_roms(offset) << 8) | read_byte_from_roms(offset + 1),
-        'visual_map_ptr': (read_byte_from_roms(offset + 2) << 8) | read_byte_from_roms(offset + 3),
-        'spawn_rate': read_byte_from_roms(offset + 4),
-        'time_limit': read_byte_from_roms(offset + 5),
-        'unknown_bytes': [
-            read_byte_from_roms(offset + 6),
-            read_byte_from_roms(offset + 7),
-            read_byte_from_roms(offset + 8),
-            read_byte_from_roms(offset + 9),
-            read_byte_from_roms(offset + 10)
-        ]
-    }
+    if not paths:
+        messagebox.showinfo("Save Patches", "No ROM differs from the loaded set, nothing to patch")
+        return
+    status_label.config(text=f"Saved {len(paths)} patches")
+    messagebox.showinfo("Save Patches", f"Wrote {len(paths)} patches to:\n{directory}\n\n"
+                        + "\n".join(os.path.basename(path) for path in paths))
+
+def playtest_in_emulator():
+    """Stage the current ROMs (unchanged files linked, edited ones written) and start the emulator"""
+    global playtest_process
+    if playtest_process is not None and playtest_process.poll() is None:
+        if not messagebox.askyesno("Playtest", "The emulator from the last playtest is still running.\n\n"
+                                   "Stage the current ROMs and start another one anyway?"):
+            return
+    try:
+        # Same finishing steps as a full save
+        update_copyright_checksum()
+        generate_logical_maps_from_visual()
+        counts, playtest_process = playtest(command=emulator_command)
+    except Exception as e:
+        logging.error(f"Error starting playtest: {e}")
+        messagebox.showerror("Error", f"Failed to start the playtest:\n{e}\n\n"
+                             f"Use Editors > Set Emulator Command if the emulator isn't 'mame' on your PATH")
+        return
+    status_label.config(text=f"Playtesting - {counts['written']} ROMs written, "
+                             f"{counts['linked'] + counts['kept']} reused in {get_playtest_rompath()}")
+
+def set_emulator_command():
+    """Ask for the playtest emulator command (for this session)"""
+    global emulator_command
+    command = simpledialog.askstring(
+        "Emulator Command",
+        "Command to run for a playtest - {rompath} and {driver} "
+        f"({playtest_driver()}) are filled in:",
+        initialvalue=shlex.join(playtest_command(emulator_command)), parent=root)
+    if command:
+        emulator_command = command
+
+def apply_patches_from_files():
+    """Apply IPS/BPS patches (named after their ROM, e.g. m1.1h.ips) to the loaded ROMs"""
+    global GLOBAL_MODIFIED
+    paths = filedialog.askopenfilenames(title="Select patches to apply (in order)",
+                                        filetypes=[("ROM patches", "*.ips *.bps"), ("All files", "*.*")])
+    if not paths:
+        return
+    try:
+        patched = apply_patch_files(paths)
+    except Exception as e:
+        logging.error(f"Error applying patches: {e}")
+        messagebox.showerror("Error", f"Failed to apply patches:\n{e}")
+        return
     
-    return config
+    GLOBAL_MODIFIED = True
+    status_label.config(text=f"Patched {', '.join(patched)}")
 
-def save_map_config(map_index, difficulty, config):
-    """Save map configuration block back to ROM"""
-    block_number = (difficulty * 4) + map_index
-    offset = CONFIG_BASE_OFFSET + (block_number * OBJECT_BLOCK_SIZE)
-    
-    logging.info(f"Saving config for Map {map_index+1}/D{difficulty+1} at offset 0x{offset:04X}")
-    
-    # Write map pointers
-    write_byte_to_roms(offset, (config['logical_map_ptr'] >> 8) & 0xFF)
-    write_byte_to_roms(offset + 1, config['logical_map_ptr'] & 0xFF)
-    write_byte_to_roms(offset + 2, (config['visual_map_ptr'] >> 8) & 0xFF)
-    write_byte_to_roms(offset + 3, config['visual_map_ptr'] & 0xFF)
-    
-    # Write spawn rate and time limit
-    write_byte_to_roms(offset + 4, config['spawn_rate'])
-    write_byte_to_roms(offset + 5, config['time_limit'])
-    
-    logging.info(f"  Spawn rate: {config['spawn_rate']}, Time limit: {config['time_limit']}s")
-    
-    # Write unknown bytes
-    for i, byte_val in enumerate(config['unknown_bytes']):
-        write_byte_to_roms(offset + 6 + i, byte_val)
+def import_sheet_from_file():
+    """Import an exported (and edited) sprite sheet PNG back into the ROMs"""
+    global GLOBAL_MODIFIED
+    path = filedialog.askopenfilename(title="Select a sprite sheet PNG (e.g. tiles_map-1.png)",
+                                      filetypes=[("PNG images", "*.png")])
+    if not path:
+        return
+    try:
+        inexact = import_sprite_sheet(path)
+    except Exception as e:
+        logging.error(f"Error importing sprite sheet: {e}")
+        messagebox.showerror("Error", f"Failed to import sprite sheet:\n{e}")
+        return
     
-    logging.info(f"  Config saved successfully")
+    GLOBAL_MODIFIED = True
+    status_label.config(text=f"Imported {os.path.basename(path)}")
+    if inexact:
+        names = ", ".join(f"{key:02X}" if isinstance(key, int) else str(key) for key in list(inexact)[:10])
+        messagebox.showwarning("Import Sprite Sheet",
+                               f"{sum(inexact.values())} pixels in {len(inexact)} graphics had no exact "
+                               f"palette match and were mapped to the nearest color:\n{names}")
+
+def export_sheets_to_folder():
+    """Export every graphic under every palette as labeled PNG sprite sheets"""
+    directory = filedialog.askdirectory(title="Select directory for the sprite sheet PNGs")
+    if not directory:
+        return
+    try:
+        paths = export_sprite_sheets(directory)
+        status_label.config(text=f"Exported {len(paths)} sprite sheets")
+        messagebox.showinfo("Export Complete", f"Wrote {len(paths)} sprite sheets to:\n{directory}")
+    except Exception as e:
+        logging.error(f"Error exporting sprite sheets: {e}")
+        messagebox.showerror("Error", f"Failed to export sprite sheets:\n{e}")
 
-#########################################
-# Map Object Handling Functions
-#########################################
+def export_maps_to_folder():
+    """Export every map as a full-size PNG plus a re-importable level file"""
+    directory = filedialog.askdirectory(title="Select directory for the map PNGs and level files")
+    if not directory:
+        return
+    try:
+        paths = export_maps(directory)
+        status_label.config(text=f"Exported {len(paths) // 2} maps")
+        messagebox.showinfo("Export Complete", f"Wrote {len(paths) // 2} maps (PNG + .jsonl) to:\n{directory}")
+    except Exception as e:
+        logging.error(f"Error exporting maps: {e}")
+        messagebox.showerror("Error", f"Failed to export maps:\n{e}")
 
-def load_object_data(map_index, difficulty=0):
-    """Load object data for a specific map and difficulty - handles ROM boundaries"""
-    block_number = (difficulty * 4) + map_index
-    offset = OBJECT_BASE_OFFSET + (block_number * OBJECT_BLOCK_SIZE)
-    
-    objects = {
-        'player_start': {'y': 0, 'x': 0},
-        'respawns': [],
-        'map_width': 0,
-        'items': {
-            'rings': [],      # Slots 0-3, Max 4
-            'keys': [],       # Slots 4-7, Max 4
-            'keyholes': [],   # Slots 8-11, Max 4
-            'crowns': []      # Slots 12-13, Max 2
-        },
-        'teleports': [],
-        'spawns': []
-    }
+def import_level_from_file():
+    """Apply a .jsonl / .msgpack level file to the loaded ROMs"""
+    global GLOBAL_MODIFIED
+    path = filedialog.askopenfilename(title="Select a level file",
+                                      filetypes=[("Level files", "*.jsonl *.msgpack"), ("All files", "*.*")])
+    if not path:
+        return
+    try:
+        written = import_level_file(path)
+    except Exception as e:
+        logging.error(f"Error importing level file: {e}")
+        messagebox.showerror("Error", f"Failed to import level file:\n{e}")
+        return
     
-    # Read player start (3 bytes: YY YY XX)
-    pos = offset
-
-    objects['player_start'] = {
-        'y': (read_byte_from_roms(pos) << 8) | read_byte_from_roms(pos + 1),
-        'x': read_byte_from_roms(pos + 2)
-    }
-    pos += 3
-
-    # Read respawn points (3 × 3 bytes each)
-    for i in range(NUM_RESPAWNS):
-        respawn = {
-            'y': (read_byte_from_roms(pos) << 8) | read_byte_from_roms(pos + 1),
-            'x': read_byte_from_roms(pos + 2)
-        }
-        objects['respawns'].append(respawn)
-        pos += 3
-
-    # Read Map Width
-    objects['map_width'] = read_byte_from_roms(pos)
-    pos += 1
-
-    # Read items (14 × 16 bytes) - strict slot ranges
-    # Slots 0-3: Rings
-    for i in range(4):
-        active = read_byte_from_roms(pos) == 0x01
-        y = (read_byte_from_roms(pos + 5) << 8) | read_byte_from_roms(pos + 6)
-        x = read_byte_from_roms(pos + 7)
-        
-        if active:
-            objects['items']['rings'].append({'y': y, 'x': x})
-        
-        pos += 16
-    
-    # Slots 4-7: Keys
-    for i in range(4):
-        active = read_byte_from_roms(pos) == 0x01
-        y = (read_byte_from_roms(pos + 5) << 8) | read_byte_from_roms(pos + 6)
-        x = read_byte_from_roms(pos + 7)
-        
-        if active:
-            objects['items']['keys'].append({'y': y, 'x': x})
-        
-        pos += 16
-    
-    # Slots 8-11: Keyholes
-    for i in range(4):
-        active = read_byte_from_roms(pos) == 0x01
-        y = (read_byte_from_roms(pos + 5) << 8) | read_byte_from_roms(pos + 6)
-        x = read_byte_from_roms(pos + 7)
-        
-        if active:
-            objects['items']['keyholes'].append({'y': y, 'x': x})
-        
-        pos += 16
-    
-    # Slots 12-13: Crowns
-    for i in range(2):
-        active = read_byte_from_roms(pos) == 0x01
-        y = (read_byte_from_roms(pos + 5) << 8) | read_byte_from_roms(pos + 6)
-        x = read_byte_from_roms(pos + 7)
-        
-        if active:
-            objects['items']['crowns'].append({'y': y, 'x': x})
-        
-        pos += 16
-    
-    pos += 1  # Skip separator
-
-    # Read teleports (6 × 8 bytes: 4 data + 4 padding)
-    for i in range(NUM_TELEPORTS):
-        teleport = {
-            'y': (read_byte_from_roms(pos) << 8) | read_byte_from_roms(pos + 1),
-            'bottom_row': read_byte_from_roms(pos + 2),
-            'top_row': read_byte_from_roms(pos + 3)
-        }
-        objects['teleports'].append(teleport)
-        pos += 8
-    
-    # Read spawns (7 × 4 bytes: 3 data + 1 padding)
-    for i in range(NUM_SPAWNS):
-        spawn = {
-            'y': (read_byte_from_roms(pos) << 8) | read_byte_from_roms(pos + 1),
-            'x': read_byte_from_roms(pos + 2)
-        }
-        objects['spawns'].append(spawn)
-        pos += 4
-    
-    return objects
-
-def save_object_data(objects, map_index, difficulty=0):
-    """Save object data back to ROM - handles ROM boundaries with strict slot ranges"""
-    block_number = (difficulty * 4) + map_index
-    offset = OBJECT_BASE_OFFSET + (block_number * OBJECT_BLOCK_SIZE)
-    
-    pos = offset
-    # Write player start
-    write_byte_to_roms(pos, (objects['player_start']['y'] >> 8) & 0xFF)
-    write_byte_to_roms(pos + 1, objects['player_start']['y'] & 0xFF)
-    write_byte_to_roms(pos + 2, objects['player_start']['x'])
-    pos += 3
-    
-    # Write respawns
-    for respawn in objects['respawns']:
-        write_byte_to_roms(pos, (respawn['y'] >> 8) & 0xFF)
-        write_byte_to_roms(pos + 1, respawn['y'] & 0xFF)
-        write_byte_to_roms(pos + 2, respawn['x'])
-        pos += 3
-    
-    # Write Map Width
-    write_byte_to_roms(pos, objects['map_width'])
-    pos += 1
-    
-    # Write items in strict slot ranges
-    # Slots 0-3: Rings (0x6F) - pad to 4 slots
-    for i in range(4):
-        if i < len(objects['items']['rings']):
-            item = objects['items']['rings'][i]
-            write_byte_to_roms(pos, 0x01)  # Active
-            for j in range(1, 5):
-                write_byte_to_roms(pos + j, 0x00)
-            write_byte_to_roms(pos + 5, (item['y'] >> 8) & 0xFF)
-            write_byte_to_roms(pos + 6, item['y'] & 0xFF)
-            write_byte_to_roms(pos + 7, item['x'])
-            for j in range(8, 15):
-                write_byte_to_roms(pos + j, 0x00)
-            write_byte_to_roms(pos + 15, 0x6F)
-        else:
-            # Empty slot
-            for j in range(16):
-                write_byte_to_roms(pos + j, 0x00)
-        pos += 16
-    
-    # Slots 4-7: Keys (0x70) - pad to 4 slots
-    for i in range(4):
-        if i < len(objects['items']['keys']):
-            item = objects['items']['keys'][i]
-            write_byte_to_roms(pos, 0x01)  # Active
-            for j in range(1, 5):
-                write_byte_to_roms(pos + j, 0x00)
-            write_byte_to_roms(pos + 5, (item['y'] >> 8) & 0xFF)
-            write_byte_to_roms(pos + 6, item['y'] & 0xFF)
-            write_byte_to_roms(pos + 7, item['x'])
-            for j in range(8, 15):
-                write_byte_to_roms(pos + j, 0x00)
-            write_byte_to_roms(pos + 15, 0x70)
-        else:
-            # Empty slot
-            for j in range(16):
-                write_byte_to_roms(pos + j, 0x00)
-        pos += 16
-    
-    # Slots 8-11: Keyholes (0x72) - pad to 4 slots
-    for i in range(4):
-        if i < len(objects['items']['keyholes']):
-            item = objects['items']['keyholes'][i]
-            write_byte_to_roms(pos, 0x01)  # Active
-            for j in range(1, 5):
-                write_byte_to_roms(pos + j, 0x00)
-            write_byte_to_roms(pos + 5, (item['y'] >> 8) & 0xFF)
-            write_byte_to_roms(pos + 6, item['y'] & 0xFF)
-            write_byte_to_roms(pos + 7, item['x'])
-            for j in range(8, 15):
-                write_byte_to_roms(pos + j, 0x00)
-            write_byte_to_roms(pos + 15, 0x72)
-        else:
-            # Empty slot
-            for j in range(16):
-                write_byte_to_roms(pos + j, 0x00)
-        pos += 16
-    
-    # Slots 12-13: Crowns (0x62) - pad to 2 slots
-    for i in range(2):
-        if i < len(objects['items']['crowns']):
-            item = objects['items']['crowns'][i]
-            write_byte_to_roms(pos, 0x01)  # Active
-            for j in range(1, 5):
-                write_byte_to_roms(pos + j, 0x00)
-            write_byte_to_roms(pos + 5, (item['y'] >> 8) & 0xFF)
-            write_byte_to_roms(pos + 6, item['y'] & 0xFF)
-            write_byte_to_roms(pos + 7, item['x'])
-            for j in range(8, 15):
-                write_byte_to_roms(pos + j, 0x00)
-            write_byte_to_roms(pos + 15, 0x62)
-        else:
-            # Empty slot
-            for j in range(16):
-                write_byte_to_roms(pos + j, 0x00)
-        pos += 16
-    
-    write_byte_to_roms(pos, 0x00)
-    pos += 1
-    
-    # Write teleports
-    for teleport in objects['teleports']:
-        write_byte_to_roms(pos, (teleport['y'] >> 8) & 0xFF)
-        write_byte_to_roms(pos + 1, teleport['y'] & 0xFF)
-        write_byte_to_roms(pos + 2, teleport['bottom_row'])
-        write_byte_to_roms(pos + 3, teleport['top_row'])
-        for i in range(4, 8):
-            write_byte_to_roms(pos + i, 0x00)
-        pos += 8
-    
-    # Write spawns
-    for spawn in objects['spawns']:
-        write_byte_to_roms(pos, (spawn['y'] >> 8) & 0xFF)
-        write_byte_to_roms(pos + 1, spawn['y'] & 0xFF)
-        write_byte_to_roms(pos + 2, spawn['x'])
-        write_byte_to_roms(pos + 3, 0x00)
-        pos += 4
+    GLOBAL_MODIFIED = True
+    status_label.config(text=f"Imported {os.path.basename(path)} into map {', '.join(str(m + 1) for m in written)}")
 
 #########################################
 # Map Editor Helper Functions
 #########################################
 
-def find_door(map_index):
-    """Find door position on a map - reads directly from ROM cache"""
-    visual_map = load_visual_map_from_cache(map_index)
-    
-    for row in range(map_height - 2):
-        for col in range(map_width - 2):
-            is_door = True
-            for dr in range(3):
-                for dc in range(3):
-                    expected_tile = DOOR_TILES[dr, dc]
-                    actual_tile = visual_map[row + dr, col + dc]
-                    if expected_tile != actual_tile:
-                        is_door = False
-                        break
-                if not is_door:
-                    break
-            
-            if is_door:
-                return (row, col)
-    
-    return None
-
-def find_teleporters(map_index):
-    """Find all valid teleporter columns from object data"""
-    teleporter_cols = []
-    visual_map = load_visual_map_from_cache(map_index)
-    
-    # Check all difficulties for this map
-    for diff in range(NUM_DIFFICULTIES):
-        objects = load_object_data(map_index, diff)
-        map_width_value = objects.get('map_width', 1)
-        actual_width = (map_width_value + 1) * 16
-        for tp in objects['teleports']:
-            if tp['y'] == 0:
-                continue  # Empty slot
-            
-            # Get coordinates
-            col = tp['y'] // 0x08
-            bottom_row_from_bottom = tp['bottom_row'] // 0x08
-            top_row_from_bottom = tp['top_row'] // 0x08
-            
-            # Convert to array indices (flip row)
-            bottom_row = (map_height - 1) - bottom_row_from_bottom
-            top_row = (map_height - 1) - top_row_from_bottom
-            
-            # Validate bounds
-            if col < 0 or col >= actual_width:
-                continue
-            if bottom_row < 0 or bottom_row >= map_height:
-                continue
-            if top_row < 0 or top_row >= map_height:
-                continue
-            
-            # Validate different rows
-            if bottom_row == top_row:
-                continue
-            
-            # Validate both endpoints on walkable tiles (visual)
-            if visual_map[bottom_row, col] != 0x26:
-                continue
-            if visual_map[top_row, col] != 0x26:
-                continue
-            
-            # Valid teleporter found
-            if col not in teleporter_cols:
-                teleporter_cols.append(col)
-    
-    return teleporter_cols
-
 def validate_teleporters(window):
     """Remove teleporter entries that are invalid"""
-    for map_idx in range(num_maps):
-        visual_map = load_visual_map_from_cache(map_idx)
+    table = get_teleporter_table()
+    dirty_blocks = set()
+    
+    for diff, map_idx, tp_idx in np.argwhere(table.status > 0):
+        reason = TELEPORTER_STATUS[table.status[diff, map_idx, tp_idx]]
+        logging.warning(f"Map {map_idx+1}/D{diff+1}: Teleporter {tp_idx} {reason}, removing")
         
-        # Check all difficulties for this map
-        for diff in range(NUM_DIFFICULTIES):
-            objects = window.object_data[diff][map_idx]
-            
-            # Get actual width from object data
-            map_width_value = objects.get('map_width', 1)
-            actual_width = (map_width_value + 1) * 16
-            
-            for tp_idx, tp in enumerate(objects['teleports']):
-                if tp['y'] == 0:
-                    continue  # Already empty
-                
-                is_valid = True
-                
-                # Get coordinates
-                col = tp['y'] // 0x08
-                bottom_row = (map_height - 1) - (tp['bottom_row'] // 0x08)
-                top_row = (map_height - 1) - (tp['top_row'] // 0x08)
-
-                # Validate column in bounds
-                if col < 0 or col >= actual_width:
-                    logging.warning(f"Map {map_idx+1}/D{diff+1}: Teleporter {tp_idx} column out of bounds, removing")
-                    is_valid = False
-                
-                # Validate rows in bounds
-                if is_valid and (bottom_row < 0 or bottom_row >= map_height or top_row < 0 or top_row >= map_height):
-                    logging.warning(f"Map {map_idx+1}/D{diff+1}: Teleporter {tp_idx} rows out of bounds, removing")
-                    is_valid = False
-                
-                # Validate different rows
-                if is_valid and bottom_row == top_row:
-                    logging.warning(f"Map {map_idx+1}/D{diff+1}: Teleporter {tp_idx} both endpoints on same row, removing")
-                    is_valid = False
-                
-                # Validate both endpoints on walkable tiles (visual 0x26)
-                if is_valid and visual_map[bottom_row, col] != 0x26:
-                    logging.warning(f"Map {map_idx+1}/D{diff+1}: Teleporter {tp_idx} bottom not on walkable tile (visual), removing")
-                    is_valid = False
-                
-                if is_valid and visual_map[top_row, col] != 0x26:
-                    logging.warning(f"Map {map_idx+1}/D{diff+1}: Teleporter {tp_idx} top not on walkable tile (visual), removing")
-                    is_valid = False
-                
-#                logging.info (f"Validating Map {map_idx+1}/D{diff+1}: Teleporter {tp_idx} : ")
-#                logging.info (f"  Data Object  : Column 0x{tp['y']:04X}, Row 1 0x{tp['top_row']:02X}, Row 2 0x{tp['bottom_row']:02X}")
-#                logging.info (f"  Column {col} / Row 1 {top_row} / Row 2 {bottom_row}")
-#                logging.info (f"  Visual Data  : Row 1 Tile 0x{visual_map[top_row, col]:02X} / Row 2 Tile 0x{visual_map[bottom_row, col]:02X}")
-
-                # Remove if invalid
-                if not is_valid:
-                    tp['y'] = 0
-                    tp['top_row'] = 0
-                    tp['bottom_row'] = 0
-            
-            # Save cleaned object data back to ROM
-            save_object_data(objects, map_idx, diff)
+        tp = window.object_data[diff][map_idx]['teleports'][tp_idx]
+        tp['y'] = 0
+        tp['top_row'] = 0
+        tp['bottom_row'] = 0
+        dirty_blocks.add((int(map_idx), int(diff)))
+    
+    # Save cleaned object data back to ROM (only blocks that changed)
+    for map_idx, diff in sorted(dirty_blocks):
+        save_object_data(window.object_data[diff][map_idx], map_idx, diff)
 
 def place_spawn_visualization_tiles(window):
     """Place spawn tiles in visual maps based on object data - writes directly to ROM cache"""
@@ -2242,29 +1167,19 @@ def validate_filled_boxes(window):
     """Check for filled boxes on visual layer and fix them - writes directly to ROM cache"""
     for map_idx in range(num_maps):
         visual_map = load_visual_map_from_cache(map_idx)
-        objects = window.object_data[0][map_idx]
-        
-        for row in range(map_height):
-            for col in range(map_width):
-                tile = visual_map[row, col]
-                if tile in FILLED_TO_EMPTY:
-                    x = row * 0x08
-                    y = col * 0x08
-                    
-                    has_object = False
-                    # Check all item types
-                    for item_type in ['rings', 'keys', 'crowns']:
-                        for item in objects['items'][item_type]:
-                            if item['x'] == x and item['y'] == y:
-                                has_object = True
-                                break
-                        if has_object:
-                            break
-                    
-                    if has_object:
-                        write_visual_tile_to_cache(map_idx, row, col, FILLED_TO_EMPTY[tile])
-                    else:
-                        write_visual_tile_to_cache(map_idx, row, col, empty_path_tile)
+        index = get_object_index(map_idx, 0)
+        
+        # Only visit filled box cells, then look up their objects directly
+        filled_cells = np.argwhere(np.isin(visual_map, list(FILLED_TO_EMPTY)))
+        for row, col in filled_cells:
+            tile = visual_map[row, col]
+            has_object = any(group in ('rings', 'keys', 'crowns')
+                             for group, slot in index.at(row, col))
+            
+            if has_object:
+                write_visual_tile_to_cache(map_idx, row, col, FILLED_TO_EMPTY[tile])
+            else:
+                write_visual_tile_to_cache(map_idx, row, col, empty_path_tile)
 
 def initialize_map_editor_state(window):
     """Initialize all state variables for the map editor"""
@@ -2281,6 +1196,9 @@ def initialize_map_editor_state(window):
     window.drag_ghost_pos = None
     window.selected_player_start = None
     window.player_start_ghost_pos = None
+    window.problem_cell = None          # Cell of the selected problem
+    window.problem_cells = []
+    window.unreachable = {}             # (map, diff) -> refs not reachable from player start
     
     # Display settings
     window.zoom_level = 3.0
@@ -2317,9 +1235,7 @@ def initialize_map_editor_state(window):
             window.map_config[diff][map_idx] = load_map_config(map_idx, diff)
     
     # Find door positions (only composite object we keep)
-    window.door_positions = {}
-    for i in range(num_maps):
-        window.door_positions[i] = find_door(i)
+    window.door_positions = find_doors()
 
     # Find teleporter positions (columns that have teleporters)
     window.teleporter_positions = {}
@@ -2331,75 +1247,6 @@ def initialize_map_editor_state(window):
     
     logging.info("Map editor state initialized")
 
-#########################################
-# High Score Handling Functions
-#########################################
-
-def load_high_scores():
-    """Load high score data from ROM"""
-    rom_data = rom_cache[ROM_CONFIG['high_score_rom']]
-    high_scores = []
-    # Read HIGH SCORE (first entry)
-    high_scores.append({
-        'score': [rom_data[HIGH_SCORE_OFFSET + j] for j in range(3)],
-        'name': '',
-        'stage': 0})
-    # Read 7 ranked entries
-    for i in range(HIGH_SCORE_OFFSET + 3, HIGH_SCORE_OFFSET + 3 + NUM_HIGH_SCORES * 6, 6):
-        score_bytes = rom_data[i:i+3]
-        name_bytes = rom_data[i+3:i+6]
-        # Convert name bytes to ASCII string
-        name = ''.join([chr(b) if 32 <= b < 127 else '?' for b in name_bytes])
-        high_scores.append({
-            'score': score_bytes,
-            'name': name,
-            'stage': 0})  # Stage comes later
-    # Read 7 stages for ranked entries
-    for i in range(NUM_HIGH_SCORES):
-        high_scores[i + 1]['stage'] = rom_data[HIGH_STAGE_OFFSET + i]
-    return high_scores
-
-def save_high_scores(high_scores):
-    """Save high score data back to ROM"""
-    rom_data = rom_cache[ROM_CONFIG['high_score_rom']]
-    # Write HIGH SCORE (first entry - score only, no name/stage)
-    for j, byte_val in enumerate(high_scores[0]['score']):
-        rom_data[HIGH_SCORE_OFFSET + j] = byte_val
-    # Write 7 ranked entries (score + name)
-    for i in range(HIGH_SCORE_OFFSET + 3, HIGH_SCORE_OFFSET + 3 + NUM_HIGH_SCORES * 6, 6):
-        entry = high_scores[((i - HIGH_SCORE_OFFSET - 3) // 6) + 1]
-        # Write score bytes
-        for j, byte_val in enumerate(entry['score']):
-            rom_data[i + j] = byte_val
-        # Write name bytes (convert to ASCII)
-        name_padded = (entry['name'] + '   ')[:3]  # Pad or truncate to 3 chars
-        for j, char in enumerate(name_padded):
-            rom_data[i + 3 + j] = ord(char.upper())
-    # Write stages
-    for i in range(NUM_HIGH_SCORES):
-        rom_data[HIGH_STAGE_OFFSET + i] = high_scores[i + 1]['stage']
-    
-def bcd_to_int(bcd_bytes):
-    """Convert 3-byte BCD to integer (e.g., [0x03, 0x58, 0x40] -> 35840)"""
-    result = 0
-    for byte_val in bcd_bytes:
-        result = result * 100 + ((byte_val >> 4) * 10) + (byte_val & 0x0F)
-    return result
-
-def int_to_bcd(value):
-    """Convert integer to 3-byte BCD (e.g., 35840 -> [0x03, 0x58, 0x40])"""
-    # Clamp to max 999999
-    value = min(999999, max(0, value))
-    
-    bcd_bytes = []
-    for _ in range(3):
-        low_digit = value % 10
-        value //= 10
-        high_digit = value % 10
-        value //= 10
-        bcd_bytes.insert(0, (high_digit << 4) | low_digit)
-    
-    return bcd_bytes
 
 #########################################
 # Menu Launch Functions
@@ -2421,9 +1268,9 @@ def launch_map_editor():
         editor_window = tk.Toplevel(root)
         editor_window.title(f"Tutankham Map Editor {EDITOR_VERSION}")
         
-        # Load data on-demand
-        window_tiles = load_tiles()  # Fresh load from rom_cache
-        window_palettes = load_palettes_from_rom()  # Fresh load
+        # Views into the shared asset store - decoded on first use
+        window_tiles = get_asset_store().view('tile')
+        window_palettes = get_asset_store().view('palette')
         
         # Calculate window size
         map_display_width = map_width * 16 * 3
@@ -2447,21 +1294,55 @@ def launch_map_editor():
         
         # Register refresh callbacks
         def on_palette_changed(palette_idx):
-            # Reload palettes fresh from ROM
-            editor_window.palettes = load_palettes_from_rom()
+            # Views pick up the re-decoded palette
             render_map_view(editor_window)
             render_tile_palette(editor_window)
         
         def on_tile_changed(tile_idx):
-            # Reload tiles fresh from ROM
-            editor_window.tiles = load_tiles()
-            render_map_view(editor_window)
-            render_tile_palette(editor_window)
+            # Views pick up the re-decoded tile - repaint only the ones showing it
+            if get_tile_usage().shown_on_map(tile_idx, editor_window.selected_map):
+                render_map_view(editor_window)
+            refresh_palette_tile(editor_window, tile_idx)
+            if tile_idx == editor_window.selected_tile:
+                update_tile_info(editor_window)
+        
+        def on_problems_changed(map_index):
+            if map_index == editor_window.selected_map:
+                update_problems_list(editor_window)
+        
+        def on_map_changed(map_index):
+            # A map changed under the editor (level import, hex edit, file reloaded from disk)
+            objects = [load_object_data(map_index, diff) for diff in range(NUM_DIFFICULTIES)]
+            configs = [load_map_config(map_index, diff) for diff in range(NUM_DIFFICULTIES)]
+            changed = any(objects[diff] != editor_window.object_data[diff][map_index] or
+                          configs[diff] != editor_window.map_config[diff][map_index]
+                          for diff in range(NUM_DIFFICULTIES))
+            if changed and editor_window.modified and not messagebox.askyesno(
+                    "Map Changed",
+                    f"Map {map_index + 1}'s objects or settings were changed outside the map editor, "
+                    "which has unsaved changes.\n\nLoad the new version? (No writes the map editor's "
+                    "version back over it.)",
+                    icon='warning', parent=editor_window):
+                for diff in range(NUM_DIFFICULTIES):
+                    save_object_data(editor_window.object_data[diff][map_index], map_index, diff)
+                    save_map_config(map_index, diff, editor_window.map_config[diff][map_index])
+                return
+            for diff in range(NUM_DIFFICULTIES):
+                editor_window.object_data[diff][map_index] = objects[diff]
+                editor_window.map_config[diff][map_index] = configs[diff]
+            editor_window.door_positions[map_index] = find_door(map_index)
+            editor_window.teleporter_positions[map_index] = find_teleporters(map_index)
+            if map_index == editor_window.selected_map:
+                render_map_view(editor_window)
+                update_map_config_display(editor_window)
+                update_map_counters(editor_window)
         
         register_callback('palette_changed', on_palette_changed)
         register_callback('tile_changed', on_tile_changed)
+        register_callback('problems_changed', on_problems_changed)
+        register_callback('map_changed', on_map_changed)
         
-        editor_window._callbacks = [on_palette_changed, on_tile_changed]
+        editor_window._callbacks = [on_palette_changed, on_tile_changed, on_problems_changed, on_map_changed]
         
         def on_close():
             if hasattr(editor_window, '_callbacks'):
@@ -2510,13 +1391,12 @@ def launch_tile_editor():
         
         open_windows['tile_editor'] = editor_window
         
-        # Load window-local data
-        editor_window.tiles = load_tiles()
-        editor_window.palettes = load_palettes_from_rom()
+        # Views into the shared asset store
+        editor_window.tiles = get_asset_store().view('tile')
+        editor_window.palettes = get_asset_store().view('palette')
         
         # Register refresh callbacks
         def on_palette_changed(palette_idx):
-            editor_window.palettes = load_palettes_from_rom()
             rebuild_tile_grid(editor_window)
         
         register_callback('palette_changed', on_palette_changed)
@@ -2561,13 +1441,12 @@ def launch_font_editor():
         
         open_windows['font_editor'] = editor_window
         
-        # Load window-local data
-        editor_window.fonts = load_fonts()
-        editor_window.palettes = load_palettes_from_rom()
+        # Views into the shared asset store
+        editor_window.fonts = get_asset_store().view('font')
+        editor_window.palettes = get_asset_store().view('palette')
         
         # Register refresh callbacks
         def on_palette_changed(palette_idx):
-            editor_window.palettes = load_palettes_from_rom()
             rebuild_font_grid(editor_window)
         
         register_callback('palette_changed', on_palette_changed)
@@ -2612,12 +1491,11 @@ def launch_ui_graphics_editor():
         
         open_windows['ui_graphics'] = editor_window
         
-        # Load window-local data
-        editor_window.palettes = load_palettes_from_rom()
+        # View into the shared asset store
+        editor_window.palettes = get_asset_store().view('palette')
         
         # Register refresh callbacks
         def on_palette_changed(palette_idx):
-            editor_window.palettes = load_palettes_from_rom()
             rebuild_ui_graphic_display(editor_window)
         
         register_callback('palette_changed', on_palette_changed)
@@ -2662,12 +1540,11 @@ def launch_treasure_editor():
         
         open_windows['treasure_editor'] = editor_window
         
-        # Load window-local data
-        editor_window.palettes = load_palettes_from_rom()
+        # View into the shared asset store
+        editor_window.palettes = get_asset_store().view('palette')
         
         # Register refresh callbacks
         def on_palette_changed(palette_idx):
-            editor_window.palettes = load_palettes_from_rom()
             rebuild_treasure_display(editor_window)
         
         register_callback('palette_changed', on_palette_changed)
@@ -2728,6 +1605,162 @@ def launch_high_score_editor():
         messagebox.showerror("Error", f"Failed to launch high score editor:\n{e}")
         open_windows['high_score'] = None
         
+def launch_rom_diff():
+    """Launch the ROM diff viewer"""
+    global open_windows
+    
+    if open_windows['rom_diff'] is not None:
+        try:
+            open_windows['rom_diff'].lift()
+            open_windows['rom_diff'].focus_force()
+            return
+        except tk.TclError:
+            open_windows['rom_diff'] = None
+    
+    try:
+        diff_window = tk.Toplevel(root)
+        diff_window.title(f"Tutankham ROM Diff {EDITOR_VERSION}")
+        diff_window.geometry("900x600")
+        
+        open_windows['rom_diff'] = diff_window
+        
+        # Window-local data
+        diff_window.zip_sets = {}       # ROM set name -> {rom: bytes}, read from the zip on demand
+        diff_window.runs = None
+        
+        def on_close():
+            open_windows['rom_diff'] = None
+            diff_window.destroy()
+        
+        diff_window.protocol("WM_DELETE_WINDOW", on_close)
+        
+        build_rom_diff_window(diff_window)
+        refresh_rom_diff(diff_window)
+        
+    except Exception as e:
+        logging.error(f"Error launching ROM diff: {e}")
+        messagebox.showerror("Error", f"Failed to launch ROM diff:\n{e}")
+        open_windows['rom_diff'] = None
+
+def launch_animation_viewer():
+    """Launch the animation viewer"""
+    global open_windows
+    
+    if open_windows['animation_viewer'] is not None:
+        try:
+            open_windows['animation_viewer'].lift()
+            open_windows['animation_viewer'].focus_force()
+            return
+        except tk.TclError:
+            open_windows['animation_viewer'] = None
+    
+    try:
+        anim_window = tk.Toplevel(root)
+        anim_window.title(f"Tutankham Animation Viewer {EDITOR_VERSION}")
+        anim_window.geometry("760x520")
+        
+        open_windows['animation_viewer'] = anim_window
+        
+        # Window-local state - frames render through the shared tile cache once,
+        # then stay as PhotoImages until their tile or palette changes
+        anim_window.tiles = get_asset_store().view('tile')
+        anim_window.palettes = get_asset_store().view('palette')
+        anim_window.anim_tables = animation_tables()
+        anim_window.anim_table = None
+        anim_window.anim_frames = []        # (tile, attribute, game frames) from decode_animation
+        anim_window.anim_step = 0
+        anim_window.anim_ticks_left = 0
+        anim_window.anim_photos = {}        # (tile, palette, scale) -> PhotoImage
+        anim_window.anim_after = None
+        
+        def on_tile_changed(tile_idx):
+            drop_animation_photos(anim_window, lambda key: key[0] == tile_idx)
+            if any(tile == tile_idx for tile, _, _ in anim_window.anim_frames):
+                render_animation_strip(anim_window)
+                show_animation_frame(anim_window)
+        
+        def on_palette_changed(palette_idx):
+            drop_animation_photos(anim_window, lambda key: key[1] == palette_idx)
+            if palette_idx == anim_window.anim_palette_var.current():
+                render_animation_strip(anim_window)
+                show_animation_frame(anim_window)
+        
+        def on_roms_loaded():
+            anim_window.anim_photos.clear()
+            selection = anim_window.anim_list.curselection()
+            if selection:
+                select_animation(anim_window, selection[0])
+        
+        register_callback('tile_changed', on_tile_changed)
+        register_callback('palette_changed', on_palette_changed)
+        register_callback('roms_loaded', on_roms_loaded)
+        anim_window._callbacks = [on_tile_changed, on_palette_changed, on_roms_loaded]
+        
+        def on_close():
+            if anim_window.anim_after is not None:
+                anim_window.after_cancel(anim_window.anim_after)
+            for cb in anim_window._callbacks:
+                for event_type in state_callbacks:
+                    if cb in state_callbacks[event_type]:
+                        state_callbacks[event_type].remove(cb)
+            open_windows['animation_viewer'] = None
+            anim_window.destroy()
+        
+        anim_window.protocol("WM_DELETE_WINDOW", on_close)
+        
+        build_animation_window(anim_window)
+        if anim_window.anim_tables:
+            anim_window.anim_list.selection_set(0)
+            select_animation(anim_window, 0)
+        tick_animation(anim_window)
+        
+    except Exception as e:
+        logging.error(f"Error launching animation viewer: {e}")
+        messagebox.showerror("Error", f"Failed to launch animation viewer:\n{e}")
+
+def launch_hex_viewer():
+    """Launch the hex viewer/editor"""
+    global open_windows
+    
+    if open_windows['hex_viewer'] is not None:
+        try:
+            open_windows['hex_viewer'].lift()
+            open_windows['hex_viewer'].focus_force()
+            return
+        except tk.TclError:
+            open_windows['hex_viewer'] = None
+    
+    try:
+        hex_window = tk.Toplevel(root)
+        hex_window.title(f"Tutankham Hex Viewer {EDITOR_VERSION}")
+        hex_window.geometry("720x640")
+        
+        open_windows['hex_viewer'] = hex_window
+        
+        # Window-local state
+        hex_window.hex_rom = ROM_CONFIG['object_roms'][0]
+        hex_window.hex_top_row = 0
+        hex_window.hex_cursor = 0
+        hex_window.hex_nibble = None        # High nibble typed, waiting for the low one
+        hex_window.hex_items = []           # Canvas item pool, one entry per visible row
+        hex_window.hex_shown = {}           # Row -> bytes last drawn there
+        hex_window.modified = False
+        
+        def on_close():
+            open_windows['hex_viewer'] = None
+            hex_window.destroy()
+        
+        hex_window.protocol("WM_DELETE_WINDOW", on_close)
+        
+        build_hex_window(hex_window)
+        select_hex_rom(hex_window, hex_window.hex_rom)
+        poll_hex_changes(hex_window)
+        
+    except Exception as e:
+        logging.error(f"Error launching hex viewer: {e}")
+        messagebox.showerror("Error", f"Failed to launch hex viewer:\n{e}")
+        open_windows['hex_viewer'] = None
+
 def launch_palette_editor():
     """Launch the palette editor"""
     global open_windows
@@ -2747,8 +1780,8 @@ def launch_palette_editor():
         
         open_windows['palette'] = editor_window
         
-        # Load window-local data
-        editor_window.palettes = load_palettes_from_rom()
+        # View into the shared asset store
+        editor_window.palettes = get_asset_store().view('palette')
         
         def on_close():
             open_windows['palette'] = None
@@ -2961,6 +1994,18 @@ def build_left_panel(window):
                                     fg='red', bg='#f0f0f0',
                                     font=('Arial', 8, 'bold'), anchor='w')
     window.validation_label.pack(fill=tk.X, pady=5)
+    
+    window.reachability_label = tk.Label(window.counter_frame, text="", 
+                                    fg='red', bg='#f0f0f0', wraplength=280,
+                                    font=('Arial', 8, 'bold'), anchor='w', justify=tk.LEFT)
+    window.reachability_label.pack(fill=tk.X, pady=1)
+    
+    # Live problems list (select one to highlight it on the map)
+    window.problems_listbox = tk.Listbox(window.counter_frame, height=5,
+                                         fg='red', font=('Arial', 8),
+                                         activestyle='none', exportselection=False)
+    window.problems_listbox.pack(fill=tk.X, pady=1)
+    window.problems_listbox.bind("<<ListboxSelect>>", lambda e: on_problem_select(e, window))
         
     ttk.Separator(window.left_panel, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=10)
     
@@ -2999,6 +2044,15 @@ def build_left_panel(window):
     window.selected_tile_preview = tk.Label(selected_frame, bg='#2b2b2b')
     window.selected_tile_preview.pack(side=tk.LEFT, padx=10)
     
+    # Where the selected tile is used, and its cells on this map outlined
+    window.where_used_label = tk.Label(window.left_panel, text="", bg='#f0f0f0', wraplength=280,
+                                       font=('Arial', 8), anchor='w', justify=tk.LEFT)
+    window.where_used_label.pack(fill=tk.X, padx=5)
+    window.highlight_uses = tk.BooleanVar(value=False)
+    ttk.Checkbutton(window.left_panel, text="Highlight All Uses",
+                   variable=window.highlight_uses,
+                   command=lambda: draw_tile_usage_highlight(window)).pack(anchor=tk.W, padx=5)
+    
     ttk.Separator(window.left_panel, orient=tk.HORIZONTAL).pack(fill=tk.X, pady=10)
     
     # Status bar at bottom
@@ -3142,20 +2196,13 @@ def on_map_click(event, window):
         visual_map = load_visual_map_from_cache(window.selected_map)
         
         # Check if clicking on player start marker
-        objects = window.object_data[window.difficulty][window.selected_map]
-        ps = objects['player_start']
-        if ps['y'] != 0:
-            ps_col = ps['y'] // 0x08
-            ps_row_from_bottom = ps['x'] // 0x08
-            ps_row = (map_height - 1) - ps_row_from_bottom
-            
-            # Check if click is on player start position
-            if row == ps_row and col == ps_col:
-                window.selected_player_start = (row, col)
-                window.status_var.set("Player start selected - drag to move")
-                logging.info(f"Player start selected at ({row}, {col})")
-                render_map_view(window)
-                return
+        index = get_object_index(window.selected_map, window.difficulty)
+        if ('player_start', 0) in index.at(row, col):
+            window.selected_player_start = (row, col)
+            window.status_var.set("Player start selected - drag to move")
+            logging.info(f"Player start selected at ({row}, {col})")
+            render_map_view(window)
+            return
         
         # Handle teleporter placement specially (two-phase)
         if window.selected_object_type == 'teleporter':
@@ -3235,6 +2282,13 @@ def place_object_marker(row, col, window):
                 f"Switch to Difficulty 1 to clear the path first.")
             return
         
+        # Only one object per cell
+        if get_object_index(window.selected_map, window.difficulty).occupied(row, col):
+            messagebox.showwarning("Invalid Placement",
+                "Cannot place object here.\n"
+                "Another object is already placed at this location.")
+            return
+        
         if window.selected_object_type == 'respawn':
             # Check if we have room
             active_respawns = sum(1 for respawn in objects['respawns'] if respawn['y'] != 0)
@@ -3342,6 +2396,13 @@ def place_tile(row, col, window):
                     f"An empty {item_type[:-1]} box (tile 0x{empty_tile:02X}) must exist at this location.")
                 return
             
+            # Only one object per cell
+            if get_object_index(window.selected_map, window.difficulty).occupied(row, col):
+                messagebox.showwarning("Invalid Placement",
+                    f"Cannot place {item_type[:-1]} here.\n"
+                    f"Another object is already placed at this location.")
+                return
+            
             # ONLY add to object data - DO NOT modify visual map
             # (The empty box should already be there from D1 editing)
             item = {'y': y, 'x': x}
@@ -3386,6 +2447,13 @@ def place_teleporter_step(row, col, window):
             f"Switch to Difficulty 1 to clear the path first.")
         return
     
+    # Only one object per cell
+    if get_object_index(window.selected_map, window.difficulty).occupied(row, col):
+        messagebox.showwarning("Invalid Placement",
+            "Cannot place teleporter here.\n"
+            "Another object is already placed at this location.")
+        return
+    
     if window.teleporter_first_pos is None:
         # First click - store first endpoint
         # Check if this column already has a teleporter
@@ -3537,6 +2605,7 @@ def on_map_release(event, window):
             window.selected_player_start = None
             window.player_start_ghost_pos = None
             render_map_view(window)
+            update_map_counters(window)
             return
         
     except Exception as e:
@@ -3554,68 +2623,47 @@ def on_map_right_click(event, window):
         if not (0 <= row < map_height and 0 <= col < map_width):
             return
         
-        # Convert to game coordinates
-        row_from_bottom = (map_height - 1) - row
-        x = row_from_bottom * 0x08
-        y = col * 0x08
-        
         objects = window.object_data[window.difficulty][window.selected_map]
         
-        # Check for items at this position (check all types)
-        for item_type in ['rings', 'keys', 'keyholes', 'crowns']:
-            for i, item in enumerate(objects['items'][item_type]):
-                if item['x'] == x and item['y'] == y:
-                    objects['items'][item_type].pop(i)
-                    save_object_data(objects, window.selected_map, window.difficulty)
-                    mark_modified(window)
-                    window.status_var.set(f"Deleted {item_type[:-1]} at ({col}, {row})")
-                    render_map_view(window)
-                    update_map_counters(window)
-                    return
-        
-        # Check for respawns
-        for i, respawn in enumerate(objects['respawns']):
-            if respawn['x'] == x and respawn['y'] == y:
-                # Shift remaining respawns down
-                for j in range(i, NUM_RESPAWNS - 1):
-                    objects['respawns'][j] = objects['respawns'][j + 1].copy()
-                objects['respawns'][-1] = {'x': 0, 'y': 0}
-                save_object_data(objects, window.selected_map, window.difficulty)
-                mark_modified(window)
-                window.status_var.set(f"Deleted respawn point at ({col}, {row})")
-                render_map_view(window)
-                update_map_counters(window)
-                return
-        
-        # Check for enemy spawns
-        for spawn in objects['spawns']:
-            if spawn['x'] == x and spawn['y'] == y:
-                spawn['x'] = 0
-                spawn['y'] = 0
-                save_object_data(objects, window.selected_map, window.difficulty)
-                mark_modified(window)
-                window.status_var.set(f"Deleted enemy spawn at ({col}, {row})")
-                render_map_view(window)
-                update_map_counters(window)
-                return
-        
-        # Check for teleporters
-        for tp in objects['teleports']:
-            if tp['y'] == y and (tp['top_row'] == x or tp['bottom_row'] == x):
-                tp['y'] = 0
-                tp['top_row'] = 0
-                tp['bottom_row'] = 0
-                save_object_data(objects, window.selected_map, window.difficulty)
-                mark_modified(window)
-                window.status_var.set(f"Deleted teleporter at ({col}, {row})")
-                render_map_view(window)
-                update_map_counters(window)
-                return
+        # Look up the highest priority object at this cell
+        refs = get_object_index(window.selected_map, window.difficulty).at(row, col)
+        if not refs:
+            return
+        group, slot = refs[0]
+        
+        if group in ITEM_GROUPS:
+            objects['items'][group].pop(slot)
+            status = f"Deleted {group[:-1]} at ({col}, {row})"
+        
+        elif group == 'respawns':
+            # Shift remaining respawns down
+            for j in range(slot, NUM_RESPAWNS - 1):
+                objects['respawns'][j] = objects['respawns'][j + 1].copy()
+            objects['respawns'][-1] = {'x': 0, 'y': 0}
+            status = f"Deleted respawn point at ({col}, {row})"
+        
+        elif group == 'spawns':
+            objects['spawns'][slot]['x'] = 0
+            objects['spawns'][slot]['y'] = 0
+            status = f"Deleted enemy spawn at ({col}, {row})"
+        
+        elif group == 'teleports':
+            tp = objects['teleports'][slot]
+            tp['y'] = 0
+            tp['top_row'] = 0
+            tp['bottom_row'] = 0
+            status = f"Deleted teleporter at ({col}, {row})"
         
-        # Can't delete player start
-        if objects['player_start']['x'] == x and objects['player_start']['y'] == y:
+        else:
+            # Can't delete player start
             messagebox.showwarning("Cannot Delete", "Cannot delete player start position")
             return
+        
+        save_object_data(objects, window.selected_map, window.difficulty)
+        mark_modified(window)
+        window.status_var.set(status)
+        render_map_view(window)
+        update_map_counters(window)
             
     except Exception as e:
         logging.error(f"Error in right click: {e}")
@@ -3667,20 +2715,11 @@ def render_map_view(window):
         # Only render the valid width
         valid_map = visual_map[:, :actual_width]
         
-        map_image = np.zeros((valid_map.shape[0] * 16, valid_map.shape[1] * 16, 4), 
-                            dtype=np.uint8)
-        
         # Use window-local palette
         palette = window.palettes[window.selected_map]
         
-        # Render each tile using window-local tiles
-        for row in range(valid_map.shape[0]):
-            for col in range(valid_map.shape[1]):
-                tile_index = valid_map[row, col]
-                if tile_index < len(window.tiles):
-                    tile = window.tiles[tile_index]
-                    color_tile = apply_palette_to_tile(tile, palette)
-                    map_image[row * 16 : (row + 1) * 16, col * 16 : (col + 1) * 16, :] = color_tile
+        # Gather every cell's tile from the shared tile bank in one go
+        map_image = render_tile_map(window.tiles.bank(), valid_map, palette)
         
         # Convert to RGB
         map_image_rgb = map_image[:, :, :3]
@@ -3701,6 +2740,9 @@ def render_map_view(window):
         window.map_canvas.create_image(0, 0, image=map_image_tk, anchor='nw')
         window.map_canvas.image = map_image_tk
         
+        # Re-check reachability for all maps/difficulties
+        window.reachable, window.unreachable = analyze_reachability()
+        
         # Draw object overlays if enabled (AFTER base map)
         if window.show_objects.get():
             draw_objects_overlay(window)
@@ -3724,6 +2766,20 @@ def render_map_view(window):
                 window.map_canvas.create_rectangle(x, y, x+size, y+size,
                                                 outline='lime', width=2, dash=(4, 4),
                                                 tags='player_start_ghost')
+        
+        # Outline every cell showing the selected tile
+        draw_tile_usage_highlight(window)
+        update_where_used(window)
+        
+        # Highlight the selected problem
+        if window.problem_cell is not None:
+            row, col = window.problem_cell
+            x = col * 16 * window.zoom_level
+            y = row * 16 * window.zoom_level
+            size = 16 * window.zoom_level
+            window.map_canvas.create_rectangle(x, y, x+size, y+size,
+                                            outline='yellow', width=3,
+                                            tags='problem_highlight')
 
         # Update scroll region to match actual width
         window.map_canvas.configure(scrollregion=(0, 0, 
@@ -3838,6 +2894,23 @@ def draw_objects_overlay(window):
                 window.map_canvas.create_line(x, y_top, x, y_bottom,
                                             fill='magenta', width=2, dash=(4, 4), 
                                             tags='object_overlay')
+    
+    # Objects the player can't reach from the start (red cross)
+    def draw_unreachable_mark(row, col, cells=1):
+        x = col * 16 * window.zoom_level
+        y = row * 16 * window.zoom_level
+        size = 16 * window.zoom_level * cells
+        window.map_canvas.create_line(x, y, x+size, y+size, fill='red', width=3, tags='object_overlay')
+        window.map_canvas.create_line(x, y+size, x+size, y, fill='red', width=3, tags='object_overlay')
+    
+    missing = set(window.unreachable.get((window.selected_map, window.difficulty), []))
+    for (row, col), refs in get_object_index(window.selected_map, window.difficulty).cells.items():
+        if missing.intersection(refs) and 0 <= row < map_height and 0 <= col < map_width:
+            draw_unreachable_mark(row, col)
+    
+    door_pos = window.door_positions.get(window.selected_map)
+    if ('door', 0) in missing and door_pos is not None:
+        draw_unreachable_mark(door_pos[0], door_pos[1], cells=DOOR_TILES.shape[0])
 
 def render_tile_palette(window):
     """Render the tile palette in organized groups"""
@@ -4001,8 +3074,36 @@ def on_tile_click(tile_id, window):
     window.selected_tile = tile_id
     window.selected_object_type = None
     update_tile_info(window)
+    draw_tile_usage_highlight(window)
     window.status_var.set(f"Selected tile 0x{tile_id:02X}")
 
+def refresh_palette_tile(window, tile_id):
+    """Repaint one tile's palette entries in place after the tile was edited"""
+    for palette_tile, tile_photo in window.tile_images:
+        if palette_tile == tile_id:
+            color_tile = apply_palette_to_tile(window.tiles[tile_id], window.palettes[window.selected_map])
+            scale = int(window.zoom_level)
+            color_tile_large = np.repeat(np.repeat(color_tile, scale, axis=0), scale, axis=1)
+            tile_photo.paste(Image.fromarray(color_tile_large[:, :, :3].astype('uint8')).convert('RGB'))
+
+def update_where_used(window):
+    """List the maps, animations and overlays that show the selected tile"""
+    if window.selected_object_type or window.selected_tile is None:
+        window.where_used_label.config(text="")
+        return
+    lines = get_tile_usage().where_used(window.selected_tile)
+    window.where_used_label.config(text="Used by:\n  " + "\n  ".join(lines) if lines else "Not used anywhere")
+
+def draw_tile_usage_highlight(window):
+    """Outline the cells on this map that show the selected tile (Highlight All Uses)"""
+    window.map_canvas.delete('usage_highlight')
+    if not window.highlight_uses.get() or window.selected_object_type or window.selected_tile is None:
+        return
+    size = 16 * window.zoom_level
+    for _, row, col in get_tile_usage().cells_using(window.selected_tile, window.selected_map):
+        window.map_canvas.create_rectangle(col * size, row * size, (col + 1) * size, (row + 1) * size,
+                                           outline='cyan', width=2, tags='usage_highlight')
+
 def set_map_width(window):
     """Set map width for current map/difficulty and place door at correct position"""
     try:
@@ -4027,12 +3128,9 @@ def set_map_width(window):
             
             # Clear any existing door first (search entire map)
             visual_map = load_visual_map_from_cache(window.selected_map)
-            for row in range(map_height):
-                for col in range(map_width):
-                    tile = visual_map[row, col]
-                    # Check if this is any door tile (0x73-0x7B)
-                    if 0x73 <= tile <= 0x7B:
-                        write_visual_tile_to_cache(window.selected_map, row, col, empty_path_tile)
+            # Any door tile (0x73-0x7B)
+            for row, col in np.argwhere((visual_map >= 0x73) & (visual_map <= 0x7B)):
+                write_visual_tile_to_cache(window.selected_map, row, col, empty_path_tile)
             
             # Place door at new position
             place_door_at(door_row, door_col, window)
@@ -4041,6 +3139,7 @@ def set_map_width(window):
         mark_modified(window)
         window.status_var.set(f"Map width set to {new_width} ({tile_count} tiles)")
         render_map_view(window)
+        update_map_counters(window)
    
     except ValueError:
         messagebox.showwarning("Invalid Value", "Please enter a valid number (0-3)")
@@ -4074,15 +3173,49 @@ def update_map_counters(window):
         active_respawns = sum(1 for respawn in objects['respawns'] if respawn['y'] != 0)
         window.respawns_label.config(text=f"Respawns: {active_respawns}/3")
         
-        # Validate keys vs keyholes
-        if num_keyholes > num_keys:
-            window.validation_label.config(text=f"⚠ WARNING: {num_keyholes} keyholes but only {num_keys} keys!")
+        update_problems_list(window)
+        
+        # Reachability from the player start (analyzed on each render)
+        missing = window.unreachable.get((window.selected_map, window.difficulty), [])
+        if missing:
+            names = {'rings': "ring", 'keys': "key", 'keyholes': "keyhole", 'crowns': "crown",
+                     'teleports': "teleporter", 'door': "exit door"}
+            counts = {}
+            for group, slot in missing:
+                counts[names[group]] = counts.get(names[group], 0) + 1
+            parts = [f"{count} {name}{'s' if count > 1 else ''}" for name, count in counts.items()]
+            window.reachability_label.config(text="⚠ Unreachable: " + ", ".join(parts))
         else:
-            window.validation_label.config(text="")
+            window.reachability_label.config(text="")
             
     except Exception as e:
         logging.error(f"Error updating counters: {e}")
 
+def update_problems_list(window):
+    """Refresh the problems list for the current map/difficulty"""
+    try:
+        problems = get_validation_engine().problems_for(window.selected_map, window.difficulty)
+        window.problem_cells = [cell for message, cell in problems]
+        if window.problem_cell not in window.problem_cells:
+            window.problem_cell = None
+        
+        window.problems_listbox.delete(0, tk.END)
+        for message, cell in problems:
+            window.problems_listbox.insert(tk.END, message)
+        
+        if problems:
+            window.validation_label.config(text=f"⚠ WARNING: {len(problems)} problem(s) on this map")
+        else:
+            window.validation_label.config(text="")
+    except Exception as e:
+        logging.error(f"Error updating problems list: {e}")
+
+def on_problem_select(event, window):
+    """Highlight the cell of the selected problem"""
+    selection = window.problems_listbox.curselection()
+    window.problem_cell = window.problem_cells[selection[0]] if selection else None
+    render_map_view(window)
+
 def update_map_config_display(window):
     """Update map config display"""
     try:
@@ -4100,6 +3233,7 @@ def update_map_config_display(window):
 def update_tile_info(window):
     """Update selected tile info"""
     try:
+        update_where_used(window)
         if window.selected_object_type:
             # Show the marker tile for the selected object type
             marker_tiles = {
@@ -4273,17 +3407,8 @@ def rebuild_ui_graphic_display(window):
     palette_idx = window._palette_dropdown.current()
     palette = window.palettes[palette_idx]  # Use window-local palette
     
-    # Extract pixels
-    rom_data = rom_cache[config['rom']]
-    pixels = extract_pixels(rom_data, config['offset'], 
-                           height=config['height'], 
-                           width=config['width'],
-                           mode=config['mode'],
-                           bytes_per_row=config.get('bytes_per_row'))
-    
-    # Rotate if needed
-    if config.get('rotate'):
-        pixels = np.rot90(pixels, k=1)
+    # Decoded (and rotated) pixels from the shared asset store
+    pixels = get_asset_store().get('ui', graphic_name)
     
     # Apply palette
     color_sprite = apply_palette_to_tile(pixels, palette)
@@ -4429,17 +3554,8 @@ def rebuild_treasure_display(window):
     palette_idx = window._palette_dropdown.current()
     palette = window.palettes[palette_idx]  # Use window-local palette
     
-    # Extract pixels
-    rom_data = rom_cache[config['rom']]
-    pixels = extract_pixels(rom_data, config['offset'], 
-                           height=config['height'], 
-                           width=config['width'],
-                           mode=config['mode'],
-                           bytes_per_row=config.get('bytes_per_row'))
-    
-    # Rotate if needed
-    if config.get('rotate'):
-        pixels = np.rot90(pixels, k=1)
+    # Decoded (and rotated) pixels from the shared asset store
+    pixels = get_asset_store().get('treasure', treasure_name)
     
     # Apply palette
     color_sprite = apply_palette_to_tile(pixels, palette)
@@ -4892,21 +4008,6 @@ def update_high_score_entry(index, score_var, name_var, stage_var, window):
     except ValueError:
         messagebox.showwarning("Invalid Input", "Please enter valid numbers")
 
-def sync_high_score(high_scores):
-    """Sync HIGH SCORE with highest ranked score"""
-    if len(high_scores) < 2:
-        return
-    max_score = max(bcd_to_int(entry['score']) for entry in high_scores[1:])
-    high_scores[0]['score'] = int_to_bcd(max_score)
-
-def sort_high_scores(high_scores):
-    """Sort high scores in descending order"""
-    ranked_entries = high_scores[1:]
-    ranked_entries.sort(key=lambda x: bcd_to_int(x['score']), reverse=True)
-    high_scores[1:] = ranked_entries
-    return high_scores
-
-
 def reset_high_scores(window):
     """Reset high scores to defaults"""
     if not messagebox.askyesno("Confirm Reset", 
@@ -4989,7 +4090,7 @@ def rebuild_palette_grid(window):
     for widget in content_frame.winfo_children():
         widget.destroy()
     
-    palettes = load_palettes_from_rom()
+    palettes = get_asset_store().view('palette')
     
     # Build each palette row
     for pal_idx, pal_name in enumerate(PALETTE_NAMES):
@@ -5039,8 +4140,7 @@ def build_palette_row(window, parent, palettes, palette_idx, palette_name):
 
 def edit_palette_color(window, palette_idx, color_idx):
     """Open color editor dialog for a specific palette color"""
-    palettes = load_palettes_from_rom()
-    palette = palettes[palette_idx]
+    palette = get_asset_store().get('palette', palette_idx)
     
     # Get current RGB values
     r, g, b = palette[color_idx][1], palette[color_idx][2], palette[color_idx][3]
@@ -5170,11 +4270,12 @@ def apply_palette_color(window, dialog, palette_idx, color_idx, red_var, green_v
         palette_offset = PALETTE_FILE_OFFSETS[palette_idx]
         palette_byte = encode_palette_byte(r, g, b)
         rom_cache[ROM_CONFIG['palette_rom']][palette_offset + color_idx] = palette_byte
+        get_asset_store().invalidate_rom_range(ROM_CONFIG['palette_rom'], palette_offset + color_idx,
+                                               palette_offset + color_idx + 1)
         
         dialog.destroy()
         
-        # Reload this window's palette data
-        window.palettes = load_palettes_from_rom()
+        # This window's palette view picks up the change
         rebuild_palette_grid(window)
         
         window.pal_status_label.config(text=f"Updated {PALETTE_NAMES[palette_idx]} color {color_idx}")
@@ -5217,10 +4318,518 @@ def reset_palettes(window):
         offset = PALETTE_FILE_OFFSETS[pal_idx]
         for color_idx, byte_val in enumerate(palette_bytes):
             rom_data[offset + color_idx] = byte_val
+        get_asset_store().invalidate_rom_range(ROM_CONFIG['palette_rom'], offset, offset + len(palette_bytes))
     
     rebuild_palette_grid(window)
     window.pal_status_label.config(text="Restored factory default palettes")
 
+#########################################
+# Animation Viewer Functions
+#########################################
+
+def build_animation_window(window):
+    """Animation list on the left, player, frame strip and controls on the right"""
+    main_frame = ttk.Frame(window, padding=5)
+    main_frame.pack(fill=tk.BOTH, expand=True)
+    
+    list_frame = ttk.Frame(main_frame)
+    list_frame.pack(side=tk.LEFT, fill=tk.Y)
+    window.anim_list = tk.Listbox(list_frame, width=38, exportselection=False)
+    for table in window.anim_tables:
+        window.anim_list.insert(tk.END, f"{table['rom']} 0x{table['start']:03X}  {table['name']}")
+    list_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=window.anim_list.yview)
+    window.anim_list.config(yscrollcommand=list_scroll.set)
+    window.anim_list.pack(side=tk.LEFT, fill=tk.Y)
+    list_scroll.pack(side=tk.LEFT, fill=tk.Y)
+    window.anim_list.bind("<<ListboxSelect>>",
+                          lambda e: select_animation(window, window.anim_list.curselection()[0])
+                          if window.anim_list.curselection() else None)
+    
+    right_frame = ttk.Frame(main_frame, padding=(10, 0))
+    right_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    
+    controls = ttk.Frame(right_frame)
+    controls.pack(fill=tk.X)
+    ttk.Label(controls, text="Palette:").pack(side=tk.LEFT)
+    window.anim_palette_var = ttk.Combobox(controls, values=PALETTE_NAMES, state="readonly", width=14)
+    window.anim_palette_var.current(0)
+    window.anim_palette_var.pack(side=tk.LEFT, padx=5)
+    window.anim_palette_var.bind("<<ComboboxSelected>>",
+                                 lambda e: (render_animation_strip(window), show_animation_frame(window)))
+    window.anim_playing = tk.BooleanVar(value=True)
+    ttk.Checkbutton(controls, text="Play", variable=window.anim_playing).pack(side=tk.LEFT, padx=5)
+    ttk.Label(controls, text="Slow-down:").pack(side=tk.LEFT, padx=(10, 0))
+    window.anim_slowdown = tk.IntVar(value=8)
+    ttk.Spinbox(controls, from_=1, to=60, width=4, textvariable=window.anim_slowdown).pack(side=tk.LEFT, padx=5)
+    
+    size = 16 * ANIM_SCALE
+    window.anim_canvas = tk.Canvas(right_frame, width=size, height=size, bg='black', highlightthickness=0)
+    window.anim_canvas.pack(pady=10)
+    window.anim_strip = tk.Canvas(right_frame, height=16 * ANIM_STRIP_SCALE + 24, bg='gray20', highlightthickness=0)
+    window.anim_strip.pack(fill=tk.X)
+    window.anim_status_label = ttk.Label(right_frame, text="", relief=tk.SUNKEN, anchor=tk.W)
+    window.anim_status_label.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+
+def select_animation(window, index):
+    """Show an animation from the start"""
+    window.anim_table = window.anim_tables[index]
+    window.anim_frames = decode_animation(window.anim_table)
+    window.anim_step = 0
+    window.anim_ticks_left = 0
+    header, footer = animation_header(window.anim_table)
+    window.anim_status_label.config(
+        text=f"{window.anim_table['name']}: {len(window.anim_frames)} frames, "
+             f"{animation_duration_ms(window.anim_frames):.0f} ms per loop in game - "
+             f"header {header.hex(' ').upper()}, end {footer.hex(' ').upper()}")
+    render_animation_strip(window)
+    show_animation_frame(window)
+
+def animation_photo(window, tile, scale):
+    """A frame's PhotoImage, rendered from the shared tile cache on first use"""
+    palette_idx = window.anim_palette_var.current()
+    key = (tile, palette_idx, scale)
+    photo = window.anim_photos.get(key)
+    if photo is None:
+        rgba = apply_palette_to_tile(window.tiles[tile], window.palettes[palette_idx])
+        large = np.repeat(np.repeat(rgba, scale, axis=0), scale, axis=1)
+        photo = window.anim_photos[key] = ImageTk.PhotoImage(Image.fromarray(large.astype('uint8'), 'RGBA'))
+    return photo
+
+def drop_animation_photos(window, stale):
+    """Forget only the rendered frames a tile or palette change affects"""
+    for key in [key for key in window.anim_photos if stale(key)]:
+        del window.anim_photos[key]
+
+def render_animation_strip(window):
+    """Every frame of the animation side by side, the playing one outlined"""
+    window.anim_strip.delete("all")
+    size = 16 * ANIM_STRIP_SCALE
+    for step, (tile, attribute, _) in enumerate(window.anim_frames):
+        x = 4 + step * (size + 8)
+        if tile is not None:
+            window.anim_strip.create_image(x, 4, image=animation_photo(window, tile, ANIM_STRIP_SCALE), anchor='nw')
+        label = f"{tile:02X}/{attribute:02X}" if tile is not None else f"??/{attribute:02X}"
+        window.anim_strip.create_text(x + size // 2, size + 14, text=label, fill='white', font=('Courier', 8))
+        window.anim_strip.create_rectangle(x - 2, 2, x + size + 1, size + 5, outline='', tags=f"step{step}")
+
+def show_animation_frame(window):
+    """Draw the current step in the player and move the strip's outline to it"""
+    window.anim_canvas.delete("all")
+    for step in range(len(window.anim_frames)):
+        window.anim_strip.itemconfig(f"step{step}", outline='yellow' if step == window.anim_step else '')
+    if not window.anim_frames:
+        return
+    tile = window.anim_frames[window.anim_step][0]
+    if tile is None:
+        size = 16 * ANIM_SCALE
+        window.anim_canvas.create_text(size // 2, size // 2, text="?", fill='red', font=('Arial', 24))
+    else:
+        window.anim_canvas.create_image(0, 0, image=animation_photo(window, tile, ANIM_SCALE), anchor='nw')
+
+def tick_animation(window):
+    """One game frame: advance when the current tile's frames (times the slow-down) are up
+    
+    The table is re-read at the start of every loop, so edits made elsewhere
+    (hex viewer, reloads) show up on the next pass.
+    """
+    if window.anim_playing.get() and window.anim_frames:
+        window.anim_ticks_left -= 1
+        if window.anim_ticks_left <= 0:
+            window.anim_step = (window.anim_step + 1) % len(window.anim_frames)
+            if window.anim_step == 0:
+                frames = decode_animation(window.anim_table)
+                if frames != window.anim_frames:
+                    window.anim_frames = frames
+                    render_animation_strip(window)
+            try:
+                slowdown = max(1, window.anim_slowdown.get())
+            except tk.TclError:
+                slowdown = 1  # Spinbox being typed into
+            window.anim_ticks_left = window.anim_frames[window.anim_step][2] * slowdown
+            show_animation_frame(window)
+    window.anim_after = window.after(ANIM_TICK_MS, tick_animation, window)
+
+#########################################
+# Hex Viewer Functions
+#########################################
+
+def build_hex_window(window):
+    """Build the hex viewer interface"""
+    main_frame = ttk.Frame(window, padding=10)
+    main_frame.pack(fill=tk.BOTH, expand=True)
+    
+    # ROM selection and goto
+    top_frame = ttk.Frame(main_frame)
+    top_frame.pack(fill=tk.X, pady=5)
+    
+    ttk.Label(top_frame, text="ROM").pack(side=tk.LEFT, padx=5)
+    window.hex_rom_var = tk.StringVar(value=window.hex_rom)
+    rom_combo = ttk.Combobox(top_frame, textvariable=window.hex_rom_var, values=list(rom_cache),
+                             state="readonly", width=8)
+    rom_combo.pack(side=tk.LEFT, padx=5)
+    rom_combo.bind("<<ComboboxSelected>>", lambda e: select_hex_rom(window, window.hex_rom_var.get()))
+    
+    ttk.Label(top_frame, text="Go to (offset or region)").pack(side=tk.LEFT, padx=5)
+    window.hex_goto_var = tk.StringVar()
+    goto_entry = ttk.Entry(top_frame, textvariable=window.hex_goto_var, width=30)
+    goto_entry.pack(side=tk.LEFT, padx=5)
+    goto_entry.bind("<Return>", lambda e: goto_hex(window))
+    ttk.Button(top_frame, text="Close", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    # Rows are drawn on a canvas from a fixed item pool - only the visible ones exist
+    view_frame = ttk.Frame(main_frame)
+    view_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+    window.hex_canvas = tk.Canvas(view_frame, bg='white', highlightthickness=1, takefocus=1)
+    window.hex_scrollbar = ttk.Scrollbar(view_frame, orient=tk.VERTICAL,
+                                         command=lambda *args: scroll_hex(window, *args))
+    window.hex_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    window.hex_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    
+    window.hex_canvas.bind("<Configure>", lambda e: layout_hex_rows(window))
+    window.hex_canvas.bind("<Button-1>", lambda e: on_hex_click(window, e))
+    window.hex_canvas.bind("<Motion>", lambda e: on_hex_hover(window, e))
+    window.hex_canvas.bind("<Key>", lambda e: on_hex_key(window, e))
+    window.hex_canvas.bind("<MouseWheel>", lambda e: scroll_hex(window, 'scroll', -3 if e.delta > 0 else 3, 'units'))
+    window.hex_canvas.bind("<Button-4>", lambda e: scroll_hex(window, 'scroll', -3, 'units'))
+    window.hex_canvas.bind("<Button-5>", lambda e: scroll_hex(window, 'scroll', 3, 'units'))
+    
+    window.hex_status_label = ttk.Label(main_frame, text="Click a byte, then type hex digits to change it",
+                                        relief=tk.SUNKEN, anchor=tk.W)
+    window.hex_status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=2)
+
+def select_hex_rom(window, rom_name):
+    """Show a ROM, with its bytes colored by MemoryMap region"""
+    window.hex_rom = rom_name
+    window.hex_top_row = 0
+    window.hex_cursor = 0
+    window.hex_nibble = None
+    
+    # Region row per byte, looked up once per ROM; color alternates between neighbors
+    memory_map = get_memory_map()
+    window.hex_regions = memory_map.rows_at(rom_name, np.arange(len(rom_cache[rom_name])))
+    colors = []
+    for row in np.unique(window.hex_regions):
+        if row < 0:
+            continue
+        color = HEX_REGION_COLORS[len(colors) % len(HEX_REGION_COLORS)]
+        if memory_map.descriptions[row].startswith("Unknown"):
+            color = HEX_UNKNOWN_COLOR
+        colors.append((row, color))
+    window.hex_colors = dict(colors)
+    render_hex_rows(window)
+
+def hex_row_count(window):
+    """Total rows in the current ROM"""
+    return -(-len(rom_cache[window.hex_rom]) // HEX_BYTES_PER_ROW)
+
+def layout_hex_rows(window):
+    """(Re)build the canvas item pool to fit the visible rows"""
+    canvas = window.hex_canvas
+    canvas.delete('all')
+    window.hex_items = []
+    visible = max(1, canvas.winfo_height() // HEX_ROW_HEIGHT)
+    hex_x = 7 * HEX_CHAR_WIDTH
+    ascii_x = hex_x + HEX_BYTES_PER_ROW * 3 * HEX_CHAR_WIDTH + 2 * HEX_CHAR_WIDTH
+    
+    for i in range(visible):
+        y = i * HEX_ROW_HEIGHT + 2
+        row_items = {'address': canvas.create_text(4, y, anchor=tk.NW, font=('Courier', 10), fill='#808080'),
+                     'cells': [], 'bytes': [],
+                     'ascii': canvas.create_text(ascii_x, y, anchor=tk.NW, font=('Courier', 10))}
+        for col in range(HEX_BYTES_PER_ROW):
+            x = hex_x + col * 3 * HEX_CHAR_WIDTH
+            row_items['cells'].append(canvas.create_rectangle(x - 2, y - 1, x + 2 * HEX_CHAR_WIDTH + 2,
+                                                              y + HEX_ROW_HEIGHT - 3, outline='', fill=''))
+            row_items['bytes'].append(canvas.create_text(x, y, anchor=tk.NW, font=('Courier', 10)))
+        window.hex_items.append(row_items)
+    render_hex_rows(window)
+
+def render_hex_rows(window, rows=None):
+    """Draw ROM rows into the item pool - all visible rows, or just the given ones"""
+    if not window.hex_items:
+        return
+    data = rom_cache[window.hex_rom]
+    top = window.hex_top_row
+    if rows is None:
+        rows = range(top, top + len(window.hex_items))
+        window.hex_shown = {}
+    
+    canvas = window.hex_canvas
+    for row in rows:
+        items = window.hex_items[row - top]
+        start = row * HEX_BYTES_PER_ROW
+        chunk = bytes(data[start:start + HEX_BYTES_PER_ROW])
+        window.hex_shown[row] = chunk
+        canvas.itemconfig(items['address'], text=f"{start:04X}" if chunk else "")
+        canvas.itemconfig(items['ascii'], text="".join(chr(b) if 0x20 <= b < 0x7F else '.' for b in chunk))
+        for col in range(HEX_BYTES_PER_ROW):
+            offset = start + col
+            if col < len(chunk):
+                fill = window.hex_colors.get(window.hex_regions[offset], '')
+                if offset == window.hex_cursor:
+                    fill = HEX_CURSOR_COLOR
+                canvas.itemconfig(items['bytes'][col], text=f"{chunk[col]:02X}")
+                canvas.itemconfig(items['cells'][col], fill=fill)
+            else:
+                canvas.itemconfig(items['bytes'][col], text="")
+                canvas.itemconfig(items['cells'][col], fill='')
+    
+    total = hex_row_count(window)
+    window.hex_scrollbar.set(top / total, min(1.0, (top + len(window.hex_items)) / total))
+
+def scroll_hex(window, *args):
+    """Scrollbar / mouse wheel handler - moves the first visible row"""
+    max_top = max(0, hex_row_count(window) - len(window.hex_items))
+    if args[0] == 'moveto':
+        top = int(float(args[1]) * hex_row_count(window))
+    elif args[2] == 'pages':
+        top = window.hex_top_row + int(args[1]) * len(window.hex_items)
+    else:
+        top = window.hex_top_row + int(args[1])
+    top = min(max(0, top), max_top)
+    if top != window.hex_top_row:
+        window.hex_top_row = top
+        render_hex_rows(window)
+
+def hex_offset_at(window, x, y):
+    """ROM offset under a canvas point, or None"""
+    hex_x = 7 * HEX_CHAR_WIDTH
+    col = (x - hex_x + HEX_CHAR_WIDTH // 2) // (3 * HEX_CHAR_WIDTH)
+    row = window.hex_top_row + y // HEX_ROW_HEIGHT
+    offset = row * HEX_BYTES_PER_ROW + col
+    if x < hex_x - 2 or not 0 <= col < HEX_BYTES_PER_ROW or offset >= len(rom_cache[window.hex_rom]):
+        return None
+    return offset
+
+def describe_hex_offset(window, offset):
+    """Status text for a byte: offset, value and MemoryMap region"""
+    value = rom_cache[window.hex_rom][offset]
+    text = f"{window.hex_rom} 0x{offset:04X} = 0x{value:02X} ({value})"
+    region = get_memory_map().region_at(window.hex_rom, offset)
+    if region:
+        text += f"  -  {region[3]} [0x{region[1]:04X}-0x{region[2]:04X}]"
+        if region[4]:
+            text += f"  {region[4]}"
+    return text
+
+def on_hex_hover(window, event):
+    """Show the region under the mouse"""
+    offset = hex_offset_at(window, event.x, event.y)
+    if offset is not None:
+        window.hex_status_label.config(text=describe_hex_offset(window, offset))
+
+def move_hex_cursor(window, offset):
+    """Move the edit cursor, scrolling it into view"""
+    offset = min(max(0, offset), len(rom_cache[window.hex_rom]) - 1)
+    old_row = window.hex_cursor // HEX_BYTES_PER_ROW
+    window.hex_cursor = offset
+    window.hex_nibble = None
+    
+    row = offset // HEX_BYTES_PER_ROW
+    if row < window.hex_top_row or row >= window.hex_top_row + len(window.hex_items):
+        window.hex_top_row = max(0, min(row - len(window.hex_items) // 2,
+                                        hex_row_count(window) - len(window.hex_items)))
+        render_hex_rows(window)
+    else:
+        visible = range(window.hex_top_row, window.hex_top_row + len(window.hex_items))
+        render_hex_rows(window, [r for r in {old_row, row} if r in visible])
+    window.hex_status_label.config(text=describe_hex_offset(window, offset))
+
+def on_hex_click(window, event):
+    """Select a byte for editing"""
+    window.hex_canvas.focus_set()
+    offset = hex_offset_at(window, event.x, event.y)
+    if offset is not None:
+        move_hex_cursor(window, offset)
+
+def on_hex_key(window, event):
+    """Hex digits edit the selected byte (high then low nibble), arrows move"""
+    moves = {'Left': -1, 'Right': 1, 'Up': -HEX_BYTES_PER_ROW, 'Down': HEX_BYTES_PER_ROW}
+    if event.keysym in moves:
+        move_hex_cursor(window, window.hex_cursor + moves[event.keysym])
+        return
+    if event.keysym == 'Escape':
+        window.hex_nibble = None
+        return
+    
+    digit = event.char.upper()
+    if len(digit) != 1 or digit not in "0123456789ABCDEF":
+        return
+    if window.hex_nibble is None:
+        window.hex_nibble = int(digit, 16)
+        window.hex_status_label.config(text=f"0x{window.hex_cursor:04X} = {digit}_")
+        return
+    
+    value = window.hex_nibble << 4 | int(digit, 16)
+    poke_rom_byte(window.hex_rom, window.hex_cursor, value)
+    mark_modified(window)
+    move_hex_cursor(window, window.hex_cursor + 1)
+
+def poke_rom_byte(rom_name, offset, value):
+    """Write one raw byte, keeping the caches derived from that ROM in step"""
+    global GLOBAL_MODIFIED
+    
+    if rom_name == ROM_CONFIG['visual_map_rom'] and offset < num_maps * visual_map_size:
+        # Map tiles go through the map write path (teleporter table, validation)
+        map_idx, byte_index = divmod(offset, visual_map_size)
+        col, flipped_row = divmod(byte_index, map_height)
+        write_visual_tile_to_cache(map_idx, map_height - 1 - flipped_row, col, value)
+        trigger_callback('map_changed', map_idx)
+    else:
+        # Same invalidation and events as a file changed on disk (tiles, fonts, palettes, object blocks)
+        rom_cache[rom_name][offset] = value
+        notify_rom_change(rom_name, offset, offset + 1)
+    
+    GLOBAL_MODIFIED = True
+    logging.info(f"Poked {rom_name} 0x{offset:04X} = 0x{value:02X}")
+
+def goto_hex(window):
+    """Jump to a hex offset (e.g. 4A0 or 0xA4A0) or a MemoryMap region name"""
+    target = window.hex_goto_var.get().strip()
+    if not target:
+        return
+    try:
+        offset = int(target, 16) % 0x1000
+    except ValueError:
+        matches = [row for row, description in enumerate(get_memory_map().descriptions)
+                   if target.lower() in description.lower()]
+        if not matches:
+            window.hex_status_label.config(text=f"No region matches '{target}'")
+            return
+        rom_name, offset, _, _, _ = get_memory_map().region(matches[0])
+        if rom_name != window.hex_rom and rom_name in rom_cache:
+            window.hex_rom_var.set(rom_name)
+            select_hex_rom(window, rom_name)
+    move_hex_cursor(window, offset)
+    window.hex_canvas.focus_set()
+
+def poll_hex_changes(window):
+    """Redraw only the visible rows whose bytes changed since they were drawn"""
+    try:
+        if not window.winfo_exists():
+            return
+    except tk.TclError:
+        return
+    
+    data = rom_cache.get(window.hex_rom)
+    if data is not None:
+        changed = [row for row, shown in window.hex_shown.items()
+                   if data[row * HEX_BYTES_PER_ROW:row * HEX_BYTES_PER_ROW + HEX_BYTES_PER_ROW] != shown]
+        if changed:
+            render_hex_rows(window, changed)
+    window.after(HEX_REFRESH_MS, lambda: poll_hex_changes(window))
+
+#########################################
+# ROM Diff Functions
+#########################################
+
+def build_rom_diff_window(window):
+    """Build the ROM diff interface"""
+    main_frame = ttk.Frame(window, padding=10)
+    main_frame.pack(fill=tk.BOTH, expand=True)
+    
+    # Comparison selection
+    sources = [DIFF_LOADED, DIFF_CURRENT] + list(ROM_SETS)
+    select_frame = ttk.Frame(main_frame)
+    select_frame.pack(fill=tk.X, pady=5)
+    
+    window.diff_old_var = tk.StringVar(value=DIFF_LOADED)
+    window.diff_new_var = tk.StringVar(value=DIFF_CURRENT)
+    window.diff_live_var = tk.BooleanVar(value=True)
+    
+    ttk.Label(select_frame, text="Compare").pack(side=tk.LEFT, padx=5)
+    old_combo = ttk.Combobox(select_frame, textvariable=window.diff_old_var, values=sources,
+                             state="readonly", width=26)
+    old_combo.pack(side=tk.LEFT, padx=5)
+    ttk.Label(select_frame, text="with").pack(side=tk.LEFT, padx=5)
+    new_combo = ttk.Combobox(select_frame, textvariable=window.diff_new_var, values=sources,
+                             state="readonly", width=26)
+    new_combo.pack(side=tk.LEFT, padx=5)
+    for combo in (old_combo, new_combo):
+        combo.bind("<<ComboboxSelected>>", lambda e: refresh_rom_diff(window, force=True))
+    
+    ttk.Checkbutton(select_frame, text="Live", variable=window.diff_live_var).pack(side=tk.LEFT, padx=10)
+    ttk.Button(select_frame, text="Close", command=window.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    # Changed runs
+    tree_frame = ttk.Frame(main_frame)
+    tree_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+    
+    columns = ('rom', 'range', 'size', 'region')
+    window.diff_tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
+    for column, heading, width in [('rom', "ROM", 70), ('range', "File Offsets", 120),
+                                   ('size', "Bytes", 60), ('region', "MemoryMap Region", 600)]:
+        window.diff_tree.heading(column, text=heading)
+        window.diff_tree.column(column, width=width, stretch=(column == 'region'))
+    scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=window.diff_tree.yview)
+    window.diff_tree.configure(yscrollcommand=scrollbar.set)
+    window.diff_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    window.diff_tree.bind("<<TreeviewSelect>>", lambda e: show_rom_diff_bytes(window))
+    
+    window.diff_status_label = ttk.Label(main_frame, text="", relief=tk.SUNKEN, anchor=tk.W)
+    window.diff_status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=2)
+
+def rom_diff_source(window, name):
+    """{rom: bytes} for one side of the comparison"""
+    if name == DIFF_CURRENT:
+        return rom_cache
+    if name == DIFF_LOADED:
+        return roms.original_rom_cache
+    if name not in window.zip_sets:
+        window.zip_sets[name] = read_rom_set(name)
+    return window.zip_sets[name]
+
+def refresh_rom_diff(window, force=False):
+    """Re-diff and redraw the run list if it changed - reschedules itself while live"""
+    try:
+        if not window.winfo_exists():
+            return
+    except tk.TclError:
+        return
+    
+    try:
+        old = rom_diff_source(window, window.diff_old_var.get())
+        new = rom_diff_source(window, window.diff_new_var.get())
+        start = time.perf_counter()
+        runs = diff_rom_sets(old, new)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    except Exception as e:
+        logging.error(f"Error diffing ROMs: {e}")
+        window.diff_status_label.config(text=f"Can't compare: {e}")
+        runs, elapsed_ms = [], 0
+    
+    if force or runs != window.runs:
+        window.runs = runs
+        window.diff_tree.delete(*window.diff_tree.get_children())
+        for i, run in enumerate(runs):
+            window.diff_tree.insert('', tk.END, iid=str(i), values=(
+                run['rom'], f"0x{run['start']:04X}-0x{run['end'] - 1:04X}", run['size'],
+                describe_regions(run['regions'])))
+        total = sum(run['size'] for run in runs)
+        window.diff_status_label.config(
+            text=f"{len(runs)} changed runs, {total} bytes ({elapsed_ms:.1f} ms)")
+    
+    # Only the live ROM cache can change underneath the window
+    if window.diff_live_var.get() and DIFF_CURRENT in (window.diff_old_var.get(), window.diff_new_var.get()):
+        if getattr(window, '_diff_after', None):
+            window.after_cancel(window._diff_after)
+        window._diff_after = window.after(DIFF_REFRESH_MS, lambda: refresh_rom_diff(window))
+
+def show_rom_diff_bytes(window):
+    """Show the old and new bytes of the selected run in the status bar"""
+    selection = window.diff_tree.selection()
+    if not selection:
+        return
+    run = window.runs[int(selection[0])]
+    old = rom_diff_source(window, window.diff_old_var.get())[run['rom']][run['start']:run['end']]
+    new = rom_diff_source(window, window.diff_new_var.get())[run['rom']][run['start']:run['end']]
+    limit = 16
+    more = " ..." if run['size'] > limit else ""
+    window.diff_status_label.config(text=f"{run['rom']} 0x{run['start']:04X}: "
+                                    f"{bytes(old[:limit]).hex(' ').upper()}{more} -> "
+                                    f"{bytes(new[:limit]).hex(' ').upper()}{more}")
+
 #########################################
 # About Menu Functions
 #########################################
@@ -5254,108 +4863,163 @@ def show_about():
         f"- Tutankham speedrunning and high-score community"
     )
 
-#########################################
-# Initialize Main TK Window
-#########################################
-
-root = tk.Tk()
-root.title(f"Tutankham ROM Editor {EDITOR_VERSION}")
-root.geometry("400x300")
-root.protocol("WM_DELETE_WINDOW", on_quit)
-
-#########################################
-# Create Dropdown Menus
-#########################################
-
-menubar = tk.Menu(root)
-# --- File Menu ---
-filemenu = tk.Menu(menubar, tearoff=False)
-filemenu.add_command(label="-- File Operations --", state="disabled")
-filemenu.add_separator()
-filemenu.add_command(label="-- Loading --", state="disabled")
-filemenu.add_command(label="Reload Original ROMs From Zip", 
-                    command=lambda: load_all("Zip"))
-filemenu.add_command(label="Open ROMs From Current Directory", 
-                    command=lambda: load_all(None))
-filemenu.add_command(label="Open ROMs From Folder", 
-                    command=lambda: load_all("Folder"))
-filemenu.add_separator()
-filemenu.add_command(label="-- Saving --", state="disabled")
-filemenu.add_command(label="Save ROMs", 
-                    command=lambda: save_roms(None))
-filemenu.add_command(label="Save ROMs To Folder", 
-                    command=lambda: save_roms_to_folder())
-filemenu.add_separator()
-filemenu.add_command(label="Exit", command=on_quit)
-menubar.add_cascade(label="File", menu=filemenu)
-# --- Editor Menu ---
-editormenu = tk.Menu(menubar, tearoff=False)
-editormenu.add_command(label="-- Map Editor --", state="disabled")
-editormenu.add_command(label="Edit Maps", command=launch_map_editor)
-editormenu.add_separator()
-editormenu.add_command(label="-- Tile / Graphics Editor --", state="disabled")
-editormenu.add_command(label="Edit Tiles", command=launch_tile_editor)
-editormenu.add_command(label="Edit Fonts", command=launch_font_editor)
-editormenu.add_command(label="Edit UI Graphics", command=launch_ui_graphics_editor)
-editormenu.add_command(label="Edit Treasures", command=launch_treasure_editor)
-editormenu.add_separator()
-editormenu.add_command(label="-- Data Editor --", state="disabled")
-editormenu.add_command(label="High Scores", command=launch_high_score_editor)
-editormenu.add_command(label="Palette", command=launch_palette_editor)
-menubar.add_cascade(label="Editors", menu=editormenu)
-# --- Help Menu ---
-helpmenu = tk.Menu(menubar, tearoff=False)
-helpmenu.add_command(label="About", 
-                    command=lambda: show_about())
-menubar.add_cascade(label="Help", menu=helpmenu)
-
 #########################################
 # Main Code
 #########################################
 
-root.config(menu=menubar)				                # Attach to window
 all_tiles = all_fonts = None                            # Initialize Global Variables
 visual_maps = logical_maps = None		                # Initialize Global Variables
 palettes = high_scores = None			                # Initialize Global Variables
-load_all("Zip")						                    # Load initial data from zip
-create_window_icon(root)                                # Create Window Icon
-
-# Add a status label to main window
-status_frame = ttk.Frame(root)
-status_frame.pack(side=tk.BOTTOM, fill=tk.X)
-status_label = ttk.Label(status_frame, text="Ready - Select an editor from the menu", 
-                        relief=tk.SUNKEN, anchor=tk.W)
-status_label.pack(fill=tk.X, padx=5, pady=2)
-
-# Add a welcome message to main window
-welcome_frame = ttk.Frame(root, padding=20)
-welcome_frame.pack(expand=True)
+root = status_label = digest_label = None               # Created by main()
+playtest_process = emulator_command = None              # Last playtest's emulator, command set from the menu
 
-ttk.Label(welcome_frame, text=f"Tutankham ROM Editor {EDITOR_VERSION}", 
-         font=('Arial', 18, 'bold')).pack(pady=10)
+def main(benchmark=False):
+    """Create the main Tk window, load the ROMs and run the editor
+    
+    Args:
+        benchmark: Quit as soon as the ROMs are loaded and report the startup
+                   times against STARTUP_BUDGET_MS (--startup-benchmark)
+    
+    Returns:
+        Exit code
+    """
+    global root, status_label, digest_label
+    
+    # Initialize Main TK Window
+    root = tk.Tk()
+    root.title(f"Tutankham ROM Editor {EDITOR_VERSION}")
+    root.geometry("400x300")
+    root.protocol("WM_DELETE_WINDOW", on_quit)
+    
+    # Create Dropdown Menus
+    menubar = tk.Menu(root)
+    # --- File Menu ---
+    filemenu = tk.Menu(menubar, tearoff=False)
+    filemenu.add_command(label="-- File Operations --", state="disabled")
+    filemenu.add_separator()
+    filemenu.add_command(label="-- Loading --", state="disabled")
+    filemenu.add_command(label="Reload Original ROMs From Zip", 
+                        command=lambda: load_all("Zip"))
+    filemenu.add_command(label="Open ROMs From Current Directory", 
+                        command=lambda: load_all(None))
+    filemenu.add_command(label="Open ROMs From Folder", 
+                        command=lambda: load_all("Folder"))
+    filemenu.add_command(label="Open ROMs From Folder (Edit In Place)", 
+                        command=lambda: load_all("In-Place Folder"))
+    filemenu.add_separator()
+    filemenu.add_command(label="-- Saving --", state="disabled")
+    filemenu.add_command(label="Save ROMs", 
+                        command=lambda: save_roms(None))
+    filemenu.add_command(label="Save ROMs To Folder", 
+                        command=lambda: save_roms_to_folder())
+    filemenu.add_separator()
+    filemenu.add_command(label="Save Patches (IPS)", 
+                        command=lambda: save_patches('.ips'))
+    filemenu.add_command(label="Save Patches (BPS)", 
+                        command=lambda: save_patches('.bps'))
+    filemenu.add_command(label="Apply Patches", 
+                        command=lambda: apply_patches_from_files())
+    filemenu.add_command(label="-- Export --", state="disabled")
+    filemenu.add_command(label="Export Sprite Sheets (PNG)", 
+                        command=lambda: export_sheets_to_folder())
+    filemenu.add_command(label="Import Sprite Sheet (PNG)", 
+                        command=lambda: import_sheet_from_file())
+    filemenu.add_command(label="Export Maps (PNG + Level Files)", 
+                        command=lambda: export_maps_to_folder())
+    filemenu.add_command(label="Import Level File", 
+                        command=lambda: import_level_from_file())
+    filemenu.add_separator()
+    filemenu.add_command(label="Exit", command=on_quit)
+    menubar.add_cascade(label="File", menu=filemenu)
+    # --- Editor Menu ---
+    editormenu = tk.Menu(menubar, tearoff=False)
+    editormenu.add_command(label="-- Map Editor --", state="disabled")
+    editormenu.add_command(label="Edit Maps", command=launch_map_editor)
+    editormenu.add_separator()
+    editormenu.add_command(label="-- Tile / Graphics Editor --", state="disabled")
+    editormenu.add_command(label="Edit Tiles", command=launch_tile_editor)
+    editormenu.add_command(label="Edit Fonts", command=launch_font_editor)
+    editormenu.add_command(label="Edit UI Graphics", command=launch_ui_graphics_editor)
+    editormenu.add_command(label="Edit Treasures", command=launch_treasure_editor)
+    editormenu.add_separator()
+    editormenu.add_command(label="-- Data Editor --", state="disabled")
+    editormenu.add_command(label="High Scores", command=launch_high_score_editor)
+    editormenu.add_command(label="Palette", command=launch_palette_editor)
+    editormenu.add_separator()
+    editormenu.add_command(label="-- Tools --", state="disabled")
+    editormenu.add_command(label="ROM Diff", command=launch_rom_diff)
+    editormenu.add_command(label="Hex Viewer", command=launch_hex_viewer)
+    editormenu.add_command(label="Animation Viewer", command=launch_animation_viewer)
+    editormenu.add_command(label="Playtest In Emulator", command=playtest_in_emulator)
+    editormenu.add_command(label="Set Emulator Command", command=set_emulator_command)
+    menubar.add_cascade(label="Editors", menu=editormenu)
+    # --- Help Menu ---
+    helpmenu = tk.Menu(menubar, tearoff=False)
+    helpmenu.add_command(label="About", 
+                        command=lambda: show_about())
+    menubar.add_cascade(label="Help", menu=helpmenu)
+    
+    root.config(menu=menubar)				                # Attach to window
+    root._menubar = menubar
+    root._filemenu = filemenu
+
+    # There is nothing to edit without the zip
+    if not os.path.exists(roms.ROM_ZIP_PATH):
+        messagebox.showerror("Error", f"Zip file not found:\n{roms.ROM_ZIP_PATH}")
+        sys.exit(1)
+
+    # Add a status label to main window
+    status_frame = ttk.Frame(root)
+    status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+    digest_label = ttk.Label(status_frame, text="", relief=tk.SUNKEN, anchor=tk.E, cursor="hand2")
+    digest_label.pack(side=tk.RIGHT, padx=5, pady=2)
+    digest_label.bind("<Button-1>", lambda e: show_rom_digests())
+    status_label = ttk.Label(status_frame, text="Loading ROMs...", 
+                            relief=tk.SUNKEN, anchor=tk.W)
+    status_label.pack(fill=tk.X, padx=5, pady=2)
+
+    # Add a welcome message to main window
+    welcome_frame = ttk.Frame(root, padding=20)
+    welcome_frame.pack(expand=True)
+
+    ttk.Label(welcome_frame, text=f"Tutankham ROM Editor {EDITOR_VERSION}", 
+             font=('Arial', 18, 'bold')).pack(pady=10)
+
+    # ROM set selector
+    romset_frame = ttk.Frame(welcome_frame)
+    romset_frame.pack(pady=10)
+
+    ttk.Label(romset_frame, text="ROM Set:", font=('Arial', 11)).pack(side=tk.LEFT, padx=5)
+
+    rom_set_var = tk.StringVar(value=roms.CURRENT_ROM_SET)
+    rom_set_dropdown = ttk.Combobox(romset_frame,
+                                    textvariable=rom_set_var,
+                                    values=list(ROM_SETS.keys()),
+                                    state="readonly",
+                                    width=20)
+    rom_set_dropdown.pack(side=tk.LEFT, padx=5)
+    rom_set_dropdown.bind("<<ComboboxSelected>>", 
+                         lambda e: switch_rom_set(rom_set_var.get()))
 
-# ROM set selector
-romset_frame = ttk.Frame(welcome_frame)
-romset_frame.pack(pady=10)
+    # Store reference
+    root._rom_set_var = rom_set_var
+    root._rom_set_dropdown = rom_set_dropdown
 
-ttk.Label(romset_frame, text="ROM Set:", font=('Arial', 11)).pack(side=tk.LEFT, padx=5)
+    ttk.Label(welcome_frame, text="Select a function from the menu to begin", 
+             font=('Arial', 12)).pack(pady=5)
+    ttk.Label(welcome_frame, text="Always remember to SAVE your work after editing", 
+             font=('Arial', 12)).pack(pady=5)
 
-rom_set_var = tk.StringVar(value=CURRENT_ROM_SET)
-rom_set_dropdown = ttk.Combobox(romset_frame,
-                                textvariable=rom_set_var,
-                                values=list(ROM_SETS.keys()),
-                                state="readonly",
-                                width=20)
-rom_set_dropdown.pack(side=tk.LEFT, padx=5)
-rom_set_dropdown.bind("<<ComboboxSelected>>", 
-                     lambda e: switch_rom_set(rom_set_var.get()))
+    # Window first, ROMs (and the icon, which needs them) while it's up
+    set_rom_menus_state("disabled")
+    root.after_idle(lambda: mark_startup('window'))
+    load_roms_in_background(lambda error: finish_startup(error, benchmark))
 
-# Store reference
-root._rom_set_var = rom_set_var
+    root.mainloop()
 
-ttk.Label(welcome_frame, text="Select a function from the menu to begin", 
-         font=('Arial', 12)).pack(pady=5)
-ttk.Label(welcome_frame, text="Always remember to SAVE your work after editing", 
-         font=('Arial', 12)).pack(pady=5)
+    if benchmark:
+        return report_startup_benchmark(getattr(root, '_startup_error', None))
+    return 0
 
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main(benchmark="--startup-benchmark" in sys.argv))
@@ -0,0 +1,41 @@
+"""Shared fixtures: a synthetic MAME zip of random ROMs, loaded like the real one"""
+import os
+import random
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tutankham import roms
+
+ROM_SIZE = 0x1000
+MAP_TILES = [0x26, 0x26, 0x26, 0x00, 0x21, 0x6F, 0x22]     # Mostly wall, some floor and items
+
+@pytest.fixture(scope='session')
+def rom_zip(tmp_path_factory):
+    """tutankhm.zip holding every file any ROM set needs, filled with random bytes
+    
+    The visual map ROM gets real map tile ids so the map code sees plausible maps.
+    """
+    rnd = random.Random(1982)
+    names = {os.path.basename(path) for rom_set in roms.ROM_SETS.values() for path in rom_set['files'].values()}
+    visual_maps = {os.path.basename(rom_set['files'][roms.ROM_CONFIG['visual_map_rom']])
+                   for rom_set in roms.ROM_SETS.values()}
+    zip_path = tmp_path_factory.mktemp('roms') / 'tutankhm.zip'
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        for name in sorted(names):
+            data = bytearray(rnd.randrange(256) for _ in range(ROM_SIZE))
+            if name in visual_maps:
+                for i in range(4 * 0x300):
+                    data[i] = rnd.choice(MAP_TILES)
+            zf.writestr(name, bytes(data))
+    return str(zip_path)
+
+@pytest.fixture
+def loaded_roms(rom_zip):
+    """Load the synthetic zip as the Konami set; yields rom_cache"""
+    roms.CURRENT_ROM_SET = 'Konami'
+    roms.load_roms_from_zip(rom_zip)
+    yield roms.rom_cache
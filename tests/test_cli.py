@@ -0,0 +1,15 @@
+"""Command line subcommands that CI runs"""
+from tutankham.cli import main
+
+def test_startup_benchmark_within_budget(rom_zip, capsys):
+    assert main(['startup-benchmark', '--source', rom_zip, '--runs', '1']) == 0
+    out = capsys.readouterr().out
+    assert 'imports' in out and 'roms' in out and out.rstrip().endswith('OK - startup within budget')
+
+def test_startup_benchmark_over_budget_fails(rom_zip, capsys):
+    assert main(['startup-benchmark', '--source', rom_zip, '--runs', '1', '--budget', 'roms=0']) == 1
+    assert 'FAIL - startup over budget' in capsys.readouterr().out
+
+def test_startup_benchmark_reports_a_broken_load(tmp_path, capsys):
+    assert main(['startup-benchmark', '--source', str(tmp_path / 'missing.zip'), '--runs', '1']) == 1
+    assert 'Zip file not found' in capsys.readouterr().err
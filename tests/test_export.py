@@ -0,0 +1,26 @@
+"""Sprite sheet export -> import round trips"""
+import os
+
+import pytest
+
+from tutankham.export import SHEET_CLASSES, export_sprite_sheets, import_sprite_sheet
+from tutankham.graphics import PALETTE_NAMES
+from tutankham.roms import rom_cache
+
+@pytest.mark.parametrize('palette_idx', range(len(PALETTE_NAMES)))
+def test_unchanged_sheets_import_byte_for_byte(loaded_roms, tmp_path, palette_idx):
+    before = {name: bytes(data) for name, data in rom_cache.items()}
+    paths = export_sprite_sheets(tmp_path, [palette_idx], scale=1)
+    assert len(paths) == len(SHEET_CLASSES)
+    for path in paths:
+        import_sprite_sheet(path)
+    changed = {name: sum(a != b for a, b in zip(before[name], rom_cache[name]))
+               for name in before if before[name] != bytes(rom_cache[name])}
+    assert changed == {}
+
+def test_scaled_sheet_finds_its_scale(loaded_roms, tmp_path):
+    before = bytes(rom_cache['j6.6h'])
+    path, = export_sprite_sheets(tmp_path, [0], ['fonts'], scale=3)
+    assert os.path.basename(path).startswith('fonts_')
+    assert import_sprite_sheet(path) == {}
+    assert bytes(rom_cache['j6.6h']) == before
@@ -0,0 +1,42 @@
+"""Bank decode/pack round trips and write_bank's written range"""
+import numpy as np
+
+from tutankham.graphics import byte_layout, decode_bank, pack_bank, write_bank
+
+def random_rom(seed=0, size=0x1000):
+    return bytearray(np.random.default_rng(seed).integers(0, 256, size, dtype=np.uint8).tobytes())
+
+def test_pack_inverts_decode():
+    rom = random_rom()
+    offsets = np.arange(32) * 128
+    for rotate in (True, False):
+        bank = decode_bank(rom, offsets, 16, 16, rotate=rotate)
+        assert pack_bank(bank, rotate).tobytes() == bytes(rom)
+
+def test_write_bank_round_trip_tile_and_sprite():
+    rom = random_rom(1)
+    for args in ((16, 16, 'tile', None), (44, 44, 'sprite', 24)):
+        bank = decode_bank(rom, [0x200], *args)
+        copy = bytearray(len(rom))
+        start, end = write_bank(copy, [0x200], bank, *args)
+        layout = 0x200 + byte_layout(*args)
+        assert (start, end) == (int(layout.min()), int(layout.max()) + 1)
+        assert np.array_equal(decode_bank(copy, [0x200], *args), bank)
+
+def test_region_write_touches_only_its_bytes():
+    rom = random_rom(2)
+    before = bytes(rom)
+    bank = decode_bank(rom, [0x80], 16, 16, rotate=False)
+    bank[0, 5, 6] ^= 0x0F
+    start, end = write_bank(rom, [0x80], bank, 16, 16, rotate=False, region=(5, 6, 6, 7))
+    changed = [i for i in range(len(rom)) if rom[i] != before[i]]
+    assert changed == [0x80 + 5 * 8 + 3]
+    assert (start, end) == (changed[0], changed[0] + 1)
+
+def test_written_range_ignores_bytes_past_the_rom():
+    rom = random_rom(3, size=0x100)
+    bank = decode_bank(rom, [0xC0], 16, 16)
+    start, end = write_bank(rom, [0xC0], bank, 16, 16)
+    assert (start, end) == (0xC0, 0x100)
+    start, end = write_bank(rom, [0x100], bank, 16, 16)
+    assert start == end
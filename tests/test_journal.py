@@ -0,0 +1,68 @@
+"""Autosave journal write -> replay, torn batches and mismatched ROMs"""
+from tutankham import roms
+from tutankham.journal import Journal, read_journal, recoverable_edits, replay_journal
+from tutankham.roms import rom_cache
+
+def edit_and_sync(journal):
+    rom_cache['m1.1h'][0x10:0x14] = b'\x01\x02\x03\x04'
+    rom_cache['c8.8i'][0x300] ^= 0xFF
+    assert journal.sync() == 2
+    assert journal.sync() == 0
+    rom_cache['m1.1h'][0x12] = 0xAA
+    rom_cache['j6.6h'][0xFFF] ^= 0x0F
+    assert journal.sync() == 2
+    return {name: bytes(data) for name, data in rom_cache.items()}
+
+def test_replay_restores_the_edits(loaded_roms, rom_zip, tmp_path):
+    path = str(tmp_path / 'tutankham.journal')
+    journal = Journal(path)
+    journal.begin()
+    edited = edit_and_sync(journal)
+
+    roms.load_roms_from_zip(rom_zip)
+    assert bytes(rom_cache['m1.1h']) != edited['m1.1h']
+    count, last_time = recoverable_edits(path)
+    assert count == 4 and last_time
+    assert replay_journal(path) == 4
+    assert {name: bytes(data) for name, data in rom_cache.items()} == edited
+
+def test_torn_last_batch_is_ignored(loaded_roms, rom_zip, tmp_path):
+    path = str(tmp_path / 'tutankham.journal')
+    journal = Journal(path)
+    journal.begin()
+    rom_cache['m2.2h'][0x40] ^= 0x01
+    journal.sync()
+    first = bytes(rom_cache['m2.2h'])
+    rom_cache['m2.2h'][0x80:0x90] = bytes(16)
+    journal.sync()
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-3])
+
+    _, _, runs, _ = read_journal(path)
+    assert runs == [('m2.2h', 0x40, first[0x40:0x41])]
+    roms.load_roms_from_zip(rom_zip)
+    replay_journal(path)
+    assert bytes(rom_cache['m2.2h']) == first
+
+def test_journal_for_other_roms_is_not_offered(loaded_roms, rom_zip, tmp_path):
+    path = str(tmp_path / 'tutankham.journal')
+    journal = Journal(path)
+    journal.begin()
+    edit_and_sync(journal)
+    roms.CURRENT_ROM_SET = 'Stern'
+    try:
+        roms.load_roms_from_zip(rom_zip)
+        assert recoverable_edits(path) is None
+    finally:
+        roms.CURRENT_ROM_SET = 'Konami'
+
+def test_discard_removes_the_file(loaded_roms, tmp_path):
+    path = tmp_path / 'tutankham.journal'
+    journal = Journal(str(path))
+    journal.begin()
+    assert recoverable_edits(str(path)) is None
+    journal.discard()
+    assert not path.exists()
+    assert journal.sync() == 0
@@ -0,0 +1,84 @@
+"""ValidationEngine rules, and incremental updates against a full rebuild"""
+import random
+
+from tutankham.maps import (NUM_DIFFICULTIES, ValidationEngine, cell_to_game, empty_path_tile,
+                            get_validation_engine, load_object_data, num_maps, save_object_data,
+                            write_visual_tile_to_cache)
+
+def place(obj, row, col):
+    obj['x'], obj['y'] = cell_to_game(row, col)
+
+def messages(map_index=0, difficulty=0):
+    return [message for message, cell in get_validation_engine().problems_for(map_index, difficulty)]
+
+def test_item_must_sit_on_its_box(loaded_roms):
+    get_validation_engine()
+    objects = load_object_data(0, 0)
+    objects['map_width'] = 3
+    objects['items']['rings'] = [{'x': 0, 'y': 0}]
+    place(objects['items']['rings'][0], 4, 10)
+    write_visual_tile_to_cache(0, 4, 10, 0x21)
+    save_object_data(objects, 0, 0)
+    assert not any(message.startswith('Ring 1') for message in messages())
+
+    write_visual_tile_to_cache(0, 4, 10, empty_path_tile)
+    assert "Ring at (10, 4) is not on a ring box" in messages()
+    write_visual_tile_to_cache(0, 4, 10, 0x21)
+    assert not any(message.startswith('Ring') for message in messages())
+
+def test_markers_need_an_empty_path_inside_the_width(loaded_roms):
+    get_validation_engine()
+    objects = load_object_data(1, 2)
+    objects['map_width'] = 0
+    place(objects['player_start'], 6, 20)
+    save_object_data(objects, 1, 2)
+    assert "Player start is outside the map width" in messages(1, 2)
+
+    objects['map_width'] = 3
+    write_visual_tile_to_cache(1, 6, 20, empty_path_tile)
+    save_object_data(objects, 1, 2)
+    assert not any(message.startswith('Player start') for message in messages(1, 2))
+    write_visual_tile_to_cache(1, 6, 20, 0x00)
+    assert "Player start at (20, 6) is not on an empty path" in messages(1, 2)
+
+def test_keyholes_need_keys(loaded_roms):
+    get_validation_engine()
+    objects = load_object_data(2, 0)
+    objects['items']['keys'] = []
+    objects['items']['keyholes'] = [{'x': 0, 'y': 0}]
+    save_object_data(objects, 2, 0)
+    assert "1 keyholes but only 0 keys" in messages(2, 0)
+    objects['items']['keys'] = [{'x': 0, 'y': 0}]
+    save_object_data(objects, 2, 0)
+    assert not any('keyholes but' in message for message in messages(2, 0))
+
+def test_filled_box_cells(loaded_roms):
+    get_validation_engine()
+    write_visual_tile_to_cache(3, 2, 30, 0x6F)
+    problems = get_validation_engine().problems_for(3, 1)
+    assert ("Filled box at (30, 2), use an empty box (0x21)", (2, 30)) in problems
+    write_visual_tile_to_cache(3, 2, 30, 0x21)
+    assert not any(message.startswith("Filled box at (30, 2)") for message in messages(3, 1))
+
+def test_incremental_matches_rebuild(loaded_roms):
+    rnd = random.Random(7)
+    engine = get_validation_engine()
+    tiles = [empty_path_tile, 0x00, 0x21, 0x22, 0x4A, 0x6F, 0x70]
+    for _ in range(200):
+        map_index, difficulty = rnd.randrange(num_maps), rnd.randrange(NUM_DIFFICULTIES)
+        if rnd.random() < 0.5:
+            write_visual_tile_to_cache(map_index, rnd.randrange(12), rnd.randrange(64), rnd.choice(tiles))
+            continue
+        objects = load_object_data(map_index, difficulty)
+        objects['map_width'] = rnd.randrange(4)
+        group = rnd.choice(['rings', 'keys', 'keyholes', 'crowns'])
+        limit = 2 if group == 'crowns' else 4
+        objects['items'][group] = [{'x': 0, 'y': 0} for _ in range(rnd.randrange(limit + 1))]
+        for obj in objects['items'][group] + [objects['player_start']] + objects['respawns']:
+            place(obj, rnd.randrange(12), rnd.randrange(64))
+        save_object_data(objects, map_index, difficulty)
+
+    rebuilt = ValidationEngine()
+    for map_index in range(num_maps):
+        for difficulty in range(NUM_DIFFICULTIES):
+            assert engine.problems_for(map_index, difficulty) == rebuilt.problems_for(map_index, difficulty)
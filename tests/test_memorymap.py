@@ -0,0 +1,70 @@
+"""MemoryMap.txt index lookups and the sidecar cache"""
+import logging
+import shutil
+
+import numpy as np
+import pytest
+
+from tutankham.memorymap import MEMORY_MAP_PATH, MemoryMap, load_memory_map, parse_memory_map
+
+@pytest.fixture
+def memory_map_copy(tmp_path):
+    path = tmp_path / 'MemoryMap.txt'
+    shutil.copy(MEMORY_MAP_PATH, path)
+    return str(path), str(path) + '.idx.npz'
+
+def all_regions(memory_map):
+    return [memory_map.region(row) for row in range(len(memory_map))]
+
+def test_sidecar_reload_matches_the_parse(memory_map_copy, caplog):
+    path, sidecar = memory_map_copy
+    caplog.set_level(logging.INFO)
+    parsed = load_memory_map(path, sidecar)
+    assert 'parsed from' in caplog.text
+    caplog.clear()
+    cached = load_memory_map(path, sidecar)
+    assert 'loaded from' in caplog.text
+    assert all_regions(cached) == all_regions(parsed)
+    assert cached.by_description == parsed.by_description
+
+def test_changed_text_rebuilds_the_sidecar(memory_map_copy, caplog):
+    path, sidecar = memory_map_copy
+    load_memory_map(path, sidecar)
+    with open(path, 'a') as f:
+        f.write("\n| m5.5h  | 0xDFF0-0xDFFF   | 16B   | Test Region                     |                            |\n")
+    caplog.set_level(logging.INFO)
+    memory_map = load_memory_map(path, sidecar)
+    assert 'parsed from' in caplog.text
+    assert memory_map.address_range('Test Region') == ('m5.5h', 0xFF0, 0x1000)
+    caplog.clear()
+    assert load_memory_map(path, sidecar).address_range('Test Region') == ('m5.5h', 0xFF0, 0x1000)
+    assert 'loaded from' in caplog.text
+
+@pytest.mark.parametrize('damage', [lambda data: data[:len(data) // 2], lambda data: b'not a zip'])
+def test_torn_sidecar_is_a_miss(memory_map_copy, caplog, damage):
+    path, sidecar = memory_map_copy
+    regions = all_regions(load_memory_map(path, sidecar))
+    with open(sidecar, 'rb') as f:
+        data = f.read()
+    with open(sidecar, 'wb') as f:
+        f.write(damage(data))
+    caplog.set_level(logging.INFO)
+    assert all_regions(load_memory_map(path, sidecar)) == regions
+    assert 'Ignoring unreadable' in caplog.text
+    caplog.clear()
+    load_memory_map(path, sidecar)
+    assert 'loaded from' in caplog.text
+
+def test_lookups():
+    memory_map = MemoryMap.from_regions(parse_memory_map([
+        "| m1.1h  | 0xA010-0xA01F   | 16B   | Second | |",
+        "| m1.1h  | 0xA000-0xA00F   | 16B   | First  | note |",
+        "| c1.1h  | 0x0100-0x01FF   | 256B  | Tiles  | |",
+    ]))
+    assert memory_map.region_at('m1.1h', 0x005) == ('m1.1h', 0x000, 0x00F, 'First', 'note')
+    assert memory_map.region_at('m1.1h', 0x020) is None
+    assert memory_map.region_at('c1.1i', 0x180)[3] == 'Tiles'
+    offsets = np.arange(0x30)
+    assert memory_map.rows_at('m1.1h', offsets).tolist() == [memory_map.row_at('m1.1h', o) for o in offsets]
+    assert [region[3] for region in memory_map.regions_in('m1.1h', 0x00A, 0x012)] == ['First', 'Second']
+    assert memory_map.address_range('Second') == ('m1.1h', 0x010, 0x020)
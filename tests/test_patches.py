@@ -0,0 +1,68 @@
+"""IPS/BPS make -> apply round trips and patch file checks"""
+import os
+import random
+
+import pytest
+
+from tutankham.patches import (apply_bps, apply_ips, apply_patch_file, diff_runs, make_bps, make_ips,
+                               write_patches)
+from tutankham.roms import original_rom_cache, rom_cache
+
+def edited_copy(original, seed, edits=40):
+    rnd = random.Random(seed)
+    edited = bytearray(original)
+    for _ in range(edits):
+        start = rnd.randrange(len(edited))
+        for i in range(start, min(len(edited), start + rnd.randrange(1, 20))):
+            edited[i] = rnd.randrange(256)
+    return bytes(edited)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_ips_round_trip(seed):
+    original = bytes(random.Random(seed).randrange(256) for _ in range(0x1000))
+    edited = edited_copy(original, seed)
+    assert bytes(apply_ips(bytearray(original), make_ips(original, edited))) == edited
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bps_round_trip(seed):
+    original = bytes(random.Random(seed).randrange(256) for _ in range(0x1000))
+    edited = edited_copy(original, seed)
+    assert bytes(apply_bps(bytearray(original), make_bps(original, edited, b'meta'))) == edited
+
+def test_ips_rle_and_truncation():
+    patch = b'PATCH' + (0x10).to_bytes(3, 'big') + b'\x00\x00' + (4).to_bytes(2, 'big') + b'\xAA' + b'EOF'
+    assert apply_ips(bytearray(0x20), patch + (0x18).to_bytes(3, 'big')) == bytearray(0x10) + b'\xAA' * 4 + bytearray(4)
+
+def test_diff_runs_merges_small_gaps():
+    original = bytes(32)
+    edited = bytes([1 if i in (2, 3, 6, 20) else 0 for i in range(32)])
+    assert diff_runs(original, edited).tolist() == [[2, 4], [6, 7], [20, 21]]
+    assert diff_runs(original, edited, 2).tolist() == [[2, 7], [20, 21]]
+
+def test_bps_rejects_wrong_source():
+    original = bytes(0x100)
+    patch = make_bps(original, b'\x01' + original[1:])
+    with pytest.raises(ValueError, match='source CRC'):
+        apply_bps(bytearray(b'\x02' * 0x100), patch)
+
+@pytest.mark.parametrize('patch_format', ['.ips', '.bps'])
+def test_patch_files_replay_the_edits(loaded_roms, tmp_path, patch_format):
+    rom_cache['m1.1h'][0x100:0x104] = b'\xDE\xAD\xBE\xEF'
+    rom_cache['c8.8i'][0x7FF] ^= 0xFF
+    edited = {name: bytes(data) for name, data in rom_cache.items()}
+    paths = write_patches(tmp_path, patch_format)
+    assert sorted(os.path.basename(path) for path in paths) == sorted(['m1.1h' + patch_format, 'c8.8i' + patch_format])
+
+    for name in rom_cache:
+        rom_cache[name][:] = original_rom_cache[name]
+    for path in paths:
+        apply_patch_file(path, notify=False)
+    assert {name: bytes(data) for name, data in rom_cache.items()} == edited
+
+def test_patch_that_resizes_a_rom_is_rejected(loaded_roms, tmp_path):
+    path = tmp_path / 'm1.1h.ips'
+    path.write_bytes(b'PATCH' + b'EOF' + (0x800).to_bytes(3, 'big'))
+    before = bytes(rom_cache['m1.1h'])
+    with pytest.raises(ValueError, match='resize'):
+        apply_patch_file(str(path), notify=False)
+    assert bytes(rom_cache['m1.1h']) == before
@@ -0,0 +1,59 @@
+"""Playtest staging: incremental restaging and the stub emulator's view of it"""
+import os
+import zlib
+
+import pytest
+
+from tutankham import playtest, roms
+from tutankham.playtest import STUB_COMMAND, launch_emulator, playtest_files, stage_playtest
+from tutankham.roms import rom_cache
+
+@pytest.fixture
+def playtest_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(playtest, 'PLAYTEST_DIR', str(tmp_path / 'playtest'))
+    monkeypatch.setattr(playtest, 'PLAYTEST_CACHE', str(tmp_path / 'playtest' / '.cache'))
+    rompath = tmp_path / 'playtest' / 'stage'
+    rompath.mkdir(parents=True)
+    return str(rompath)
+
+def stub_output(rompath, driver, capfd):
+    capfd.readouterr()
+    assert launch_emulator(rompath, driver, STUB_COMMAND).wait() == 0
+    lines = capfd.readouterr().out.splitlines()
+    return dict(line.split() for line in lines[:-1]), lines[-1]
+
+def test_restage_keeps_files_and_writes_only_the_edit(loaded_roms, rom_zip, playtest_dir, capfd):
+    total = len(playtest_files(rom_zip))
+    first = stage_playtest(playtest_dir, 'tutankhm', rom_zip)
+    assert first['linked'] == total and first['written'] == 0
+
+    second = stage_playtest(playtest_dir, 'tutankhm', rom_zip)
+    assert second == {'kept': total, 'linked': 0, 'written': 0, 'removed': 0}
+
+    rom_cache['m1.1h'][0x123] ^= 0x01
+    third = stage_playtest(playtest_dir, 'tutankhm', rom_zip)
+    assert third == {'kept': total - 1, 'linked': 0, 'written': 1, 'removed': 0}
+
+    crcs, summary = stub_output(playtest_dir, 'tutankhm', capfd)
+    assert summary == f"tutankhm: {total} files"
+    assert crcs['m1.1h'] == f"{zlib.crc32(rom_cache['m1.1h']):08X}"
+    assert crcs['c8.8i'] == f"{zlib.crc32(rom_cache['c8.8i']):08X}"
+
+    rom_cache['m1.1h'][0x123] ^= 0x01
+    fourth = stage_playtest(playtest_dir, 'tutankhm', rom_zip)
+    assert fourth == {'kept': total - 1, 'linked': 1, 'written': 0, 'removed': 0}
+
+def test_stray_files_are_removed(loaded_roms, rom_zip, playtest_dir):
+    stage_playtest(playtest_dir, 'tutankhm', rom_zip)
+    with open(os.path.join(playtest_dir, 'tutankhm', 'stray.bin'), 'wb') as f:
+        f.write(b'x')
+    assert stage_playtest(playtest_dir, 'tutankhm', rom_zip)['removed'] == 1
+
+def test_bootleg_stages_under_konami_names(rom_zip, playtest_dir, capfd, monkeypatch):
+    monkeypatch.setattr(roms, 'CURRENT_ROM_SET', 'Bootleg')
+    roms.load_roms_from_zip(rom_zip)
+    rom_cache['j6.6h'][0] ^= 0xFF
+    assert playtest.playtest_driver() == 'tutankhm'
+    assert stage_playtest(playtest_dir, zip_path=rom_zip)['written'] == 1
+    crcs, _ = stub_output(playtest_dir, 'tutankhm', capfd)
+    assert crcs['j6.6h'] == f"{zlib.crc32(rom_cache['j6.6h']):08X}"
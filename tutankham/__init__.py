@@ -0,0 +1,22 @@
+"""Tk-free core of the Tutankham ROM editor
+
+roms        ROM sets, the shared rom_cache, loading/saving and state callbacks
+graphics    palette, font and tile codecs
+maps        visual/logical map, config and object codecs plus map analysis
+            and the tile usage index
+highscores  high score table codec
+export      PNG sprite sheets of every graphic under any palette
+cli         'python -m tutankham' batch builds and exports
+levels      whole maps as JSON Lines / msgpack level files
+patches     IPS/BPS patches between the loaded and edited ROMs
+memorymap   MemoryMap.txt as an address/region interval index
+romdiff     changed byte runs between ROM sets, labeled with MemoryMap.txt regions
+digests     per-ROM CRC32/SHA1 and the copyright checksum, kept current
+journal     autosave journal of unsaved edits and crash replay
+watcher     reloads ROM files changed on disk by other tools
+playtest    stages the edited set for MAME and launches it
+animations  player/enemy animation tables
+
+Nothing here imports tkinter, so the codecs can be used from scripts and
+tests without a display. The GUI lives in TutankhamEditor.py.
+"""
@@ -0,0 +1,6 @@
+"""Allow 'python -m tutankham'"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
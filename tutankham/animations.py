@@ -0,0 +1,75 @@
+"""Player and enemy animation tables - no Tk required
+
+MemoryMap.txt lists the tables in m2.2h and 3j.3h as "... Animation - ..."
+regions whose notes give the tile count and game frames per tile, e.g.
+"6 Tiles, 1 Frame per Tile". The byte layout is not documented there; every
+table is 2 * tiles + 3 bytes, read here as one header byte, then one
+(tile code, attribute) pair per tile, then a two byte end marker. The
+layout lives in the ANIMATION_* constants so it is easy to correct as the
+disassembly progresses.
+"""
+import re
+
+from .roms import rom_cache
+from .graphics import count_tiles
+from .memorymap import get_memory_map
+
+#########################################
+# Animation Data Setup
+#########################################
+
+ANIMATION_HEADER_SIZE = 1       # Bytes before the first (tile, attribute) pair
+ANIMATION_ENTRY_SIZE  = 2       # Tile code, attribute
+ANIMATION_FOOTER_SIZE = 2       # End marker after the last pair
+ANIMATION_GAME_FPS    = 60      # Frame rate "Frame per Tile" counts in
+ANIMATION_NOTES = re.compile(r'(\d+)\s+Tiles?,\s*(\d+)\s+Frames?\s+per\s+Tile', re.IGNORECASE)
+
+#########################################
+# Animation Functions
+#########################################
+
+def animation_tables(memory_map=None):
+    """Every animation table MemoryMap.txt documents, in ROM/address order
+
+    Returns:
+        List of dicts with name, rom, start, end (exclusive file offsets),
+        tiles (count) and frames_per_tile
+    """
+    memory_map = memory_map or get_memory_map()
+    tables = []
+    for row in range(len(memory_map)):
+        rom, start, end, description, notes = memory_map.region(row)
+        match = ANIMATION_NOTES.search(notes)
+        if 'Animation' not in description or not match:
+            continue
+        tables.append({'name': description, 'rom': rom, 'start': start, 'end': end + 1,
+                       'tiles': int(match.group(1)), 'frames_per_tile': int(match.group(2))})
+    return tables
+
+def decode_animation(table):
+    """Read an animation's frames from rom_cache
+
+    Returns:
+        List of (tile index, attribute byte, game frames shown) - the tile
+        index is None for codes beyond the tile ROMs
+    """
+    data = rom_cache[table['rom']]
+    num_tiles = count_tiles()
+    frames = []
+    for entry in range(table['tiles']):
+        offset = table['start'] + ANIMATION_HEADER_SIZE + entry * ANIMATION_ENTRY_SIZE
+        if offset + ANIMATION_ENTRY_SIZE > table['end'] - ANIMATION_FOOTER_SIZE:
+            break  # Table shorter than its notes claim
+        tile = data[offset] if data[offset] < num_tiles else None
+        frames.append((tile, data[offset + 1], table['frames_per_tile']))
+    return frames
+
+def animation_header(table):
+    """The raw header and end marker bytes, for display"""
+    data = rom_cache[table['rom']]
+    return (bytes(data[table['start']:table['start'] + ANIMATION_HEADER_SIZE]),
+            bytes(data[table['end'] - ANIMATION_FOOTER_SIZE:table['end']]))
+
+def animation_duration_ms(frames):
+    """How long one pass of an animation takes in the game"""
+    return sum(shown for _, _, shown in frames) * 1000 / ANIMATION_GAME_FPS
@@ -0,0 +1,591 @@
+"""Command line front end for scripted ROM builds - no Tk required
+
+    python -m tutankham build edits.json [more.json ...] [--jobs N] [-v]
+    python -m tutankham export-sheets [--source tutankhm.zip] [-o sheets] [--palette "Map 1" ...]
+    python -m tutankham import-sheets tiles_map-1.png [...] [--source tutankhm.zip] [-o build]
+    python -m tutankham export-maps [--source tutankhm.zip] [-o maps] [--format msgpack]
+    python -m tutankham import-levels map-1.jsonl [...] [--source tutankhm.zip] [-o build]
+    python -m tutankham make-patches edited/ [--source tutankhm.zip] [-o patches] [--format bps]
+    python -m tutankham diff Konami Stern | Konami build/base [--source tutankhm.zip] [--bytes]
+    python -m tutankham checksums [--source build/base] [--dumps tutankhm.zip]
+    python -m tutankham playtest [--source build/base] [--emulator "mame {driver} -rompath {rompath}" | --stub]
+    python -m tutankham where-used 0x26 [0x6F ...] [--source build/base] [--cells]
+    python -m tutankham startup-benchmark [--source tutankhm.zip] [--runs 3] [--budget roms=1000]
+
+An edit file is JSON describing a base ROM set, the edits to apply and where
+to write the result:
+
+    {
+        "rom_set": "Konami",
+        "source": "tutankhm.zip",
+        "output": "build/base",
+        "patch_format": "ips",
+        "patches": ["hacks/speed", "hacks/colors/m1.1h.bps"],
+        "levels": ["levels/all.jsonl", {"file": "levels/maze.msgpack", "map": 2}],
+        "maps": [
+            {"map": 1, "difficulty": "all", "time_limit": 120},
+            {"map": 3, "difficulty": 4, "spawn_rate": 6}
+        ],
+        "palettes": [
+            {"palette": "Map 2", "copy_from": "Map 4"},
+            {"palette": 1, "color": 3, "rgb": [255, 0, 0]},
+            {"palette": "Map 3", "color": 5, "bits": [7, 2, 1]}
+        ],
+        "high_scores": [
+            {"rank": 1, "score": 50000, "name": "RDM", "stage": 5}
+        ],
+        "variants": [
+            {"name": "hard", "maps": [{"map": "all", "difficulty": "all", "time_limit": 60}]}
+        ]
+    }
+
+"patches" are IPS/BPS files (or folders of them, see tutankham/patches.py)
+applied straight after loading. With "patch_format" set to "ips" or "bps" the
+output folder gets one patch per changed ROM instead of full ROM files.
+Level files (see tutankham/levels.py) are applied next, so the other edits
+can tweak them; "map" moves a single-map level file to another slot.
+Maps, difficulties and ranks are 1-based like the editor shows them. Each
+variant starts from the base edits, appends its own lists and is written to
+its own "output" (default <output>/<name>). Every build runs in its own worker
+process so large batches spread across all cores.
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import roms
+from .roms import rom_cache, original_rom_cache, ROM_CONFIG, ROM_SETS, update_copyright_checksum
+from .graphics import PALETTE_FILE_OFFSETS, PALETTE_NAMES, encode_palette_byte
+from .maps import (NUM_DIFFICULTIES, load_map_config, save_map_config, generate_logical_maps_from_visual,
+                   get_tile_usage)
+from .export import SHEET_CLASSES, export_sprite_sheets, import_sprite_sheet, export_maps
+from .levels import import_level_file
+from .digests import RomDigests, known_dumps
+from .playtest import PLAYTEST_DIR, STUB_COMMAND, playtest, get_playtest_rompath
+from .patches import apply_patch_files, write_patches
+from .romdiff import read_rom_set, diff_rom_sets, format_diff
+from .highscores import (NUM_HIGH_SCORES, load_high_scores, save_high_scores, int_to_bcd,
+                         sort_high_scores, sync_high_score)
+
+STARTUP_BENCHMARK_BUDGET_MS = {     # Time from interpreter start, checked by startup-benchmark
+    'imports': 600,                 # numpy, Pillow and every tutankham module the editor imports
+    'roms':    1000}                # ROM set loaded and digested, as before the editor's "Ready"
+STARTUP_BENCHMARK_SCRIPT = """import time
+start = time.perf_counter()
+import json, sys
+import numpy, PIL.Image, colorlog
+from tutankham import (roms, graphics, maps, export, levels, patches, romdiff, memorymap, digests,
+                       animations, watcher, playtest, journal, highscores)
+imports = time.perf_counter()
+from tutankham.cli import load_source_roms
+load_source_roms(sys.argv[1], sys.argv[2])
+digests.get_rom_digests()
+loaded = time.perf_counter()
+print(json.dumps({'imports': (imports - start) * 1000, 'roms': (loaded - start) * 1000}))
+"""
+
+#########################################
+# Edit File Functions
+#########################################
+
+EDIT_LISTS = ['patches', 'levels', 'maps', 'palettes', 'high_scores']   # Sections a variant extends
+NUM_MAPS   = 4
+
+def load_edit_file(path):
+    """Load an edit file and expand it into one build per variant
+
+    Returns:
+        List of build dicts (rom_set, source, output, maps, palettes, high_scores).
+        Relative paths are resolved against the edit file's folder.
+    """
+    with open(path, 'r') as f:
+        edits = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    def resolve(p):
+        return p if os.path.isabs(p) else os.path.join(base_dir, p)
+
+    base = {
+        'name': edits.get('name', os.path.splitext(os.path.basename(path))[0]),
+        'rom_set': edits.get('rom_set', 'Konami'),
+        'source': resolve(edits.get('source', roms.ROM_ZIP_PATH)),
+        'output': resolve(edits.get('output', 'build')),
+        'patch_format': edits.get('patch_format'),}
+    for key in EDIT_LISTS:
+        base[key] = list(edits.get(key, []))
+    base['patches'] = [resolve(patch) for patch in base['patches']]
+    base['levels'] = [resolve_level(level, resolve) for level in base['levels']]
+
+    variants = edits.get('variants')
+    if not variants:
+        return [base]
+
+    builds = []
+    for variant in variants:
+        if 'name' not in variant:
+            raise ValueError(f"{path}: every variant needs a 'name'")
+        build = dict(base, name=variant['name'])
+        build['rom_set'] = variant.get('rom_set', base['rom_set'])
+        build['output'] = resolve(variant.get('output', os.path.join(base['output'], variant['name'])))
+        for key in EDIT_LISTS:
+            build[key] = base[key] + list(variant.get(key, []))
+        build['levels'] = base['levels'] + [resolve_level(level, resolve) for level in variant.get('levels', [])]
+        build['patches'] = base['patches'] + [resolve(patch) for patch in variant.get('patches', [])]
+        build['patch_format'] = variant.get('patch_format', base['patch_format'])
+        builds.append(build)
+    return builds
+
+def resolve_level(level, resolve):
+    """Normalize a level entry ("file" or {"file", "map"}) with its path resolved"""
+    if isinstance(level, str):
+        level = {'file': level}
+    return dict(level, file=resolve(level['file']))
+
+def expand_index(value, count, label):
+    """Turn a 1-based index or 'all' into a list of 0-based indexes"""
+    if value == 'all':
+        return list(range(count))
+    if not isinstance(value, int) or not 1 <= value <= count:
+        raise ValueError(f"{label} must be 1-{count} or 'all', got {value!r}")
+    return [value - 1]
+
+def palette_index(value):
+    """Palette by 1-based number or by name (e.g. 'Map 2')"""
+    if isinstance(value, str):
+        if value not in PALETTE_NAMES:
+            raise ValueError(f"Unknown palette {value!r} (expected one of {', '.join(PALETTE_NAMES)})")
+        return PALETTE_NAMES.index(value)
+    return expand_index(value, len(PALETTE_FILE_OFFSETS), "palette")[0]
+
+#########################################
+# Edit Application Functions
+#########################################
+
+def apply_level_files(levels):
+    """Apply level files in order, optionally moving a single map to another slot"""
+    for level in levels:
+        target = level.get('map')
+        if target is not None:
+            target = expand_index(target, NUM_MAPS, "map")[0]
+        import_level_file(level['file'], target)
+
+def apply_map_edits(edits):
+    """Apply time limit / spawn rate edits through save_map_config"""
+    for edit in edits:
+        for difficulty in expand_index(edit.get('difficulty', 'all'), NUM_DIFFICULTIES, "difficulty"):
+            for map_index in expand_index(edit.get('map', 'all'), NUM_MAPS, "map"):
+                config = load_map_config(map_index, difficulty)
+                if 'time_limit' in edit:
+                    if not 0 <= edit['time_limit'] <= 255:
+                        raise ValueError("Time limit must be 0-255 seconds")
+                    config['time_limit'] = edit['time_limit']
+                if 'spawn_rate' in edit:
+                    if not 1 <= edit['spawn_rate'] <= 14:
+                        raise ValueError("Spawn rate must be 1-14 (game uses 5-8, higher values may crash)")
+                    config['spawn_rate'] = edit['spawn_rate']
+                save_map_config(map_index, difficulty, config)
+
+def apply_palette_edits(edits):
+    """Apply palette copies and single color changes to the palette ROM"""
+    rom_data = rom_cache[ROM_CONFIG['palette_rom']]
+    for edit in edits:
+        offset = PALETTE_FILE_OFFSETS[palette_index(edit['palette'])]
+        if 'copy_from' in edit:
+            source = PALETTE_FILE_OFFSETS[palette_index(edit['copy_from'])]
+            rom_data[offset:offset + 16] = rom_data[source:source + 16]
+            continue
+
+        color = edit['color']
+        if not 0 <= color < 16:
+            raise ValueError(f"Palette color must be 0-15, got {color}")
+        if 'bits' in edit:
+            # Raw 3-3-2 bit values, same as the palette editor's spinboxes
+            r_bits, g_bits, b_bits = edit['bits']
+            rom_data[offset + color] = (r_bits & 0b111) | ((g_bits & 0b111) << 3) | ((b_bits & 0b11) << 6)
+        else:
+            rom_data[offset + color] = encode_palette_byte(*edit['rgb'])
+
+def apply_high_score_edits(edits):
+    """Replace ranked high score entries, then re-sort and sync HIGH SCORE"""
+    if not edits:
+        return
+    high_scores = load_high_scores()
+    for edit in edits:
+        entry = high_scores[expand_index(edit['rank'], NUM_HIGH_SCORES, "rank")[0] + 1]
+        if 'score' in edit:
+            entry['score'] = int_to_bcd(edit['score'])
+        if 'name' in edit:
+            entry['name'] = edit['name']
+        if 'stage' in edit:
+            entry['stage'] = edit['stage'] & 0xFF
+    sort_high_scores(high_scores)
+    sync_high_score(high_scores)
+    save_high_scores(high_scores)
+
+def load_source_roms(rom_set, source):
+    """Load a ROM set from a MAME zip or a folder of extracted ROMs"""
+    if rom_set not in ROM_SETS:
+        raise ValueError(f"Unknown ROM set {rom_set!r} (expected one of {', '.join(ROM_SETS)})")
+    roms.CURRENT_ROM_SET = rom_set
+    if os.path.isdir(source):
+        roms.load_roms_from_folder(source)
+    else:
+        roms.load_roms_from_zip(source)
+    missing = [name for name in ROM_SETS[rom_set]['files'] if name not in rom_cache]
+    if missing:
+        raise FileNotFoundError(f"{source} is missing {', '.join(missing)}")
+
+def run_build(build):
+    """Load, edit and write one ROM set - runs inside a worker process
+
+    Returns:
+        (name, output directory)
+    """
+    load_source_roms(build['rom_set'], build['source'])
+    apply_patch_files(build['patches'])
+    apply_level_files(build['levels'])
+    apply_map_edits(build['maps'])
+    apply_palette_edits(build['palettes'])
+    apply_high_score_edits(build['high_scores'])
+
+    # Same finishing steps as File > Save in the editor
+    update_copyright_checksum()
+    generate_logical_maps_from_visual()
+
+    if build.get('patch_format'):
+        write_patches(build['output'], '.' + build['patch_format'])
+    else:
+        os.makedirs(build['output'], exist_ok=True)
+        roms.save_all_roms(build['output'])
+    return build['name'], build['output']
+
+def run_builds(builds, jobs=None):
+    """Run builds across worker processes
+
+    Returns:
+        List of (name, output, error) - error is None on success.
+    """
+    results = []
+    if jobs == 1 or len(builds) == 1:
+        for build in builds:
+            try:
+                results.append(run_build(build) + (None,))
+            except Exception as e:
+                results.append((build['name'], build['output'], e))
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_build, build): build for build in builds}
+        for future in as_completed(futures):
+            build = futures[future]
+            try:
+                results.append(future.result() + (None,))
+            except Exception as e:
+                results.append((build['name'], build['output'], e))
+    return results
+
+#########################################
+# Command Line Functions
+#########################################
+
+def build_command(args):
+    """Handle 'build': expand every edit file and build all variants"""
+    builds = []
+    for path in args.edit_files:
+        try:
+            builds.extend(load_edit_file(path))
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            return 1
+
+    failed = 0
+    for name, output, error in run_builds(builds, args.jobs):
+        if error:
+            failed += 1
+            print(f"FAILED {name}: {error}", file=sys.stderr)
+        else:
+            print(f"Built {name} -> {output}")
+    return 1 if failed else 0
+
+def export_sheets_command(args):
+    """Handle 'export-sheets': PNG sprite sheets of every graphic"""
+    try:
+        load_source_roms(args.rom_set, args.source)
+        palette_indexes = None
+        if args.palette:
+            palette_indexes = [palette_index(int(p) if p.isdigit() else p) for p in args.palette]
+        paths = export_sprite_sheets(args.output, palette_indexes, args.sheet_class, args.scale)
+    except (OSError, ValueError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {len(paths)} sprite sheets to {args.output}")
+    return 0
+
+def import_sheets_command(args):
+    """Handle 'import-sheets': pack edited sprite sheets back into a ROM set"""
+    try:
+        load_source_roms(args.rom_set, args.source)
+        for path in args.sheets:
+            inexact = import_sprite_sheet(path)
+            if inexact:
+                print(f"{path}: {sum(inexact.values())} pixels in {len(inexact)} graphics "
+                      f"mapped to the nearest palette color", file=sys.stderr)
+        os.makedirs(args.output, exist_ok=True)
+        roms.save_all_roms(args.output)
+    except (OSError, ValueError) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Imported {len(args.sheets)} sprite sheets -> {args.output}")
+    return 0
+
+def export_maps_command(args):
+    """Handle 'export-maps': a PNG and a level file per map"""
+    try:
+        load_source_roms(args.rom_set, args.source)
+        map_indexes = [expand_index(m, NUM_MAPS, "map")[0] for m in args.map] if args.map else None
+        paths = export_maps(args.output, map_indexes, '.' + args.format, args.scale)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {len(paths) // 2} maps to {args.output}")
+    return 0
+
+def import_levels_command(args):
+    """Handle 'import-levels': apply level files to a ROM set and write it out"""
+    try:
+        load_source_roms(args.rom_set, args.source)
+        apply_level_files([{'file': path} for path in args.level_files])
+        generate_logical_maps_from_visual()
+        os.makedirs(args.output, exist_ok=True)
+        roms.save_all_roms(args.output)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Imported {len(args.level_files)} level files -> {args.output}")
+    return 0
+
+def make_patches_command(args):
+    """Handle 'make-patches': diff an edited ROM set against its source"""
+    try:
+        load_source_roms(args.rom_set, args.source)
+        source_roms = dict(original_rom_cache)
+        load_source_roms(args.rom_set, args.edited)
+        # Patch against the source set rather than the edited set as loaded
+        original_rom_cache.clear()
+        original_rom_cache.update(source_roms)
+        paths = write_patches(args.output, '.' + args.format)
+    except (OSError, ValueError) as e:
+        print(f"Patch failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {len(paths)} patches to {args.output}")
+    return 0
+
+def diff_command(args):
+    """Handle 'diff': changed runs between two sets, labeled with MemoryMap regions"""
+    try:
+        sides = [read_rom_set(side, args.source) if side in ROM_SETS else read_rom_set(args.rom_set, side)
+                 for side in (args.old, args.new)]
+    except (OSError, KeyError) as e:
+        print(f"Diff failed: {e}", file=sys.stderr)
+        return 1
+    runs = diff_rom_sets(*sides)
+    if runs:
+        print(format_diff(runs, *sides) if args.bytes else format_diff(runs))
+    print(f"{len(runs)} changed runs, {sum(run['size'] for run in runs)} bytes")
+    return 0
+
+def checksums_command(args):
+    """Handle 'checksums': CRC32/SHA1 of every ROM and whether it is still a known dump"""
+    try:
+        load_source_roms(args.rom_set, args.source)
+        digests = RomDigests(known_dumps(args.dumps))
+    except (OSError, ValueError) as e:
+        print(f"Checksums failed: {e}", file=sys.stderr)
+        return 1
+    for rom_name in sorted(digests.crc32):
+        print(f"{rom_name:6} {digests.crc32[rom_name]:08X} {digests.sha1[rom_name]}  {digests.dump_status(rom_name)}")
+    stored = digests.checksum_stored()
+    print(f"Copyright checksum 0x{digests.checksum:04X}, stored 0x{stored:04X}"
+          f"{'' if digests.checksum == stored else ' - MISMATCH, the game will fail its boot check'}")
+    return 0
+
+def playtest_command(args):
+    """Handle 'playtest': stage a ROM set for MAME, run the emulator and wait for it"""
+    try:
+        load_source_roms(args.rom_set, args.source)
+        update_copyright_checksum()
+        rompath = args.rompath or get_playtest_rompath()
+        counts, process = playtest(rompath, args.driver, STUB_COMMAND if args.stub else args.emulator, args.zip)
+    except (OSError, ValueError) as e:
+        print(f"Playtest failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Staged {rompath}: {counts['written']} written, {counts['linked']} linked, {counts['kept']} unchanged")
+    return process.wait()
+
+def where_used_command(args):
+    """Handle 'where-used': the maps, animations and overlays showing each tile"""
+    try:
+        load_source_roms(args.rom_set, args.source)
+        tiles = [int(tile, 0) for tile in args.tiles]
+    except (OSError, ValueError) as e:
+        print(f"Where-used failed: {e}", file=sys.stderr)
+        return 1
+    usage = get_tile_usage()
+    for tile_id in tiles:
+        lines = usage.where_used(tile_id)
+        print(f"Tile 0x{tile_id:02X}" + ("" if lines else ": not used anywhere"))
+        for line in lines:
+            print(f"  {line}")
+        if args.cells:
+            for map_index, row, col in usage.cells_using(tile_id):
+                print(f"    map {map_index + 1} row {row:2} col {col:2}")
+    return 0
+
+def time_startup(rom_set, source):
+    """Time the editor's headless startup path in a fresh interpreter
+
+    A new process is the only way to time the imports, this one has them
+    all already. The timer starts in the child, so interpreter launch is
+    left out.
+
+    Returns:
+        {phase: ms since the child started}, phases as in STARTUP_BENCHMARK_BUDGET_MS
+    """
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [package_parent, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, '-c', STARTUP_BENCHMARK_SCRIPT, rom_set, os.path.abspath(source)],
+                            capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        # The traceback's last lines hold the exception, messages may span lines
+        raise RuntimeError("\n".join(result.stderr.strip().splitlines()[-3:]) or
+                           f"startup exited with {result.returncode}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def startup_benchmark_command(args):
+    """Handle 'startup-benchmark': time imports and the ROM load against the budget"""
+    budget = dict(STARTUP_BENCHMARK_BUDGET_MS)
+    try:
+        for item in args.budget or []:
+            phase, _, ms = item.partition('=')
+            if phase not in budget:
+                raise ValueError(f"Unknown phase {phase!r} (expected one of {', '.join(budget)})")
+            budget[phase] = float(ms)
+        runs = [time_startup(args.rom_set, args.source) for _ in range(max(args.runs, 1))]
+    except (RuntimeError, ValueError) as e:
+        print(f"Startup benchmark failed: {e}", file=sys.stderr)
+        return 1
+
+    failed = False
+    for phase, limit in budget.items():
+        best = min(run[phase] for run in runs)
+        failed |= best > limit
+        print(f"{phase:<8} {best:9.0f} ms  (budget {limit:g} ms, best of {len(runs)})")
+    print("FAIL - startup over budget" if failed else "OK - startup within budget")
+    return 1 if failed else 0
+
+def main(argv=None):
+    """Parse the command line and dispatch to a subcommand"""
+    parser = argparse.ArgumentParser(prog='python -m tutankham', description='Tutankham ROM tools')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log codec activity')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='apply edit files to a ROM set and write the results')
+    build_parser.add_argument('edit_files', nargs='+', help='JSON edit files')
+    build_parser.add_argument('-j', '--jobs', type=int, default=None,
+                              help='worker processes (default: one per CPU)')
+    build_parser.set_defaults(func=build_command)
+
+    export_parser = subparsers.add_parser('export-sheets', help='write labeled PNG sprite sheets of all graphics')
+    export_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='MAME zip or ROM folder')
+    export_parser.add_argument('--rom-set', default='Konami', help='ROM set (default: Konami)')
+    export_parser.add_argument('-o', '--output', default='sheets', help='output folder (default: sheets)')
+    export_parser.add_argument('--palette', action='append',
+                               help='palette name or 1-based number, repeatable (default: all seven)')
+    export_parser.add_argument('--class', dest='sheet_class', action='append', choices=SHEET_CLASSES,
+                               help='asset class, repeatable (default: all)')
+    export_parser.add_argument('--scale', type=int, default=2, help='pixel scale (default: 2)')
+    export_parser.set_defaults(func=export_sheets_command)
+
+    import_parser = subparsers.add_parser('import-sheets', help='pack edited PNG sprite sheets into a ROM set')
+    import_parser.add_argument('sheets', nargs='+', help='sheet PNGs named as exported (e.g. tiles_map-1.png)')
+    import_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='MAME zip or ROM folder')
+    import_parser.add_argument('--rom-set', default='Konami', help='ROM set (default: Konami)')
+    import_parser.add_argument('-o', '--output', default='build', help='output folder (default: build)')
+    import_parser.set_defaults(func=import_sheets_command)
+
+    maps_parser = subparsers.add_parser('export-maps', help='write each map as a PNG and a level file')
+    maps_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='MAME zip or ROM folder')
+    maps_parser.add_argument('--rom-set', default='Konami', help='ROM set (default: Konami)')
+    maps_parser.add_argument('-o', '--output', default='maps', help='output folder (default: maps)')
+    maps_parser.add_argument('--map', type=int, action='append', help='1-based map, repeatable (default: all)')
+    maps_parser.add_argument('--format', choices=['jsonl', 'msgpack'], default='jsonl',
+                             help='level file format (default: jsonl)')
+    maps_parser.add_argument('--scale', type=int, default=1, help='PNG pixel scale (default: 1)')
+    maps_parser.set_defaults(func=export_maps_command)
+
+    levels_parser = subparsers.add_parser('import-levels', help='apply level files to a ROM set')
+    levels_parser.add_argument('level_files', nargs='+', help='.jsonl or .msgpack level files')
+    levels_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='MAME zip or ROM folder')
+    levels_parser.add_argument('--rom-set', default='Konami', help='ROM set (default: Konami)')
+    levels_parser.add_argument('-o', '--output', default='build', help='output folder (default: build)')
+    levels_parser.set_defaults(func=import_levels_command)
+
+    patches_parser = subparsers.add_parser('make-patches', help='write IPS/BPS patches from a source to an edited set')
+    patches_parser.add_argument('edited', help='edited ROM folder or zip')
+    patches_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='original MAME zip or ROM folder')
+    patches_parser.add_argument('--rom-set', default='Konami', help='ROM set (default: Konami)')
+    patches_parser.add_argument('-o', '--output', default='patches', help='output folder (default: patches)')
+    patches_parser.add_argument('--format', choices=['ips', 'bps'], default='ips', help='patch format (default: ips)')
+    patches_parser.set_defaults(func=make_patches_command)
+
+    diff_parser = subparsers.add_parser('diff', help='compare two ROM sets, labeled with MemoryMap regions')
+    diff_parser.add_argument('old', help='ROM set name (read from --source) or a ROM folder/zip')
+    diff_parser.add_argument('new', help='ROM set name (read from --source) or a ROM folder/zip')
+    diff_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='MAME zip the named sets come from')
+    diff_parser.add_argument('--rom-set', default='Konami', help='file names to expect in folders (default: Konami)')
+    diff_parser.add_argument('--bytes', action='store_true', help='show old -> new bytes of short runs')
+    diff_parser.set_defaults(func=diff_command)
+
+    checksums_parser = subparsers.add_parser('checksums', help='CRC32/SHA1 of each ROM against the known dumps')
+    checksums_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='MAME zip or ROM folder')
+    checksums_parser.add_argument('--rom-set', default='Konami', help='ROM set (default: Konami)')
+    checksums_parser.add_argument('--dumps', default=roms.ROM_ZIP_PATH,
+                                  help='MAME zip whose CRCs are the known dumps (default: tutankhm.zip)')
+    checksums_parser.set_defaults(func=checksums_command)
+
+    playtest_parser = subparsers.add_parser('playtest', help='stage a ROM set for MAME and run it')
+    playtest_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='MAME zip or ROM folder')
+    playtest_parser.add_argument('--rom-set', default='Konami', help='ROM set (default: Konami)')
+    playtest_parser.add_argument('--zip', default=roms.ROM_ZIP_PATH,
+                                 help='MAME zip the untouched files (sound ROMs ...) come from')
+    playtest_parser.add_argument('--rompath', help=f'staging rompath (default: a new folder in {PLAYTEST_DIR})')
+    playtest_parser.add_argument('--driver', help="MAME machine (default: the ROM set's, e.g. tutankhm)")
+    playtest_parser.add_argument('--emulator', help='emulator command with {rompath} and {driver} '
+                                 '(default: $TUTANKHAM_EMULATOR, else mame)')
+    playtest_parser.add_argument('--stub', action='store_true', help='run a stub that lists the staged files instead')
+    playtest_parser.set_defaults(func=playtest_command)
+
+    usage_parser = subparsers.add_parser('where-used', help='list the maps, animations and overlays showing tiles')
+    usage_parser.add_argument('tiles', nargs='+', help='tile numbers (0x26, 38 ...)')
+    usage_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='MAME zip or ROM folder')
+    usage_parser.add_argument('--rom-set', default='Konami', help='ROM set (default: Konami)')
+    usage_parser.add_argument('--cells', action='store_true', help='list every map cell as well')
+    usage_parser.set_defaults(func=where_used_command)
+
+    startup_parser = subparsers.add_parser('startup-benchmark',
+                                           help='time imports and the ROM load against the startup budget')
+    startup_parser.add_argument('--source', default=roms.ROM_ZIP_PATH, help='MAME zip or ROM folder')
+    startup_parser.add_argument('--rom-set', default='Konami', help='ROM set (default: Konami)')
+    startup_parser.add_argument('--runs', type=int, default=3, help='fresh interpreters to time, best counts (default: 3)')
+    startup_parser.add_argument('--budget', action='append', metavar='PHASE=MS',
+                                help='override a phase budget, repeatable (imports, roms)')
+    startup_parser.set_defaults(func=startup_benchmark_command)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(levelname)s: %(message)s')
+    return args.func(args)
@@ -0,0 +1,186 @@
+"""Per-ROM CRC32/SHA1 and the copyright checksum, kept current incrementally - no Tk required
+
+MAME identifies ROM dumps by CRC32/SHA1. RomDigests keeps both for every ROM
+in rom_cache, plus the copyright checksum the game verifies at boot. On
+refresh() each ROM is compared with what was last hashed, DIGEST_BLOCK_SIZE
+bytes at a time (most writes go straight into rom_cache, so a compare is the
+one place every write shows up):
+
+    - clean ROMs cost one memcmp
+    - CRC32 and SHA1 resume from the hash state saved at the start of the
+      first dirty block, so only that block and the ones after it are hashed
+    - the checksum moves by the byte deltas of the dirty blocks inside its
+      range instead of being re-summed
+"""
+import os
+import hashlib
+import logging
+import zipfile
+import zlib
+
+import numpy as np
+
+from . import roms
+from .roms import rom_cache, ROM_SETS, register_callback
+
+#########################################
+# Digest Data Setup
+#########################################
+
+DIGEST_BLOCK_SIZE   = 0x100     # Dirty tracking granularity
+COPYRIGHT_ROM       = 'j6.6h'   # Graphic the copyright checksum covers
+COPYRIGHT_START     = 0x5C0
+COPYRIGHT_END       = 0x5C0 + 0x66
+CHECKSUM_ROM        = '3j.3h'   # Where the game keeps the expected sum (big-endian)
+CHECKSUM_OFFSET     = 0xE25
+DUMP_MATCH, DUMP_OTHER_SET, DUMP_MODIFIED = 'match', 'other set', 'modified'
+
+#########################################
+# Digest Functions
+#########################################
+
+def known_dumps(zip_path=None):
+    """CRC32 of every file in the MAME zip, from its directory (nothing is decompressed)
+
+    Returns:
+        {crc32: [(rom set, logical ROM name), ...]}
+    """
+    zip_path = zip_path or roms.ROM_ZIP_PATH
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        crcs = {info.filename: info.CRC for info in zip_ref.infolist()}
+
+    dumps = {}
+    for rom_set, config in ROM_SETS.items():
+        for rom_name, path in config['files'].items():
+            crc = crcs.get(os.path.basename(path))
+            if crc is not None:
+                dumps.setdefault(crc, []).append((rom_set, rom_name))
+    return dumps
+
+class RomDigests:
+    """CRC32/SHA1 per ROM and the copyright checksum, re-hashed only where dirty"""
+
+    def __init__(self, dumps=None):
+        self.dumps = dumps or {}
+        self.snapshots = {}         # ROM -> bytes as last hashed
+        self.states = {}            # ROM -> [(CRC32, SHA1 object)] at the start of each block
+        self.crc32 = {}
+        self.sha1 = {}
+        self.checksum = None
+        self.rehashed = 0           # Blocks hashed so far, for profiling
+        self.refresh()
+
+    def refresh(self):
+        """Bring the digests up to date with rom_cache
+
+        Returns:
+            List of ROMs that had changed since the last refresh
+        """
+        changed = []
+        for rom_name, data in rom_cache.items():
+            snapshot = self.snapshots.get(rom_name)
+            if snapshot is not None and len(snapshot) == len(data) and data == snapshot:
+                continue  # memcmp, no hashing for clean ROMs
+
+            current = bytes(data)
+            if snapshot is not None and len(snapshot) == len(current):
+                dirty = dirty_blocks(snapshot, current)
+                if rom_name == COPYRIGHT_ROM and self.checksum is not None:
+                    self.update_checksum(snapshot, current, dirty)
+                self.hash_from(rom_name, current, int(np.argmax(dirty)))
+            else:
+                self.hash_from(rom_name, current, 0)
+            self.snapshots[rom_name] = current
+            changed.append(rom_name)
+
+        if self.checksum is None and COPYRIGHT_ROM in rom_cache:
+            self.checksum = roms.calculate_copyright_checksum()
+        return changed
+
+    def hash_from(self, rom_name, data, first_block):
+        """Re-hash data from first_block on, resuming the hash states saved there"""
+        states = self.states.get(rom_name, [])[:first_block + 1]
+        if states:
+            crc, sha1 = states[-1][0], states[-1][1].copy()
+            start = (len(states) - 1) * DIGEST_BLOCK_SIZE
+            states.pop()
+        else:
+            crc, sha1, start = 0, hashlib.sha1(), 0
+        for offset in range(start, len(data), DIGEST_BLOCK_SIZE):
+            states.append((crc, sha1.copy()))
+            block = data[offset:offset + DIGEST_BLOCK_SIZE]
+            crc = zlib.crc32(block, crc)
+            sha1.update(block)
+            self.rehashed += 1
+        self.states[rom_name] = states
+        self.crc32[rom_name] = crc
+        self.sha1[rom_name] = sha1.hexdigest()
+
+    def update_checksum(self, old, new, dirty):
+        """Move the copyright sum by the byte deltas of the dirty blocks inside its range"""
+        delta = 0
+        for block in np.flatnonzero(dirty):
+            lo = max(int(block) * DIGEST_BLOCK_SIZE, COPYRIGHT_START)
+            hi = min((int(block) + 1) * DIGEST_BLOCK_SIZE, COPYRIGHT_END)
+            if lo < hi:
+                delta += sum(new[lo:hi]) - sum(old[lo:hi])
+        self.checksum = (self.checksum + delta) & 0xFFFF
+
+    def checksum_stored(self):
+        """The checksum the game will compare against (from 3j.3h)"""
+        data = rom_cache[CHECKSUM_ROM]
+        return data[CHECKSUM_OFFSET] << 8 | data[CHECKSUM_OFFSET + 1]
+
+    def dump_status(self, rom_name):
+        """DUMP_MATCH if a ROM is still its set's dump, DUMP_OTHER_SET if it is another set's, else DUMP_MODIFIED"""
+        owners = self.dumps.get(self.crc32.get(rom_name), [])
+        if (roms.CURRENT_ROM_SET, rom_name) in owners:
+            return DUMP_MATCH
+        return DUMP_OTHER_SET if owners else DUMP_MODIFIED
+
+    def modified(self):
+        """ROMs that no longer match their set's dump"""
+        return [rom_name for rom_name in self.crc32 if self.dump_status(rom_name) != DUMP_MATCH]
+
+    def summary(self):
+        """One-line status, e.g. 'All 15 ROMs match Konami' or '2 modified: m1.1h, c8.8i'"""
+        self.refresh()
+        modified = self.modified()
+        if not modified:
+            text = f"All {len(self.crc32)} ROMs match {roms.CURRENT_ROM_SET}"
+        else:
+            text = f"{len(modified)} modified: {', '.join(modified)}"
+        if CHECKSUM_ROM in rom_cache and self.checksum is not None and self.checksum != self.checksum_stored():
+            text += " - copyright checksum will be updated on save"
+        return text
+
+def dirty_blocks(old, new):
+    """(blocks,) bool mask of the DIGEST_BLOCK_SIZE blocks where two equal-length buffers differ"""
+    old = np.frombuffer(old, dtype=np.uint8)
+    new = np.frombuffer(new, dtype=np.uint8)
+    padded = -len(old) % DIGEST_BLOCK_SIZE
+    changed = np.concatenate((old != new, np.zeros(padded, dtype=bool)))
+    return changed.reshape(-1, DIGEST_BLOCK_SIZE).any(axis=1)
+
+rom_digests = None
+
+def get_rom_digests():
+    """Get the digest tracker for the loaded ROMs, refreshed"""
+    global rom_digests
+    if rom_digests is None:
+        try:
+            dumps = known_dumps()
+        except (OSError, zipfile.BadZipFile) as e:
+            logging.info(f"No known dumps to compare against: {e}")
+            dumps = {}
+        rom_digests = RomDigests(dumps)
+    else:
+        rom_digests.refresh()
+    return rom_digests
+
+def reset_rom_digests():
+    """Drop the digests after new ROMs are loaded"""
+    global rom_digests
+    rom_digests = None
+
+register_callback('roms_loaded', reset_rom_digests)
@@ -0,0 +1,322 @@
+"""PNG sprite-sheet export and PNG import of the graphics, map image export - no Tk required"""
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from .roms import rom_cache, trigger_callback
+from .graphics import (PALETTE_NAMES, UI_GRAPHICS_CONFIG, TREASURE_GRAPHICS_CONFIG, FONT_ROM, load_palettes_from_rom,
+                       palette_rgba, load_tile_bank, load_font_bank, load_treasure_bank, load_graphic,
+                       get_font_name, tile_location, font_offset, write_bank, get_asset_store, render_tile_map)
+from .maps import num_maps, load_visual_map_from_cache
+from .levels import write_level_file
+
+#########################################
+# Sprite Sheet Data Setup
+#########################################
+
+SHEET_CLASSES    = ['tiles', 'fonts', 'ui', 'treasures']  # Asset classes that get a sheet
+SHEET_COLUMNS    = {'tiles': 16, 'fonts': 15, 'ui': 4, 'treasures': 4}
+SHEET_BACKGROUND = (32, 32, 32)   # Gutter color, distinct from the games' black
+SHEET_LABEL_COLOR = (220, 220, 220)
+SHEET_BACKGROUND_INDEX = 16       # Color indexes past the 16 palette entries
+SHEET_LABEL_INDEX = 17
+SHEET_LABEL_HEIGHT = 12           # Pixels above each cell for its label
+SHEET_PADDING    = 4              # Pixels around each cell
+LABEL_CHAR_WIDTH = 6              # Default PIL bitmap font advance
+
+#########################################
+# Sprite Sheet Functions
+#########################################
+
+def load_sheet_assets(sheet_class):
+    """Decode one asset class as (graphics, labels)
+
+    Tiles, fonts and treasures come back as one (N, H, W) bank, the odd-sized
+    UI graphics as a list. Fonts get colors 3 and 15 swapped (see
+    swap_font_colors), otherwise their foreground is black on black in every palette.
+    """
+    if sheet_class == 'tiles':
+        bank = load_tile_bank()
+        return bank, [f"{tile_id:02X}" for tile_id in range(len(bank))]
+    if sheet_class == 'fonts':
+        bank = swap_font_colors(load_font_bank())
+        return bank, [get_font_name(font_id) for font_id in range(len(bank))]
+    if sheet_class == 'treasures':
+        return load_treasure_bank(), list(TREASURE_GRAPHICS_CONFIG)
+    if sheet_class == 'ui':
+        return [load_graphic(config) for config in UI_GRAPHICS_CONFIG.values()], list(UI_GRAPHICS_CONFIG)
+    raise ValueError(f"Unknown sheet class {sheet_class!r} (expected one of {', '.join(SHEET_CLASSES)})")
+
+def swap_font_colors(indexes):
+    """Swap font colors 15 (black in every palette) and 3 (grey), in place
+
+    The font editor remaps 15 -> 3 one way; a swap shows fonts the same but
+    keeps any real color 3 pixels apart, so a sheet imports back byte for byte.
+    """
+    threes = indexes == 3
+    indexes[indexes == 15] = 3
+    indexes[threes] = 15
+    return indexes
+
+def sheet_geometry(graphics, labels, columns, scale=2):
+    """Grid of a sheet: (columns, rows, cell width, cell height, graphic top within a cell)"""
+    graphic_h = max(graphic.shape[0] for graphic in graphics) * scale
+    graphic_w = max(graphic.shape[1] for graphic in graphics) * scale
+    cell_w = max(graphic_w, max(len(label) for label in labels) * LABEL_CHAR_WIDTH) + SHEET_PADDING * 2
+    cell_h = graphic_h + SHEET_LABEL_HEIGHT + SHEET_PADDING * 2
+    columns = min(columns, len(graphics))
+    rows = -(-len(graphics) // columns)
+    return columns, rows, cell_w, cell_h, SHEET_PADDING + SHEET_LABEL_HEIGHT
+
+def compose_sheet_indexes(graphics, labels, columns, scale=2):
+    """Lay graphics and their labels out on one grid of color indexes
+
+    0-15 are palette colors, SHEET_BACKGROUND_INDEX the gutter and
+    SHEET_LABEL_INDEX the label text, so the sheet is palette independent.
+    """
+    count = len(graphics)
+    columns, rows, cell_w, cell_h, top = sheet_geometry(graphics, labels, columns, scale)
+    cells = np.full((rows * columns, cell_h, cell_w), SHEET_BACKGROUND_INDEX, dtype=np.uint8)
+    if isinstance(graphics, np.ndarray):
+        # Same-sized bank: every cell in one slice assignment
+        scaled = graphics.repeat(scale, axis=1).repeat(scale, axis=2)
+        cells[:count, top:top + scaled.shape[1], SHEET_PADDING:SHEET_PADDING + scaled.shape[2]] = scaled
+    else:
+        for i, graphic in enumerate(graphics):
+            scaled = graphic.repeat(scale, axis=0).repeat(scale, axis=1)
+            cells[i, top:top + scaled.shape[0], SHEET_PADDING:SHEET_PADDING + scaled.shape[1]] = scaled
+
+    sheet = cells.reshape(rows, columns, cell_h, cell_w).transpose(0, 2, 1, 3).reshape(rows * cell_h, columns * cell_w)
+
+    # Labels are drawn once as a mask and burned into the index image
+    label_mask = Image.new('1', (sheet.shape[1], sheet.shape[0]))
+    draw = ImageDraw.Draw(label_mask)
+    for i, label in enumerate(labels):
+        draw.text(((i % columns) * cell_w + SHEET_PADDING, (i // columns) * cell_h + 1), label, fill=1)
+    sheet[np.asarray(label_mask)] = SHEET_LABEL_INDEX
+    return sheet
+
+def render_sheet(sheet_indexes, palette):
+    """Color a composed sheet with one palette
+    
+    The sheet stays an indexed ('P') image - the palette is just its color
+    table, so nothing per pixel changes and the PNG is a third of the size.
+    """
+    colors = np.vstack([palette_rgba(palette)[:, :3],
+                        np.array([SHEET_BACKGROUND, SHEET_LABEL_COLOR], dtype=np.uint8)])
+    image = Image.fromarray(sheet_indexes, 'P')
+    image.putpalette(colors.tobytes())
+    return image
+
+def sheet_filename(sheet_class, palette_idx):
+    """e.g. tiles_map-1.png"""
+    return f"{sheet_class}_{PALETTE_NAMES[palette_idx].lower().replace(' ', '-')}.png"
+
+def export_sprite_sheets(output_dir, palette_indexes=None, sheet_classes=None, scale=2, jobs=None):
+    """Render labeled PNG sprite sheets for each asset class under each palette
+
+    Every asset class is decoded, laid out and labeled once; each palette then
+    only costs a color table and the PNG write, and the sheets are written
+    on a thread pool.
+
+    Args:
+        output_dir: Folder for the PNGs (created if needed)
+        palette_indexes: Palettes to render (default all seven)
+        sheet_classes: Subset of SHEET_CLASSES (default all)
+        scale: Integer pixel scale
+        jobs: Writer threads (default: ThreadPoolExecutor's choice)
+
+    Returns:
+        List of written paths
+    """
+    palette_indexes = range(len(PALETTE_NAMES)) if palette_indexes is None else palette_indexes
+    sheet_classes = SHEET_CLASSES if sheet_classes is None else sheet_classes
+    os.makedirs(output_dir, exist_ok=True)
+    palettes = load_palettes_from_rom()
+
+    layouts = {}
+    for sheet_class in sheet_classes:
+        graphics, labels = load_sheet_assets(sheet_class)
+        layouts[sheet_class] = compose_sheet_indexes(graphics, labels, SHEET_COLUMNS[sheet_class], scale)
+
+    def write_sheet(sheet_class, palette_idx):
+        path = os.path.join(output_dir, sheet_filename(sheet_class, palette_idx))
+        render_sheet(layouts[sheet_class], palettes[palette_idx]).save(path, compress_level=1)
+        return path
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(write_sheet, sheet_class, palette_idx)
+                   for sheet_class in sheet_classes for palette_idx in palette_indexes]
+        paths = [future.result() for future in futures]
+
+    logging.info(f"Exported {len(paths)} sprite sheets to {output_dir}")
+    return paths
+
+#########################################
+# Map Export Functions
+#########################################
+
+def render_map_image(map_index, scale=1):
+    """Render a map's visual layer at full resolution in its own palette"""
+    tile_ids = load_visual_map_from_cache(map_index)
+    image = Image.fromarray(render_tile_map(load_tile_bank(), tile_ids, load_palettes_from_rom()[map_index]), 'RGBA')
+    if scale > 1:
+        image = image.resize((image.width * scale, image.height * scale), Image.NEAREST)
+    return image
+
+def export_maps(output_dir, map_indexes=None, level_format='.jsonl', scale=1):
+    """Write each map as map-N.png plus a map-N level file
+
+    Returns:
+        List of written paths
+    """
+    map_indexes = range(num_maps) if map_indexes is None else map_indexes
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for map_index in map_indexes:
+        base = os.path.join(output_dir, f"map-{map_index + 1}")
+        render_map_image(map_index, scale).save(base + '.png', compress_level=1)
+        write_level_file(base + level_format, [map_index])
+        paths += [base + '.png', base + level_format]
+
+    logging.info(f"Exported {len(paths) // 2} maps to {output_dir}")
+    return paths
+
+#########################################
+# PNG Import Functions
+#########################################
+
+def asset_layout(kind, key):
+    """Where and how an asset is stored: (rom name, offset, height, width, mode, bytes_per_row, rotate)
+
+    height/width are in ROM orientation; rotated assets are shown (and
+    exported) turned 90°, i.e. width x height.
+    """
+    if kind == 'tile':
+        return tile_location(key) + (16, 16, 'tile', None, True)
+    if kind == 'font':
+        return (FONT_ROM, font_offset(key), 8, 8, 'tile', None, True)
+    configs = {'ui': UI_GRAPHICS_CONFIG, 'treasure': TREASURE_GRAPHICS_CONFIG}
+    if kind not in configs:
+        raise ValueError(f"Unknown asset kind {kind!r}")
+    config = configs[kind][key]
+    return (config['rom'], config['offset'], config['height'], config['width'], config['mode'],
+            config.get('bytes_per_row'), bool(config.get('rotate')))
+
+def quantize_image(image, palette, shape=None):
+    """Map every pixel of an image to the nearest color of a 16 color ARGB palette
+
+    Indexed PNGs are matched through their color table, so a color the palette
+    holds twice (0 and 15 are both black) keeps the index it was exported with.
+    An image that is an exact integer multiple of shape is sampled back down.
+
+    Returns:
+        (indexes, inexact) - (H, W) palette indexes and a mask of the pixels
+        that had no exact palette match
+    """
+    colors = palette_rgba(palette)[:, :3].astype(np.int32)
+    if image.mode == 'P':
+        # Quantize the (<= 256 entry) color table instead of every pixel
+        table = np.asarray(image.getpalette()[:768], dtype=np.int32).reshape(-1, 3)
+        distances = ((table[:, None, :] - colors[None, :, :]) ** 2).sum(axis=2)
+        lookup = distances.argmin(axis=1)
+        # Keep an entry's own slot when that slot is an exact match
+        own = np.arange(min(len(table), 16))
+        own = own[distances[own, own] == 0]
+        lookup[own] = own
+        pixels = np.asarray(image)
+        indexes = lookup[pixels]
+        inexact = distances.min(axis=1)[pixels] > 0
+    else:
+        rgb = np.asarray(image.convert('RGB'), dtype=np.int32)
+        distances = ((rgb[:, :, None, :] - colors[None, None, :, :]) ** 2).sum(axis=3)
+        indexes = distances.argmin(axis=2)
+        inexact = distances.min(axis=2) > 0
+
+    if shape is not None and indexes.shape != tuple(shape):
+        scale_y, scale_x = indexes.shape[0] // shape[0], indexes.shape[1] // shape[1]
+        if scale_y != scale_x or scale_y < 1 or indexes.shape != (shape[0] * scale_y, shape[1] * scale_x):
+            raise ValueError(f"Image is {indexes.shape[1]}x{indexes.shape[0]}, "
+                             f"expected {shape[1]}x{shape[0]} or an integer multiple")
+        indexes = indexes[::scale_y, ::scale_x]
+        inexact = inexact.reshape(shape[0], scale_y, shape[1], scale_x).any(axis=(1, 3))
+    return indexes.astype(np.uint8), inexact
+
+def import_asset(kind, key, image, palette_idx, notify=True):
+    """Quantize an image to a palette and pack it into the asset's place in ROM
+
+    Handles the asset's layout and rotation, and swaps fonts' colors 3 and 15
+    back the way load_sheet_assets swapped them.
+
+    Returns:
+        Number of pixels without an exact palette match
+    """
+    rom_name, offset, height, width, mode, bytes_per_row, rotate = asset_layout(kind, key)
+    shape = (width, height) if rotate else (height, width)
+    indexes, inexact = quantize_image(image, load_palettes_from_rom()[palette_idx], shape)
+    if kind == 'font':
+        swap_font_colors(indexes)
+
+    start, end = write_bank(rom_cache[rom_name], [offset], indexes[None], height, width, mode, bytes_per_row,
+                            rotate=rotate)
+    get_asset_store().invalidate_rom_range(rom_name, start, end)
+    if notify and kind in ('tile', 'font'):
+        trigger_callback(f'{kind}_changed', key)
+
+    if inexact.any():
+        logging.warning(f"{kind} {key}: {int(inexact.sum())} pixels had no exact match in {PALETTE_NAMES[palette_idx]}")
+    return int(inexact.sum())
+
+SHEET_KINDS = {'tiles': 'tile', 'fonts': 'font', 'ui': 'ui', 'treasures': 'treasure'}
+
+def parse_sheet_filename(path):
+    """(sheet class, palette index) from an exported name like tiles_map-1.png"""
+    filename = os.path.basename(path)
+    for sheet_class in SHEET_KINDS:
+        for palette_idx in range(len(PALETTE_NAMES)):
+            if sheet_filename(sheet_class, palette_idx) == filename:
+                return sheet_class, palette_idx
+    raise ValueError(f"Can't tell the asset class and palette from {os.path.basename(path)} "
+                     f"(expected e.g. {sheet_filename('tiles', 0)})")
+
+def import_sprite_sheet(path, sheet_class=None, palette_idx=None):
+    """Import every asset from a sprite sheet laid out like export_sprite_sheets
+
+    The class and palette default to what the filename says; the scale is
+    worked out from the image size.
+
+    Returns:
+        {asset key: inexact pixel count} for the assets that had any
+    """
+    if sheet_class is None or palette_idx is None:
+        sheet_class, palette_idx = parse_sheet_filename(path)
+    kind = SHEET_KINDS[sheet_class]
+    image = Image.open(path)
+    image.load()
+
+    graphics, labels = load_sheet_assets(sheet_class)
+    keys = list(range(len(graphics))) if kind in ('tile', 'font') else labels
+    for scale in range(1, 17):
+        columns, rows, cell_w, cell_h, top = sheet_geometry(graphics, labels, SHEET_COLUMNS[sheet_class], scale)
+        if image.size == (columns * cell_w, rows * cell_h):
+            break
+    else:
+        raise ValueError(f"{os.path.basename(path)} is {image.size[0]}x{image.size[1]}, "
+                         f"which doesn't match any scale of the {sheet_class} sheet layout")
+
+    inexact = {}
+    for i, (key, graphic) in enumerate(zip(keys, graphics)):
+        x = (i % columns) * cell_w + SHEET_PADDING
+        y = (i // columns) * cell_h + top
+        cell = image.crop((x, y, x + graphic.shape[1] * scale, y + graphic.shape[0] * scale))
+        count = import_asset(kind, key, cell, palette_idx, notify=False)
+        if count:
+            inexact[key] = count
+    if kind in ('tile', 'font'):
+        trigger_callback(f'{kind}_changed', None)
+
+    logging.info(f"Imported {len(keys)} {sheet_class} from {path}")
+    return inexact
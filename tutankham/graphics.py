@@ -0,0 +1,763 @@
+"""Palette, font and tile codecs over the ROM cache - no Tk required"""
+import numpy as np
+import logging
+
+from .roms import rom_cache, ROM_CONFIG, trigger_callback, register_callback
+
+#########################################
+# Graphics Data Setup
+#########################################
+
+# Palette ROM configuration
+PALETTE_ROM_PATH = "./m1.1h"
+PALETTE_FILE_OFFSETS = [0x2D1, 0x2E1, 0x2F1, 0x301, 0x311, 0x321, 0x331]
+tile_size          = 16 * 16 // 2 # Tile Size
+# Tile names for display (0x00 - 0x9F, 160 tiles total)
+TILE_NAMES = {
+    # Empty Path
+    0x26: "Empty Path",
+    # Adventurer
+    0x23: "Man Down 1",      0x24: "Man Down 2",        0x25: "Man Down 3",
+    0x29: "Man Down 4",      0x2A: "Man Up 1",          0x2B: "Man Up 2",
+    0x2C: "Man Up 3",        0x2D: "Man Up 4",          0x2E: "Man Left 1",
+    0x2F: "Man Left 2",      0x30: "Man Left 3",        0x31: "Man Left 4",
+    0x3A: "Man Right 1",     0x3B: "Man Right 2",       0x3C: "Man Right 3", 
+    0x3D: "Man Right 4",
+    # Adventurer Carrying Key
+    0x4E: "Man+Key Down 1",   0x4F: "Man+Key Down 2",     0x50: "Man+Key Down 3",
+    0x51: "Man+Key Down 4",   0x52: "Man+Key Up 1",       0x53: "Man+Key Up 2",
+    0x54: "Man+Key Up 3",     0x55: "Man+Key Up 4",       0x5A: "Man+Key Left 1", 
+    0x5B: "Man+Key Left 2",   0x5C: "Man+Key Left 3",     0x5D: "Man+Key Left 4", 
+    0x5E: "Man+Key Right 1",  0x5F: "Man+Key Right 2",    0x60: "Man+Key Right 3", 
+    0x61: "Man+Key Right 4",
+    # Walls 
+    0x00: "Wall 01",          0x01: "Wall 02",            0x02: "Wall 03", 
+    0x03: "Wall 04",          0x04: "Wall 05",            0x05: "Wall 06", 
+    0x06: "Wall 07",          0x07: "Wall 08",            0x08: "Wall 09", 
+    0x09: "Wall 10",          0x0A: "Wall 11",            0x0B: "Wall 12",
+    0x0C: "Wall 13",          0x0D: "Wall 14",            0x0E: "Wall 15", 
+    0x11: "Wall 16",          0x13: "Wall 17",            0x1F: "Wall 18", 
+    0x20: "Wall 19",          0x27: "Wall 20",            0x28: "Wall 21",
+    # Monster Spawn Cloud
+    0x56: "Spawn Cloud 1",    0x57: "Spawn Cloud 2",      0x58: "Spawn Cloud 3", 
+    0x59: "Spawn Cloud 4",    0x63: "Spawn Cloud 5", 
+    # Adventurer Death (Skull)
+    0x67: "Man Death 1",      0x68: "Man Death 2",        0x69: "Man Death 3", 
+    0x6A: "Man Death 4",
+    # Monster Death (Particles)
+    0x6B: "Monster Death 1",  0x6C: "Monster Death 2",    0x6D: "Monster Death 3",
+    0x6E: "Monster Death 4", 
+    # Object Boxes 
+    0x4A: "Empty Crown Box",  0x21: "Empty Ring Box",     0x22: "Empty Key Box",
+    0x62: "Full Crown Box",   0x6F: "Full Ring Box",      0x70: "Full Key Box",
+    # Score Boxes
+    0x80: "Score Box - 500",  0x81: "Score Box - 1000",   0x82: "Score Box - 1500",
+    0x83: "Score Box - 2000", 0x84: "Score Box - 3000",   0x85: "Score Box - 4000",
+    # Teleport Pillars
+    0x64: "Teleport Left",    0x65: "Teleport Right",
+    # Monster Spawner Walls
+    0x1D: "Spawn Top Left",   0x0F: "Spawn Top Center",   0x10: "Spawn Top Right", 
+    0x1B: "Spawn Middle Left",                            0x12: "Spawn Middle Right", 
+    0x18: "Spawn Bottom Left",0x15: "Spawn Bottom Center",0x14: "Spawn Bottom Right",
+    # Keyhole
+    0x72: "Keyhole 1",        0x16: "Keyhole 2",          0x1E: "Keyhole 3",
+    0x4D: "Keyhole 4",        0x66: "Keyhole 5",          0x71: "Keyhole 6",
+    # Big Door
+    0x73: "Door Top Left",    0x74: "Door Top Center",    0x75: "Door Top Right", 
+    0x76: "Door Middle Left", 0x77: "Door Middle Center", 0x78: "Door Middle Right", 
+    0x79: "Door Bottom Left", 0x7A: "Door Bottom Center", 0x7B: "Door Bottom Right",
+    # Tut Mask
+    0x86: "Tut Mask Left",    0x87: "Tut Mask Right",     0x88: "Tut Mask Center",
+    # Cobra
+    0x36: "Cobra Left 1",     0x37: "Cobra Left 2",       0x38: "Cobra Left 3", 
+    0x39: "Cobra Left 4",     0x46: "Cobra Right 1",      0x47: "Cobra Right 2", 
+    0x48: "Cobra Right 3",    0x49: "Cobra Right 4", 
+    # Vulture
+    0x3E: "Vulture Left 1",   0x3F: "Vulture Left 2",     0x40: "Vulture Left 3",
+    0x41: "Vulture Left 4",   0x42: "Vulture Right 1",    0x43: "Vulture Right 2",
+    0x44: "Vulture Right 3",  0x45: "Vulture Right 4", 
+    # Bat
+    0x32: "Bat 1",            0x33: "Bat 2",              0x34: "Bat 3", 
+    0x35: "Bat 4",            0x7C: "Bat 5",              0x7D: "Bat 6", 
+    0x7E: "Bat 7", 
+    # Dragon
+    0x89: "Dragon Left 1",    0x8A: "Dragon Left 2",      0x8B: "Dragon Left 3",
+    0x8C: "Dragon Left ",     0x8D: "Dragon Right 1",     0x8E: "Dragon Right 2",
+    0x8F: "Dragon Right 3",   0x90: "Dragon Right 4",
+    # Gryphon
+    0x91: "Gryphon Left 1",   0x92: "Gryphon Left 2",     0x93: "Gryphon Left 3",
+    0x94: "Gryphon Left 4",   0x95: "Gryphon Right 1",    0x96: "Gryphon Right 2",
+    0x97: "Gryphon Right 3",  0x98: "Gryphon Right 4",
+    # Glaive
+    0x99: "Glaive 1",         0x9A: "Glaive 2",           0x9B: "Glaive 3",
+    0x9C: "Glaive 4",         0x9D: "Glaive 5",           0x9E: "Glaive 6",
+    0x9F: "Glaive 7",
+   # Unknown/Unused
+    0x17: "Flame 1 (Unused)",
+    0x19: "Flame 2 (Unused)", 
+    0x1A: "Flame 3 (Unused)",
+    0x1C: "Flame 4 (Unused)", 
+    0x4B: "Score Box - 2000 (Unused)", 
+    0x4C: "Score Box - 3000 (Unused)",
+    0x7F: "Rock? (Unused)"
+}
+
+# UI Graphics configuration
+UI_GRAPHICS_CONFIG = {
+    "Copyright Notice": {
+        'rom': 'j6.6h',
+        'offset': 0x05C0,
+        'width': 16,
+        'height': 102,
+        'mode': 'sprite',
+        'bytes_per_row': 16,
+        'rotate': True,
+        'zoom': 5,
+        'description': 'Copyright symbol displayed on title screen'
+    },
+    "Timer Banner": {
+        'rom': 'j6.6h',
+        'offset': 0x08F0,
+        'width': 32,
+        'height': 39,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 6,
+        'description': 'Timer display banner at top of screen'
+    },
+    "Player Counter": {
+        'rom': 'j6.6h',
+        'offset': 0x05A0,
+        'width': 8,
+        'height': 8,
+        'mode': 'sprite',
+        'bytes_per_row': 8,
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Player life counter icon'
+    },
+    "Smart Bomb Counter": {
+        'rom': 'j6.6h',
+        'offset': 0x0B70,
+        'width': 16,
+        'height': 14,
+        'mode': 'sprite',
+        'bytes_per_row': 16,
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Genie lamp/smart bomb counter icon'
+    },
+    "Stage Banner": {
+        'rom': 'j6.6h',
+        'offset': 0x0C60,
+        'width': 30,
+        'height': 32,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Stage number banner display'
+    },
+    "Title Letter - T": {
+        'rom': 'c8.8i',
+        'offset': 0x0C00,
+        'width': 30,
+        'height': 25,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Game Title - Upper Case T'
+    },
+    "Title Letter - u": {
+        'rom': 'c8.8i',
+        'offset': 0x0D77,
+        'width': 20,
+        'height': 20,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Game Title - Lower Case u'
+    },
+    "Title Letter - t": {
+        'rom': 'c8.8i',
+        'offset': 0x0E3F,
+        'width': 26,
+        'height': 14,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Game Title - Lower Case t'
+    },
+    "Title Letter - a": {
+        'rom': 'c6.6i',
+        'offset': 0x0E00,
+        'width': 20,
+        'height': 20,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Game Title - Lower Case a'
+    },
+    "Title Letter - n": {
+        'rom': 'c7.7i',
+        'offset': 0x0E00,
+        'width': 20,
+        'height': 20,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Game Title - Lower Case n'
+    },
+    "Title Letter - k": {
+        'rom': 'c6.6i',
+        'offset': 0x0EC8,
+        'width': 30,
+        'height': 20,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Game Title - Lower Case k'
+    },
+    "Title Letter - h": {
+        'rom': 'c7.7i',
+        'offset': 0x0EC8,
+        'width': 30,
+        'height': 20,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Game Title - Lower Case h'
+    },
+    "Title Letter - m": {
+        'rom': 'c8.8i',
+        'offset': 0x0EF5,
+        'width': 20,
+        'height': 26,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'Game Title - Lower Case m'
+    }
+}
+
+# Treasure graphics configuration (separate from UI graphics)
+TREASURE_GRAPHICS_CONFIG = {
+    "Treasure 1 (Map)": {
+        'rom': 'c9.9i',
+        'offset': 0x0000,
+        'width': 44,
+        'height': 44,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'End of level treasure - World Map'
+    },
+    "Treasure 2 (Genie Lamp)": {
+        'rom': 'c9.9i',
+        'offset': 0x03DE,
+        'width': 44,
+        'height': 44,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'End of level treasure - Genie Lamp'
+    },
+    "Treasure 3 (Treasure Chest)": {
+        'rom': 'c9.9i',
+        'offset': 0x07BC,
+        'width': 44,
+        'height': 44,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'End of level treasure - Treasure Chest'
+    },
+    "Treasure 4 (Tut Mask)": {
+        'rom': 'c9.9i',
+        'offset': 0x0B9A,
+        'width': 44,
+        'height': 44,
+        'mode': 'tile',
+        'rotate': True,
+        'zoom': 10,
+        'description': 'End of level treasure - Tutankhamun Mask'
+    }
+}
+
+FONT_NAMES = {
+    # Digits (0x0000-0x013F, 10 chars × 32 bytes)
+    0: "0",   1: "1",  2: "2",  3: "3",  4: "4",
+    5: "5",   6: "6",  7: "7",  8: "8",  9: "9",
+    # Special characters (0x0140-0x021F, 7 chars × 32 bytes)
+    10: "©", 11: "□", 12: ".", 13: "!", 14: "?",
+    15: "♪", 16: " ",
+    # Alphabet (0x0220-0x055F, 26 chars × 32 bytes)
+    17: "A", 18: "B", 19: "C", 20: "D", 21: "E", 
+    22: "F", 23: "G", 24: "H", 25: "I", 26: "J", 
+    27: "K", 28: "L", 29: "M", 30: "N", 31: "O", 
+    32: "P", 33: "Q", 34: "R", 35: "S", 36: "T", 
+    37: "U", 38: "V", 39: "W", 40: "X", 41: "Y", 
+    42: "Z"
+}
+FONT_ROM   = 'j6.6h'
+font_size  = 8 * 8 // 2       # Font Character Size
+FONT_GROUPS = [               # (offset, count) - digits 0-9, special characters, A-Z
+    (0x0000, 10),
+    (0x0140, 7),
+    (0x0220, 26)]
+NUM_FONTS  = sum(count for _, count in FONT_GROUPS)
+PALETTE_NAMES = [
+    "Map 1",
+    "Map 2", 
+    "Map 3",
+    "Map 4",
+    "High Score",
+    "Title Screen",
+    "Player Start"
+]
+
+#########################################
+# Palette Handling Functions
+#########################################
+
+def load_palettes_from_rom():
+    """Load all 7 palettes from ROM (4 maps + 3 unknowns)"""
+    return [load_palette(palette_idx) for palette_idx in range(len(PALETTE_FILE_OFFSETS))]
+
+def load_palette(palette_idx):
+    """Load one 16 color palette from ROM"""
+    rom_data = rom_cache[ROM_CONFIG['palette_rom']]
+    offset = PALETTE_FILE_OFFSETS[palette_idx]
+    palette = []
+    for i in range(16):  # 16 colors per palette
+        byte_val = rom_data[offset + i]
+        r, g, b = decode_palette_byte(byte_val)
+        palette.append((255, r, g, b))  # Keep ARGB format for compatibility
+    return palette
+
+def decode_palette_byte(byte_val):
+    """
+    Decode a single palette byte to RGB.
+    Format: BBGGGRRR (bits 7-0)
+    """
+    r = (byte_val & 0b00000111)      # bits 0-2
+    g = (byte_val & 0b00111000) >> 3 # bits 3-5
+    b = (byte_val & 0b11000000) >> 6 # bits 6-7
+    
+    # Scale to 0-255 range
+    r_scaled = int(r * 255 / 7)
+    g_scaled = int(g * 255 / 7)
+    b_scaled = int(b * 255 / 3)
+    
+    return (r_scaled, g_scaled, b_scaled)
+
+def encode_palette_byte(r, g, b):
+    """
+    Encode RGB values back to palette byte format.
+    """
+    r_bits = int(round(r * 7 / 255)) & 0b111
+    g_bits = int(round(g * 7 / 255)) & 0b111
+    b_bits = int(round(b * 3 / 255)) & 0b11
+    
+    return r_bits | (g_bits << 3) | (b_bits << 6)
+
+#########################################
+# Font Handling Functions
+#########################################
+
+def load_fonts():
+    """Load all 43 font characters from j6.6h ROM"""
+    return list(load_font_bank())
+
+def font_offset(font_id):
+    """Offset of a font character in j6.6h"""
+    for group_offset, count in FONT_GROUPS:
+        if font_id < count:
+            return group_offset + font_id * font_size
+        font_id -= count
+    raise IndexError("Font character beyond font ROM")
+
+def load_font(font_id):
+    """Decode one 8x8 font character"""
+    return decode_bank(rom_cache[FONT_ROM], [font_offset(font_id)], 8, 8)[0]
+
+def get_font_name(font_id):
+    """Get human-readable name for a font character"""
+    return FONT_NAMES.get(font_id, f"Font {font_id}")
+
+#########################################
+# Tile Handling Functions
+#########################################
+
+def extract_pixels(rom, offset, height, width, mode='tile', bytes_per_row=None):
+    """
+    Generic 4bpp pixel extractor for ROM sprites/tiles.
+    
+    Supports two common layouts:
+    - 'tile': Standard row-major (8px=4 bytes/row). Default for square tiles.
+    - 'sprite': Interleaved even/odd scanlines (16 bytes per 2 rows). Default bytes_per_row=16.
+    
+    Args:
+        rom: bytearray/list/np.array of ROM data.
+        offset: Starting byte offset in ROM.
+        height: Pixel height.
+        width: Pixel width (must be even).
+        mode: 'tile' (row-major) or 'sprite' (interleaved scanlines).
+        bytes_per_row: For 'sprite' mode only; defaults to width//2 * 2 (padded to even).
+    
+    Returns:
+        (height, width) uint8 array of pixel indices (0-15).
+    
+    Examples:
+        # 8x8 tile (32 bytes)
+        tile = extract_pixels(rom, 0x1000, 8, 8)  # mode='tile' auto
+        # 16x16 sprite (interleaved, 16 bytes/2rows -> 128 bytes)
+        sprite = extract_pixels(rom, 0x2000, 16, 16, mode='sprite')
+        # Odd height sprite (17 rows -> final single scanline)
+        tall = extract_pixels(rom, 0x3000, 17, 32, mode='sprite', bytes_per_row=16)
+    """
+    assert width % 2 == 0, "Width must be even for 4bpp"
+    return decode_bank(rom, [offset], height, width, mode, bytes_per_row, rotate=False)[0]
+
+def rotate_tile(tile):
+    return np.rot90(tile, k=1)
+
+def apply_palette_to_tile(tile, palette):
+    """Color a tile (or any stack of tiles) with an ARGB palette, giving RGBA pixels"""
+    return palette_rgba(palette)[np.asarray(tile) % 16]
+
+def load_tiles():
+    """All tiles as a list - rows of the contiguous load_tile_bank() array"""
+    return list(load_tile_bank())
+
+def tile_location(tile_idx):
+    """(rom name, offset) of a tile, same numbering as load_tiles"""
+    rom_tile = tile_idx
+    for rom_name in ROM_CONFIG['tile_roms']:
+        num_tiles = len(rom_cache[rom_name]) // tile_size
+        if rom_tile < num_tiles:
+            return rom_name, rom_tile * tile_size
+        rom_tile -= num_tiles
+    raise IndexError(f"Tile 0x{tile_idx:02X} beyond tile ROMs")
+
+def load_tile(tile_idx):
+    """Decode a single tile without decoding the whole bank"""
+    rom_name, offset = tile_location(tile_idx)
+    return decode_bank(rom_cache[rom_name], [offset], 16, 16)[0]
+
+def count_tiles():
+    """Number of tiles across the tile ROMs"""
+    return sum(len(rom_cache.get(rom_name, b'')) // tile_size for rom_name in ROM_CONFIG['tile_roms'])
+
+def save_tile_changes(tile_idx, new_tile_data):
+    """Save an edited tile (16x16, rotated like load_tiles) back to ROM cache"""
+    rom_name, offset = tile_location(tile_idx)
+    
+    # Convert tile data back to ROM format (interleaved nibbles) and write to rom_cache
+    start, end = write_bank(rom_cache[rom_name], [offset], np.asarray(new_tile_data)[None], 16, 16)
+    get_asset_store().invalidate_rom_range(rom_name, start, end)
+    
+    # Trigger callback to refresh other windows
+    trigger_callback('tile_changed', tile_idx)
+    
+    logging.info(f"Saved tile 0x{tile_idx:02X}")
+
+def get_tile_name(tile_id):
+    """Get human-readable name for a tile"""
+    return TILE_NAMES.get(tile_id, f"Tile {tile_id:02X}")
+
+#########################################
+# Tile Bank Functions
+#########################################
+
+def byte_layout(height, width, mode='tile', bytes_per_row=None):
+    """(height, width/2) ROM byte offsets of each pixel pair, relative to the graphic's start
+    
+    'tile' rows are packed back to back; 'sprite' rows come in pairs, the odd
+    row in the second half of each bytes_per_row chunk (see extract_pixels).
+    """
+    rows = np.arange(height)
+    if mode == 'tile':
+        row_starts = rows * (width // 2)
+    elif mode == 'sprite':
+        if bytes_per_row is None:
+            bytes_per_row = width // 2
+        row_starts = (rows // 2) * bytes_per_row + (rows % 2) * (bytes_per_row // 2)
+    else:
+        raise ValueError("mode must be 'tile' or 'sprite'")
+    return row_starts[:, None] + np.arange(width // 2)[None, :]
+
+def decode_bank(rom, offsets, height, width, mode='tile', bytes_per_row=None, rotate=True):
+    """Decode same-sized graphics at each offset into one contiguous (N, H, W) uint8 array
+    
+    Bytes past the end of the ROM read as 0, like extract_pixels. With rotate
+    the graphics come out turned 90° like load_tiles, so the bank is (N, W, H).
+    """
+    rom = np.frombuffer(rom, dtype=np.uint8) if isinstance(rom, (bytes, bytearray)) else np.asarray(rom, dtype=np.uint8)
+    index = np.asarray(offsets, dtype=np.intp)[:, None, None] + byte_layout(height, width, mode, bytes_per_row)
+    data = np.where(index < len(rom), rom[np.minimum(index, len(rom) - 1)], 0).astype(np.uint8)
+    
+    pixels = np.empty(index.shape[:2] + (width,), dtype=np.uint8)
+    pixels[..., 0::2] = data & 0x0F      # Low nibble is the left pixel
+    pixels[..., 1::2] = data >> 4
+    if rotate:
+        pixels = np.ascontiguousarray(np.rot90(pixels, k=1, axes=(1, 2)))
+    return pixels
+
+def pack_bank(bank, rotate=True):
+    """Exact inverse of decode_bank: (N, H, W) pixels -> (N, H, W/2) ROM bytes"""
+    pixels = np.asarray(bank, dtype=np.uint8)
+    if rotate:
+        pixels = np.rot90(pixels, k=-1, axes=(1, 2))
+    return (pixels[..., 0::2] & 0x0F) | ((pixels[..., 1::2] & 0x0F) << 4)
+
+def write_bank(rom, offsets, bank, height, width, mode='tile', bytes_per_row=None, rotate=True,
+               region=None):
+    """Pack a bank straight into a ROM bytearray at each offset
+    
+    Args:
+        height, width: Graphic size in ROM orientation (as passed to decode_bank)
+        region: Optional (top, bottom, left, right) pixel rectangle in ROM
+                orientation - only the bytes holding those pixels are written,
+                so a single pixel edit rewrites a single byte
+    
+    Returns:
+        (start, end) byte range written, for invalidating decoded copies
+    """
+    view = np.frombuffer(rom, dtype=np.uint8)
+    layout = byte_layout(height, width, mode, bytes_per_row)
+    data = pack_bank(bank, rotate)
+    if region is not None:
+        top, bottom, left, right = region
+        pairs = slice(left // 2, (right + 1) // 2)
+        layout = layout[top:bottom, pairs]
+        data = data[:, top:bottom, pairs]
+    
+    index = np.asarray(offsets, dtype=np.intp)[:, None, None] + layout
+    in_rom = index < len(view)
+    written = index[in_rom]
+    view[written] = data[in_rom]
+    
+    if not len(written):
+        return len(view), len(view)
+    return int(written.min()), int(written.max()) + 1
+
+def changed_region(changed, shape, rotate=False):
+    """Bounding (top, bottom, left, right) of changed (y, x) pixels, in ROM orientation
+    
+    shape is the displayed (possibly rotated) graphic's shape; with rotate the
+    pixels are mapped back the same way write_bank un-rotates them.
+    """
+    mask = np.zeros(shape, dtype=bool)
+    for y, x in changed:
+        mask[y, x] = True
+    if rotate:
+        mask = np.rot90(mask, k=-1)
+    rows, cols = np.nonzero(mask)
+    return int(rows.min()), int(rows.max()) + 1, int(cols.min()), int(cols.max()) + 1
+
+def palette_rgba(palette):
+    """(16, 4) RGBA lookup table for an ARGB palette"""
+    colors = np.zeros((16, 4), dtype=np.uint8)
+    for color_index, (a, r, g, b) in enumerate(palette[:16]):
+        colors[color_index] = (r, g, b, a)
+    return colors
+
+def render_tile_map(bank, tile_ids, palette):
+    """Gather a (rows, cols) grid of tile ids from a tile bank into one RGBA image
+    
+    Ids beyond the bank render black, like the per-tile renderer did.
+    """
+    tile_ids = np.asarray(tile_ids)
+    known = tile_ids < len(bank)
+    image = palette_rgba(palette)[bank[np.where(known, tile_ids, 0)] % 16]
+    image[~known] = 0
+    rows, cols, tile_h, tile_w, _ = image.shape
+    return image.transpose(0, 2, 1, 3, 4).reshape(rows * tile_h, cols * tile_w, 4)
+
+def load_tile_bank():
+    """Every tile as one contiguous (N, 16, 16) array, rotated like load_tiles"""
+    return np.concatenate([
+        decode_bank(rom_cache[rom_name], np.arange(len(rom_cache[rom_name]) // tile_size) * tile_size, 16, 16)
+        for rom_name in ROM_CONFIG['tile_roms']])
+
+def load_font_bank():
+    """All 43 font characters as one (43, 8, 8) array"""
+    return decode_bank(rom_cache[FONT_ROM], [font_offset(font_id) for font_id in range(NUM_FONTS)], 8, 8)
+
+def load_treasure_bank():
+    """The end of level treasures as one (N, 44, 44) array, in TREASURE_GRAPHICS_CONFIG order"""
+    configs = list(TREASURE_GRAPHICS_CONFIG.values())
+    rom_name, height, width = configs[0]['rom'], configs[0]['height'], configs[0]['width']
+    return decode_bank(rom_cache[rom_name], [config['offset'] for config in configs], height, width)
+
+#########################################
+# Decoded Asset Store
+#########################################
+
+def load_graphic(config):
+    """Decode a UI graphic or treasure from its UI_GRAPHICS_CONFIG/TREASURE_GRAPHICS_CONFIG entry"""
+    return decode_bank(rom_cache[config['rom']], [config['offset']], config['height'], config['width'],
+                       config['mode'], config.get('bytes_per_row'), rotate=bool(config.get('rotate')))[0]
+
+def graphic_span(config):
+    """Number of ROM bytes a UI graphic or treasure is decoded from"""
+    layout = byte_layout(config['height'], config['width'], config['mode'], config.get('bytes_per_row'))
+    return int(layout.max()) + 1
+
+class AssetView:
+    """Read-only sequence over one kind of asset - what editor windows hold instead of copies"""
+
+    def __init__(self, store, kind):
+        self.store = store
+        self.kind = kind
+
+    def __len__(self):
+        return len(self.store.keys[self.kind])
+
+    def __getitem__(self, index):
+        return self.store.get(self.kind, self.store.keys[self.kind][index])
+
+    def __iter__(self):
+        return (self.store.get(self.kind, key) for key in self.store.keys[self.kind])
+
+    def bank(self):
+        """The whole kind as one read-only (N, H, W) array (tiles, fonts, treasures)"""
+        return self.store.bank(self.kind)
+
+class AssetStore:
+    """Process-wide memo of decoded tiles, fonts, UI graphics, treasures and palettes
+    
+    Assets are decoded on first access and shared by every window. Tiles, font
+    characters and treasures live in contiguous (N, H, W) banks with a per-entry
+    valid flag; the odd-sized UI graphics and the palettes are memoized one by
+    one. Each asset remembers the ROM bytes it came from, so
+    invalidate_rom_range() only drops the assets a write actually touched and
+    the next access decodes them again. Everything handed out is read-only -
+    copy before editing (snapshot() copies a whole bank).
+    """
+
+    def __init__(self):
+        self.decoded = {}       # (kind, key) -> decoded asset, for kinds without a bank
+        self.decodes = 0        # Assets decoded (memo misses), for profiling
+        self.rebuild()
+
+    def rebuild(self):
+        """Re-read asset locations from the ROM cache and drop everything decoded"""
+        self.decoded.clear()
+        treasures = list(TREASURE_GRAPHICS_CONFIG.values())
+        
+        # Bank kind -> ([(rom name, offset)] per entry, height, width) in ROM orientation
+        self.bank_layouts = {
+            'tile': ([tile_location(tile_idx) for tile_idx in range(count_tiles())], 16, 16),
+            'font': ([(FONT_ROM, font_offset(font_id)) for font_id in range(NUM_FONTS)], 8, 8),
+            'treasure': ([(config['rom'], config['offset']) for config in treasures],
+                         treasures[0]['height'], treasures[0]['width'])}
+        self.keys = {
+            'tile': list(range(len(self.bank_layouts['tile'][0]))),
+            'font': list(range(NUM_FONTS)),
+            'ui': list(UI_GRAPHICS_CONFIG),
+            'treasure': list(TREASURE_GRAPHICS_CONFIG),
+            'palette': list(range(len(PALETTE_FILE_OFFSETS)))}
+        self.loaders = {
+            'ui': lambda name: load_graphic(UI_GRAPHICS_CONFIG[name]),
+            'palette': load_palette}
+
+        self.banks = {}         # Bank kind -> (N, W, H) array, rotated like load_tiles
+        self.bank_views = {}    # Bank kind -> read-only view handed out
+        self.valid = {}         # Bank kind -> (N,) bool, entry decoded and current
+        self.key_index = {}     # Bank kind -> {key: bank entry}
+        for kind, (entries, height, width) in self.bank_layouts.items():
+            self.banks[kind] = np.zeros((len(entries), width, height), dtype=np.uint8)
+            self.bank_views[kind] = self.banks[kind].view()
+            self.bank_views[kind].flags.writeable = False
+            self.valid[kind] = np.zeros(len(entries), dtype=bool)
+            self.key_index[kind] = {key: i for i, key in enumerate(self.keys[kind])}
+
+        # ROM name -> [(start, end, (kind, key))] for invalidation
+        self.spans = {}
+        for kind, (entries, height, width) in self.bank_layouts.items():
+            span = height * width // 2
+            for key, (rom_name, offset) in zip(self.keys[kind], entries):
+                self.add_span(rom_name, offset, span, (kind, key))
+        for name, config in UI_GRAPHICS_CONFIG.items():
+            self.add_span(config['rom'], config['offset'], graphic_span(config), ('ui', name))
+        for palette_idx, offset in enumerate(PALETTE_FILE_OFFSETS):
+            self.add_span(ROM_CONFIG['palette_rom'], offset, 16, ('palette', palette_idx))
+
+    def add_span(self, rom_name, offset, length, asset):
+        self.spans.setdefault(rom_name, []).append((offset, offset + length, asset))
+
+    def decode_entries(self, kind, indexes):
+        """Decode bank entries in one vectorized pass per ROM"""
+        entries, height, width = self.bank_layouts[kind]
+        by_rom = {}
+        for i in indexes:
+            by_rom.setdefault(entries[i][0], []).append(i)
+        for rom_name, group in by_rom.items():
+            offsets = [entries[i][1] for i in group]
+            self.banks[kind][group] = decode_bank(rom_cache[rom_name], offsets, height, width)
+        self.valid[kind][indexes] = True
+        self.decodes += len(indexes)
+
+    def get(self, kind, key):
+        """Decoded asset, decoding and memoizing it on first access"""
+        if kind in self.banks:
+            index = self.key_index[kind][key]
+            if not self.valid[kind][index]:
+                self.decode_entries(kind, [index])
+            return self.bank_views[kind][index]
+
+        asset = self.decoded.get((kind, key))
+        if asset is None:
+            asset = self.loaders[kind](key)
+            if isinstance(asset, np.ndarray):
+                asset.flags.writeable = False
+            else:
+                asset = tuple(asset)
+            self.decoded[(kind, key)] = asset
+            self.decodes += 1
+        return asset
+
+    def bank(self, kind):
+        """Whole bank as a read-only (N, H, W) array, decoding any stale entries first"""
+        stale = np.flatnonzero(~self.valid[kind])
+        if len(stale):
+            self.decode_entries(kind, stale)
+        return self.bank_views[kind]
+
+    def snapshot(self, kind):
+        """Private copy of a bank, e.g. for undo or diffing"""
+        return self.bank(kind).copy()
+
+    def view(self, kind):
+        """Live sequence of one kind of asset for a window to hold"""
+        return AssetView(self, kind)
+
+    def invalidate_rom_range(self, rom_name, start, end):
+        """Drop decoded assets overlapping rom_name[start:end] after those bytes change"""
+        dropped = 0
+        for span_start, span_end, (kind, key) in self.spans.get(rom_name, ()):
+            if not (span_start < end and start < span_end):
+                continue
+            if kind in self.valid:
+                index = self.key_index[kind][key]
+                dropped += int(self.valid[kind][index])
+                self.valid[kind][index] = False
+            elif self.decoded.pop((kind, key), None) is not None:
+                dropped += 1
+        return dropped
+asset_store = None              # AssetStore, built on first use
+
+def get_asset_store():
+    """Get the shared decoded-asset store, building it on first use"""
+    global asset_store
+    if asset_store is None:
+        asset_store = AssetStore()
+    return asset_store
+
+def reset_asset_store():
+    """Re-read the store after new ROMs are loaded (windows keep their views)"""
+    if asset_store is not None:
+        asset_store.rebuild()
+
+register_callback('roms_loaded', reset_asset_store)
@@ -0,0 +1,95 @@
+"""High score table codec - no Tk required"""
+from .roms import rom_cache, ROM_CONFIG
+
+#########################################
+# High Score Data Setup
+#########################################
+
+# High Score data constants
+HIGH_SCORE_OFFSET  = 0x04A0  # Offset for high score data in m1.1h
+HIGH_STAGE_OFFSET  = HIGH_SCORE_OFFSET + 0x2D
+NUM_HIGH_SCORES    = 7       # 7 high score entries
+
+#########################################
+# High Score Handling Functions
+#########################################
+
+def load_high_scores():
+    """Load high score data from ROM"""
+    rom_data = rom_cache[ROM_CONFIG['high_score_rom']]
+    high_scores = []
+    # Read HIGH SCORE (first entry)
+    high_scores.append({
+        'score': [rom_data[HIGH_SCORE_OFFSET + j] for j in range(3)],
+        'name': '',
+        'stage': 0})
+    # Read 7 ranked entries
+    for i in range(HIGH_SCORE_OFFSET + 3, HIGH_SCORE_OFFSET + 3 + NUM_HIGH_SCORES * 6, 6):
+        score_bytes = rom_data[i:i+3]
+        name_bytes = rom_data[i+3:i+6]
+        # Convert name bytes to ASCII string
+        name = ''.join([chr(b) if 32 <= b < 127 else '?' for b in name_bytes])
+        high_scores.append({
+            'score': score_bytes,
+            'name': name,
+            'stage': 0})  # Stage comes later
+    # Read 7 stages for ranked entries
+    for i in range(NUM_HIGH_SCORES):
+        high_scores[i + 1]['stage'] = rom_data[HIGH_STAGE_OFFSET + i]
+    return high_scores
+
+def save_high_scores(high_scores):
+    """Save high score data back to ROM"""
+    rom_data = rom_cache[ROM_CONFIG['high_score_rom']]
+    # Write HIGH SCORE (first entry - score only, no name/stage)
+    for j, byte_val in enumerate(high_scores[0]['score']):
+        rom_data[HIGH_SCORE_OFFSET + j] = byte_val
+    # Write 7 ranked entries (score + name)
+    for i in range(HIGH_SCORE_OFFSET + 3, HIGH_SCORE_OFFSET + 3 + NUM_HIGH_SCORES * 6, 6):
+        entry = high_scores[((i - HIGH_SCORE_OFFSET - 3) // 6) + 1]
+        # Write score bytes
+        for j, byte_val in enumerate(entry['score']):
+            rom_data[i + j] = byte_val
+        # Write name bytes (convert to ASCII)
+        name_padded = (entry['name'] + '   ')[:3]  # Pad or truncate to 3 chars
+        for j, char in enumerate(name_padded):
+            rom_data[i + 3 + j] = ord(char.upper())
+    # Write stages
+    for i in range(NUM_HIGH_SCORES):
+        rom_data[HIGH_STAGE_OFFSET + i] = high_scores[i + 1]['stage']
+    
+def bcd_to_int(bcd_bytes):
+    """Convert 3-byte BCD to integer (e.g., [0x03, 0x58, 0x40] -> 35840)"""
+    result = 0
+    for byte_val in bcd_bytes:
+        result = result * 100 + ((byte_val >> 4) * 10) + (byte_val & 0x0F)
+    return result
+
+def int_to_bcd(value):
+    """Convert integer to 3-byte BCD (e.g., 35840 -> [0x03, 0x58, 0x40])"""
+    # Clamp to max 999999
+    value = min(999999, max(0, value))
+    
+    bcd_bytes = []
+    for _ in range(3):
+        low_digit = value % 10
+        value //= 10
+        high_digit = value % 10
+        value //= 10
+        bcd_bytes.insert(0, (high_digit << 4) | low_digit)
+    
+    return bcd_bytes
+
+def sync_high_score(high_scores):
+    """Sync HIGH SCORE with highest ranked score"""
+    if len(high_scores) < 2:
+        return
+    max_score = max(bcd_to_int(entry['score']) for entry in high_scores[1:])
+    high_scores[0]['score'] = int_to_bcd(max_score)
+
+def sort_high_scores(high_scores):
+    """Sort high scores in descending order"""
+    ranked_entries = high_scores[1:]
+    ranked_entries.sort(key=lambda x: bcd_to_int(x['score']), reverse=True)
+    high_scores[1:] = ranked_entries
+    return high_scores
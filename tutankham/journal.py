@@ -0,0 +1,256 @@
+"""Autosave journal - unsaved edits appended to disk as they happen - no Tk required
+
+A background thread wakes every JOURNAL_INTERVAL_S seconds, diffs rom_cache
+against what it last journaled and appends the changed byte runs as one
+batch, fsynced once. The journal always describes the edits since the ROMs
+were loaded, so after a crash the next start can replay it onto the freshly
+loaded set; replay reads only the journaled runs, never whole ROMs.
+
+File layout (little-endian):
+
+    header  b'TUTJRNL1', u16 set name length, set name, u8 ROM count,
+            then per ROM: u8 name length, name, u32 CRC32 of the loaded ROM
+    batch   u32 unix time, u16 run count,
+            then per run: u8 ROM index, u16 offset, u16 length, bytes
+            and a u32 CRC32 of the batch - a torn last batch is ignored
+"""
+import os
+import logging
+import struct
+import threading
+import time
+import zlib
+
+from . import roms
+from .roms import rom_cache, original_rom_cache, register_callback, state_callbacks, trigger_callback
+from .patches import diff_runs
+
+#########################################
+# Journal Data Setup
+#########################################
+
+# Journal file, kept next to the editor
+JOURNAL_PATH       = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tutankham.journal")
+JOURNAL_MAGIC      = b'TUTJRNL1'
+JOURNAL_INTERVAL_S = 5.0        # Autosave period
+JOURNAL_MERGE_GAP  = 5          # Unchanged bytes bridged between runs - cheaper than a new 5 byte run header
+BATCH_HEADER       = struct.Struct('<IH')
+RUN_HEADER         = struct.Struct('<BHH')
+
+#########################################
+# Journal Functions
+#########################################
+
+def journal_header():
+    """Header naming the ROM set and the CRC32 of each ROM as loaded"""
+    names = list(original_rom_cache)
+    set_name = roms.CURRENT_ROM_SET.encode('utf-8')
+    header = bytearray(JOURNAL_MAGIC) + struct.pack('<H', len(set_name)) + set_name + bytes([len(names)])
+    for rom_name in names:
+        encoded = rom_name.encode('utf-8')
+        header += bytes([len(encoded)]) + encoded + struct.pack('<I', zlib.crc32(original_rom_cache[rom_name]))
+    return bytes(header), names
+
+class Journal:
+    """Appends rom_cache deltas to the journal file, one fsynced batch per sync()"""
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self.lock = threading.Lock()    # sync() runs on the autosave thread, begin() on whoever loads ROMs
+        self.names = []
+        self.snapshots = {}             # ROM -> bytes as of the last batch
+        self.runs = 0                   # Runs journaled since begin(), for the status bar
+
+    def begin(self):
+        """Start a fresh journal for the ROMs as loaded (truncates the file)"""
+        with self.lock:
+            header, self.names = journal_header()
+            self.snapshots = {rom_name: bytes(original_rom_cache[rom_name]) for rom_name in self.names}
+            self.runs = 0
+            with open(self.path, 'wb') as f:
+                f.write(header)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def capture(self):
+        """Diff rom_cache against the snapshots and build one batch
+
+        Returns:
+            (batch bytes, run count), batch is None when nothing changed
+        """
+        body = bytearray()
+        count = 0
+        for index, rom_name in enumerate(self.names):
+            data = rom_cache.get(rom_name)
+            snapshot = self.snapshots[rom_name]
+            if data is None or len(data) != len(snapshot):
+                continue  # Mid-load, begin() follows
+            current = bytes(data)   # One copy under the GIL, edits on the Tk thread land in the next batch
+            if current == snapshot:
+                continue
+            for start, end in diff_runs(snapshot, current, JOURNAL_MERGE_GAP):
+                body += RUN_HEADER.pack(index, int(start), int(end - start)) + current[start:end]
+                count += 1
+            self.snapshots[rom_name] = current
+        if not count:
+            return None, 0
+        batch = BATCH_HEADER.pack(int(time.time()), count) + body
+        return batch + struct.pack('<I', zlib.crc32(batch)), count
+
+    def sync(self):
+        """Append what changed since the last batch, one write and one fsync
+
+        Returns:
+            Number of runs appended
+        """
+        with self.lock:
+            if not self.names:
+                return 0
+            batch, count = self.capture()
+            if batch is None:
+                return 0
+            with open(self.path, 'ab') as f:
+                f.write(batch)
+                f.flush()
+                os.fsync(f.fileno())
+            self.runs += count
+            return count
+
+    def discard(self):
+        """Remove the journal file (clean exit)"""
+        with self.lock:
+            self.names = []
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+def read_journal(path=JOURNAL_PATH):
+    """Parse a journal file
+
+    Returns:
+        (rom set, {ROM: base CRC32}, [(ROM, offset, bytes), ...] in journal
+        order, time of the last good batch or None)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(JOURNAL_MAGIC):
+        raise ValueError(f"{path} is not an autosave journal")
+
+    pos = len(JOURNAL_MAGIC)
+    (length,) = struct.unpack_from('<H', data, pos)
+    rom_set = data[pos + 2:pos + 2 + length].decode('utf-8')
+    pos += 2 + length
+    count = data[pos]
+    pos += 1
+    names, crcs = [], {}
+    for _ in range(count):
+        length = data[pos]
+        rom_name = data[pos + 1:pos + 1 + length].decode('utf-8')
+        (crcs[rom_name],) = struct.unpack_from('<I', data, pos + 1 + length)
+        names.append(rom_name)
+        pos += 5 + length
+
+    runs, last_time = [], None
+    while pos + BATCH_HEADER.size <= len(data):
+        stamp, count = BATCH_HEADER.unpack_from(data, pos)
+        end = pos + BATCH_HEADER.size
+        batch_runs = []
+        for _ in range(count):
+            if end + RUN_HEADER.size > len(data):
+                break
+            index, offset, length = RUN_HEADER.unpack_from(data, end)
+            end += RUN_HEADER.size
+            batch_runs.append((index, offset, data[end:end + length]))
+            end += length
+        if end + 4 > len(data) or zlib.crc32(data[pos:end]) != struct.unpack_from('<I', data, end)[0]:
+            logging.warning(f"Autosave journal {path} ends in a torn batch, ignoring it")
+            break
+        runs += [(names[index], offset, chunk) for index, offset, chunk in batch_runs]
+        last_time = stamp
+        pos = end + 4
+    return rom_set, crcs, runs, last_time
+
+def recoverable_edits(path=JOURNAL_PATH):
+    """Check for a journal left behind that fits the ROMs just loaded
+
+    Returns:
+        (run count, time of the last batch) or None when there is nothing
+        to replay or the journal was made against other ROMs
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        rom_set, crcs, runs, last_time = read_journal(path)
+    except (OSError, ValueError, struct.error, IndexError, UnicodeDecodeError) as e:
+        logging.warning(f"Unreadable autosave journal {path}: {e}")
+        return None
+    if not runs:
+        return None
+    loaded = {rom_name: zlib.crc32(data) for rom_name, data in original_rom_cache.items()}
+    if rom_set != roms.CURRENT_ROM_SET or any(loaded.get(rom_name) != crc for rom_name, crc in crcs.items()):
+        logging.warning(f"Autosave journal {path} was made against other ROMs ({rom_set}), not offering it")
+        return None
+    return len(runs), last_time
+
+def replay_journal(path=JOURNAL_PATH):
+    """Apply a journal's runs to rom_cache in order, then rebuild the derived caches
+
+    Returns:
+        Number of runs applied
+    """
+    _, _, runs, _ = read_journal(path)
+    for rom_name, offset, chunk in runs:
+        rom_cache[rom_name][offset:offset + len(chunk)] = chunk
+    logging.info(f"Replayed {len(runs)} journaled runs from {path}")
+    trigger_callback('roms_loaded')
+    return len(runs)
+
+#########################################
+# Autosave Thread Functions
+#########################################
+
+autosave_journal = None
+autosave_stop = None
+
+def start_autosave(path=JOURNAL_PATH, interval=JOURNAL_INTERVAL_S):
+    """Start journaling the loaded ROMs on a daemon thread
+
+    The journal restarts whenever ROMs are (re)loaded; edits already in
+    rom_cache at that point (a replayed journal, applied patches) are written
+    as the first batch straight away.
+    """
+    global autosave_journal, autosave_stop
+    if autosave_journal is not None:
+        return autosave_journal
+    autosave_journal = Journal(path)
+    autosave_stop = threading.Event()
+
+    def run(journal, stop):
+        while not stop.wait(interval):
+            try:
+                journal.sync()
+            except OSError as e:
+                logging.error(f"Autosave failed: {e}")
+
+    restart_autosave()
+    register_callback('roms_loaded', restart_autosave)
+    threading.Thread(target=run, args=(autosave_journal, autosave_stop), name="autosave", daemon=True).start()
+    logging.info(f"Autosaving edits to {path} every {interval:g} s")
+    return autosave_journal
+
+def restart_autosave():
+    """Begin a new journal for freshly loaded ROMs and write what already differs"""
+    if autosave_journal is not None:
+        autosave_journal.begin()
+        autosave_journal.sync()
+
+def stop_autosave(discard=True):
+    """Stop the autosave thread - discard the journal on a clean exit"""
+    global autosave_journal, autosave_stop
+    if autosave_journal is None:
+        return
+    autosave_stop.set()
+    if restart_autosave in state_callbacks['roms_loaded']:
+        state_callbacks['roms_loaded'].remove(restart_autosave)
+    if discard:
+        autosave_journal.discard()
+    autosave_journal = autosave_stop = None
@@ -0,0 +1,197 @@
+"""Level files - whole maps as JSON Lines or msgpack record streams - no Tk required
+
+A level file is a stream of records: one header, then one record per map with
+its visual tiles and all four difficulty blocks (config + objects):
+
+    {"format": "tutankham-levels", "version": 1, "rom_set": "Konami"}
+    {"map": 1, "tiles": ["2626...", ...], "difficulties": [{"spawn_rate": 6, ...}, ...]}
+
+.jsonl files hold one JSON record per line, with the tiles as one hex string
+per row so they diff well under version control. .msgpack files hold the same
+records back to back, with the tiles as raw bytes (needs 'pip install msgpack').
+Records are written and applied one at a time, so a file never has to be held
+in memory as a whole.
+"""
+import json
+import logging
+import os
+
+import numpy as np
+
+from . import roms
+from .roms import trigger_callback
+from .maps import (num_maps, map_width, map_height, NUM_DIFFICULTIES, NUM_RESPAWNS, NUM_TELEPORTS, NUM_SPAWNS,
+                   ITEM_GROUPS, load_visual_map_from_cache, write_visual_tile_to_cache,
+                   load_map_config, save_map_config, load_object_data, save_object_data)
+
+#########################################
+# Level File Data Setup
+#########################################
+
+LEVEL_FORMAT    = 'tutankham-levels'
+LEVEL_VERSION   = 1
+LEVEL_EXTENSIONS = ['.jsonl', '.msgpack']
+LEVEL_CONFIG_KEYS = ['spawn_rate', 'time_limit', 'unknown_bytes']  # Map pointers stay with the ROM set
+ITEM_SLOTS      = {'rings': 4, 'keys': 4, 'keyholes': 4, 'crowns': 2}
+
+#########################################
+# Level Record Functions
+#########################################
+
+def level_record(map_index, binary=False):
+    """Build the record for one map: visual tiles plus every difficulty block
+
+    Args:
+        map_index: 0-based map
+        binary: tiles as raw bytes (msgpack) instead of hex rows (JSON)
+    """
+    visual_map = load_visual_map_from_cache(map_index)
+    if binary:
+        tiles = visual_map.tobytes()
+    else:
+        tiles = [row.tobytes().hex() for row in visual_map]
+
+    difficulties = []
+    for difficulty in range(NUM_DIFFICULTIES):
+        config = load_map_config(map_index, difficulty)
+        block = {key: config[key] for key in LEVEL_CONFIG_KEYS}
+        block['objects'] = load_object_data(map_index, difficulty)
+        difficulties.append(block)
+    return {'map': map_index + 1, 'tiles': tiles, 'difficulties': difficulties}
+
+def record_tiles(record):
+    """Decode a record's tiles (hex rows or raw bytes) to a (map_height, map_width) array"""
+    tiles = record['tiles']
+    if isinstance(tiles, list):
+        tiles = bytes.fromhex(''.join(tiles))
+    visual_map = np.frombuffer(tiles, dtype=np.uint8)
+    if visual_map.size != map_height * map_width:
+        raise ValueError(f"Map {record.get('map')}: expected {map_height * map_width} tiles, got {visual_map.size}")
+    return visual_map.reshape(map_height, map_width)
+
+def check_objects(objects, label):
+    """Check an object dict has the fixed slot counts save_object_data writes
+
+    save_object_data writes the lists back to back, so a wrong count would
+    shift everything after it into the next block.
+    """
+    try:
+        counts = [('respawns', objects['respawns'], NUM_RESPAWNS, True),
+                  ('teleports', objects['teleports'], NUM_TELEPORTS, True),
+                  ('spawns', objects['spawns'], NUM_SPAWNS, True)]
+        counts += [(group, objects['items'][group], ITEM_SLOTS[group], False) for group in ITEM_GROUPS]
+    except KeyError as e:
+        raise ValueError(f"{label}: objects are missing {e}") from None
+    for name, entries, slots, exact in counts:
+        if len(entries) > slots or (exact and len(entries) != slots):
+            expected = f"exactly {slots}" if exact else f"at most {slots}"
+            raise ValueError(f"{label}: {name} needs {expected} entries, got {len(entries)}")
+
+def apply_level_record(record, map_index=None):
+    """Write one map record into the ROM cache
+
+    Tiles go through write_visual_tile_to_cache (changed cells only), blocks
+    through save_object_data and save_map_config, so the derived caches stay
+    in step exactly as with edits made in the editor.
+
+    Returns:
+        0-based map index the record was written to
+    """
+    if map_index is None:
+        map_index = record['map'] - 1
+    if not 0 <= map_index < num_maps:
+        raise ValueError(f"Map must be 1-{num_maps}, got {map_index + 1}")
+    if len(record['difficulties']) != NUM_DIFFICULTIES:
+        raise ValueError(f"Map {map_index + 1}: expected {NUM_DIFFICULTIES} difficulties, "
+                         f"got {len(record['difficulties'])}")
+
+    visual_map = record_tiles(record)
+    for difficulty, block in enumerate(record['difficulties']):
+        check_objects(block['objects'], f"Map {map_index + 1}/D{difficulty + 1}")
+
+    current = load_visual_map_from_cache(map_index)
+    for row, col in np.argwhere(visual_map != current):
+        write_visual_tile_to_cache(map_index, row, col, int(visual_map[row, col]))
+
+    for difficulty, block in enumerate(record['difficulties']):
+        config = load_map_config(map_index, difficulty)
+        config.update({key: block[key] for key in LEVEL_CONFIG_KEYS if key in block})
+        save_map_config(map_index, difficulty, config)
+        save_object_data(block['objects'], map_index, difficulty)
+    return map_index
+
+#########################################
+# Level File Functions
+#########################################
+
+def level_file_kind(path):
+    """'.jsonl' or '.msgpack' from a level file's extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in LEVEL_EXTENSIONS:
+        raise ValueError(f"{path}: level files must end in {' or '.join(LEVEL_EXTENSIONS)}")
+    return ext
+
+def write_level_file(path, map_indexes=None):
+    """Write maps (default all four) to a level file, one record at a time
+
+    Returns:
+        Number of maps written
+    """
+    map_indexes = list(range(num_maps) if map_indexes is None else map_indexes)
+    header = {'format': LEVEL_FORMAT, 'version': LEVEL_VERSION, 'rom_set': roms.CURRENT_ROM_SET}
+
+    if level_file_kind(path) == '.msgpack':
+        import msgpack  # Optional, only needed for binary level files
+        packer = msgpack.Packer()
+        with open(path, 'wb') as f:
+            f.write(packer.pack(header))
+            for map_index in map_indexes:
+                f.write(packer.pack(level_record(map_index, binary=True)))
+    else:
+        with open(path, 'w') as f:
+            f.write(json.dumps(header) + '\n')
+            for map_index in map_indexes:
+                f.write(json.dumps(level_record(map_index), separators=(',', ':')) + '\n')
+
+    logging.info(f"Wrote {len(map_indexes)} maps to {path}")
+    return len(map_indexes)
+
+def read_level_records(path):
+    """Yield the map records of a level file as they are decoded, after checking its header"""
+    if level_file_kind(path) == '.msgpack':
+        import msgpack  # Optional, only needed for binary level files
+        f = open(path, 'rb')
+        records = msgpack.Unpacker(f, raw=False)
+    else:
+        f = open(path, 'r')
+        records = (json.loads(line) for line in f if line.strip())
+
+    with f:
+        header = next(records, None)
+        if not isinstance(header, dict) or header.get('format') != LEVEL_FORMAT:
+            raise ValueError(f"{path} is not a Tutankham level file")
+        if header.get('version', 0) > LEVEL_VERSION:
+            raise ValueError(f"{path} is level file version {header['version']}, "
+                             f"this editor reads up to {LEVEL_VERSION}")
+        yield from records
+
+def import_level_file(path, target_map=None):
+    """Apply every map in a level file to the loaded ROM set
+
+    Args:
+        target_map: 0-based slot for a single-map file's level, instead of the
+            map number it was exported from
+
+    Returns:
+        List of 0-based map indexes written
+    """
+    written = []
+    for record in read_level_records(path):
+        if target_map is not None and written:
+            raise ValueError(f"{path} holds more than one map, it can't be moved to a single slot")
+        written.append(apply_level_record(record, target_map))
+
+    for map_index in written:
+        trigger_callback('map_changed', map_index)
+    logging.info(f"Imported {path} into maps {', '.join(str(m + 1) for m in written)}")
+    return written
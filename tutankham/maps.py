@@ -0,0 +1,1253 @@
+"""Map, object and config codecs plus derived map analysis - no Tk required"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import logging
+
+from .roms import rom_cache, ROM_CONFIG, register_callback, trigger_callback, write_byte_to_roms, read_byte_from_roms
+from .animations import animation_tables, decode_animation
+
+#########################################
+# Map Data Setup
+#########################################
+
+# Constants
+num_maps           = 4       # Number Of Maps in Game
+map_width          = 64      # Map Width  by Tile Count
+map_height         = 12      # Map Height by Tile Count
+visual_map_size    = 0x300   # Visual  Map Byte Size In ROM
+logical_map_size   = 0x700   # Logical Map Byte Size In ROM
+empty_path_tile    = 0x26    # Blank Path - Where Player/Monsters Can Move Freely
+# Level Data Constants
+CONFIG_BASE_OFFSET = 0x061E  # Config data for each map/difficulty block
+CONFIG_BLOCK_SIZE  = 11      # 11 bytes of config data per block
+MAP_CONFIG_OFFSETS = {
+    'logical_map_ptr': 0,
+    'visual_map_ptr':  2,
+    'spawn_rate':      4,
+    'time_limit':      5,
+    'unknown_bytes': (6, 11)}# 5 bytes from offset 6-10
+OBJECT_BASE_OFFSET = CONFIG_BASE_OFFSET + CONFIG_BLOCK_SIZE  # Object data follows config
+OBJECT_BLOCK_SIZE  = 0x0148  # Block Size 
+NUM_DIFFICULTIES   = 4       # Four Difficulties
+NUM_ITEMS          = 14      # Max Items - Keys, Treasure Boxes, Rings, Keyholes
+NUM_TELEPORTS      = 6       # Max Number Of Teleporter Pairs
+NUM_SPAWNS         = 7       # Max Number Of Enemy Spawn Points
+NUM_RESPAWNS       = 3       # Max Number Of Player Respawn Points
+MAP_WIDTH_BLOCK_OFFSET = 3 + NUM_RESPAWNS * 3                      # Map width byte in object block
+TELEPORT_BLOCK_OFFSET  = MAP_WIDTH_BLOCK_OFFSET + 1 + NUM_ITEMS * 16 + 1  # Teleports follow items + separator
+# Tile Palette Categories
+PATH_TILES = [0x26]          # Empty Path Tile
+WALL_TILES = [0x00, 0x01,    # Wall Tiles
+              0x02, 0x03, 
+              0x04, 0x05, 
+              0x06, 0x07, 
+              0x08, 0x09, 
+              0x0A, 0x0B, 
+              0x0C, 0x0D, 
+              0x0E, 0x11, 
+              0x13, 0x1F, 
+              0x20, 0x27, 
+              0x28]
+SPAWNER_TILES = [0x0F,      # All spawner decoration pieces
+              0x10, 0x12, 
+              0x14, 0x15, 
+              0x18, 0x1B, 
+              0x1D]
+TELEPORTER_TILES = [
+              0x64, 0x65]   # Left and Right Pillars
+TREASURE_TILES = [
+              0x4A, 0x62,   # Crown box (empty, filled)
+              0x21, 0x6F,   # Ring box (empty, filled)
+              0x22, 0x70,   # Key box (empty, filled)
+              0x72]         # Keyhole
+SPAWN_MARKER_TILES = [0x29, # Player start (drag-only, not in palette)
+              0x17]         # Respawn flame
+# Composite block definitions
+DOOR_POSITIONS_BY_WIDTH = {
+    0: (8, 11),            # Width 0: 16 tiles
+    1: (8, 27),            # Width 1: 32 tiles
+    2: (8, 43),            # Width 2: 48 tiles
+    3: (8, 59),            # Width 3: 64 tiles
+}
+DOOR_TILES = np.array([
+   [115, 116, 117],          # Door Top Tiles
+   [118, 119, 120],          # Door Middle Tiles
+   [121, 122, 123]])         # Door Bottom Tiles
+DOOR_LOGICAL = np.array([
+  [[0x00,0x00],              # Door Top Left Logical Bytes
+   [0x00,0x06],              # Door Top Middle Logical Bytes
+   [0x00,0x00]],             # Door Top Right Logical Bytes
+  [[0x55,0x06],              # Door Center Left Logical Bytes
+   [0xF6,0x6E],              # Door Center Middle Logical Bytes
+   [0xF6,0x06]],             # Door Center Right Logical Bytes
+  [[0x00,0x00],              # Door Bottom Left Logical Bytes
+   [0xF0,0x66],              # Door Bottom Middle Logical Bytes
+   [0xF0,0x00]]])            # Door Bottom Right Logical Bytes
+LOGICAL_BORDER = 0xCC        # Logical map border bytes
+LOGICAL_TILE_BYTES = np.full((256, 2), 0x55, dtype=np.uint8)    # Everything else is solid
+LOGICAL_TILE_BYTES[[empty_path_tile, 0x72]] = 0x00              # Walkable path and keyhole
+LOGICAL_TILE_BYTES[DOOR_TILES.ravel()] = DOOR_LOGICAL.reshape(-1, 2)
+TILE_WILDCARD = -1           # Matches any tile in a multi-tile pattern
+SPAWNER_WALL_PATTERN = np.array([
+   [0x1D, 0x0F, 0x10],       # Spawner Top Walls
+   [0x1B,   -1, 0x12],       # Spawner Middle Walls (center is open)
+   [0x18, 0x15, 0x14]],      # Spawner Bottom Walls
+   dtype=np.int16)
+# Item tile constraints
+ITEM_TILES = {
+    0x62: 0x4A,  # Crown -> bottom-accessible box
+    0x6F: 0x21,  # Ring -> top-accessible box
+    0x70: 0x22,  # Key -> side-accessible box
+    0x72: 0x26   # Keyhole -> opens to blank space
+}
+# Empty to filled box mapping
+EMPTY_TO_FILLED = {
+    0x4A: 0x62,  # Crown box
+    0x21: 0x6F,  # Ring box
+    0x22: 0x70,  # Key box
+}
+FILLED_TO_EMPTY = {v: k for k, v in EMPTY_TO_FILLED.items()}
+
+# Overlay Tile Selections
+PLAYER_START_MARKER_TILE = 0x29    # Forward-facing player sprite
+RESPAWN_MARKER_TILE      = 0x6E    # Flame sprite
+ENEMY_SPAWN_MARKER_TILE  = 0x17    # Poof cloud sprite (or whatever you prefer)
+TELEPORTER_MARKER_TILE   = 0x63    # Pillar sprite (or whatever you prefer)
+OVERLAY_TILES = {                   # Sprites the map editor draws over objects
+    PLAYER_START_MARKER_TILE: 'Player start marker',
+    RESPAWN_MARKER_TILE:      'Respawn marker',
+    ENEMY_SPAWN_MARKER_TILE:  'Enemy spawn marker',
+    TELEPORTER_MARKER_TILE:   'Teleporter marker',
+    0x6F: 'Ring overlay', 0x70: 'Key overlay', 0x62: 'Crown overlay', 0x72: 'Keyhole overlay'}
+
+#########################################
+# Map Handling Functions
+#########################################
+
+def load_visual_map_from_cache(map_index):
+    """Load a single visual map directly from ROM cache"""
+    map_data = rom_cache[ROM_CONFIG['visual_map_rom']]
+    start_offset = map_index * visual_map_size
+    
+    # ROM is column-major with rows stored bottom-up: reshape and flip
+    raw = np.frombuffer(map_data, dtype=np.uint8, count=visual_map_size, offset=start_offset)
+    return raw.reshape(map_width, map_height).T[::-1].copy()
+
+def load_all_visual_maps():
+    """Load all visual maps as one (num_maps, map_height, map_width) array"""
+    map_data = rom_cache[ROM_CONFIG['visual_map_rom']]
+    raw = np.frombuffer(map_data, dtype=np.uint8, count=num_maps * visual_map_size)
+    return raw.reshape(num_maps, map_width, map_height).transpose(0, 2, 1)[:, ::-1].copy()
+
+def read_visual_tile_from_cache(map_index, row, col):
+    """Read a single tile directly from ROM cache"""
+    flipped_row = map_height - 1 - row
+    offset = map_index * visual_map_size + col * map_height + flipped_row
+    return rom_cache[ROM_CONFIG['visual_map_rom']][offset]
+
+def write_visual_tile_to_cache(map_index, row, col, tile_id):
+    """Write a single tile directly to ROM cache"""
+    map_data = rom_cache[ROM_CONFIG['visual_map_rom']]
+    
+    flipped_row = map_height - 1 - row
+    byte_index = col * map_height + flipped_row
+    offset = map_index * visual_map_size + byte_index
+    
+    map_data[offset] = tile_id
+    
+    if teleporter_table is not None:
+        teleporter_table.on_tile_changed(map_index, row, col, tile_id)
+    if validation_engine is not None:
+        validation_engine.on_cell_changed(map_index, row, col, tile_id)
+    if tile_usage is not None:
+        tile_usage.on_tile_changed(map_index, row, col, tile_id)
+
+def build_logical_map(visual_map, actual_width):
+    """
+    Build one logical collision map from a visual map.
+    
+    Args:
+        visual_map: (map_height, map_width) visual map
+        actual_width: map width in tiles
+    
+    Returns:
+        (map_width, 28) uint8 array - per column 14 first bytes then 14
+        second bytes, rows stored bottom-up with a border row at each end
+    """
+    logical = np.full((map_width, 2, 14), LOGICAL_BORDER, dtype=np.uint8)
+    
+    # Interior rows, flipped: rom 1 -> vis 11, rom 12 -> vis 0
+    logical[:, :, 1:13] = LOGICAL_TILE_BYTES[visual_map[::-1]].transpose(1, 2, 0)
+    
+    # Border columns, unused space past the right border
+    logical[actual_width - 1:actual_width] = LOGICAL_BORDER
+    logical[actual_width:] = 0x00
+    logical[0] = LOGICAL_BORDER
+    return logical.reshape(map_width, 28)
+
+def generate_logical_maps_from_visual():
+    """Generate all logical collision maps from visual tilemaps on save"""
+    
+    for map_idx in range(num_maps):
+        # Get actual width from object data
+        objects = load_object_data(map_idx, 0)  # Use D1 for width
+        actual_width = (objects['map_width'] + 1) * 16
+        logging.info(f"Map {map_idx}: map_width={objects['map_width']}, actual_width={actual_width}")
+        # Load visual map
+        visual_map = load_visual_map_from_cache(map_idx)
+        
+        # Determine which ROM and offset
+        rom_index = map_idx // 2
+        map_in_rom = map_idx % 2
+        rom_name = ROM_CONFIG['logical_map_roms'][rom_index]
+        rom_data = rom_cache[rom_name]
+        start_offset = map_in_rom * logical_map_size
+        
+        rom_data[start_offset:start_offset + logical_map_size] = build_logical_map(visual_map, actual_width).tobytes()
+        
+        logging.info(f"Generated logical map for Map {map_idx + 1}, width={actual_width} tiles")
+
+#########################################
+# Map Configuration Functions
+#########################################
+
+def load_map_config(map_index, difficulty=0):
+    """Load map configuration block (first 11 bytes of object block)"""
+    block_number = (difficulty * 4) + map_index
+    offset = CONFIG_BASE_OFFSET + (block_number * OBJECT_BLOCK_SIZE)
+    
+    config = {
+        'logical_map_ptr': (read_byte_from_roms(offset) << 8) | read_byte_from_roms(offset + 1),
+        'visual_map_ptr': (read_byte_from_roms(offset + 2) << 8) | read_byte_from_roms(offset + 3),
+        'spawn_rate': read_byte_from_roms(offset + 4),
+        'time_limit': read_byte_from_roms(offset + 5),
+        'unknown_bytes': [
+            read_byte_from_roms(offset + 6),
+            read_byte_from_roms(offset + 7),
+            read_byte_from_roms(offset + 8),
+            read_byte_from_roms(offset + 9),
+            read_byte_from_roms(offset + 10)
+        ]
+    }
+    
+    return config
+
+def save_map_config(map_index, difficulty, config):
+    """Save map configuration block back to ROM"""
+    block_number = (difficulty * 4) + map_index
+    offset = CONFIG_BASE_OFFSET + (block_number * OBJECT_BLOCK_SIZE)
+    
+    logging.info(f"Saving config for Map {map_index+1}/D{difficulty+1} at offset 0x{offset:04X}")
+    
+    # Write map pointers
+    write_byte_to_roms(offset, (config['logical_map_ptr'] >> 8) & 0xFF)
+    write_byte_to_roms(offset + 1, config['logical_map_ptr'] & 0xFF)
+    write_byte_to_roms(offset + 2, (config['visual_map_ptr'] >> 8) & 0xFF)
+    write_byte_to_roms(offset + 3, config['visual_map_ptr'] & 0xFF)
+    
+    # Write spawn rate and time limit
+    write_byte_to_roms(offset + 4, config['spawn_rate'])
+    write_byte_to_roms(offset + 5, config['time_limit'])
+    
+    logging.info(f"  Spawn rate: {config['spawn_rate']}, Time limit: {config['time_limit']}s")
+    
+    # Write unknown bytes
+    for i, byte_val in enumerate(config['unknown_bytes']):
+        write_byte_to_roms(offset + 6 + i, byte_val)
+    
+    logging.info(f"  Config saved successfully")
+
+#########################################
+# Map Object Handling Functions
+#########################################
+
+def load_object_data(map_index, difficulty=0):
+    """Load object data for a specific map and difficulty - handles ROM boundaries"""
+    block_number = (difficulty * 4) + map_index
+    offset = OBJECT_BASE_OFFSET + (block_number * OBJECT_BLOCK_SIZE)
+    
+    objects = {
+        'player_start': {'y': 0, 'x': 0},
+        'respawns': [],
+        'map_width': 0,
+        'items': {
+            'rings': [],      # Slots 0-3, Max 4
+            'keys': [],       # Slots 4-7, Max 4
+            'keyholes': [],   # Slots 8-11, Max 4
+            'crowns': []      # Slots 12-13, Max 2
+        },
+        'teleports': [],
+        'spawns': []
+    }
+    
+    # Read player start (3 bytes: YY YY XX)
+    pos = offset
+
+    objects['player_start'] = {
+        'y': (read_byte_from_roms(pos) << 8) | read_byte_from_roms(pos + 1),
+        'x': read_byte_from_roms(pos + 2)
+    }
+    pos += 3
+
+    # Read respawn points (3 × 3 bytes each)
+    for i in range(NUM_RESPAWNS):
+        respawn = {
+            'y': (read_byte_from_roms(pos) << 8) | read_byte_from_roms(pos + 1),
+            'x': read_byte_from_roms(pos + 2)
+        }
+        objects['respawns'].append(respawn)
+        pos += 3
+
+    # Read Map Width
+    objects['map_width'] = read_byte_from_roms(pos)
+    pos += 1
+
+    # Read items (14 × 16 bytes) - strict slot ranges
+    # Slots 0-3: Rings
+    for i in range(4):
+        active = read_byte_from_roms(pos) == 0x01
+        y = (read_byte_from_roms(pos + 5) << 8) | read_byte_from_roms(pos + 6)
+        x = read_byte_from_roms(pos + 7)
+        
+        if active:
+            objects['items']['rings'].append({'y': y, 'x': x})
+        
+        pos += 16
+    
+    # Slots 4-7: Keys
+    for i in range(4):
+        active = read_byte_from_roms(pos) == 0x01
+        y = (read_byte_from_roms(pos + 5) << 8) | read_byte_from_roms(pos + 6)
+        x = read_byte_from_roms(pos + 7)
+        
+        if active:
+            objects['items']['keys'].append({'y': y, 'x': x})
+        
+        pos += 16
+    
+    # Slots 8-11: Keyholes
+    for i in range(4):
+        active = read_byte_from_roms(pos) == 0x01
+        y = (read_byte_from_roms(pos + 5) << 8) | read_byte_from_roms(pos + 6)
+        x = read_byte_from_roms(pos + 7)
+        
+        if active:
+            objects['items']['keyholes'].append({'y': y, 'x': x})
+        
+        pos += 16
+    
+    # Slots 12-13: Crowns
+    for i in range(2):
+        active = read_byte_from_roms(pos) == 0x01
+        y = (read_byte_from_roms(pos + 5) << 8) | read_byte_from_roms(pos + 6)
+        x = read_byte_from_roms(pos + 7)
+        
+        if active:
+            objects['items']['crowns'].append({'y': y, 'x': x})
+        
+        pos += 16
+    
+    pos += 1  # Skip separator
+
+    # Read teleports (6 × 8 bytes: 4 data + 4 padding)
+    for i in range(NUM_TELEPORTS):
+        teleport = {
+            'y': (read_byte_from_roms(pos) << 8) | read_byte_from_roms(pos + 1),
+            'bottom_row': read_byte_from_roms(pos + 2),
+            'top_row': read_byte_from_roms(pos + 3)
+        }
+        objects['teleports'].append(teleport)
+        pos += 8
+    
+    # Read spawns (7 × 4 bytes: 3 data + 1 padding)
+    for i in range(NUM_SPAWNS):
+        spawn = {
+            'y': (read_byte_from_roms(pos) << 8) | read_byte_from_roms(pos + 1),
+            'x': read_byte_from_roms(pos + 2)
+        }
+        objects['spawns'].append(spawn)
+        pos += 4
+    
+    index_objects(objects, map_index, difficulty)
+    return objects
+
+def save_object_data(objects, map_index, difficulty=0):
+    """Save object data back to ROM - handles ROM boundaries with strict slot ranges"""
+    block_number = (difficulty * 4) + map_index
+    offset = OBJECT_BASE_OFFSET + (block_number * OBJECT_BLOCK_SIZE)
+    
+    pos = offset
+    # Write player start
+    write_byte_to_roms(pos, (objects['player_start']['y'] >> 8) & 0xFF)
+    write_byte_to_roms(pos + 1, objects['player_start']['y'] & 0xFF)
+    write_byte_to_roms(pos + 2, objects['player_start']['x'])
+    pos += 3
+    
+    # Write respawns
+    for respawn in objects['respawns']:
+        write_byte_to_roms(pos, (respawn['y'] >> 8) & 0xFF)
+        write_byte_to_roms(pos + 1, respawn['y'] & 0xFF)
+        write_byte_to_roms(pos + 2, respawn['x'])
+        pos += 3
+    
+    # Write Map Width
+    write_byte_to_roms(pos, objects['map_width'])
+    pos += 1
+    
+    # Write items in strict slot ranges
+    # Slots 0-3: Rings (0x6F) - pad to 4 slots
+    for i in range(4):
+        if i < len(objects['items']['rings']):
+            item = objects['items']['rings'][i]
+            write_byte_to_roms(pos, 0x01)  # Active
+            for j in range(1, 5):
+                write_byte_to_roms(pos + j, 0x00)
+            write_byte_to_roms(pos + 5, (item['y'] >> 8) & 0xFF)
+            write_byte_to_roms(pos + 6, item['y'] & 0xFF)
+            write_byte_to_roms(pos + 7, item['x'])
+            for j in range(8, 15):
+                write_byte_to_roms(pos + j, 0x00)
+            write_byte_to_roms(pos + 15, 0x6F)
+        else:
+            # Empty slot
+            for j in range(16):
+                write_byte_to_roms(pos + j, 0x00)
+        pos += 16
+    
+    # Slots 4-7: Keys (0x70) - pad to 4 slots
+    for i in range(4):
+        if i < len(objects['items']['keys']):
+            item = objects['items']['keys'][i]
+            write_byte_to_roms(pos, 0x01)  # Active
+            for j in range(1, 5):
+                write_byte_to_roms(pos + j, 0x00)
+            write_byte_to_roms(pos + 5, (item['y'] >> 8) & 0xFF)
+            write_byte_to_roms(pos + 6, item['y'] & 0xFF)
+            write_byte_to_roms(pos + 7, item['x'])
+            for j in range(8, 15):
+                write_byte_to_roms(pos + j, 0x00)
+            write_byte_to_roms(pos + 15, 0x70)
+        else:
+            # Empty slot
+            for j in range(16):
+                write_byte_to_roms(pos + j, 0x00)
+        pos += 16
+    
+    # Slots 8-11: Keyholes (0x72) - pad to 4 slots
+    for i in range(4):
+        if i < len(objects['items']['keyholes']):
+            item = objects['items']['keyholes'][i]
+            write_byte_to_roms(pos, 0x01)  # Active
+            for j in range(1, 5):
+                write_byte_to_roms(pos + j, 0x00)
+            write_byte_to_roms(pos + 5, (item['y'] >> 8) & 0xFF)
+            write_byte_to_roms(pos + 6, item['y'] & 0xFF)
+            write_byte_to_roms(pos + 7, item['x'])
+            for j in range(8, 15):
+                write_byte_to_roms(pos + j, 0x00)
+            write_byte_to_roms(pos + 15, 0x72)
+        else:
+            # Empty slot
+            for j in range(16):
+                write_byte_to_roms(pos + j, 0x00)
+        pos += 16
+    
+    # Slots 12-13: Crowns (0x62) - pad to 2 slots
+    for i in range(2):
+        if i < len(objects['items']['crowns']):
+            item = objects['items']['crowns'][i]
+            write_byte_to_roms(pos, 0x01)  # Active
+            for j in range(1, 5):
+                write_byte_to_roms(pos + j, 0x00)
+            write_byte_to_roms(pos + 5, (item['y'] >> 8) & 0xFF)
+            write_byte_to_roms(pos + 6, item['y'] & 0xFF)
+            write_byte_to_roms(pos + 7, item['x'])
+            for j in range(8, 15):
+                write_byte_to_roms(pos + j, 0x00)
+            write_byte_to_roms(pos + 15, 0x62)
+        else:
+            # Empty slot
+            for j in range(16):
+                write_byte_to_roms(pos + j, 0x00)
+        pos += 16
+    
+    write_byte_to_roms(pos, 0x00)
+    pos += 1
+    
+    # Write teleports
+    for teleport in objects['teleports']:
+        write_byte_to_roms(pos, (teleport['y'] >> 8) & 0xFF)
+        write_byte_to_roms(pos + 1, teleport['y'] & 0xFF)
+        write_byte_to_roms(pos + 2, teleport['bottom_row'])
+        write_byte_to_roms(pos + 3, teleport['top_row'])
+        for i in range(4, 8):
+            write_byte_to_roms(pos + i, 0x00)
+        pos += 8
+    
+    # Write spawns
+    for spawn in objects['spawns']:
+        write_byte_to_roms(pos, (spawn['y'] >> 8) & 0xFF)
+        write_byte_to_roms(pos + 1, spawn['y'] & 0xFF)
+        write_byte_to_roms(pos + 2, spawn['x'])
+        write_byte_to_roms(pos + 3, 0x00)
+        pos += 4
+    
+    index_objects(objects, map_index, difficulty)
+    if teleporter_table is not None:
+        teleporter_table.refresh_block(map_index, difficulty)
+    if validation_engine is not None:
+        validation_engine.on_objects_changed(objects, map_index, difficulty)
+
+#########################################
+# Object Index Functions
+#########################################
+
+# Object groups in hit-test priority order (items first, player start last)
+OBJECT_GROUPS = ['rings', 'keys', 'keyholes', 'crowns',
+                 'respawns', 'spawns', 'teleports', 'player_start']
+ITEM_GROUPS   = OBJECT_GROUPS[:4]
+object_indexes = {}             # (map_index, difficulty) -> ObjectIndex
+
+def game_to_cell(x, y):
+    """Convert game coordinates (XX row byte, YYYY column word) to a (row, col) cell"""
+    return (map_height - 1) - (x // 0x08), y // 0x08
+
+def cell_to_game(row, col):
+    """Convert a (row, col) cell to game coordinates (XX, YYYY)"""
+    return ((map_height - 1) - row) * 0x08, col * 0x08
+
+class ObjectIndex:
+    """Grid index from map cell to the object slots placed on it
+    
+    Each cell maps to a list of (group, slot) references into an object dict
+    as returned by load_object_data, e.g. ('keys', 2) or ('teleports', 0).
+    Slots are indexes into the group list, so references stay valid for any
+    copy of the same object data.
+    """
+    
+    def __init__(self, objects=None):
+        self.cells = {}
+        if objects is not None:
+            self.rebuild(objects)
+    
+    def rebuild(self, objects):
+        """Rebuild the whole index from an object dict"""
+        self.cells = {}
+        
+        ps = objects['player_start']
+        if ps['y'] != 0:
+            self.add(game_to_cell(ps['x'], ps['y']), ('player_start', 0))
+        
+        for group in ITEM_GROUPS:
+            for slot, item in enumerate(objects['items'][group]):
+                self.add(game_to_cell(item['x'], item['y']), (group, slot))
+        
+        for group in ['respawns', 'spawns']:
+            for slot, obj in enumerate(objects[group]):
+                if obj['y'] != 0:
+                    self.add(game_to_cell(obj['x'], obj['y']), (group, slot))
+        
+        for slot, tp in enumerate(objects['teleports']):
+            if tp['y'] != 0:
+                self.add(game_to_cell(tp['bottom_row'], tp['y']), ('teleports', slot))
+                self.add(game_to_cell(tp['top_row'], tp['y']), ('teleports', slot))
+    
+    def add(self, cell, ref):
+        """Add a reference to a cell, keeping hit-test priority order"""
+        refs = self.cells.setdefault(cell, [])
+        refs.append(ref)
+        refs.sort(key=lambda r: OBJECT_GROUPS.index(r[0]))
+    
+    def at(self, row, col):
+        """Return the (group, slot) references at a cell, highest priority first"""
+        return self.cells.get((row, col), [])
+    
+    def occupied(self, row, col):
+        """Check whether any object is placed at a cell"""
+        return (row, col) in self.cells
+
+def index_objects(objects, map_index, difficulty):
+    """Rebuild the cell index for one map/difficulty block"""
+    object_indexes[(map_index, difficulty)] = ObjectIndex(objects)
+
+def get_object_index(map_index, difficulty=0):
+    """Get the cell index for a map/difficulty block, building it if needed"""
+    if (map_index, difficulty) not in object_indexes:
+        load_object_data(map_index, difficulty)  # Indexes as a side effect
+    return object_indexes[(map_index, difficulty)]
+
+#########################################
+# Teleporter Table Functions
+#########################################
+
+TELEPORTER_DTYPE = np.dtype([('y', np.uint16), ('bottom_row', np.uint8), ('top_row', np.uint8)])
+TELEPORTER_EMPTY = -1           # Slot status codes, 0 = valid
+TELEPORTER_STATUS = {
+    1: "column out of bounds",
+    2: "rows out of bounds",
+    3: "both endpoints on same row",
+    4: "bottom not on walkable tile (visual)",
+    5: "top not on walkable tile (visual)"}
+teleporter_table = None         # TeleporterTable, built on first use
+
+def load_object_rom_space():
+    """Return the combined object ROM space (m1.1h + m2.2h) as one uint8 array"""
+    return np.concatenate([np.frombuffer(rom_cache[rom_name], dtype=np.uint8)
+                           for rom_name in ROM_CONFIG['object_roms']])
+
+def decode_teleporters(map_ids, difficulties):
+    """
+    Decode teleporter slots and map widths for a set of object blocks at once.
+    
+    Args:
+        map_ids, difficulties: broadcastable int arrays selecting blocks
+    
+    Returns:
+        (teleports, widths) - teleports is a TELEPORTER_DTYPE array with a
+        trailing NUM_TELEPORTS axis, widths the tile width of each block
+    """
+    space = load_object_rom_space()
+    block_offsets = OBJECT_BASE_OFFSET + (np.asarray(difficulties) * num_maps + np.asarray(map_ids)) * OBJECT_BLOCK_SIZE
+    
+    slot_offsets = block_offsets[..., None] + TELEPORT_BLOCK_OFFSET + np.arange(NUM_TELEPORTS) * 8
+    teleports = np.zeros(slot_offsets.shape, dtype=TELEPORTER_DTYPE)
+    teleports['y'] = (space[slot_offsets].astype(np.uint16) << 8) | space[slot_offsets + 1]
+    teleports['bottom_row'] = space[slot_offsets + 2]
+    teleports['top_row'] = space[slot_offsets + 3]
+    
+    widths = (space[block_offsets + MAP_WIDTH_BLOCK_OFFSET].astype(np.int32) + 1) * 16
+    return teleports, widths
+
+def validate_teleporter_slots(teleports, widths, visual_maps, map_ids):
+    """
+    Validate teleporter slots with vectorized masks.
+    
+    Args:
+        teleports: TELEPORTER_DTYPE array, last axis is the slot
+        widths: tile width for each block (teleports shape minus slot axis)
+        visual_maps: (num_maps, map_height, map_width) visual maps
+        map_ids: map index for each block, broadcastable to widths
+    
+    Returns:
+        int array shaped like teleports - TELEPORTER_EMPTY, 0 for valid, or a
+        TELEPORTER_STATUS code for the first check that failed
+    """
+    col = teleports['y'].astype(np.int32) // 0x08
+    bottom_row = (map_height - 1) - teleports['bottom_row'].astype(np.int32) // 0x08
+    top_row = (map_height - 1) - teleports['top_row'].astype(np.int32) // 0x08
+    
+    # Look up endpoint tiles with clamped indices, the bounds masks reject the rest
+    maps = np.broadcast_to(np.asarray(map_ids)[..., None], col.shape)
+    safe_col = np.clip(col, 0, map_width - 1)
+    bottom_tile = visual_maps[maps, np.clip(bottom_row, 0, map_height - 1), safe_col]
+    top_tile = visual_maps[maps, np.clip(top_row, 0, map_height - 1), safe_col]
+    
+    # First matching condition wins, same order as the checks were always made
+    return np.select(
+        [teleports['y'] == 0,
+         col >= np.asarray(widths)[..., None],
+         (bottom_row < 0) | (bottom_row >= map_height) | (top_row < 0) | (top_row >= map_height),
+         bottom_row == top_row,
+         bottom_tile != empty_path_tile,
+         top_tile != empty_path_tile],
+        [TELEPORTER_EMPTY, 1, 2, 3, 4, 5],
+        default=0)
+
+class TeleporterTable:
+    """Teleporters for all 16 object blocks with a per-slot validity table
+    
+    Arrays are indexed [difficulty, map, slot]. The table is decoded once and
+    then kept current by save_object_data (one block re-decoded) and
+    write_visual_tile_to_cache (only maps with a teleporter in the edited
+    column are re-validated).
+    """
+    
+    def __init__(self):
+        self.rebuild()
+    
+    def rebuild(self):
+        """Decode and validate every block"""
+        self.map_ids = np.arange(num_maps)[None, :]
+        difficulties = np.arange(NUM_DIFFICULTIES)[:, None]
+        self.teleports, self.widths = decode_teleporters(self.map_ids, difficulties)
+        self.visual_maps = load_all_visual_maps()
+        self.status = validate_teleporter_slots(self.teleports, self.widths,
+                                                self.visual_maps, self.map_ids)
+    
+    def revalidate_map(self, map_index):
+        """Re-validate all difficulties of one map"""
+        self.status[:, map_index] = validate_teleporter_slots(
+            self.teleports[:, map_index], self.widths[:, map_index],
+            self.visual_maps, map_index)
+    
+    def refresh_block(self, map_index, difficulty):
+        """Re-decode one block after its object data was written"""
+        teleports, width = decode_teleporters(map_index, difficulty)
+        self.teleports[difficulty, map_index] = teleports
+        self.widths[difficulty, map_index] = width
+        self.status[difficulty, map_index] = validate_teleporter_slots(
+            teleports, width, self.visual_maps, map_index)
+    
+    def on_tile_changed(self, map_index, row, col, tile_id):
+        """Track a visual map write, re-validating only if a teleporter uses that column"""
+        self.visual_maps[map_index, row, col] = tile_id
+        if np.any(self.teleports['y'][:, map_index] // 0x08 == col):
+            self.revalidate_map(map_index)
+    
+    def columns(self, map_index):
+        """Columns with a valid teleporter in any difficulty, in slot order"""
+        cols = self.teleports['y'][:, map_index][self.status[:, map_index] == 0] // 0x08
+        return list(dict.fromkeys(int(col) for col in cols))
+
+def get_teleporter_table():
+    """Get the shared teleporter table, building it on first use"""
+    global teleporter_table
+    if teleporter_table is None:
+        teleporter_table = TeleporterTable()
+    return teleporter_table
+
+#########################################
+# Tile Usage Functions
+#########################################
+
+tile_usage = None               # TileUsage, built on first use
+
+class TileUsage:
+    """Inverted index from tile to everything that shows it
+    
+    cells maps a tile to the (map, row, col) cells it sits on and is kept
+    current by write_visual_tile_to_cache, one cell moved per write. frames
+    maps a tile to the (animation, frame) entries that show it; animation
+    tables are only changed by raw ROM writes, which report through
+    note_rom_write so just the tables they overlap are re-read. Overlay
+    sprites (OVERLAY_TILES) are fixed.
+    """
+    
+    def __init__(self):
+        self.rebuild()
+    
+    def rebuild(self):
+        """Index every map cell and animation frame"""
+        self.visual_maps = load_all_visual_maps()
+        self.cells = {}
+        for cell, tile_id in np.ndenumerate(self.visual_maps):
+            self.cells.setdefault(int(tile_id), set()).add(cell)
+        
+        self.animations = animation_tables()
+        self.frames = {}
+        self.animation_frames = [[] for _ in self.animations]  # Animation -> frame tiles, for re-indexing
+        for anim_index in range(len(self.animations)):
+            self.index_animation(anim_index)
+    
+    def index_animation(self, anim_index):
+        """(Re)read one animation table's frames into the index"""
+        for frame, tile_id in enumerate(self.animation_frames[anim_index]):
+            self.frames.get(tile_id, set()).discard((anim_index, frame))
+        self.animation_frames[anim_index] = [tile for tile, _, _ in decode_animation(self.animations[anim_index])]
+        for frame, tile_id in enumerate(self.animation_frames[anim_index]):
+            if tile_id is not None:  # Codes beyond the tile ROMs
+                self.frames.setdefault(tile_id, set()).add((anim_index, frame))
+    
+    def on_tile_changed(self, map_index, row, col, tile_id):
+        """Track a visual map write by moving one cell between tiles"""
+        old_tile = int(self.visual_maps[map_index, row, col])
+        if old_tile == tile_id:
+            return
+        self.visual_maps[map_index, row, col] = tile_id
+        self.cells[old_tile].discard((map_index, row, col))
+        self.cells.setdefault(tile_id, set()).add((map_index, row, col))
+    
+    def on_rom_changed(self, rom_name, start, end):
+        """Re-read the animation tables overlapping rom_name[start:end]"""
+        for anim_index, table in enumerate(self.animations):
+            if table['rom'] == rom_name and table['start'] < end and start < table['end']:
+                self.index_animation(anim_index)
+    
+    def cells_using(self, tile_id, map_index=None):
+        """Cells showing a tile, optionally on one map, in map/row/col order"""
+        return sorted(cell for cell in self.cells.get(tile_id, ()) if map_index is None or cell[0] == map_index)
+    
+    def maps_using(self, tile_id):
+        """Maps with at least one cell showing a tile"""
+        return sorted({cell[0] for cell in self.cells.get(tile_id, ())})
+    
+    def frames_using(self, tile_id):
+        """(animation index, frame) entries showing a tile"""
+        return sorted(self.frames.get(tile_id, ()))
+    
+    def shown_on_map(self, tile_id, map_index):
+        """Whether a map view draws a tile - as a cell or as an object overlay"""
+        return tile_id in OVERLAY_TILES or any(cell[0] == map_index for cell in self.cells.get(tile_id, ()))
+    
+    def where_used(self, tile_id):
+        """Readable lines: per-map cell counts, animation frames and overlays"""
+        lines = []
+        for map_index in self.maps_using(tile_id):
+            count = len(self.cells_using(tile_id, map_index))
+            lines.append(f"Map {map_index + 1}: {count} cell{'s' if count != 1 else ''}")
+        by_animation = {}
+        for anim_index, frame in self.frames_using(tile_id):
+            by_animation.setdefault(anim_index, []).append(str(frame + 1))
+        for anim_index, frames in by_animation.items():
+            lines.append(f"{self.animations[anim_index]['name']}: frame {', '.join(frames)}")
+        if tile_id in OVERLAY_TILES:
+            lines.append(OVERLAY_TILES[tile_id])
+        return lines
+
+def get_tile_usage():
+    """Get the shared tile usage index, building it on first use"""
+    global tile_usage
+    if tile_usage is None:
+        tile_usage = TileUsage()
+    return tile_usage
+
+def note_rom_write(rom_name, start, end):
+    """Keep the tile usage index in step with a raw ROM write (hex viewer, reload)"""
+    if tile_usage is not None:
+        tile_usage.on_rom_changed(rom_name, start, end)
+
+#########################################
+# Validation Rule Functions
+#########################################
+
+validation_rules = {}           # Rule name -> (scope, subjects, check), in registration order
+validation_engine = None        # ValidationEngine, built on first use
+ITEM_GROUP_TILES = {            # Item group -> (item tile, visual tiles it may sit on)
+    'rings':    (0x6F, (0x21,)),
+    'keys':     (0x70, (0x22,)),
+    'keyholes': (0x72, (0x72, empty_path_tile)),
+    'crowns':   (0x62, (0x4A,))}
+
+def register_rule(name, scope, subjects, check):
+    """
+    Register a validation rule with the engine.
+    
+    Args:
+        name: Unique rule name
+        scope: 'block' rules check object slots of one map/difficulty,
+               'cell' rules check single visual map cells
+        subjects: For block rules, function(values) -> subjects to check;
+                  for cell rules, function(visual_maps) -> (map, row, col)
+                  cells worth checking on the initial sweep
+        check: For block rules, function(values, map_index, difficulty, subject)
+               -> (inputs, problem) where inputs are the (group, slot),
+               (group, None) and ('cell', row, col) keys that were read;
+               for cell rules, function(map_index, row, col, tile_id) -> problem.
+               A problem is (message, (row, col) or None), or None if valid.
+    """
+    validation_rules[name] = (scope, subjects, check)
+
+def object_slot_values(objects):
+    """Flatten object data into {(group, slot): value} for change tracking"""
+    ps = objects['player_start']
+    values = {('map_width', 0): objects['map_width'],
+              ('player_start', 0): (ps['x'], ps['y'])}
+    for group in ITEM_GROUPS:
+        for slot, item in enumerate(objects['items'][group]):
+            values[(group, slot)] = (item['x'], item['y'])
+    for group in ('respawns', 'spawns'):
+        for slot, obj in enumerate(objects[group]):
+            if obj['y'] != 0:
+                values[(group, slot)] = (obj['x'], obj['y'])
+    for slot, tp in enumerate(objects['teleports']):
+        if tp['y'] != 0:
+            values[('teleports', slot)] = (tp['y'], tp['bottom_row'], tp['top_row'])
+    return values
+
+def changed_slot_keys(old_values, new_values):
+    """Slot keys whose value changed, plus (group, None) for groups that gained or lost slots"""
+    changed = {key for key in old_values.keys() | new_values.keys()
+               if old_values.get(key) != new_values.get(key)}
+    changed.update((group, None) for group, slot in old_values.keys() ^ new_values.keys())
+    return changed
+
+class ValidationEngine:
+    """Incremental validator feeding the map editor problems list
+    
+    Every check is one rule applied to one subject and remembers the keys it
+    read. An object save or tile write only re-runs the checks watching a
+    changed key, so the cost of an edit does not grow with the rule set.
+    """
+    
+    def __init__(self):
+        self.values = {}        # (map, diff) -> object_slot_values
+        self.checks = {}        # (map, diff) -> check ids of block rules
+        self.inputs = {}        # check id -> watched keys
+        self.watchers = {}      # watched key -> set of check ids
+        self.problems = {}      # (map, diff or None) -> {check id: problem}
+        self.rebuild()
+    
+    def rebuild(self):
+        """Run every rule against all object blocks and visual maps"""
+        self.values.clear()
+        self.checks.clear()
+        self.inputs.clear()
+        self.watchers.clear()
+        self.problems.clear()
+        
+        for diff in range(NUM_DIFFICULTIES):
+            for map_idx in range(num_maps):
+                self.checks[(map_idx, diff)] = set()
+                self.update_block(map_idx, diff, object_slot_values(load_object_data(map_idx, diff)), None)
+        
+        visual_maps = load_all_visual_maps()
+        for name, (scope, subjects, check) in validation_rules.items():
+            if scope == 'cell':
+                for map_idx, row, col in subjects(visual_maps):
+                    self.run_cell_check(name, map_idx, int(row), int(col), visual_maps[map_idx, row, col])
+    
+    def watch(self, check_id, keys):
+        """Replace the keys a check is watching"""
+        for key in self.inputs.pop(check_id, ()):
+            self.watchers[key].discard(check_id)
+        if keys is not None:
+            self.inputs[check_id] = keys
+            for key in keys:
+                self.watchers.setdefault(key, set()).add(check_id)
+    
+    def set_problem(self, block, check_id, problem):
+        """Record or clear the problem for a check, returns True if it changed"""
+        block_problems = self.problems.setdefault(block, {})
+        if problem is None:
+            return block_problems.pop(check_id, None) is not None
+        if block_problems.get(check_id) == problem:
+            return False
+        block_problems[check_id] = problem
+        return True
+    
+    def run_block_check(self, check_id):
+        """Run one block check and re-register its inputs"""
+        name, map_idx, diff, subject = check_id
+        inputs, problem = validation_rules[name][2](self.values[(map_idx, diff)], map_idx, diff, subject)
+        self.watch(check_id, {('cell', map_idx) + key[1:] if key[0] == 'cell' else (map_idx, diff) + key
+                              for key in inputs})
+        return self.set_problem((map_idx, diff), check_id, problem)
+    
+    def run_cell_check(self, name, map_idx, row, col, tile_id):
+        """Run one cell rule on one cell"""
+        problem = validation_rules[name][2](map_idx, row, col, tile_id)
+        return self.set_problem((map_idx, None), (name, map_idx, None, (row, col)), problem)
+    
+    def update_block(self, map_idx, diff, new_values, changed):
+        """Re-run block checks whose subjects appeared or whose inputs changed"""
+        self.values[(map_idx, diff)] = new_values
+        previous = self.checks[(map_idx, diff)]
+        current = set()
+        
+        # Checks watching a changed key
+        dirty = set()
+        for key in changed or ():
+            dirty.update(self.watchers.get((map_idx, diff) + key, ()))
+        
+        updated = False
+        for name, (scope, subjects, check) in validation_rules.items():
+            if scope != 'block':
+                continue
+            for subject in subjects(new_values):
+                check_id = (name, map_idx, diff, subject)
+                current.add(check_id)
+                if check_id not in previous or check_id in dirty:
+                    updated |= self.run_block_check(check_id)
+        
+        # Subjects that no longer exist (emptied slots)
+        for check_id in previous - current:
+            self.watch(check_id, None)
+            updated |= self.set_problem((map_idx, diff), check_id, None)
+        self.checks[(map_idx, diff)] = current
+        return updated
+    
+    def on_objects_changed(self, objects, map_idx, difficulty):
+        """Track an object block write"""
+        new_values = object_slot_values(objects)
+        changed = changed_slot_keys(self.values[(map_idx, difficulty)], new_values)
+        if changed and self.update_block(map_idx, difficulty, new_values, changed):
+            trigger_callback('problems_changed', map_idx)
+    
+    def on_cell_changed(self, map_idx, row, col, tile_id):
+        """Track a visual map write"""
+        updated = False
+        for check_id in list(self.watchers.get(('cell', map_idx, row, col), ())):
+            updated |= self.run_block_check(check_id)
+        for name, (scope, subjects, check) in validation_rules.items():
+            if scope == 'cell':
+                updated |= self.run_cell_check(name, map_idx, row, col, tile_id)
+        if updated:
+            trigger_callback('problems_changed', map_idx)
+    
+    def problems_for(self, map_index, difficulty):
+        """Problems on one map/difficulty, in rule order"""
+        rule_order = {name: i for i, name in enumerate(validation_rules)}
+        found = list(self.problems.get((map_index, difficulty), {}).items())
+        found += self.problems.get((map_index, None), {}).items()
+        found.sort(key=lambda entry: (rule_order[entry[0][0]], str(entry[0][3])))
+        return [problem for check_id, problem in found]
+
+def get_validation_engine():
+    """Get the shared validation engine, building it on first use"""
+    global validation_engine
+    if validation_engine is None:
+        validation_engine = ValidationEngine()
+    return validation_engine
+
+def slot_cell(values, group, slot):
+    """Array cell of an object slot, or None if it is off the map"""
+    x, y = values[(group, slot)]
+    row, col = game_to_cell(x, y)
+    if 0 <= row < map_height and 0 <= col < min((values[('map_width', 0)] + 1) * 16, map_width):
+        return row, col
+    return None
+
+def check_item_box(values, map_index, difficulty, subject):
+    """Items must sit on their box tile (keyholes on a path or keyhole tile)"""
+    group, slot = subject
+    name = group[:-1].capitalize()
+    inputs = {subject, ('map_width', 0)}
+    cell = slot_cell(values, group, slot)
+    if cell is None:
+        return inputs, (f"{name} {slot + 1} is outside the map width", None)
+    
+    row, col = cell
+    inputs.add(('cell', row, col))
+    item_tile, box_tiles = ITEM_GROUP_TILES[group]
+    if read_visual_tile_from_cache(map_index, row, col) not in box_tiles:
+        return inputs, (f"{name} at ({col}, {row}) is not on a {group[:-1]} box", cell)
+    return inputs, None
+
+def check_marker_path(values, map_index, difficulty, subject):
+    """Player start, respawns and enemy spawns must sit on an empty path"""
+    group, slot = subject
+    name = {'player_start': "Player start", 'respawns': f"Respawn {slot + 1}",
+            'spawns': f"Enemy spawn {slot + 1}"}[group]
+    inputs = {subject, ('map_width', 0)}
+    cell = slot_cell(values, group, slot)
+    if cell is None:
+        return inputs, (f"{name} is outside the map width", None)
+    
+    row, col = cell
+    inputs.add(('cell', row, col))
+    if read_visual_tile_from_cache(map_index, row, col) != empty_path_tile:
+        return inputs, (f"{name} at ({col}, {row}) is not on an empty path", cell)
+    return inputs, None
+
+def check_teleporter(values, map_index, difficulty, subject):
+    """Teleporters must pass the teleporter table checks"""
+    group, slot = subject
+    y, bottom_row, top_row = values[subject]
+    col = y // 0x08
+    inputs = {subject, ('map_width', 0)}
+    for row_value in (bottom_row, top_row):
+        row, _ = game_to_cell(row_value, y)
+        if 0 <= row < map_height and 0 <= col < map_width:
+            inputs.add(('cell', row, col))
+    
+    status = get_teleporter_table().status[difficulty, map_index, slot]
+    if status > 0:
+        row, _ = game_to_cell(bottom_row, y)
+        cell = (row, col) if 0 <= row < map_height and 0 <= col < map_width else None
+        return inputs, (f"Teleporter {slot + 1} {TELEPORTER_STATUS[status]}", cell)
+    return inputs, None
+
+def check_keyholes_vs_keys(values, map_index, difficulty, subject):
+    """Every keyhole needs a key"""
+    num_keys = sum(1 for group, slot in values if group == 'keys')
+    num_keyholes = sum(1 for group, slot in values if group == 'keyholes')
+    inputs = {('keys', None), ('keyholes', None)}
+    if num_keyholes > num_keys:
+        return inputs, (f"{num_keyholes} keyholes but only {num_keys} keys", None)
+    return inputs, None
+
+def find_filled_boxes(visual_maps):
+    """Cells holding a filled box tile"""
+    return np.argwhere(np.isin(visual_maps, list(FILLED_TO_EMPTY)))
+
+def check_filled_box(map_index, row, col, tile_id):
+    """Boxes are stored empty, the item comes from object data"""
+    if tile_id in FILLED_TO_EMPTY:
+        return (f"Filled box at ({col}, {row}), use an empty box (0x{FILLED_TO_EMPTY[tile_id]:02X})", (row, col))
+    return None
+
+register_rule('item_box', 'block',
+              lambda values: [key for key in values if key[0] in ITEM_GROUPS], check_item_box)
+register_rule('marker_path', 'block',
+              lambda values: [key for key in values if key[0] in ('player_start', 'respawns', 'spawns')
+                              and values[key][1] != 0], check_marker_path)
+register_rule('teleporter', 'block',
+              lambda values: [key for key in values if key[0] == 'teleports'], check_teleporter)
+register_rule('keyholes_vs_keys', 'block', lambda values: [None], check_keyholes_vs_keys)
+register_rule('filled_box', 'cell', find_filled_boxes, check_filled_box)
+
+#########################################
+# Reachability Functions
+#########################################
+
+REACHABILITY_GROUPS = ITEM_GROUPS + ['teleports']  # Objects the player has to get to
+ROW_SHIFTS = [np.uint64(1 << i) for i in range(6)]  # Bit shifts 1, 2, 4 ... 32
+
+def pack_rows(cells):
+    """Pack a (..., map_width) bool array into one uint64 per row, bit n = column n"""
+    return np.packbits(cells, axis=-1, bitorder='little').view('<u8')[..., 0]
+
+def unpack_rows(rows):
+    """Unpack uint64 rows back into a (..., map_width) bool array"""
+    return np.unpackbits(rows[..., None].view(np.uint8), axis=-1, bitorder='little').astype(bool)
+
+def fill_rows(reached, walkable):
+    """Flood reached bits left and right along walkable runs (Kogge-Stone fill)"""
+    east, west = reached.copy(), reached.copy()
+    pro_east, pro_west = walkable.copy(), walkable.copy()
+    for shift in ROW_SHIFTS:
+        east |= pro_east & (east << shift)
+        pro_east &= pro_east << shift
+        west |= pro_west & (west >> shift)
+        pro_west &= pro_west >> shift
+    return east | west
+
+def neighbours(rows):
+    """Cells 4-adjacent to the set bits (including the cells themselves)"""
+    one = np.uint64(1)
+    near = rows | (rows << one) | (rows >> one)
+    near[..., 1:] |= rows[..., :-1]
+    near[..., :-1] |= rows[..., 1:]
+    return near
+
+def walkable_cells(visual_maps, widths):
+    """
+    Cells the player can stand on, from the same bytes as the logical map.
+    
+    Args:
+        visual_maps: (num_maps, map_height, map_width) visual maps
+        widths: tile width per map (D1 width, as the logical map is generated)
+    
+    Returns:
+        (num_maps, map_height, map_width) bool array
+    """
+    walkable = (LOGICAL_TILE_BYTES[visual_maps] == 0).all(axis=-1)
+    cols = np.arange(map_width)
+    walkable &= ((cols >= 1) & (cols < np.asarray(widths)[:, None] - 1))[:, None, :]
+    return walkable
+
+def analyze_reachability():
+    """
+    Flood fill every map and difficulty at once from its player start.
+    
+    Each map row is a uint64 bitboard, so one pass floods whole walkable
+    runs sideways, steps one row up/down and then follows valid teleporter
+    pairs (both directions), until nothing new is reached.
+    
+    Returns:
+        (reachable, unreachable) - reachable is a (NUM_DIFFICULTIES, num_maps,
+        map_height, map_width) bool array of cells on or next to a reached
+        cell, unreachable maps
+        (map, difficulty) to the object refs (and ('door', 0)) that cannot be
+        reached. Blocks without a player start are skipped.
+    """
+    table = get_teleporter_table()
+    visual_maps = table.visual_maps
+    walkable = pack_rows(walkable_cells(visual_maps, table.widths[0]))
+    walkable = np.broadcast_to(walkable, (NUM_DIFFICULTIES,) + walkable.shape)
+    
+    # Seed from each player start
+    seeds = np.zeros((NUM_DIFFICULTIES, num_maps, map_height, map_width), dtype=bool)
+    has_start = np.zeros((NUM_DIFFICULTIES, num_maps), dtype=bool)
+    for diff in range(NUM_DIFFICULTIES):
+        for map_idx in range(num_maps):
+            for cell, refs in get_object_index(map_idx, diff).cells.items():
+                if ('player_start', 0) in refs and 0 <= cell[0] < map_height and 0 <= cell[1] < map_width:
+                    seeds[diff, map_idx][cell] = True
+                    has_start[diff, map_idx] = True
+    reached = pack_rows(seeds) & walkable
+    
+    # Teleporter endpoints as (difficulty, map, row) plus column bit
+    diffs, maps, slots = np.nonzero(table.status == 0)
+    tp = table.teleports[diffs, maps, slots]
+    tp_cols = (tp['y'] // 0x08).astype(np.uint64)
+    tp_bottom = (map_height - 1) - tp['bottom_row'].astype(np.int64) // 0x08
+    tp_top = (map_height - 1) - tp['top_row'].astype(np.int64) // 0x08
+    one = np.uint64(1)
+    
+    while True:
+        previous = reached
+        reached = fill_rows(reached, walkable)
+        reached |= neighbours(reached) & walkable
+        
+        # Either end reached -> both ends reached
+        if len(diffs):
+            ends = ((reached[diffs, maps, tp_bottom] >> tp_cols) | (reached[diffs, maps, tp_top] >> tp_cols)) & one
+            np.bitwise_or.at(reached, (diffs, maps, tp_bottom), ends << tp_cols)
+            np.bitwise_or.at(reached, (diffs, maps, tp_top), ends << tp_cols)
+        
+        if np.array_equal(reached, previous):
+            break
+    
+    reachable = unpack_rows(neighbours(reached))
+    doors = np.isin(visual_maps, DOOR_TILES)
+    
+    unreachable = {}
+    for diff, map_idx in zip(*np.nonzero(has_start)):
+        diff, map_idx = int(diff), int(map_idx)
+        missing = []
+        for (row, col), refs in get_object_index(map_idx, diff).cells.items():
+            if not (0 <= row < map_height and 0 <= col < map_width) or not reachable[diff, map_idx, row, col]:
+                missing += [ref for ref in refs if ref[0] in REACHABILITY_GROUPS]
+        if doors[map_idx].any() and not (reachable[diff, map_idx] & doors[map_idx]).any():
+            missing.append(('door', 0))
+        unreachable[(map_idx, diff)] = sorted(set(missing))
+    return reachable, unreachable
+
+#########################################
+# Map Helper Functions
+#########################################
+
+def find_tile_pattern(maps, pattern):
+    """
+    Find every placement of a multi-tile pattern in one or more visual maps.
+    
+    Args:
+        maps: (rows, cols) map or (num_maps, rows, cols) stack of maps
+        pattern: 2D array of tile IDs, TILE_WILDCARD entries match any tile
+    
+    Returns:
+        (N, maps.ndim) int array of match positions (top-left corner),
+        e.g. rows of (map, row, col) for a stack, sorted in scan order
+    """
+    maps = np.asarray(maps)
+    pattern = np.asarray(pattern)
+    
+    # Every pattern-sized window of every map: (..., rows-ph+1, cols-pw+1, ph, pw)
+    windows = sliding_window_view(maps, pattern.shape, axis=(-2, -1))
+    care = pattern != TILE_WILDCARD
+    matches = np.all(windows[..., care] == pattern[care], axis=-1)
+    
+    return np.argwhere(matches)
+
+def find_doors():
+    """Find door positions on all maps in one pass - {map_index: (row, col) or None}"""
+    doors = {map_idx: None for map_idx in range(num_maps)}
+    
+    # Matches come back in scan order, keep the first one per map
+    for map_idx, row, col in find_tile_pattern(load_all_visual_maps(), DOOR_TILES):
+        if doors[map_idx] is None:
+            doors[map_idx] = (int(row), int(col))
+    
+    return doors
+
+def find_door(map_index):
+    """Find door position on a map - reads directly from ROM cache"""
+    matches = find_tile_pattern(load_visual_map_from_cache(map_index), DOOR_TILES)
+    if len(matches) == 0:
+        return None
+    return (int(matches[0][0]), int(matches[0][1]))
+
+def find_teleporters(map_index):
+    """Find all valid teleporter columns from object data"""
+    return get_teleporter_table().columns(map_index)
+
+def reset_map_caches():
+    """Drop caches derived from the ROM cache after new ROMs are loaded"""
+    global teleporter_table, validation_engine, tile_usage
+    object_indexes.clear()
+    teleporter_table = None
+    validation_engine = None
+    tile_usage = None
+
+register_callback('roms_loaded', reset_map_caches)
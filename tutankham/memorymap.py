@@ -0,0 +1,237 @@
+"""MemoryMap.txt as a sorted interval index - no Tk required
+
+The table is parsed once into parallel numpy arrays sorted by (ROM, start),
+so address -> region is a bisection and region name -> address range is a
+dict lookup. The arrays are cached in a binary sidecar next to
+MemoryMap.txt, keyed by the text file's SHA-1, and rebuilt whenever the
+text changes.
+"""
+import os
+import logging
+import bisect
+import hashlib
+import tempfile
+
+import numpy as np
+
+#########################################
+# Memory Map Data Setup
+#########################################
+
+# MemoryMap.txt, kept next to the editor
+MEMORY_MAP_PATH    = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "MemoryMap.txt")
+MEMORY_MAP_SIDECAR = MEMORY_MAP_PATH + ".idx.npz"   # Parsed index, rebuilt when the hash changes
+ROM_SIZE           = 0x1000     # Every ROM is 4KB, addresses are CPU/bank addresses
+MEMORY_MAP_ALIASES = {'c1.1h': 'c1.1i'}   # Typos in MemoryMap.txt's ROM column
+MEMORY_MAP_ARRAYS  = ['roms', 'rom_ids', 'starts', 'ends', 'descriptions', 'notes']
+
+#########################################
+# Memory Map Functions
+#########################################
+
+def parse_memory_map(lines):
+    """Parse MemoryMap.txt's table rows
+
+    Returns:
+        List of (rom, start, end, description, notes) with start/end as
+        inclusive file offsets into the 4KB ROM
+    """
+    regions = []
+    for line in lines:
+        cells = [cell.strip() for cell in line.strip().strip('|').split('|')]
+        if len(cells) < 4 or not cells[1].startswith('0x'):
+            continue  # Header and separator rows
+        rom = MEMORY_MAP_ALIASES.get(cells[0], cells[0])
+        first, last = (int(address, 16) for address in cells[1].split('-'))
+        notes = cells[4] if len(cells) > 4 else ''
+        regions.append((rom, first % ROM_SIZE, last % ROM_SIZE, cells[3], notes))
+    return regions
+
+class MemoryMap:
+    """Interval index over MemoryMap.txt regions
+
+    Regions are rows of parallel arrays sorted by (ROM, start). A region is
+    returned as a (rom, start, end, description, notes) tuple, end inclusive
+    like the text file.
+    """
+
+    def __init__(self, roms, rom_ids, starts, ends, descriptions, notes):
+        self.roms = [str(rom) for rom in roms]
+        self.rom_ids = np.asarray(rom_ids, dtype=np.uint8)
+        self.starts = np.asarray(starts, dtype=np.uint16)
+        self.ends = np.asarray(ends, dtype=np.uint16)
+        self.descriptions = [str(text) for text in descriptions]
+        self.notes = [str(text) for text in notes]
+
+        # One sorted key per row for bisection, and name -> rows for reverse lookups
+        self.keys = (self.rom_ids.astype(np.int64) << 16 | self.starts).tolist()
+        self.rom_index = {rom: i for i, rom in enumerate(self.roms)}
+        self.by_description = {}
+        for row, description in enumerate(self.descriptions):
+            self.by_description.setdefault(description, []).append(row)
+
+    @classmethod
+    def from_regions(cls, regions):
+        """Build the index from parse_memory_map rows (duplicates dropped)"""
+        regions = sorted(set(regions), key=lambda r: (r[0], r[1], r[2]))
+        roms = sorted({region[0] for region in regions})
+        rom_index = {rom: i for i, rom in enumerate(roms)}
+        columns = list(zip(*regions)) or [()] * 5
+        return cls(roms, [rom_index[rom] for rom in columns[0]], columns[1], columns[2], columns[3], columns[4])
+
+    def __len__(self):
+        return len(self.keys)
+
+    def region(self, row):
+        """The region tuple for one row"""
+        return (self.roms[self.rom_ids[row]], int(self.starts[row]), int(self.ends[row]),
+                self.descriptions[row], self.notes[row])
+
+    def row_at(self, rom, offset):
+        """Row of the region covering a file offset, or -1"""
+        if rom not in self.rom_index:
+            return -1
+        key = self.rom_index[rom] << 16 | offset
+        row = bisect.bisect_right(self.keys, key) - 1
+        if row >= 0 and self.rom_ids[row] == self.rom_index[rom] and offset <= self.ends[row]:
+            return row
+        return -1
+
+    def region_at(self, rom, offset):
+        """The region covering a file offset, or None"""
+        row = self.row_at(rom, offset)
+        return self.region(row) if row >= 0 else None
+
+    def rows_at(self, rom, offsets):
+        """Vectorized row_at for an array of offsets of one ROM (-1 where unmapped)"""
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if rom not in self.rom_index:
+            return np.full(offsets.shape, -1)
+        rom_id = self.rom_index[rom]
+        rows = np.searchsorted(self.keys, rom_id << 16 | offsets, side='right') - 1
+        clipped = np.maximum(rows, 0)
+        hit = (rows >= 0) & (self.rom_ids[clipped] == rom_id) & (offsets <= self.ends[clipped])
+        return np.where(hit, rows, -1)
+
+    def regions_in(self, rom, start, end):
+        """Regions overlapping the [start, end) offsets, in address order"""
+        if rom not in self.rom_index:
+            return []
+        rom_id = self.rom_index[rom] << 16
+        first = max(bisect.bisect_right(self.keys, rom_id | start) - 1, 0)
+        last = bisect.bisect_left(self.keys, rom_id | end)
+        return [self.region(row) for row in range(first, last)
+                if self.rom_ids[row] == self.rom_index[rom] and self.ends[row] >= start]
+
+    def find(self, description):
+        """Every region with exactly this description, in address order"""
+        return [self.region(row) for row in self.by_description.get(description, [])]
+
+    def address_range(self, description):
+        """(rom, start, end exclusive) of the first region with this description
+
+        Raises:
+            KeyError: no region has that description
+        """
+        rom, start, end, _, _ = self.region(self.by_description[description][0])
+        return rom, start, end + 1
+
+    def arrays(self):
+        """The index as plain arrays for the sidecar - text as newline-joined UTF-8 bytes"""
+        def blob(texts):
+            return np.frombuffer('\n'.join(texts).encode('utf-8'), dtype=np.uint8)
+        return {'roms': blob(self.roms), 'rom_ids': self.rom_ids, 'starts': self.starts, 'ends': self.ends,
+                'descriptions': blob(self.descriptions), 'notes': blob(self.notes)}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuild the index from arrays()"""
+        def texts(blob):
+            return blob.tobytes().decode('utf-8').split('\n')
+        return cls(texts(arrays['roms']), arrays['rom_ids'], arrays['starts'], arrays['ends'],
+                   texts(arrays['descriptions']), texts(arrays['notes']))
+
+def load_memory_map(path=MEMORY_MAP_PATH, sidecar=MEMORY_MAP_SIDECAR):
+    """Load MemoryMap.txt, from the sidecar when its hash still matches
+
+    A sidecar that can't be read (torn, corrupt, another version) counts as a
+    miss. It is written to a temporary file and renamed into place, so a crash
+    or a second editor mid-write never leaves a torn one. A sidecar that can't
+    be written (read-only install) is skipped; the index is then parsed from
+    the text on every start.
+    """
+    with open(path, 'rb') as f:
+        text = f.read()
+    digest = np.frombuffer(hashlib.sha1(text).digest(), dtype=np.uint8)
+
+    try:
+        with np.load(sidecar, allow_pickle=False) as cached:
+            if np.array_equal(cached['digest'], digest):
+                logging.info(f"Memory map loaded from {sidecar}")
+                return MemoryMap.from_arrays({name: cached[name] for name in MEMORY_MAP_ARRAYS})
+    except Exception as e:
+        if os.path.exists(sidecar):
+            logging.info(f"Ignoring unreadable memory map sidecar {sidecar}: {e}")
+
+    memory_map = MemoryMap.from_regions(parse_memory_map(text.decode('utf-8').splitlines()))
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(sidecar) + '.',
+                                         dir=os.path.dirname(sidecar) or '.')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, digest=digest, **memory_map.arrays())
+        os.replace(temp_path, sidecar)
+    except OSError as e:
+        logging.debug(f"Couldn't write memory map sidecar {sidecar}: {e}")
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+    logging.info(f"Memory map parsed from {path}: {len(memory_map)} regions")
+    return memory_map
+
+def check_offsets(memory_map):
+    """Compare the hard-coded offsets against MemoryMap.txt
+
+    Every offset the codecs use on their own should fall inside a region of
+    the right ROM; the named ones should start the region of that name.
+
+    Returns:
+        List of mismatch messages (also logged as warnings)
+    """
+    from .roms import ROM_CONFIG
+    from .graphics import PALETTE_FILE_OFFSETS, UI_GRAPHICS_CONFIG, TREASURE_GRAPHICS_CONFIG
+    from .highscores import HIGH_SCORE_OFFSET
+    from .maps import CONFIG_BASE_OFFSET
+
+    expected = [('PALETTE_FILE_OFFSETS', ROM_CONFIG['palette_rom'], offset, None) for offset in PALETTE_FILE_OFFSETS]
+    expected.append(('HIGH_SCORE_OFFSET', ROM_CONFIG['high_score_rom'], HIGH_SCORE_OFFSET, 'HIGH SCORE'))
+    expected.append(('CONFIG_BASE_OFFSET', ROM_CONFIG['object_roms'][0], CONFIG_BASE_OFFSET,
+                     'Map 1/D1 Logical Map Pointer'))
+    for name, config in UI_GRAPHICS_CONFIG.items():
+        expected.append((name, config['rom'], config['offset'], None))
+    for name, config in TREASURE_GRAPHICS_CONFIG.items():
+        expected.append((name, config['rom'], config['offset'], None))
+
+    problems = []
+    for constant, rom, offset, description in expected:
+        region = memory_map.region_at(rom, offset)
+        if region is None:
+            problems.append(f"{constant}: {rom} 0x{offset:04X} isn't in any MemoryMap.txt region")
+        elif description is not None and (region[1] != offset or region[3] != description):
+            problems.append(f"{constant}: {rom} 0x{offset:04X} is '{region[3]}' in MemoryMap.txt, not '{description}'")
+    for problem in problems:
+        logging.warning(problem)
+    return problems
+
+memory_map = None
+
+def get_memory_map():
+    """Get the MemoryMap.txt index, loading it on first use"""
+    global memory_map
+    if memory_map is None:
+        try:
+            memory_map = load_memory_map()
+            check_offsets(memory_map)
+        except OSError as e:
+            logging.warning(f"No memory map, regions will be unlabeled: {e}")
+            memory_map = MemoryMap.from_regions([])
+    return memory_map
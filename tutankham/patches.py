@@ -0,0 +1,277 @@
+"""IPS / BPS patches between the loaded and edited ROMs - no Tk required
+
+Patches are per ROM and named after it (m1.1h.ips, c8.8i.bps ...), so a
+patch folder can be applied on top of any copy of the same set. They are
+made against original_rom_cache, the ROMs as they were loaded, so patches
+applied after loading end up in the next patch too.
+"""
+import os
+import logging
+import zlib
+
+import numpy as np
+
+from .roms import rom_cache, original_rom_cache, trigger_callback
+from .digests import get_rom_digests
+
+#########################################
+# Patch Data Setup
+#########################################
+
+PATCH_FORMATS  = ['.ips', '.bps']
+IPS_HEADER     = b'PATCH'
+IPS_FOOTER     = b'EOF'
+IPS_MAX_RECORD = 0xFFFF     # 16-bit record size
+IPS_RECORD_OVERHEAD = 5     # 3 byte offset + 2 byte size
+BPS_HEADER     = b'BPS1'
+BPS_SOURCE_READ, BPS_TARGET_READ, BPS_SOURCE_COPY, BPS_TARGET_COPY = range(4)
+
+#########################################
+# Diff Functions
+#########################################
+
+def diff_runs(original, edited, merge_gap=0):
+    """Find the runs of changed bytes between two equal-length buffers
+
+    Args:
+        merge_gap: Join runs separated by this many unchanged bytes or fewer -
+            cheaper than a new record when a record costs more than the gap
+
+    Returns:
+        (N, 2) array of [start, end) offsets
+    """
+    changed = np.frombuffer(original, dtype=np.uint8) != np.frombuffer(edited, dtype=np.uint8)
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], changed, [False])).astype(np.int8)))
+    runs = edges.reshape(-1, 2)
+    if merge_gap and len(runs) > 1:
+        # A run starts a new group unless the gap before it is small enough to bridge
+        keep = np.concatenate(([True], runs[1:, 0] - runs[:-1, 1] > merge_gap))
+        runs = np.column_stack((runs[keep, 0], np.append(runs[np.flatnonzero(keep)[1:] - 1, 1], runs[-1, 1])))
+    return runs
+
+#########################################
+# IPS Functions
+#########################################
+
+def make_ips(original, edited):
+    """Build an IPS patch turning original into edited (same size)"""
+    patch = bytearray(IPS_HEADER)
+    for start, end in diff_runs(original, edited, IPS_RECORD_OVERHEAD):
+        for offset in range(start, end, IPS_MAX_RECORD):
+            chunk = edited[offset:min(end, offset + IPS_MAX_RECORD)]
+            patch += offset.to_bytes(3, 'big') + len(chunk).to_bytes(2, 'big') + chunk
+    patch += IPS_FOOTER
+    return bytes(patch)
+
+def apply_ips(data, patch):
+    """Apply an IPS patch in place to a bytearray (RLE records and truncation included)"""
+    if patch[:5] != IPS_HEADER:
+        raise ValueError("Not an IPS patch")
+    pos = 5
+    while patch[pos:pos + 3] != IPS_FOOTER:
+        if pos + 5 > len(patch):
+            raise ValueError("IPS patch is truncated")
+        offset = int.from_bytes(patch[pos:pos + 3], 'big')
+        size = int.from_bytes(patch[pos + 3:pos + 5], 'big')
+        pos += 5
+        if size == 0:
+            # RLE record: 2 byte count, 1 byte value
+            size = int.from_bytes(patch[pos:pos + 2], 'big')
+            chunk = patch[pos + 2:pos + 3] * size
+            pos += 3
+        else:
+            chunk = patch[pos:pos + size]
+            pos += size
+        if offset + size > len(data):
+            raise ValueError(f"IPS record at 0x{offset:06X} runs past the end of the {len(data)} byte ROM")
+        data[offset:offset + size] = chunk
+    pos += 3
+    if len(patch) >= pos + 3:
+        del data[int.from_bytes(patch[pos:pos + 3], 'big'):]
+    return data
+
+#########################################
+# BPS Functions
+#########################################
+
+def encode_bps_number(value):
+    """BPS variable-length number"""
+    out = bytearray()
+    while True:
+        low = value & 0x7F
+        value >>= 7
+        if value == 0:
+            out.append(0x80 | low)
+            return bytes(out)
+        out.append(low)
+        value -= 1
+
+def decode_bps_number(patch, pos):
+    """Read a BPS number, returns (value, next position)"""
+    value, shift = 0, 1
+    while True:
+        byte = patch[pos]
+        pos += 1
+        value += (byte & 0x7F) * shift
+        if byte & 0x80:
+            return value, pos
+        shift <<= 7
+        value += shift
+
+def make_bps(original, edited, metadata=b'', target_crc=None):
+    """Build a BPS patch: SourceRead for unchanged stretches, TargetRead for the edits
+
+    target_crc can pass in an already known CRC32 of edited.
+    """
+    patch = bytearray(BPS_HEADER)
+    patch += encode_bps_number(len(original)) + encode_bps_number(len(edited))
+    patch += encode_bps_number(len(metadata)) + metadata
+
+    pos = 0
+    for start, end in diff_runs(original, edited[:len(original)], 1):
+        if start > pos:
+            patch += encode_bps_number((start - pos - 1) << 2 | BPS_SOURCE_READ)
+        patch += encode_bps_number((end - start - 1) << 2 | BPS_TARGET_READ) + edited[start:end]
+        pos = end
+    if len(edited) > pos:
+        patch += encode_bps_number((len(edited) - pos - 1) << 2 | BPS_SOURCE_READ)
+
+    if target_crc is None:
+        target_crc = zlib.crc32(edited)
+    patch += zlib.crc32(original).to_bytes(4, 'little') + target_crc.to_bytes(4, 'little')
+    patch += zlib.crc32(patch).to_bytes(4, 'little')
+    return bytes(patch)
+
+def apply_bps(data, patch):
+    """Apply a BPS patch to a bytearray, checking all three CRCs
+
+    Returns:
+        The patched bytearray (BPS writes a new target, so this is a new object)
+    """
+    if patch[:4] != BPS_HEADER:
+        raise ValueError("Not a BPS patch")
+    if zlib.crc32(patch[:-4]) != int.from_bytes(patch[-4:], 'little'):
+        raise ValueError("BPS patch is corrupt (patch CRC mismatch)")
+    if zlib.crc32(data) != int.from_bytes(patch[-12:-8], 'little'):
+        raise ValueError("BPS patch was made for a different ROM (source CRC mismatch)")
+
+    source_size, pos = decode_bps_number(patch, 4)
+    target_size, pos = decode_bps_number(patch, pos)
+    metadata_size, pos = decode_bps_number(patch, pos)
+    pos += metadata_size
+
+    target = bytearray(target_size)
+    out = source_rel = target_rel = 0
+    end = len(patch) - 12
+    while pos < end:
+        data_value, pos = decode_bps_number(patch, pos)
+        action, length = data_value & 3, (data_value >> 2) + 1
+        if action == BPS_SOURCE_READ:
+            target[out:out + length] = data[out:out + length]
+        elif action == BPS_TARGET_READ:
+            target[out:out + length] = patch[pos:pos + length]
+            pos += length
+        else:
+            rel, pos = decode_bps_number(patch, pos)
+            delta = -(rel >> 1) if rel & 1 else rel >> 1
+            if action == BPS_SOURCE_COPY:
+                source_rel += delta
+                target[out:out + length] = data[source_rel:source_rel + length]
+                source_rel += length
+            else:
+                # Target copies may overlap what they write, so go byte by byte
+                target_rel += delta
+                for i in range(length):
+                    target[out + i] = target[target_rel + i]
+                target_rel += length
+        out += length
+
+    if zlib.crc32(target) != int.from_bytes(patch[-8:-4], 'little'):
+        raise ValueError("BPS patch produced the wrong ROM (target CRC mismatch)")
+    return target
+
+#########################################
+# Patch File Functions
+#########################################
+
+def changed_roms():
+    """Names of the ROMs whose cache differs from what was loaded"""
+    return [rom_name for rom_name, data in rom_cache.items()
+            if rom_name in original_rom_cache and data != original_rom_cache[rom_name]]
+
+def write_patches(output_dir, patch_format='.ips'):
+    """Write one patch per changed ROM
+
+    Returns:
+        List of written paths
+    """
+    if patch_format not in PATCH_FORMATS:
+        raise ValueError(f"Patch format must be one of {', '.join(PATCH_FORMATS)}, got {patch_format!r}")
+    os.makedirs(output_dir, exist_ok=True)
+    digests = get_rom_digests()
+
+    paths = []
+    for rom_name in changed_roms():
+        path = os.path.join(output_dir, rom_name + patch_format)
+        if patch_format == '.ips':
+            patch = make_ips(original_rom_cache[rom_name], bytes(rom_cache[rom_name]))
+        else:
+            patch = make_bps(original_rom_cache[rom_name], bytes(rom_cache[rom_name]),
+                             target_crc=digests.crc32[rom_name])
+        with open(path, 'wb') as f:
+            f.write(patch)
+        paths.append(path)
+        logging.info(f"Wrote {path}")
+    return paths
+
+def patch_rom_name(path):
+    """ROM a patch file is for, from its name (m1.1h.ips -> m1.1h)"""
+    rom_name, ext = os.path.splitext(os.path.basename(path))
+    if ext.lower() not in PATCH_FORMATS:
+        raise ValueError(f"{path}: patch files must end in {' or '.join(PATCH_FORMATS)}")
+    if rom_name not in rom_cache:
+        raise ValueError(f"{path}: no ROM named {rom_name} is loaded")
+    return rom_name
+
+def apply_patch_file(path, notify=True):
+    """Apply an IPS or BPS patch file to its ROM in the cache"""
+    rom_name = patch_rom_name(path)
+    with open(path, 'rb') as f:
+        patch = f.read()
+
+    if path.lower().endswith('.ips'):
+        patched = apply_ips(bytearray(rom_cache[rom_name]), patch)
+    else:
+        patched = apply_bps(rom_cache[rom_name], patch)
+    if len(patched) != len(rom_cache[rom_name]):
+        # Every codec reads fixed offsets - a resized ROM would corrupt them and the saved file
+        raise ValueError(f"{path} would resize {rom_name} from {len(rom_cache[rom_name])} "
+                         f"to {len(patched)} bytes")
+    # Patch in place so anything holding the cache's bytearray sees the change
+    rom_cache[rom_name][:] = patched
+    logging.info(f"Applied {path} to {rom_name}")
+
+    if notify:
+        trigger_callback('roms_loaded')
+    return rom_name
+
+def apply_patch_files(paths):
+    """Apply patches in order (folders expand to their patch files, sorted)
+
+    Derived caches are rebuilt once at the end, like after a load.
+
+    Returns:
+        List of patched ROM names
+    """
+    patched = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, name) for name in os.listdir(path)
+                           if os.path.splitext(name)[1].lower() in PATCH_FORMATS)
+        else:
+            files = [path]
+        patched += [apply_patch_file(patch_path, notify=False) for patch_path in files]
+
+    if patched:
+        trigger_callback('roms_loaded')
+    return patched
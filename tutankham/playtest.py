@@ -0,0 +1,228 @@
+"""Stage the edited ROM set for MAME and launch it - no Tk required
+
+PLAYTEST_DIR is per user. Each editor stages into its own folder under it,
+kept for every playtest of that session and removed at exit:
+
+    <PLAYTEST_DIR>/.cache/<CRC32>.rom             zip members, extracted once and shared
+    <PLAYTEST_DIR>/stage-XXXX/<driver>/<file>     what MAME loads
+    <PLAYTEST_DIR>/stage-XXXX/staged.json         file -> CRC32 of what is staged
+
+The driver is the current ROM set's MAME machine (ROM_SETS 'mame_driver'),
+and files are staged under the names that machine expects.
+
+Every file MAME needs is named by its CRC32 (cached digests for rom_cache,
+the zip directory for everything else). A file already staged with that
+CRC is left alone. A file whose CRC is a zip member is hard linked (or
+reflinked, or as a last resort copied) from the extract cache. Only ROMs
+edited away from every known dump are written. A playtest after a one-tile
+edit therefore writes one 4KB file.
+
+The emulator command is a list of arguments with {rompath} and {driver}
+placeholders, from the TUTANKHAM_EMULATOR environment variable or
+PLAYTEST_COMMAND. STUB_COMMAND stands in for MAME in tests: it checks that
+the staged set is complete and prints each file's CRC32.
+"""
+import os
+import sys
+import json
+import atexit
+import getpass
+import shlex
+import logging
+import shutil
+import subprocess
+import tempfile
+import zipfile
+
+from . import roms
+from .roms import rom_cache, ROM_SETS
+from .digests import get_rom_digests
+
+#########################################
+# Playtest Data Setup
+#########################################
+
+def playtest_user():
+    """User name for the staging folder, so users sharing a temp folder never share a stage"""
+    try:
+        return getpass.getuser()
+    except (ImportError, KeyError, OSError):
+        return str(os.getuid()) if hasattr(os, 'getuid') else 'default'
+
+PLAYTEST_DIR     = os.path.join(tempfile.gettempdir(), f"tutankham-playtest-{playtest_user()}")
+PLAYTEST_CACHE   = os.path.join(PLAYTEST_DIR, '.cache')
+PLAYTEST_COMMAND = ['mame', '{driver}', '-rompath', '{rompath}', '-window', '-skip_gameinfo']
+PLAYTEST_ENV     = 'TUTANKHAM_EMULATOR'
+STUB_SCRIPT = """import sys, os, zlib
+rompath, driver = sys.argv[1:3]
+folder = os.path.join(rompath, driver)
+names = sorted(os.listdir(folder))
+for name in names:
+    with open(os.path.join(folder, name), 'rb') as f:
+        print(f"{name} {zlib.crc32(f.read()):08X}")
+print(f"{driver}: {len(names)} files")
+sys.exit(0 if names else 1)
+"""
+STUB_COMMAND = [sys.executable, '-c', STUB_SCRIPT, '{rompath}', '{driver}']
+FICLONE = 0x40049409            # Linux reflink ioctl
+
+#########################################
+# Staging Functions
+#########################################
+
+def link_file(source, target):
+    """Hard link source to target, else reflink, else copy
+
+    Returns:
+        'link', 'reflink' or 'copy'
+    """
+    try:
+        os.link(source, target)
+        return 'link'
+    except OSError:
+        pass
+    try:
+        import fcntl  # Unix only
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return 'reflink'
+    except (ImportError, OSError):
+        shutil.copyfile(source, target)
+        return 'copy'
+
+def write_file(path, data):
+    """Write a new file and rename it into place
+
+    A staged file may be a hard link into the cache, so it is never
+    written in place. The temporary name is unique, editors share the cache.
+    """
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+playtest_rompath = None         # This editor's stage under PLAYTEST_DIR, made on first use
+
+def get_playtest_rompath():
+    """This process's own staging rompath - two editors never stage over each other"""
+    global playtest_rompath
+    if playtest_rompath is None:
+        os.makedirs(PLAYTEST_DIR, mode=0o700, exist_ok=True)
+        playtest_rompath = tempfile.mkdtemp(prefix='stage-', dir=PLAYTEST_DIR)
+        atexit.register(shutil.rmtree, playtest_rompath, True)
+    return playtest_rompath
+
+def playtest_driver(rom_set=None):
+    """MAME machine for a ROM set (default: the current one), also the rompath subfolder it reads"""
+    return ROM_SETS[rom_set or roms.CURRENT_ROM_SET]['mame_driver']
+
+def playtest_files(zip_path=None):
+    """Everything MAME should find: {file name: (CRC32, bytes or None for a zip member)}"""
+    zip_path = zip_path or roms.ROM_ZIP_PATH
+    rom_set = ROM_SETS[roms.CURRENT_ROM_SET]
+    names = ROM_SETS[rom_set.get('mame_names', roms.CURRENT_ROM_SET)]['files']
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        files = {info.filename: (info.CRC, None) for info in zip_ref.infolist() if not info.is_dir()}
+    members = {crc for crc, _ in files.values()}
+
+    digests = get_rom_digests()
+    for rom_name in rom_set['files']:
+        crc = digests.crc32[rom_name]
+        files[os.path.basename(names[rom_name])] = (crc, None if crc in members else bytes(rom_cache[rom_name]))
+    return files
+
+def stage_playtest(rompath=None, driver=None, zip_path=None):
+    """Bring the staged rompath in line with rom_cache plus the zip's other files
+
+    rompath defaults to get_playtest_rompath(), driver to playtest_driver().
+
+    Returns:
+        {'kept': n, 'linked': n, 'written': n, 'removed': n}
+    """
+    rompath = rompath or get_playtest_rompath()
+    driver = driver or playtest_driver()
+    zip_path = zip_path or roms.ROM_ZIP_PATH
+    cache_dir = PLAYTEST_CACHE
+    driver_dir = os.path.join(rompath, driver)
+    manifest_path = os.path.join(rompath, 'staged.json')
+    os.makedirs(PLAYTEST_DIR, mode=0o700, exist_ok=True)
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(driver_dir, exist_ok=True)
+    try:
+        with open(manifest_path) as f:
+            staged = json.load(f)
+    except (OSError, ValueError):
+        staged = {}
+
+    files = playtest_files(zip_path)
+    counts = {'kept': 0, 'linked': 0, 'written': 0, 'removed': 0}
+    methods = set()
+    zip_ref = None
+    try:
+        for name, (crc, data) in files.items():
+            target = os.path.join(driver_dir, name)
+            if staged.get(name) == crc and os.path.exists(target):
+                counts['kept'] += 1
+                continue
+            if os.path.lexists(target):
+                os.remove(target)
+            if data is not None:
+                write_file(target, data)
+                counts['written'] += 1
+            else:
+                cached = os.path.join(cache_dir, f"{crc:08X}.rom")
+                if not os.path.exists(cached):
+                    zip_ref = zip_ref or zipfile.ZipFile(zip_path, 'r')
+                    member = next(info for info in zip_ref.infolist() if info.CRC == crc)
+                    write_file(cached, zip_ref.read(member))
+                methods.add(link_file(cached, target))
+                counts['linked'] += 1
+            staged[name] = crc
+    finally:
+        if zip_ref is not None:
+            zip_ref.close()
+
+    for name in set(os.listdir(driver_dir)) - set(files):
+        os.remove(os.path.join(driver_dir, name))
+        staged.pop(name, None)
+        counts['removed'] += 1
+    write_file(manifest_path, json.dumps(staged, indent=1).encode('utf-8'))
+
+    logging.info(f"Staged {roms.CURRENT_ROM_SET} in {driver_dir}: " +
+                 ", ".join(f"{count} {kind}" for kind, count in counts.items()) +
+                 (f" ({'/'.join(sorted(methods))})" if methods else ""))
+    return counts
+
+#########################################
+# Emulator Functions
+#########################################
+
+def playtest_command(command=None):
+    """The emulator command: argument, else $TUTANKHAM_EMULATOR, else PLAYTEST_COMMAND"""
+    if command is None:
+        command = os.environ.get(PLAYTEST_ENV) or PLAYTEST_COMMAND
+    if isinstance(command, str):
+        command = shlex.split(command)
+    return list(command)
+
+def launch_emulator(rompath=None, driver=None, command=None):
+    """Start the emulator on the staged rompath without waiting for it
+
+    Returns:
+        The subprocess.Popen
+    """
+    rompath = rompath or get_playtest_rompath()
+    driver = driver or playtest_driver()
+    # Plain replace rather than str.format, arguments may hold other braces (STUB_SCRIPT)
+    args = [arg.replace('{rompath}', rompath).replace('{driver}', driver) for arg in playtest_command(command)]
+    logging.info(f"Launching {' '.join(shlex.quote(arg) for arg in args)}")
+    return subprocess.Popen(args, cwd=rompath)
+
+def playtest(rompath=None, driver=None, command=None, zip_path=None):
+    """Stage the current set and launch the emulator on it
+
+    Returns:
+        (staging counts, Popen)
+    """
+    counts = stage_playtest(rompath, driver, zip_path)
+    return counts, launch_emulator(rompath, driver, command)
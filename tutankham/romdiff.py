@@ -0,0 +1,87 @@
+"""ROM set comparison - changed byte runs labeled with MemoryMap.txt regions - no Tk required"""
+import os
+import zipfile
+
+from . import roms
+from .roms import rom_cache, original_rom_cache, ROM_SETS
+from .patches import diff_runs
+from .memorymap import get_memory_map
+
+#########################################
+# ROM Diff Data Setup
+#########################################
+
+DIFF_MERGE_GAP    = 0       # Unchanged bytes bridged between runs (0 = exact runs)
+DIFF_LABEL_LIMIT  = 3       # Region names listed per run before "+N more"
+
+#########################################
+# ROM Diff Functions
+#########################################
+
+def read_rom_set(rom_set, source=None):
+    """Read a ROM set from a MAME zip or ROM folder without touching rom_cache
+
+    Returns:
+        {logical ROM name: bytes}
+    """
+    source = source or roms.ROM_ZIP_PATH
+    files = {rom_name: os.path.basename(path) for rom_name, path in ROM_SETS[rom_set]['files'].items()}
+    if os.path.isdir(source):
+        data = {}
+        for rom_name, filename in files.items():
+            with open(os.path.join(source, filename), 'rb') as f:
+                data[rom_name] = f.read()
+        return data
+    with zipfile.ZipFile(source, 'r') as zip_ref:
+        return {rom_name: zip_ref.read(filename) for rom_name, filename in files.items()}
+
+def diff_rom_sets(old, new, merge_gap=DIFF_MERGE_GAP):
+    """Compare two {ROM name: bytes} snapshots
+
+    Identical ROMs are skipped with a plain bytes compare; the rest are diffed
+    with numpy and every run of changed bytes is labeled with the memory map
+    regions it touches.
+
+    Returns:
+        List of runs in ROM/address order, each a dict with rom, start, end
+        (exclusive file offsets), size and regions (MemoryMap descriptions)
+    """
+    memory_map = get_memory_map()
+    runs = []
+    for rom_name in sorted(set(old) & set(new)):
+        a, b = old[rom_name], new[rom_name]
+        if a == b:
+            continue
+        size = min(len(a), len(b))
+        spans = [(int(start), int(end)) for start, end in diff_runs(a[:size], b[:size], merge_gap)]
+        if len(a) != len(b):
+            spans.append((size, max(len(a), len(b))))
+        for start, end in spans:
+            regions = [region[3] for region in memory_map.regions_in(rom_name, start, end)]
+            runs.append({'rom': rom_name, 'start': start, 'end': end, 'size': end - start, 'regions': regions})
+    return runs
+
+def diff_edits():
+    """Runs changed in rom_cache since the ROMs were loaded"""
+    return diff_rom_sets(original_rom_cache, rom_cache)
+
+def describe_regions(regions, limit=DIFF_LABEL_LIMIT):
+    """Short label for a run's regions, e.g. 'Tile 0x09 - Wall, Tile 0x0A - Wall (+3 more)'"""
+    if not regions:
+        return "(unmapped)"
+    label = ", ".join(regions[:limit])
+    if len(regions) > limit:
+        label += f" (+{len(regions) - limit} more)"
+    return label
+
+def format_diff(runs, old=None, new=None):
+    """Text report of diff runs, one line per run, with the bytes if both sides are given"""
+    lines = []
+    for run in runs:
+        line = f"{run['rom']:6} 0x{run['start']:04X}-0x{run['end'] - 1:04X} {run['size']:5}B  {describe_regions(run['regions'])}"
+        if old is not None and new is not None and run['size'] <= 8:
+            before = old[run['rom']][run['start']:run['end']].hex(' ').upper()
+            after = new[run['rom']][run['start']:run['end']].hex(' ').upper()
+            line += f"  [{before} -> {after}]"
+        lines.append(line)
+    return "\n".join(lines)
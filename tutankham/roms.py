@@ -0,0 +1,406 @@
+"""ROM sets, the shared ROM cache and state callbacks - no Tk required"""
+import os
+import shutil
+from datetime import datetime
+import logging
+import zipfile
+import tempfile
+
+#########################################
+# ROM Data Setup
+#########################################
+
+# ROM file structure - centralized definition
+ROM_CONFIG = {
+    'tile_roms': ['c1.1i', 'c2.2i', 'c3.3i', 'c4.4i', 'c5.5i'],
+    'visual_map_rom': 'c8.8i',
+    'logical_map_roms': ['c6.6i', 'c7.7i'],
+    'object_roms': ['m1.1h', 'm2.2h'],
+    'high_score_rom': 'm1.1h',
+    'palette_rom': 'm1.1h',}
+# All ROM files with paths
+CURRENT_ROM_SET = 'Konami'      # Default Set (Konami, Stern, Bootleg)
+ROM_SETS = {
+    'Konami': {
+        'name': 'Konami (Original)',
+        'mame_driver': 'tutankhm',
+        'notes': [
+            'Original Japanese release',
+            'Copyright: © 1982 KONAMI',
+        ],
+        'files': {
+            'c1.1i': './c1.1i',
+            'c2.2i': './c2.2i',
+            'c3.3i': './c3.3i',
+            'c4.4i': './c4.4i',
+            'c5.5i': './c5.5i',
+            'c6.6i': './c6.6i',
+            'c7.7i': './c7.7i',
+            'c8.8i': './c8.8i',
+            'c9.9i': './c9.9i',
+            'm1.1h': './m1.1h',
+            'm2.2h': './m2.2h',
+            'm4.4h': './m4.4h',
+            'm5.5h': './m5.5h',
+            '3j.3h': './3j.3h',
+            'j6.6h': './j6.6h',
+        }
+    },
+    'Stern': {
+        'name': 'Stern Electronics (US)',
+        'mame_driver': 'tutankhms',
+        'notes': [
+            'Licensed US release by Stern Electronics',
+            'Copyright: © 1982 KONAMI / STERN ELECTRONICS',
+            'Differences in copyright graphic and checksum'
+        ],    
+        'files': {
+            'c1.1i': './c1.1i',
+            'c2.2i': './c2.2i',
+            'c3.3i': './c3.3i',
+            'c4.4i': './c4.4i',
+            'c5.5i': './c5.5i',
+            'c6.6i': './c6.6i',
+            'c7.7i': './c7.7i',
+            'c8.8i': './c8.8i',
+            'c9.9i': './c9.9i',
+            'm1.1h': './m1.1h',
+            'm2.2h': './m2.2h',
+            'm4.4h': './m4.4h',
+            'm5.5h': './m5.5h',
+            '3j.3h': './3a.3h',
+            'j6.6h': './a6.6h',
+        }
+    },
+    'Bootleg': {
+        'name': 'Bootleg (Unofficial)',
+        'mame_driver': 'tutankhm',  # No bootleg machine in MAME -
+        'mame_names': 'Konami',     # playtested as the Konami set, under its file names
+        'notes': [
+            'Copyright changed from "© 1982 KONAMI" to "1982"',
+            'Title graphic zeroed out (no "TUTANKHAM" logo)',
+            'Copy protection bypassed (checksum branch NOPed at 0xCE27)',
+            'High score name changed from HTA to SYY',
+            'Otherwise identical to Konami version, including the ignored checksum'
+        ],        
+        'files': {
+            'c1.1i': './t7.1i',
+            'c2.2i': './t8.2i',
+            'c3.3i': './t9.3i',
+            'c4.4i': './t10.4i',
+            'c5.5i': './t11.5i',
+            'c6.6i': './t12.6i',
+            'c7.7i': './t13.7i',
+            'c8.8i': './t14.8i',
+            'c9.9i': './t15.9i',
+            'm1.1h': './t1.1h',
+            'm2.2h': './t2.2h',
+            'm4.4h': './t4.4h',
+            'm5.5h': './t5.5h',
+            '3j.3h': './t3.3h',
+            'j6.6h': './t6.6h',
+        }
+    }
+}
+# Global ROM cache - loaded once at startup
+rom_cache          = {}
+original_rom_cache = {}         # ROMs as loaded (bytes), the base for patches
+rom_paths          = {}         # ROM -> file it was loaded from (empty for zip loads, the extract is temporary)
+in_place_roms      = {}         # ROM edited in place -> [file path, bytes on disk as of the last load/save]
+WRITEBACK_BLOCK_SIZE = 0x100    # Granularity of in-place saves - a 4KB ROM is a single OS page
+# MAME zip, expected next to the editor
+ROM_ZIP_PATH       = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tutankhm.zip")
+state_callbacks = {             # Callback registry for cross-window updates
+    'palette_changed': [],
+    'tile_changed':    [],
+    'font_changed':    [],
+    'problems_changed': [],
+    'map_changed':      [],
+    'roms_loaded':      []
+}
+
+#########################################
+# State Callback Functions
+#########################################
+
+def register_callback(event_type, callback):
+    """Register a callback for a state change event"""
+    if event_type in state_callbacks:
+        state_callbacks[event_type].append(callback)
+
+def trigger_callback(event_type, *args, **kwargs):
+    """Trigger all callbacks for an event type"""
+    if event_type in state_callbacks:
+        # Make a copy to avoid modification during iteration
+        callbacks = state_callbacks[event_type].copy()
+        
+        for callback in callbacks:
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                # Window was destroyed (Tk reports a bad path name), remove this callback
+                if "bad window path name" in str(e):
+                    logging.debug(f"Removing stale callback for {event_type}")
+                    state_callbacks[event_type].remove(callback)
+                else:
+                    logging.error(f"Callback error for {event_type}: {e}")
+
+#########################################
+# Rom Handling Functions
+#########################################
+
+def load_all_roms(in_place=False):
+    """Load all ROM files into memory at startup
+    
+    Args:
+        in_place: Save back into these files, writing only changed blocks
+                  (see write_back_rom). Edits always live in rom_cache's own
+                  bytearrays, never in pages shared with the files, so an
+                  outside tool rewriting a file can't take them away.
+    """
+    global rom_cache
+    rom_files = ROM_SETS[CURRENT_ROM_SET]['files']
+    
+    # Clear cache first
+    rom_cache.clear()
+    original_rom_cache.clear()
+    rom_paths.clear()
+    in_place_roms.clear()
+    logging.info(f"Loading ROM set: {ROM_SETS[CURRENT_ROM_SET]['name']}")
+    
+    for rom_name, rom_path in rom_files.items():
+        try:
+            with open(rom_path, 'rb') as f:
+                original_rom_cache[rom_name] = f.read()
+            rom_cache[rom_name] = bytearray(original_rom_cache[rom_name])
+            if in_place:
+                in_place_roms[rom_name] = [os.path.abspath(rom_path), original_rom_cache[rom_name]]
+            rom_paths[rom_name] = os.path.abspath(rom_path)
+            # Log both logical name and physical filename
+            physical_filename = os.path.basename(rom_path)
+            logging.info("Loaded %s from %s: %d bytes", rom_name, physical_filename, len(rom_cache[rom_name]))
+        except Exception as e:
+            physical_filename = os.path.basename(rom_path)
+            logging.critical("Error loading %s from %s: %s", rom_name, physical_filename, e)
+    
+    logging.info(f"ROM cache now contains {len(rom_cache)} files")
+    
+    # Let derived caches (object indexes, teleporter table ...) rebuild
+    trigger_callback('roms_loaded')
+
+def load_roms_from_folder(folder_path: str, in_place=False):
+    """Temporarily repoint ROM files and call load_all_roms() (in_place: see load_all_roms)."""
+    global ROM_SETS, CURRENT_ROM_SET
+    
+    original = ROM_SETS[CURRENT_ROM_SET]['files'].copy()
+    try:
+        # Look for files by their PHYSICAL names in the folder
+        updated_paths = {}
+        rom_files = ROM_SETS[CURRENT_ROM_SET]['files']
+        
+        for logical_name, physical_path in rom_files.items():
+            # Extract just the filename
+            physical_filename = os.path.basename(physical_path)
+            full_path = os.path.join(folder_path, physical_filename)
+            
+            if not os.path.isfile(full_path):
+                raise FileNotFoundError(f"Missing {physical_filename} (needed for {logical_name}) in {folder_path}")
+            
+            updated_paths[logical_name] = full_path
+            logging.info(f"Found {logical_name} -> {physical_filename}")
+        
+        # Update paths temporarily
+        ROM_SETS[CURRENT_ROM_SET]['files'].update(updated_paths)
+        
+        load_all_roms(in_place)
+        logging.info("ROMs loaded from folder%s: %s", " for in-place editing" if in_place else "", folder_path)
+    finally:
+        ROM_SETS[CURRENT_ROM_SET]['files'].clear()
+        ROM_SETS[CURRENT_ROM_SET]['files'].update(original)
+
+def load_roms_from_zip(zip_path=None):
+    """Load ROMs from the MAME zip (by default the one in the application directory)."""
+    global ROM_SETS, CURRENT_ROM_SET
+    
+    try:
+        zip_path = zip_path or ROM_ZIP_PATH
+
+        if not os.path.exists(zip_path):
+            raise FileNotFoundError(f"Zip file not found:\n{zip_path}")
+
+        with tempfile.TemporaryDirectory() as extract_dir:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                zip_ref.extractall(extract_dir)
+            logging.info(f"Extracted ROMs from: {zip_path}")
+            
+            # Log what files were extracted
+            extracted_files = os.listdir(extract_dir)
+            logging.info(f"Extracted files: {', '.join(extracted_files)}")
+
+            # Point ROM_SETS to extracted versions
+            # Look for files by their PHYSICAL names (not logical names)
+            updated_paths = {}
+            rom_files = ROM_SETS[CURRENT_ROM_SET]['files']
+            
+            for logical_name, physical_path in rom_files.items():
+                # Extract just the filename from the path (e.g., './a6.6h' -> 'a6.6h')
+                physical_filename = os.path.basename(physical_path)
+                extracted_path = os.path.join(extract_dir, physical_filename)
+                
+                if os.path.exists(extracted_path):
+                    updated_paths[logical_name] = extracted_path
+                    logging.info(f"Mapped {logical_name} -> {physical_filename}")
+                else:
+                    logging.error(f"MISSING: {logical_name} needs physical file '{physical_filename}' but not found in zip!")
+                    raise FileNotFoundError(
+                        f"ROM set '{ROM_SETS[CURRENT_ROM_SET]['name']}' requires file:\n"
+                        f"  {physical_filename}\n\n"
+                        f"But it was not found in {zip_path}\n\n"
+                        f"Available files: {', '.join(extracted_files)}"
+                    )
+
+            # Only temporarily override ROM_SETS
+            original_paths = rom_files.copy()
+            ROM_SETS[CURRENT_ROM_SET]['files'].update(updated_paths)
+
+            # Load the ROMs
+            load_all_roms()
+            rom_paths.clear()   # Nothing to watch in a temporary extract
+            logging.info("ROMs loaded successfully from zip file.")
+
+            # Restore ROM_SETS to original paths
+            ROM_SETS[CURRENT_ROM_SET]['files'].clear()
+            ROM_SETS[CURRENT_ROM_SET]['files'].update(original_paths)
+
+            # Temporary directory auto-deletes here
+    except Exception as e:
+        logging.error(f"Error loading from zip: {e}")
+        raise
+
+def save_all_roms(target_directory=None):
+    """Write all modified ROMs back to disk
+    
+    Args:
+        target_directory: Optional directory path. If None, saves to original ROM_FILES paths.
+                         If specified, saves all ROMs to that directory with original names.
+    
+    Returns:
+        List of ROMs that could not be written (empty when everything was saved)
+    """
+    from .digests import get_rom_digests  # digests builds on this module
+    rom_files = ROM_SETS[CURRENT_ROM_SET]['files']
+    digests = get_rom_digests()
+    
+    failed = []
+    for rom_name, rom_data in rom_cache.items():
+        try:
+            if not target_directory and rom_name in in_place_roms:
+                write_back_rom(rom_name)
+                continue
+            if target_directory:
+                rom_path = os.path.join(target_directory, rom_name)
+            else:
+                rom_path = rom_files[rom_name]
+            
+            with open(rom_path, 'wb') as f:
+                f.write(rom_data)
+            logging.info("Saved %s to %s (CRC32 %08X, %s)", rom_name, rom_path,
+                         digests.crc32[rom_name], digests.dump_status(rom_name))
+        except Exception as e:
+            logging.critical("Error saving %s: %s", rom_name, e)
+            failed.append(rom_name)
+    return failed
+
+def write_back_rom(rom_name):
+    """Write the changed blocks of a ROM loaded in place back to its file
+    
+    Blocks are compared with what the file held after the last load or save,
+    so an unchanged ROM costs one compare and no I/O.
+    
+    Returns:
+        Number of blocks written
+    """
+    rom_path, on_disk = in_place_roms[rom_name]
+    data = rom_cache[rom_name]
+    if data == on_disk:
+        return 0
+    
+    written = 0
+    with open(rom_path, 'r+b') as f:
+        for start in range(0, len(data), WRITEBACK_BLOCK_SIZE):
+            block = data[start:start + WRITEBACK_BLOCK_SIZE]
+            if block != on_disk[start:start + WRITEBACK_BLOCK_SIZE]:
+                f.seek(start)
+                f.write(block)
+                written += 1
+    in_place_roms[rom_name][1] = bytes(data)
+    logging.info("Wrote %d changed %d-byte blocks of %s back to %s",
+                 written, WRITEBACK_BLOCK_SIZE, rom_name, rom_path)
+    return written
+
+def read_byte_from_roms(offset):
+    """Read a single byte from the combined ROM space"""
+    rom_index = offset // 0x1000
+    rom_offset = offset % 0x1000
+    
+    if rom_index >= len(ROM_CONFIG['object_roms']):
+        raise ValueError(f"Offset 0x{offset:04X} beyond available ROMs")
+    
+    # Get ROM name and read from cache
+    rom_name = ROM_CONFIG['object_roms'][rom_index]
+    return rom_cache[rom_name][rom_offset]
+
+def write_byte_to_roms(offset, value):
+    """Write a single byte to the global ROM cache"""
+    rom_index = offset // 0x1000
+    rom_offset = offset % 0x1000
+    
+    if rom_index >= len(ROM_CONFIG['object_roms']):
+        raise ValueError(f"Offset 0x{offset:04X} beyond available ROMs")
+    
+    # Write directly to global rom_cache
+    rom_name = ROM_CONFIG['object_roms'][rom_index]
+    rom_cache[rom_name][rom_offset] = value
+
+def backup_file(filepath):
+    if os.path.exists(filepath):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_path = f"{filepath}.backup_{timestamp}"
+        shutil.copy2(filepath, backup_path)
+        return backup_path
+    return None
+
+#########################################
+# Copyright Checksum Handling Functions
+#########################################
+
+def calculate_copyright_checksum():
+    """Calculate and return the copyright graphic checksum"""
+    rom_data = rom_cache['j6.6h']
+    base_addr = 0x5C0
+    byte_count = 0x66
+    
+    A = B = 0x00
+    X = base_addr
+    
+    for _ in range(byte_count):
+        byte_val = rom_data[X]
+        B_sum = B + byte_val
+        carry_out = 1 if B_sum >= 0x100 else 0
+        B = B_sum & 0xFF
+        X += 1
+        A = (A + carry_out) & 0xFF
+    
+    return (A << 8) | B
+
+def update_copyright_checksum():
+    """Write the copyright checksum to ROM, reusing the incrementally tracked sum"""
+    from .digests import get_rom_digests  # digests builds on this module
+    checksum = get_rom_digests().checksum
+    if checksum is None:
+        checksum = calculate_copyright_checksum()
+    
+    # Checksum stored at 0xCE25-0xCE26 in 3j.3h (big-endian)
+    rom_cache['3j.3h'][0xE25] = (checksum >> 8) & 0xFF  # High byte
+    rom_cache['3j.3h'][0xE26] = checksum & 0xFF         # Low byte
+    logging.info("Copyright checksum updated: 0x%04X", checksum)
@@ -0,0 +1,188 @@
+"""Watch the loaded ROM files for changes made by other tools - no Tk required
+
+poll() stats every file the ROMs were loaded from (nothing to watch after a
+zip load) and only reads a file whose size or mtime moved. A changed file is
+diffed against what the editor last saw on disk:
+
+    - the same bytes as rom_cache: nothing to do (our own save, or a touch)
+    - rom_cache still equals the old disk bytes: the changed runs are written
+      into rom_cache in place and announced with the same events the editors
+      fire (tile_changed, map_changed ...), so only affected views redraw
+    - rom_cache has unsaved edits: a conflict, left alone until resolve()
+"""
+import os
+import logging
+import zlib
+
+from .roms import rom_cache, rom_paths, in_place_roms, ROM_CONFIG, register_callback, trigger_callback
+from .patches import diff_runs
+from .graphics import (PALETTE_FILE_OFFSETS, FONT_ROM, NUM_FONTS, font_size, font_offset, tile_size,
+                       get_asset_store)
+from .maps import (num_maps, visual_map_size, CONFIG_BASE_OFFSET, OBJECT_BLOCK_SIZE, NUM_DIFFICULTIES,
+                   reset_map_caches, note_rom_write)
+
+#########################################
+# Watcher Data Setup
+#########################################
+
+PALETTE_SIZE = 0x10             # Bytes per palette at each PALETTE_FILE_OFFSETS entry
+WATCH_RELOADED, WATCH_CONFLICT, WATCH_MISSING, WATCH_RESIZED = 'reloaded', 'conflict', 'missing', 'resized'
+
+#########################################
+# Change Notification Functions
+#########################################
+
+def notify_rom_change(rom_name, start, end):
+    """Invalidate and announce whatever rom_name[start:end] feeds"""
+    get_asset_store().invalidate_rom_range(rom_name, start, end)
+    note_rom_write(rom_name, start, end)
+
+    if rom_name in ROM_CONFIG['tile_roms']:
+        rom_index = ROM_CONFIG['tile_roms'].index(rom_name)
+        base = sum(len(rom_cache[name]) // tile_size for name in ROM_CONFIG['tile_roms'][:rom_index])
+        for tile in range(start // tile_size, (end - 1) // tile_size + 1):
+            trigger_callback('tile_changed', base + tile)
+
+    if rom_name == FONT_ROM:
+        for font_id in range(NUM_FONTS):
+            if font_offset(font_id) < end and start < font_offset(font_id) + font_size:
+                trigger_callback('font_changed', font_id)
+
+    if rom_name == ROM_CONFIG['palette_rom']:
+        for palette_idx, offset in enumerate(PALETTE_FILE_OFFSETS):
+            if offset < end and start < offset + PALETTE_SIZE:
+                trigger_callback('palette_changed', palette_idx)
+
+    maps = set()
+    if rom_name == ROM_CONFIG['visual_map_rom']:
+        maps.update(range(start // visual_map_size, min((end - 1) // visual_map_size + 1, num_maps)))
+    if rom_name in ROM_CONFIG['object_roms']:
+        space = ROM_CONFIG['object_roms'].index(rom_name) * 0x1000
+        first = max((space + start - CONFIG_BASE_OFFSET) // OBJECT_BLOCK_SIZE, 0)
+        last = min((space + end - 1 - CONFIG_BASE_OFFSET) // OBJECT_BLOCK_SIZE, num_maps * NUM_DIFFICULTIES - 1)
+        maps.update(block % num_maps for block in range(first, last + 1))
+    if maps:
+        reset_map_caches()
+        for map_index in sorted(maps):
+            trigger_callback('map_changed', map_index)
+
+#########################################
+# Watcher Functions
+#########################################
+
+def file_signature(path):
+    """(size, mtime in ns) - cheap first check before reading a file"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+class RomWatcher:
+    """Polls the files in rom_paths and reloads the ones changed on disk"""
+
+    def __init__(self, paths=None):
+        self.paths = dict(rom_paths if paths is None else paths)
+        self.signatures = {}
+        self.disk = {}              # ROM -> bytes as last seen on disk
+        self.conflicts = {}         # ROM -> disk bytes waiting on resolve()
+        for rom_name, path in self.paths.items():
+            try:
+                self.signatures[rom_name] = file_signature(path)
+                with open(path, 'rb') as f:
+                    self.disk[rom_name] = f.read()
+            except OSError:
+                self.signatures[rom_name] = None    # Gone already, picked up if it comes back
+                self.disk[rom_name] = bytes(rom_cache[rom_name])
+
+    def poll(self):
+        """Check every watched file once
+
+        Returns:
+            List of (ROM, status, detail) for files that needed attention -
+            status is WATCH_RELOADED (detail: changed runs), WATCH_CONFLICT,
+            WATCH_MISSING or WATCH_RESIZED
+        """
+        events = []
+        for rom_name, path in self.paths.items():
+            try:
+                signature = file_signature(path)
+            except OSError:
+                if self.signatures[rom_name] is not None:
+                    self.signatures[rom_name] = None
+                    events.append((rom_name, WATCH_MISSING, path))
+                continue
+            if signature == self.signatures[rom_name]:
+                continue
+            self.signatures[rom_name] = signature
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            if data == self.disk[rom_name]:
+                continue  # Touched, not changed
+            if len(data) != len(rom_cache[rom_name]):
+                events.append((rom_name, WATCH_RESIZED, len(data)))
+            elif rom_cache[rom_name] == data:
+                self.sync_disk(rom_name, data)  # Saved by us, or the same change made in both places
+            elif rom_cache[rom_name] != self.disk[rom_name]:
+                self.conflicts[rom_name] = data
+                events.append((rom_name, WATCH_CONFLICT, path))
+            else:
+                events.append((rom_name, WATCH_RELOADED, self.reload(rom_name, data)))
+        return events
+
+    def sync_disk(self, rom_name, data):
+        """Record data as what the file now holds"""
+        self.disk[rom_name] = data
+        self.conflicts.pop(rom_name, None)
+        if rom_name in in_place_roms:
+            in_place_roms[rom_name][1] = data   # In-place saves diff against this
+
+    def reload(self, rom_name, data):
+        """Write the runs that changed on disk into rom_cache and announce them
+
+        Returns:
+            Number of changed runs
+        """
+        runs = diff_runs(rom_cache[rom_name], data)
+        for start, end in runs:
+            rom_cache[rom_name][start:end] = data[start:end]
+        self.sync_disk(rom_name, data)
+        return self.announce(rom_name, None, data, runs)
+
+    def announce(self, rom_name, old, data, runs=None):
+        """Fire the change events for the runs where old and data differ
+
+        Returns:
+            Number of changed runs
+        """
+        if runs is None:
+            runs = diff_runs(old, data)
+        for start, end in runs:
+            notify_rom_change(rom_name, int(start), int(end))
+        logging.info(f"Reloaded {rom_name} from {self.paths[rom_name]}: {len(runs)} changed runs, "
+                     f"CRC32 {zlib.crc32(data):08X}")
+        return len(runs)
+
+    def resolve(self, rom_name, take_disk):
+        """Settle a conflict: reload the file over the unsaved edits, or keep
+        the edits (the next save overwrites the file)"""
+        data = self.conflicts.pop(rom_name)
+        if take_disk:
+            return self.reload(rom_name, data)
+        self.sync_disk(rom_name, data)
+        logging.info(f"Kept unsaved edits to {rom_name} over the version on disk")
+        return 0
+
+rom_watcher = None
+
+def get_rom_watcher():
+    """Get the watcher for the files the ROMs were loaded from"""
+    global rom_watcher
+    if rom_watcher is None:
+        rom_watcher = RomWatcher()
+    return rom_watcher
+
+def reset_rom_watcher():
+    """Watch the new files after ROMs are loaded"""
+    global rom_watcher
+    rom_watcher = None
+
+register_callback('roms_loaded', reset_rom_watcher)